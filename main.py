@@ -3,17 +3,475 @@
 Punto de entrada principal del Sistema de Gestión Bancaria
 """
 
-import tkinter as tk
-from views.interfaz_banco import InterfazBanco
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+from models.registro_clientes import RegistroClientes
+from models.analitico import estimar_colas, validar_con_simulacion
+from models.dotacion import planificar_dotacion
+from models.ingesta import ColaIngesta, ServidorIngesta, medir_rendimiento
+from models.enrutamiento import comparar_topologias
+from models.descansos import comparar_descansos
+from models.estimacion import estimar_con_precision
+from models.comparacion import comparar_tecnicas
+from models.historial import HistorialEjecuciones
+from models.escenarios import buscar_escenario, listar_escenarios
+from models.barrido import CoordinadorBarrido, TrabajadorBarrido, generar_unidades
+from utils.aleatorio import secuencia
+from utils.config import (NUM_VENTANILLAS, FILA_VIRTUAL, FPS_TERMINAL, VELOCIDAD_TERMINAL,
+                          PRECISION_RELATIVA, POLITICA_DESCANSO, RUTA_HISTORIAL, PUERTO_BARRIDO,
+                          REPLICAS_BARRIDO, DURACION_BARRIDO, INTERVALO_MEMORIA_SIMULADO, SEMILLA_MAESTRA)
+from utils.metricas import MetricasBanco, ExportadorMetricas
+from utils.memoria import PerfilMemoria, resumir_reporte
+from utils.notificaciones import SumideroArchivo, SumideroHTTP, SumideroSMTP
+from views.tablero_web import ServidorTablero
+
+def parsear_argumentos():
+    """Define y procesa los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Sistema de Gestión Bancaria")
+    parser.add_argument("--metricas-puerto", type=int, default=None,
+                        help="Publica métricas Prometheus en http://127.0.0.1:PUERTO/metrics")
+    parser.add_argument("--metricas-archivo", default=None,
+                        help="Reescribe periódicamente las métricas en este archivo de texto")
+    parser.add_argument("--exportar-registros", default=None,
+                        help="Al cerrar, exporta los clientes a .csv, .npz o .parquet")
+    parser.add_argument("--historial", nargs="?", const=RUTA_HISTORIAL, default=None, metavar="RUTA",
+                        help="Guarda la ejecución (parámetros, semilla y métricas) en esta base SQLite")
+    parser.add_argument("--historial-clientes", action="store_true",
+                        help="Con --historial, guarda además una fila por cliente atendido")
+    parser.add_argument("--listar-historial", nargs="?", const="", default=None, metavar="ESCENARIO",
+                        help="Muestra las últimas ejecuciones guardadas (opcionalmente de un escenario) y termina")
+    parser.add_argument("--notificaciones-archivo", default=None,
+                        help="Agrega las notificaciones a este archivo JSON Lines")
+    parser.add_argument("--notificaciones-http", default=None, metavar="URL",
+                        help="Envía las notificaciones por POST a esta URL local")
+    parser.add_argument("--notificaciones-smtp", default=None, metavar="HOST:PUERTO",
+                        help="Envía las notificaciones a un servidor SMTP local")
+    parser.add_argument("--ingesta-puerto", type=int, default=None,
+                        help="Recibe clientes de kioscos por TCP en 127.0.0.1:PUERTO (una solicitud JSON por línea)")
+    parser.add_argument("--medir-ingesta", action="store_true",
+                        help="Mide el rendimiento de la cola de ingreso con 1 a 16 productores y termina")
+    parser.add_argument("--fila-virtual", action="store_true",
+                        help="Los clientes sacan turno, esperan fuera y reciben un aviso en el celular")
+    parser.add_argument("--terminal", action="store_true",
+                        help="Muestra la simulación en un tablero de terminal (curses) en lugar de Tk")
+    parser.add_argument("--fps", type=float, default=FPS_TERMINAL,
+                        help="Cuadros por segundo del tablero de terminal")
+    parser.add_argument("--velocidad", type=float, default=VELOCIDAD_TERMINAL,
+                        help="Segundos simulados por segundo real en el tablero de terminal")
+    parser.add_argument("--web", type=int, default=None, metavar="PUERTO",
+                        help="Sirve un tablero web en vivo en http://127.0.0.1:PUERTO/")
+    parser.add_argument("--escenario", default=None, metavar="NOMBRE",
+                        help="Inicia este escenario de escenarios/ (o un archivo .toml/.json) en la interfaz o con --terminal")
+    parser.add_argument("--listar-escenarios", action="store_true",
+                        help="Valida y compila los escenarios de escenarios/ y termina")
+    parser.add_argument("--perfil-memoria", nargs="?", const="perfil_memoria.json", default=None, metavar="RUTA",
+                        help="Mide la memoria (tracemalloc y contadores), abre el panel de depuración "
+                             "y al cerrar escribe el reporte JSON")
+    parser.add_argument("--estres", nargs="?", const="reporte_estres.json", default=None,
+                        metavar="REPORTE", help="Ejecuta la prueba de estrés de la interfaz y escribe el reporte")
+    parser.add_argument("--validar-analitico", action="store_true",
+                        help="Compara el estimador analítico con simulaciones sin interfaz y termina")
+    parser.add_argument("--semilla", type=int, default=SEMILLA_MAESTRA,
+                        help="Semilla maestra para repetir exactamente una ejecución "
+                             "(por defecto, SEMILLA_MAESTRA de utils/config.py)")
+    parser.add_argument("--ventanillas", type=int, default=NUM_VENTANILLAS,
+                        help="Número de ventanillas para los modos sin interfaz")
+    parser.add_argument("--tasa-llegada", type=float, default=None,
+                        help="Clientes por segundo para los modos sin interfaz (Poisson)")
+    parser.add_argument("--dotacion", default=None, metavar="PERFIL",
+                        help="Llegadas por hora separadas por comas; imprime las ventanillas necesarias por hora")
+    parser.add_argument("--comparar-filas", action="store_true",
+                        help="Compara la espera con fila única y con varias filas enrutadas y termina")
+    parser.add_argument("--comparar-descansos", action="store_true",
+                        help="Compara rendimiento y espera de cada política de descanso y termina")
+    parser.add_argument("--precision", type=float, nargs="?", const=PRECISION_RELATIVA, default=None,
+                        metavar="RELATIVA", help="Simula sin interfaz hasta que los intervalos de espera "
+                                                 "alcanzan esta precisión relativa y termina")
+    parser.add_argument("--comparar-pareado", nargs=2, default=None, metavar=("A", "B"),
+                        help="Compara dos configuraciones (ej. n_ventanillas=3,tasa_llegada=0.15) con "
+                             "números comunes, antitéticas y variable de control y termina")
+    parser.add_argument("--metrica", default="espera_promedio",
+                        help="Resultado del simulador a comparar con --comparar-pareado")
+    parser.add_argument("--barrido", default=None, metavar="DIMENSIONES",
+                        help="Coordina un barrido, ej. \"ventanillas=[2,3,4],tasa_llegada=[0.1,0.2],descanso=['fijo','diferido']\"")
+    parser.add_argument("--replicas", type=int, default=REPLICAS_BARRIDO,
+                        help="Réplicas por configuración del barrido")
+    parser.add_argument("--duracion-replica", type=float, default=DURACION_BARRIDO,
+                        help="Segundos simulados por réplica del barrido")
+    parser.add_argument("--barrido-host", default="127.0.0.1",
+                        help="Dirección donde escucha el coordinador (0.0.0.0 para otras máquinas)")
+    parser.add_argument("--barrido-puerto", type=int, default=PUERTO_BARRIDO,
+                        help="Puerto del coordinador del barrido")
+    parser.add_argument("--trabajadores-locales", type=int, default=0,
+                        help="Lanza esta cantidad de trabajadores en esta máquina junto al coordinador")
+    parser.add_argument("--trabajador", default=None, metavar="HOST:PUERTO",
+                        help="Trabaja para el coordinador de barridos indicado hasta que termine")
+    parser.add_argument("--clave-barrido", default=None,
+                        help="Clave compartida entre coordinador y trabajadores")
+    parser.add_argument("--salida-barrido", default=None, metavar="RUTA",
+                        help="Escribe un CSV con el resumen de cada réplica del barrido")
+    parser.add_argument("--sla-prioritarios", type=float, default=120,
+                        help="Objetivo de p95 de espera de prioritarios en segundos")
+    parser.add_argument("--sla-normales", type=float, default=600,
+                        help="Objetivo de p95 de espera de normales en segundos")
+    return parser.parse_args()
+
+def crear_exportador(args):
+    """Crea el exportador de métricas si se solicitó alguna salida"""
+    if args.metricas_puerto is None and args.metricas_archivo is None:
+        return None
+    return ExportadorMetricas(MetricasBanco(), puerto=args.metricas_puerto,
+                              archivo=args.metricas_archivo)
+
+def crear_sumideros(args, web=None):
+    """Crea los sumideros de notificación adicionales solicitados"""
+    sumideros = [web.sumidero] if web is not None else []
+    if args.notificaciones_archivo:
+        sumideros.append(SumideroArchivo(args.notificaciones_archivo))
+    if args.notificaciones_http:
+        sumideros.append(SumideroHTTP(args.notificaciones_http))
+    if args.notificaciones_smtp:
+        host, _, puerto = args.notificaciones_smtp.partition(":")
+        sumideros.append(SumideroSMTP(host, int(puerto or 25)))
+    return sumideros
+
+def ejecutar_validacion(args):
+    """Imprime la comparación entre el modelo analítico y la simulación"""
+    analitico = estimar_colas(args.ventanillas, args.tasa_llegada)
+    if not analitico['estable']:
+        # Con ρ ≥ 1 la espera analítica es infinita y la simulada solo refleja la duración
+        print(f"⚠️ Configuración inestable (ρ={analitico['ocupacion']:.3f} ≥ 1): no hay régimen "
+              f"estacionario que comparar. Pruebe con más --ventanillas o menos --tasa-llegada")
+        return
+    comparacion = validar_con_simulacion(semilla=args.semilla or 0, n_ventanillas=args.ventanillas,
+                                         tasa_llegada=args.tasa_llegada)
+    print(f"{'Métrica':<22}{'Analítico':>12}{'Simulado':>12}{'Error':>10}")
+    for clave, (analitico, simulado, error) in comparacion.items():
+        print(f"{clave:<22}{analitico:>12.3f}{simulado:>12.3f}{error:>10.1%}")
+
+def ejecutar_dotacion(args):
+    """Imprime el plan de ventanillas por hora para el perfil de llegadas"""
+    perfil = [float(valor) for valor in args.dotacion.split(",")]
+    sla = {'p95_prioritarios': args.sla_prioritarios, 'p95_normales': args.sla_normales}
+    print(f"{'Hora':<6}{'Llegadas/h':>12}{'Analítico':>11}{'Ventanillas':>13}")
+    for hora in planificar_dotacion(perfil, sla, semilla=args.semilla or 0):
+        print(f"{hora['hora']:<6}{hora['tasa'] * 3600:>12.0f}{hora['analitico']:>11}{hora['ventanillas']:>13}")
+
+def ejecutar_comparacion_filas(args):
+    """Imprime las colas de la espera de cada topología de filas"""
+    tasa = args.tasa_llegada or 0.3
+    print(f"{args.ventanillas} ventanillas, {tasa} clientes/s")
+    print(f"{'Configuración':<28}{'Media':>9}{'p95':>9}{'p99':>9}{'Máxima':>9}")
+    for fila in comparar_topologias(args.ventanillas, tasa, semilla=args.semilla or 0):
+        print(f"{fila['configuracion']:<28}{fila['espera_media']:>9.1f}{fila['p95']:>9.1f}"
+              f"{fila['p99']:>9.1f}{fila['maxima']:>9.1f}")
+
+def ejecutar_comparacion_descansos(args):
+    """Imprime el impacto de cada política de descanso"""
+    tasas = [args.tasa_llegada] if args.tasa_llegada else None
+    print(f"{args.ventanillas} ventanillas")
+    print(f"{'Llegadas/h':>10}  {'Política':<26}{'Clientes/h':>11}{'Espera':>9}{'p95 prio':>10}{'p95 norm':>10}"
+          f"{'Descanso s/h':>14}")
+    for fila in comparar_descansos(args.ventanillas, tasas, semilla=args.semilla or 0):
+        print(f"{fila['tasa'] * 3600:>10.0f}  {fila['politica']:<26}{fila['rendimiento'] * 3600:>11.1f}"
+              f"{fila['espera_promedio']:>9.1f}"
+              f"{fila['p95_prioritarios']:>10.1f}{fila['p95_normales']:>10.1f}{fila['descanso_por_hora']:>14.0f}")
+
+def ejecutar_estimacion(args):
+    """Imprime el calentamiento detectado y los intervalos de espera alcanzados"""
+    resultado = estimar_con_precision(args.precision, semilla=args.semilla or 0,
+                                      n_ventanillas=args.ventanillas, tasa_llegada=args.tasa_llegada)
+    if resultado['inestable'] and not resultado['atendidos']:
+        print(f"⚠️ Sistema inestable (ρ={resultado['ocupacion']:.3f} ≥ 1): la espera crece sin límite, "
+              f"no hay media que estimar. Pruebe con más --ventanillas o menos --tasa-llegada")
+        return
+    if resultado['convergio']:
+        estado = "alcanzada"
+    elif resultado['inestable']:
+        estado = "NO alcanzada (inestable: la fila no deja de crecer)"
+    else:
+        estado = "NO alcanzada (límite de duración)"
+    print(f"Precisión ±{resultado['precision']:.0%} {estado} tras {resultado['duracion']:,.0f}s simulados "
+          f"({resultado['atendidos']} atendidos)")
+    print(f"{'Clase':<14}{'Calentamiento':>14}{'Usados':>9}{'Media':>9}"
+          f"{'IC ' + format(resultado['confianza'], '.0%'):>22}{'±rel':>8}")
+    for clase in ('prioritarios', 'normales'):
+        e = resultado[clase]
+        truncamiento = "-" if e['truncamiento'] is None else e['truncamiento']
+        intervalo = f"[{e['ic'][0]:.1f}, {e['ic'][1]:.1f}]"
+        print(f"{clase:<14}{truncamiento:>14}{e['observaciones']:>9}{e['media']:>9.1f}"
+              f"{intervalo:>22}{e['semiancho_relativo']:>8.1%}")
+
+def parsear_configuracion(texto):
+    """Convierte "clave=valor,clave=valor" en argumentos de SimuladorBanco (los valores pueden ser listas)"""
+    llamada = ast.parse(f"dict({texto})", mode="eval").body
+    return {argumento.arg: ast.literal_eval(argumento.value) for argumento in llamada.keywords}
+
+def ejecutar_comparacion_pareada(args):
+    """Imprime la diferencia A - B y los clientes simulados con cada técnica de reducción de varianza"""
+    a, b = (parsear_configuracion(texto) for texto in args.comparar_pareado)
+    print(f"A: {a}\nB: {b}\nMétrica: {args.metrica} (A - B)")
+    print(f"{'Técnica':<34}{'Diferencia':>11}{'IC 95%':>20}{'Pares':>7}{'Clientes':>11}")
+    for fila in comparar_tecnicas(a, b, metrica=args.metrica, semilla=args.semilla or 0):
+        intervalo = f"[{fila['ic'][0]:.2f}, {fila['ic'][1]:.2f}]"
+        marca = "" if fila['convergio'] else " (sin converger)"
+        print(f"{fila['tecnica']:<34}{fila['diferencia']:>11.2f}{intervalo:>20}{fila['pares']:>7}"
+              f"{fila['clientes']:>11,}{marca}")
+
+def ejecutar_barrido(args):
+    """Coordina un barrido distribuido e imprime el promedio de cada configuración"""
+    unidades = generar_unidades(parsear_configuracion(args.barrido), replicas=args.replicas,
+                                duracion=args.duracion_replica, semilla=args.semilla or 0)
+    coordinador = CoordinadorBarrido(unidades, args.barrido_puerto, args.barrido_host,
+                                     clave=args.clave_barrido).iniciar()
+    print(f"🛰️ Coordinador en {coordinador.host}:{coordinador.puerto} · {len(unidades)} unidades")
+    locales = []
+    for _ in range(args.trabajadores_locales):
+        comando = [sys.executable, os.path.abspath(__file__), "--trabajador", f"127.0.0.1:{coordinador.puerto}"]
+        if args.clave_barrido:
+            comando += ["--clave-barrido", args.clave_barrido]
+        locales.append(subprocess.Popen(comando))
+
+    inicio = time.perf_counter()
+    try:
+        coordinador.esperar(progreso=lambda hechas, total: print(f"   {hechas}/{total} unidades", end="\r"))
+    except KeyboardInterrupt:
+        print("\n⛔ Barrido interrumpido: se muestran los resultados parciales")
+    finally:
+        coordinador.detener()
+        for proceso in locales:
+            proceso.terminate()
+        for proceso in locales:
+            try:
+                proceso.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+                proceso.wait()
+    print(f"\n⏱️ {len(coordinador.resultados)} unidades en {time.perf_counter() - inicio:.1f}s · "
+          f"{len(coordinador.trabajadores)} trabajadores · {coordinador.reintentos} reintentos · "
+          f"{len(coordinador.perdidas)} perdidas")
+
+    agregados = coordinador.agregados()
+    if agregados:
+        dimensiones = [c for c in unidades[0]['parametros']]
+        print("".join(f"{d:>16}" for d in dimensiones) + f"{'Réplicas':>10}{'Utilización':>13}"
+              f"{'Espera':>9}{'p95 prio':>10}{'p95 norm':>10}")
+        for fila in agregados:
+            print("".join(f"{str(fila[d]):>16}" for d in dimensiones) + f"{fila['replicas']:>10}"
+                  f"{fila['utilizacion']:>13.1%}{fila['espera_promedio']:>9.1f}"
+                  f"{fila['p95_prioritarios']:>10.1f}{fila['p95_normales']:>10.1f}")
+    if args.salida_barrido:
+        coordinador.exportar(args.salida_barrido)
+        print(f"💾 Resultados por réplica en {args.salida_barrido}")
+
+def ejecutar_trabajador(args):
+    """Trabaja para un coordinador de barridos"""
+    host, _, puerto = args.trabajador.rpartition(":")
+    trabajador = TrabajadorBarrido(host or "127.0.0.1", int(puerto), clave=args.clave_barrido)
+    try:
+        completadas = trabajador.ejecutar()
+    except PermissionError as e:
+        print(f"⛔ {e}")
+        return
+    print(f"🛠️ Trabajador {trabajador.nombre}: {completadas} unidades completadas")
+
+def ejecutar_medicion_ingesta():
+    """Imprime el rendimiento de la cola de ingreso según el número de productores"""
+    print(f"{'Productores':<13}{'Solicitudes/s':>15}{'Espera media (ms)':>20}")
+    for prueba in medir_rendimiento():
+        print(f"{prueba['productores']:<13}{prueba['por_segundo']:>15,.0f}{prueba['espera_media_ms']:>20.2f}")
+
+def ejecutar_listado_historial(args):
+    """Imprime las últimas ejecuciones guardadas en el historial"""
+    historial = HistorialEjecuciones(args.historial or RUTA_HISTORIAL)
+    try:
+        ejecuciones = historial.ejecuciones(escenario=args.listar_historial or None)
+    finally:
+        historial.cerrar()
+    print(f"{'Id':>5}  {'Inicio':<20}{'Escenario':<22}{'Vent.':>6}{'Atendidos':>11}{'Espera media':>14}  Semilla")
+    for ejecucion in ejecuciones:
+        metricas = ejecucion['metricas']
+        espera = metricas.get('espera_promedio')
+        print(f"{ejecucion['id']:>5}  {ejecucion['inicio']:<20}{ejecucion['escenario'] or '-':<22}"
+              f"{ejecucion['ventanillas'] or 0:>6}{metricas.get('atendidos', 0):>11,.0f}"
+              f"{'-' if espera is None else f'{espera:.1f}s':>14}  {ejecucion['semilla']}")
+
+def ejecutar_listado_escenarios(args):
+    """Valida y compila cada escenario e imprime un resumen"""
+    print(f"{'Escenario':<24}{'Ventanillas':>12}{'Fila inicial':>14}{'Llegadas':>10}{'Compilación':>14}")
+    errores = []
+    for escenario in listar_escenarios(errores=errores):
+        inicio = time.perf_counter()
+        carga = escenario.compilar(secuencia(args.semilla or 0).hija("llegadas", escenario.nombre))
+        print(f"{escenario.nombre:<24}{escenario.ventanillas:>12}{len(escenario.fila_inicial):>14}"
+              f"{len(carga):>10,}{(time.perf_counter() - inicio) * 1000:>11.1f} ms")
+    for _, mensaje in errores:
+        print(f"❌ {mensaje}")
+
+def guardar_perfil_memoria(perfil, ruta):
+    """Escribe el reporte del perfil de memoria y muestra su resumen"""
+    perfil.guardar(ruta)
+    for linea in resumir_reporte(perfil.reporte()):
+        print(f"🧪 {linea}")
+    print(f"💾 Perfil de memoria guardado en {ruta}")
+    perfil.detener()
+
+def ejecutar_tablero(args, metricas, registro, ingesta, web):
+    """
+    Ejecuta la simulación sin interfaz gráfica y la muestra en la terminal
+
+    Returns:
+        dict: Resultados del simulador
+    """
+    from models.simulador import SimuladorBanco
+    from views.tablero_terminal import TableroTerminal
+
+    if args.escenario:
+        parametros = buscar_escenario(args.escenario).parametros_simulador(args.semilla)
+    else:
+        parametros = {'n_ventanillas': args.ventanillas, 'tasa_llegada': args.tasa_llegada,
+                      'semilla': args.semilla}
+    simulador = SimuladorBanco(metricas=metricas, registro=registro,
+                               fila_virtual={} if args.fila_virtual or FILA_VIRTUAL else None, **parametros)
+    perfil = None
+    if args.perfil_memoria:
+        perfil = PerfilMemoria(simulador.banco, {'eventos_pendientes': simulador.pendientes}).iniciar()
+
+        def muestrear_memoria():
+            perfil.muestrear()
+            simulador.programar(INTERVALO_MEMORIA_SIMULADO, muestrear_memoria)
+        simulador.programar(INTERVALO_MEMORIA_SIMULADO, muestrear_memoria)
+    resultados = TableroTerminal(simulador, fps=args.fps, velocidad=args.velocidad, ingesta=ingesta,
+                                 web=web, perfil=perfil).ejecutar()
+    if perfil is not None:
+        perfil.muestrear()
+        guardar_perfil_memoria(perfil, args.perfil_memoria)
+    print(f"⏱️ {resultados['duracion']:,.0f}s simulados · {resultados['atendidos']} atendidos · "
+          f"espera media {resultados['espera_promedio']:.1f}s · utilización {resultados['utilizacion']:.0%}")
+    return resultados
 
 def main():
     """Función principal que inicia la aplicación"""
+    args = parsear_argumentos()
+    if args.validar_analitico:
+        ejecutar_validacion(args)
+        return
+    if args.dotacion:
+        ejecutar_dotacion(args)
+        return
+    if args.comparar_filas:
+        ejecutar_comparacion_filas(args)
+        return
+    if args.comparar_descansos:
+        ejecutar_comparacion_descansos(args)
+        return
+    if args.comparar_pareado:
+        ejecutar_comparacion_pareada(args)
+        return
+    if args.precision is not None:
+        ejecutar_estimacion(args)
+        return
+    if args.medir_ingesta:
+        ejecutar_medicion_ingesta()
+        return
+    if args.barrido:
+        ejecutar_barrido(args)
+        return
+    if args.trabajador:
+        ejecutar_trabajador(args)
+        return
+    if args.listar_historial is not None:
+        ejecutar_listado_historial(args)
+        return
+    if args.listar_escenarios:
+        ejecutar_listado_escenarios(args)
+        return
+    exportador = crear_exportador(args)
+    registro = RegistroClientes() if args.exportar_registros else None
+    historial = ejecucion_id = None
+    metricas_finales, escenario_final = {}, None
+    if args.historial:
+        historial = HistorialEjecuciones(args.historial)
+        if args.semilla is None:
+            # Se fija la semilla aquí para que la ejecución guardada se pueda repetir
+            args.semilla = secuencia(None).entropia
+        try:
+            ejecucion_id = historial.iniciar_ejecucion(
+                escenario=args.escenario or ("terminal" if args.terminal else "interfaz"),
+                ventanillas=args.ventanillas if args.terminal else NUM_VENTANILLAS,
+                semilla=args.semilla, politica=POLITICA_DESCANSO, tasa_llegada=args.tasa_llegada,
+                fila_virtual=bool(args.fila_virtual or FILA_VIRTUAL))
+        except RuntimeError as e:
+            print(f"❌ Historial deshabilitado: {e}")
+            historial.cerrar()
+            historial = None
+        if historial is not None and args.historial_clientes:
+            registro = historial.registro_clientes(ejecucion_id, siguiente=registro)
+    ingesta = servidor_ingesta = None
+    if args.ingesta_puerto is not None:
+        ingesta = ColaIngesta(registro_metricas=exportador.metricas.registro if exportador else None)
+        servidor_ingesta = ServidorIngesta(ingesta, args.ingesta_puerto).iniciar()
+        print(f"📥 Recibiendo clientes en 127.0.0.1:{servidor_ingesta.puerto}")
+    web = None
+    if args.web is not None:
+        web = ServidorTablero(args.web, registro_metricas=exportador.metricas.registro if exportador else None).iniciar()
+        print(f"🌐 Tablero web en http://127.0.0.1:{web.puerto}/")
     try:
+        if args.terminal:
+            if exportador:
+                exportador.iniciar()
+            metricas_finales = ejecutar_tablero(args, exportador.metricas if exportador else None,
+                                                registro, ingesta, web)
+            return
+        # La interfaz se importa aquí para que los modos sin interfaz no necesiten Tk ni PIL
+        import tkinter as tk
+        from views.interfaz_banco import InterfazBanco
+        from views.modo_estres import ModoEstres
+        
         root = tk.Tk()
-        app = InterfazBanco(root)
+        app = InterfazBanco(root, metricas=exportador.metricas if exportador else None,
+                            registro=registro, sumideros_notificacion=crear_sumideros(args, web),
+                            ingesta=ingesta, semilla=args.semilla,
+                            fila_virtual=args.fila_virtual or FILA_VIRTUAL, web=web,
+                            perfil_memoria=bool(args.perfil_memoria))
+        if exportador:
+            exportador.iniciar()
+            print(f"📈 Métricas disponibles (puerto={exportador.puerto}, archivo={exportador.archivo})")
+        if args.estres:
+            root.after(1000, ModoEstres(app, ruta_reporte=args.estres).iniciar)
+        elif args.escenario:
+            escenario = buscar_escenario(args.escenario)
+            root.after(500, app.iniciar_escenario, escenario)
         root.mainloop()
+        metricas_finales, escenario_final = app.banco.obtener_estadisticas(), app.escenario_activo
+        app.cerrar()
+        if app.perfil_memoria is not None:
+            guardar_perfil_memoria(app.perfil_memoria, args.perfil_memoria)
     except Exception as e:
         print(f"Error al iniciar la aplicación: {e}")
+        if not args.terminal:
+            print("💡 Sin pantalla disponible, pruebe con --terminal")
+    finally:
+        if servidor_ingesta:
+            servidor_ingesta.detener()
+        if web:
+            web.detener()
+        if exportador:
+            exportador.detener()
+        if historial is not None:
+            if args.historial_clientes:
+                registro.vaciar()
+                registro = registro.siguiente
+            historial.finalizar_ejecucion(ejecucion_id, metricas_finales, escenario=escenario_final)
+            historial.cerrar()
+            print(f"🗄️ Ejecución {ejecucion_id} guardada en {args.historial}")
+        if registro is not None:
+            registro.exportar(args.exportar_registros)
+            print(f"💾 {len(registro)} clientes exportados a {args.exportar_registros}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,5 +5,9 @@ Paquete de modelos del sistema bancario
 from .persona import Persona
 from .ventanilla import Ventanilla
 from .banco import Banco
+from .registro_clientes import RegistroClientes
+from .simulador import SimuladorBanco
+from .ingesta import ColaIngesta
+from .enrutamiento import EnrutadorFilas
 
-__all__ = ['Persona', 'Ventanilla', 'Banco']
\ No newline at end of file
+__all__ = ['Persona', 'Ventanilla', 'Banco', 'RegistroClientes', 'SimuladorBanco', 'ColaIngesta', 'EnrutadorFilas']
\ No newline at end of file
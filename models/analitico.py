@@ -0,0 +1,182 @@
+"""
+Estimador analítico de colas (Erlang-C y prioridad no expropiativa M/M/c)
+"""
+
+import math
+import time
+
+from utils.aleatorio import secuencia
+from utils.config import (NUM_VENTANILLAS, TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX,
+                          TIEMPO_DESCANSO, TIEMPO_ENTRE_CLIENTES_MIN, TIEMPO_ENTRE_CLIENTES_MAX)
+
+
+def erlang_c(c, carga):
+    """
+    Probabilidad de espera en una cola M/M/c
+
+    Args:
+        c (int): Número de servidores
+        carga (float): Carga ofrecida a = λ/μ en Erlangs
+
+    Returns:
+        float: Probabilidad de que un cliente tenga que esperar (1.0 si es inestable)
+    """
+    if carga >= c:
+        return 1.0
+    # Recurrencia estable de Erlang-B y conversión a Erlang-C
+    b = 1.0
+    for k in range(1, c + 1):
+        b = carga * b / (k + carga * b)
+    rho = carga / c
+    return b / (1 - rho * (1 - b))
+
+
+def momentos_servicio(tiempo_atencion=(TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX),
+                      tiempo_descanso=TIEMPO_DESCANSO):
+    """
+    Media y cuadrado del coeficiente de variación del tiempo que una ventanilla
+    queda ocupada por cliente (atención entera uniforme + descanso fijo)
+
+    Returns:
+        tuple: (media_atencion, media_ocupacion, cv2_ocupacion)
+    """
+    minimo, maximo = tiempo_atencion
+    media_atencion = (minimo + maximo) / 2
+    varianza = ((maximo - minimo + 1) ** 2 - 1) / 12
+    media_ocupacion = media_atencion + tiempo_descanso
+    return media_atencion, media_ocupacion, varianza / media_ocupacion ** 2
+
+
+def estimar_colas(n_ventanillas=NUM_VENTANILLAS, tasa_llegada=None, proporcion_prioritarios=0.25,
+                  tiempo_atencion=(TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX),
+                  tiempo_descanso=TIEMPO_DESCANSO, cv2_llegadas=None):
+    """
+    Estima esperas por clase con M/M/c de prioridad no expropiativa y la
+    corrección de Allen-Cunneen para llegadas y atenciones no exponenciales.
+
+    La ventanilla se considera ocupada durante la atención y el descanso, por
+    lo que el tiempo de servidor es atención + descanso.
+
+    Args:
+        n_ventanillas (int): Número de ventanillas
+        tasa_llegada (float): Clientes por segundo. Si es None se usa la media
+            de los intervalos uniformes de utils/config.py
+        proporcion_prioritarios (float): Fracción de clientes prioritarios
+        tiempo_atencion (tuple): Rango (mín, máx) del tiempo de atención en segundos
+        tiempo_descanso (int): Segundos de descanso tras cada cliente
+        cv2_llegadas (float): CV² de los intervalos entre llegadas (1 = Poisson)
+
+    Returns:
+        dict: Esperas medias y p95 por clase (segundos), utilización y estabilidad
+    """
+    inicio = time.perf_counter()
+
+    if tasa_llegada is None:
+        a, b = TIEMPO_ENTRE_CLIENTES_MIN / 1000, TIEMPO_ENTRE_CLIENTES_MAX / 1000
+        media_intervalo = (a + b) / 2
+        tasa_llegada = 1 / media_intervalo
+        if cv2_llegadas is None:
+            cv2_llegadas = ((b - a) ** 2 / 12) / media_intervalo ** 2
+    elif cv2_llegadas is None:
+        cv2_llegadas = 1.0
+
+    c = n_ventanillas
+    media_atencion, media_ocupacion, cv2_servicio = momentos_servicio(tiempo_atencion, tiempo_descanso)
+    mu = 1 / media_ocupacion
+    carga = tasa_llegada / mu
+    ocupacion = carga / c
+    factor = (cv2_llegadas + cv2_servicio) / 2
+
+    resultado = {
+        'estable': ocupacion < 1,
+        'utilizacion': tasa_llegada * media_atencion / c,
+        'ocupacion': ocupacion,
+        'carga': carga,
+        'tasa_llegada': tasa_llegada,
+    }
+
+    if ocupacion >= 1:
+        resultado.update({
+            'prob_espera': 1.0,
+            'espera_prioritarios': math.inf,
+            'espera_normales': math.inf,
+            'espera_promedio': math.inf,
+            'p95_prioritarios': math.inf,
+            'p95_normales': math.inf,
+            'largo_fila': math.inf,
+        })
+    else:
+        prob_espera = erlang_c(c, carga)
+        sigma_1 = proporcion_prioritarios * ocupacion
+        base = prob_espera / (c * mu) * factor
+        espera_prioritarios = base / (1 - sigma_1)
+        espera_normales = base / ((1 - sigma_1) * (1 - ocupacion))
+        espera_promedio = (proporcion_prioritarios * espera_prioritarios
+                           + (1 - proporcion_prioritarios) * espera_normales)
+        resultado.update({
+            'prob_espera': prob_espera,
+            'espera_prioritarios': espera_prioritarios,
+            'espera_normales': espera_normales,
+            'espera_promedio': espera_promedio,
+            'p95_prioritarios': percentil_espera(espera_prioritarios, prob_espera, 95),
+            'p95_normales': percentil_espera(espera_normales, prob_espera, 95),
+            'largo_fila': tasa_llegada * espera_promedio,
+        })
+
+    resultado['tiempo_calculo_us'] = (time.perf_counter() - inicio) * 1e6
+    return resultado
+
+
+def percentil_espera(espera_media, prob_espera, p):
+    """
+    Percentil de la espera suponiendo que, condicionada a esperar, la espera
+    es exponencial (exacto para M/M/c FIFO, aproximado por clase)
+
+    Args:
+        espera_media (float): Espera media incondicional
+        prob_espera (float): Probabilidad de esperar
+        p (float): Percentil (0-100)
+
+    Returns:
+        float: Espera en segundos
+    """
+    cola = 1 - p / 100
+    if prob_espera <= cola or espera_media <= 0:
+        return 0.0
+    return espera_media / prob_espera * math.log(prob_espera / cola)
+
+
+def validar_con_simulacion(duracion=20000, replicas=3, semilla=0, **parametros):
+    """
+    Compara la estimación analítica con simulaciones sin interfaz gráfica
+
+    Args:
+        duracion (float): Segundos simulados por réplica
+        replicas (int): Número de réplicas independientes
+        semilla (int): Semilla maestra; cada réplica usa su propia secuencia hija
+        **parametros: Mismos argumentos que estimar_colas
+
+    Returns:
+        dict: Métrica -> (analítico, simulado, error_relativo)
+    """
+    from models.simulador import SimuladorBanco
+
+    semillas = secuencia(semilla)
+    analitico = estimar_colas(**parametros)
+    claves = ('utilizacion', 'espera_prioritarios', 'espera_normales', 'espera_promedio',
+              'p95_prioritarios', 'p95_normales')
+
+    acumulado = dict.fromkeys(claves, 0.0)
+    parametros_sim = {k: v for k, v in parametros.items() if k != 'cv2_llegadas'}
+    for r in range(replicas):
+        sim = SimuladorBanco(semilla=semillas.hija("replica", r), calentamiento=duracion * 0.1, **parametros_sim)
+        resultados = sim.ejecutar(duracion)
+        for clave in claves:
+            acumulado[clave] += resultados[clave] / replicas
+
+    comparacion = {}
+    for clave in claves:
+        esperado, simulado = analitico[clave], acumulado[clave]
+        error = abs(esperado - simulado) / simulado if simulado else math.nan
+        comparacion[clave] = (esperado, simulado, error)
+    return comparacion
@@ -1,26 +1,61 @@
-import random
+import time
+from collections import deque
+from itertools import chain, islice
+from models.descansos import DescansoFijo
+from models.enrutamiento import EnrutadorFilas
 from models.persona import Persona
 from models.ventanilla import Ventanilla
+from utils.aleatorio import secuencia
+from utils.config import (NIVELES_LOG, VENTANA_AGREGACION_LOG, BUSQUEDA_ASIGNACION,
+                          TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX, TIEMPO_DESCANSO)
+from utils.log_agregado import AgregadorLog
 
 class Banco:
     """
     Sistema principal que gestiona las ventanillas y la fila de clientes
     """
     
-    def __init__(self, n_ventanillas=3, interfaz=None):
+    def __init__(self, n_ventanillas=3, interfaz=None, metricas=None, reloj=time.monotonic,
+                 registro=None, max_log=None, semillas=None):
         """
         Inicializa el sistema bancario
         
         Args:
             n_ventanillas (int): Número de ventanillas
             interfaz: Referencia a la interfaz gráfica
+            metricas (MetricasBanco): Métricas a actualizar (opcional)
+            reloj (callable): Función que devuelve el tiempo actual en segundos
+            registro (RegistroClientes): Registro columnar de clientes (opcional)
+            max_log (int): Líneas de log a conservar (None = sin límite)
+            semillas (SecuenciaSemillas | int): Origen de los flujos aleatorios del banco
         """
         self.ventanillas = [Ventanilla(i+1) for i in range(n_ventanillas)]
         self.fila = []
-        self.log = []
+        self.log = [] if max_log is None else deque(maxlen=max_log)
+        self.tiempo_atencion = (TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX)
+        self.tiempo_descanso = TIEMPO_DESCANSO
+        self.politica_descanso = DescansoFijo()
+        self.reloj = reloj
+        semillas = secuencia(semillas)
+        self.rng = semillas.hija("servicio").generador()
+        self.rng_transacciones = semillas.hija("transacciones").generador()
+        # Con servicio por cliente cada cliente recibe al llegar la semilla de su tiempo
+        # de atención, así dos configuraciones comparadas le sortean el mismo tiempo
+        # aunque lo atiendan en otro orden (números aleatorios comunes)
+        self.servicio_por_cliente = False
+        self.rng_semillas_servicio = semillas.hija("servicio_cliente").generador()
+        self.agregador_log = AgregadorLog(self.log, NIVELES_LOG, VENTANA_AGREGACION_LOG, reloj)
         self.interfaz = interfaz
+        self.metricas = metricas
+        self.registro = registro
+        if self.metricas:
+            self.metricas.sincronizar(self)
         self.contador_personas = 0
         self.clientes_atendidos = 0
+        self.enrutador = None
+        self.servicio = None  # CatalogoServicio; None = uniforme en tiempo_atencion
+        self.heterogeneo = False
+        self.atendibles = None  # Transacciones que alguna ventanilla atiende (None = todas)
         
         # ✅ AGREGAR MENSAJE INICIAL ACTUALIZADO
         self.log.append("[SISTEMA] 🏦 BIENVENIDO AL SISTEMA DE GESTIÓN BANCARIA")
@@ -38,7 +73,21 @@ class Banco:
         Args:
             persona (Persona): Persona a agregar
         """
+        persona.tiempo_llegada = self.reloj()
+        if self.atendibles is not None and persona.transaccion not in self.atendibles:
+            # Nadie podría atenderlo: se lo rechaza en lugar de dejarlo para siempre en la fila
+            self.log.append(f"[RECHAZO] ⛔ Cliente {persona.id}: ninguna ventanilla atiende {persona.transaccion}")
+            if self.metricas:
+                self.metricas.llegada(persona)
+            self.retirar_de_fila([persona])
+            return
+        if self.servicio_por_cliente:
+            persona.semilla_servicio = self.rng_semillas_servicio.getrandbits(64)
         self.fila.append(persona)
+        if self.enrutador:
+            self.enrutador.encolar(persona)
+        if self.metricas:
+            self.metricas.llegada(persona)
         tipo = "PRIORITARIO" if persona.prioridad else "NORMAL"
         self.log.append(f"[ENTRADA] Cliente {persona.id} ({tipo}) se une a la fila. Total en fila: {len(self.fila)}")
         
@@ -51,33 +100,37 @@ class Banco:
     def asignar(self):
         """Asigna clientes a ventanillas libres respetando prioridades"""
         ventanillas_libres = [v for v in self.ventanillas if v.esta_libre()]
+        self.agregador_log.vaciar()
         
         if not ventanillas_libres:
             # Todas las ventanillas ocupadas - escenario 4
             if self.fila:
-                ventanillas_ocupadas = len(self.ventanillas) - len(ventanillas_libres)
-                prioritarios_en_espera = sum(1 for p in self.fila if p.prioridad)
-                
-                self.log.append(f"[ESPERA] ⏳ Todas las {ventanillas_ocupadas} ventanillas ocupadas")
-                self.log.append(f"[ESPERA] 📊 {len(self.fila)} clientes esperando ({prioritarios_en_espera} prioritarios)")
-                
-                # Mostrar tiempos restantes de ventanillas
-                for ventanilla in self.ventanillas:
-                    if ventanilla.estado == "atendiendo":
-                        self.log.append(f"[MONITOREO] Ventanilla {ventanilla.id}: {ventanilla.tiempo_restante}s restantes")
+                # Los mensajes se formatean solo si el agregador decide escribirlos
+                self.agregador_log.registrar("ESPERA", self._lineas_espera, fila=len(self.fila))
+                self.agregador_log.registrar("MONITOREO", self._lineas_monitoreo)
             return
         
         if not self.fila:
             return
         
         # Buscar cliente para asignar (prioritarios primero)
-        cliente = self._obtener_siguiente_cliente()
+        if self.enrutador:
+            ventanilla, cliente = self._obtener_siguiente_de_filas(ventanillas_libres)
+        elif self.heterogeneo:
+            ventanilla, cliente = self._obtener_siguiente_heterogeneo()
+        else:
+            ventanilla, cliente = ventanillas_libres[0], self._obtener_siguiente_cliente()
         if cliente:
-            ventanilla = ventanillas_libres[0]
-            tiempo_atencion = random.randint(10, 15)
+            tiempo_atencion = self._tiempo_atencion(cliente, ventanilla)
             
             self.fila.remove(cliente)
             ventanilla.asignar_cliente(cliente, tiempo_atencion)
+            cliente.tiempo_inicio_atencion = self.reloj()
+            # El tiempo sorteado ya está dividido por la velocidad de la ventanilla
+            ventanilla.libre_estimado = cliente.tiempo_inicio_atencion + tiempo_atencion + self.tiempo_descanso
+            if self.metricas:
+                self.metricas.inicio_atencion(cliente, cliente.tiempo_inicio_atencion - cliente.tiempo_llegada)
+                self.metricas.cambio_ventanilla("libre", "atendiendo")
             
             self.log.append(f"[ASIGNACION] ✅ Cliente {cliente.id} asignado a Ventanilla {ventanilla.id} - Tiempo: {tiempo_atencion}s")
             
@@ -85,6 +138,19 @@ class Banco:
                 self.interfaz.eliminar_persona_de_fila(cliente)
                 self.interfaz.iniciar_temporizador_ventanilla(ventanilla)
         
+    def _lineas_espera(self):
+        """Genera las líneas de diagnóstico cuando todas las ventanillas están ocupadas"""
+        prioritarios_en_espera = sum(1 for p in self.fila if p.prioridad)
+        return [
+            f"[ESPERA] ⏳ Todas las {len(self.ventanillas)} ventanillas ocupadas",
+            f"[ESPERA] 📊 {len(self.fila)} clientes esperando ({prioritarios_en_espera} prioritarios)"
+        ]
+    
+    def _lineas_monitoreo(self):
+        """Genera una línea con el tiempo restante de cada ventanilla atendiendo"""
+        return [f"[MONITOREO] Ventanilla {v.id}: {v.tiempo_restante}s restantes"
+                for v in self.ventanillas if v.estado == "atendiendo"]
+    
     def _obtener_siguiente_cliente(self):
         """
         Obtiene el siguiente cliente a atender respetando prioridades
@@ -93,31 +159,180 @@ class Banco:
             Persona: Siguiente cliente a atender
         """
         # Buscar clientes prioritarios primero
-        prioritarios = [p for p in self.fila if p.prioridad]
-        if prioritarios:
-            cliente = prioritarios[0]
+        cliente = next((p for p in self.fila if p.prioridad), None)
+        if cliente:
             self.log.append(f"[PRIORIDAD] Cliente {cliente.id} (PRIORITARIO) avanza al frente de la fila")
             return cliente
         
         # Si no hay prioritarios, tomar el primero en llegar
         return self.fila[0] if self.fila else None
     
+    def _tiempo_atencion(self, cliente, ventanilla):
+        """Sortea el tiempo de atención según la transacción y la velocidad de la ventanilla"""
+        rng = type(self.rng)(cliente.semilla_servicio) if self.servicio_por_cliente else self.rng
+        if self.servicio is None and ventanilla.velocidad == 1.0:
+            return rng.randint(*self.tiempo_atencion)
+        base = (self.servicio.muestrear(cliente.transaccion, rng) if self.servicio
+                else rng.uniform(*self.tiempo_atencion))
+        return max(1, round(base / ventanilla.velocidad))
+    
+    def media_atencion(self, transaccion):
+        """Tiempo medio de atención de una transacción a velocidad 1"""
+        if self.servicio:
+            return self.servicio.media(transaccion)
+        return sum(self.tiempo_atencion) / 2
+    
+    def _obtener_siguiente_heterogeneo(self):
+        """
+        Con ventanillas de distinta velocidad o habilidades, recorre la fila
+        (prioritarios primero) y envía cada cliente a la ventanilla compatible
+        que terminaría antes de atenderlo. Si esa ventanilla está ocupada, el
+        cliente la espera y se prueba con el siguiente.
+        
+        Returns:
+            tuple: (Ventanilla, Persona) o (None, None)
+        """
+        ahora = self.reloj()
+        candidatos = chain((p for p in self.fila if p.prioridad), (p for p in self.fila if not p.prioridad))
+        for cliente in islice(candidatos, BUSQUEDA_ASIGNACION):
+            media = self.media_atencion(cliente.transaccion)
+            compatibles = [v for v in self.ventanillas if v.puede_atender(cliente.transaccion)]
+            if not compatibles:
+                continue
+            mejor = min(compatibles, key=lambda v: (
+                (ahora if v.esta_libre() else max(v.libre_estimado, ahora)) + media / v.velocidad,
+                not v.esta_libre()))
+            if mejor.esta_libre():
+                if cliente.prioridad:
+                    self.log.append(f"[PRIORIDAD] Cliente {cliente.id} (PRIORITARIO) avanza al frente de la fila")
+                return mejor, cliente
+        return None, None
+    
+    def configurar_servicio(self, catalogo=None, velocidades=None, habilidades=None):
+        """
+        Configura tiempos por transacción y ventanillas heterogéneas
+        
+        Args:
+            catalogo (CatalogoServicio): Modelos de tiempo por transacción (None = uniforme)
+            velocidades (dict): id de ventanilla -> factor de velocidad
+            habilidades (dict): id de ventanilla -> transacciones que atiende
+        
+        Raises:
+            ValueError: Si una habilidad no es una transacción conocida, si alguna
+                transacción queda sin ventanilla que la atienda o si se combinan
+                habilidades con varias filas
+        """
+        velocidades = velocidades or {}
+        habilidades = habilidades or {}
+        if habilidades:
+            self._validar_habilidades(habilidades)
+        self.servicio = catalogo
+        for ventanilla in self.ventanillas:
+            ventanilla.velocidad = velocidades.get(ventanilla.id, 1.0)
+            ventanilla.habilidades = frozenset(habilidades[ventanilla.id]) if ventanilla.id in habilidades else None
+        if any(v.habilidades is None for v in self.ventanillas):
+            self.atendibles = None
+        else:
+            self.atendibles = frozenset().union(*(v.habilidades for v in self.ventanillas))
+        # Con ventanillas idénticas basta la asignación original (primera libre)
+        self.heterogeneo = bool(velocidades or habilidades)
+    
+    def _validar_habilidades(self, habilidades):
+        """Comprueba que las habilidades nombren transacciones reales y las cubran todas"""
+        if self.enrutador:
+            raise ValueError("Las habilidades por ventanilla requieren fila única (TOPOLOGIA_FILAS = None)")
+        ids = {v.id for v in self.ventanillas}
+        desconocidas = set(habilidades) - ids
+        if desconocidas:
+            raise ValueError(f"Habilidades para ventanillas inexistentes: {sorted(desconocidas)}")
+        for id_ventanilla, transacciones in habilidades.items():
+            invalidas = set(transacciones) - set(Persona.TRANSACCIONES)
+            if invalidas:
+                raise ValueError(f"Ventanilla {id_ventanilla}: transacciones desconocidas: "
+                                 f"{', '.join(sorted(invalidas))}")
+        if len(habilidades) == len(ids):
+            cubiertas = set().union(*habilidades.values())
+            sin_ventanilla = [t for t in Persona.TRANSACCIONES if t not in cubiertas]
+            if sin_ventanilla:
+                raise ValueError(f"Ninguna ventanilla atiende: {', '.join(sin_ventanilla)}")
+    
+    def _obtener_siguiente_de_filas(self, ventanillas_libres):
+        """
+        Con varias filas, busca la primera ventanilla libre que tenga cliente
+        en su fila (o que pueda robarlo de otra)
+        
+        Returns:
+            tuple: (Ventanilla, Persona) o (None, None)
+        """
+        for ventanilla in ventanillas_libres:
+            cliente, robado = self.enrutador.siguiente_para(ventanilla)
+            if cliente:
+                if robado:
+                    self.log.append(f"[ENRUTAMIENTO] 🔀 Ventanilla {ventanilla.id} toma al Cliente {cliente.id} de otra fila")
+                return ventanilla, cliente
+        return None, None
+    
+    def configurar_filas(self, topologia=None, politica="jsew", robo=False, rng=None):
+        """
+        Cambia entre la fila única y varias filas con enrutamiento
+        
+        Args:
+            topologia (str): None (fila única), "ventanilla" o "transaccion"
+            politica (str): "jsq", "jsew" o "dos_opciones"
+            robo (bool): Si las ventanillas ociosas toman clientes de otras filas
+            rng (random.Random): Generador para las políticas aleatorias (obligatorio con topología)
+        
+        Raises:
+            ValueError: Si hay ventanillas con habilidades (el enrutador no las respeta)
+        """
+        if topologia is None:
+            self.enrutador = None
+            return
+        if any(v.habilidades is not None for v in self.ventanillas):
+            raise ValueError("Las habilidades por ventanilla requieren fila única (TOPOLOGIA_FILAS = None)")
+        self.enrutador = EnrutadorFilas(self, topologia, politica, robo, rng)
+        for persona in self.fila:
+            self.enrutador.encolar(persona)
+        self.log.append(f"[SISTEMA] 🔀 Filas por {topologia} - política {politica}{' con robo' if robo else ''}")
+    
     def terminar_atencion(self, ventanilla):
         """
         Termina la atención en una ventanilla
         
         Args:
             ventanilla (Ventanilla): Ventanilla que terminó de atender
+        
+        Returns:
+            int: Segundos de descanso (0 = la ventanilla ya quedó libre y quien
+                llama no debe programar el fin del descanso)
         """
         if ventanilla.cliente:
             self.clientes_atendidos += 1
             self.log.append(f"[ATENCION COMPLETADA] ✅ Cliente {ventanilla.cliente.id} finalizado en Ventanilla {ventanilla.id}")
             self.log.append(f"[TRANSACCION] 📋 {ventanilla.cliente.transaccion} - COMPLETADA")
             ventanilla.cliente.estado = "atendido"
+            ventanilla.cliente.tiempo_fin_atencion = self.reloj()
+            if self.metricas:
+                self.metricas.fin_atencion()
+            if self.registro is not None:
+                self.registro.registrar(ventanilla.cliente, ventanilla.id)
+            if self.enrutador:
+                self.enrutador.fin_atencion(ventanilla)
         
-        ventanilla.liberar()
-        self.log.append(f"[DESCANSO] ⏸️ Ventanilla {ventanilla.id} en pausa por {ventanilla.tiempo_restante} segundos")
-        self.actualizar_interfaz()
+        estado_anterior = ventanilla.estado
+        descanso = self.politica_descanso.duracion(self, ventanilla)
+        ventanilla.liberar(descanso)
+        ventanilla.libre_estimado = self.reloj() + descanso
+        if self.metricas:
+            self.metricas.cambio_ventanilla(estado_anterior, ventanilla.estado)
+        if descanso:
+            self.log.append(f"[DESCANSO] ⏸️ Ventanilla {ventanilla.id} en pausa por {descanso} segundos")
+            self.actualizar_interfaz()
+        else:
+            # Sin descanso queda libre ya: si esperara un evento de 0 s contaría como descansando
+            self.log.append(f"[DESCANSO] ⏭️ Ventanilla {ventanilla.id} pospone su descanso - {len(self.fila)} clientes en fila")
+            self.liberar_ventanilla(ventanilla)
+        return descanso
         
     def liberar_ventanilla(self, ventanilla):
         """
@@ -126,6 +341,8 @@ class Banco:
         Args:
             ventanilla (Ventanilla): Ventanilla a liberar
         """
+        if self.metricas:
+            self.metricas.cambio_ventanilla(ventanilla.estado, "libre")
         ventanilla.estado = "libre"
         ventanilla.tiempo_restante = 0
         
@@ -139,6 +356,24 @@ class Banco:
         self.actualizar_interfaz()
         self.asignar()  # Intentar asignar inmediatamente
         
+    def retirar_de_fila(self, personas):
+        """
+        Retira clientes de la fila sin atenderlos (ej. limpieza por saturación)
+        
+        Args:
+            personas (list): Clientes a retirar
+        """
+        retirados = {id(p) for p in personas}
+        self.fila = [p for p in self.fila if id(p) not in retirados]
+        for persona in personas:
+            persona.estado = "retirado"
+            if self.enrutador:
+                self.enrutador.retirar(persona)
+            if self.registro is not None:
+                self.registro.registrar(persona)
+        if self.metricas:
+            self.metricas.rechazo(personas)
+        
     def obtener_estadisticas(self):
         """
         Obtiene estadísticas actuales del sistema
@@ -0,0 +1,414 @@
+"""
+Barridos de parámetros repartidos entre varios procesos o máquinas: un
+coordinador TCP entrega unidades de trabajo y los trabajadores devuelven un
+resumen de cada simulación
+"""
+
+import csv
+import hmac
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from models.descansos import crear_politica
+from utils.aleatorio import secuencia
+from utils.config import (DURACION_BARRIDO, REPLICAS_BARRIDO, PLAZO_UNIDAD_BARRIDO, INTENTOS_BARRIDO,
+                          ESPERA_BARRIDO, RECONEXIONES_BARRIDO)
+
+# Resultados de SimuladorBanco que viajan de vuelta al coordinador
+CAMPOS_RESUMEN = ('atendidos', 'rendimiento', 'utilizacion', 'espera_promedio', 'espera_prioritarios',
+                  'espera_normales', 'p95_prioritarios', 'p95_normales', 'descanso_por_hora', 'en_fila',
+                  'eventos')
+
+
+def generar_unidades(dimensiones, replicas=REPLICAS_BARRIDO, duracion=DURACION_BARRIDO, semilla=0):
+    """
+    Producto cartesiano de las dimensiones por réplica
+
+    Todas las configuraciones usan las mismas semillas por réplica (números
+    aleatorios comunes), así que las diferencias entre ellas no se deben al azar.
+
+    Args:
+        dimensiones (dict): Argumento -> lista de valores. Se aceptan los argumentos
+            de SimuladorBanco, 'descanso' (nombre de política de descanso) y
+            'escenario' (nombre de un archivo de escenarios/)
+        replicas (int): Réplicas por configuración
+        duracion (float): Segundos simulados por réplica
+        semilla (int): Semilla maestra
+
+    Returns:
+        list: Unidades {'id', 'parametros', 'replica', 'semilla', 'duracion'}
+    """
+    entropia = secuencia(semilla).entropia
+    claves = list(dimensiones)
+    valores = [v if isinstance(v, (list, tuple)) else [v] for v in dimensiones.values()]
+    unidades = []
+    for combinacion in itertools.product(*valores):
+        for replica in range(replicas):
+            unidades.append({'id': len(unidades), 'parametros': dict(zip(claves, combinacion)),
+                             'replica': replica, 'semilla': entropia, 'duracion': duracion})
+    return unidades
+
+
+def ejecutar_unidad(unidad):
+    """
+    Simula una unidad de trabajo
+
+    Returns:
+        dict: Campos de CAMPOS_RESUMEN más 'segundos' (tiempo real de cómputo)
+    """
+    # Importación local: simulador -> banco -> ... -> barrido
+    from models.simulador import SimuladorBanco
+    from models.escenarios import buscar_escenario
+
+    inicio = time.perf_counter()
+    parametros = dict(unidad['parametros'])
+    semilla = secuencia(unidad['semilla']).hija("replica", unidad['replica'])
+    escenario = parametros.pop('escenario', None)
+    base = buscar_escenario(escenario).parametros_simulador(semilla) if escenario else {'semilla': semilla}
+    descanso = parametros.pop('descanso', None)
+    if descanso is not None:
+        parametros['politica_descanso'] = crear_politica(descanso)
+    if 'ventanillas' in parametros:
+        parametros['n_ventanillas'] = parametros.pop('ventanillas')
+    parametros = dict(base, **parametros)
+    parametros.setdefault('max_log', 1)
+    parametros.setdefault('calentamiento', unidad['duracion'] * 0.1)
+
+    resultados = SimuladorBanco(**parametros).ejecutar(unidad['duracion'])
+    resumen = {campo: resultados[campo] for campo in CAMPOS_RESUMEN}
+    resumen['segundos'] = time.perf_counter() - inicio
+    return resumen
+
+
+def _enviar(archivo, mensaje):
+    archivo.write(json.dumps(mensaje).encode("utf-8") + b"\n")
+    archivo.flush()
+
+
+def _recibir(archivo):
+    linea = archivo.readline()
+    if not linea:
+        raise ConnectionError("Conexión cerrada")
+    return json.loads(linea)
+
+
+class CoordinadorBarrido:
+    """
+    Reparte unidades de trabajo a los trabajadores que se conectan.
+
+    Protocolo (una línea JSON por mensaje): el trabajador saluda con
+    {"tipo": "hola"} y luego repite {"tipo": "pedir"}; el coordinador responde
+    con una unidad, con {"tipo": "esperar"} si todas están prestadas o con
+    {"tipo": "fin"}. El resultado vuelve como {"tipo": "resultado"}.
+
+    Cada unidad entregada queda prestada hasta `plazo` segundos: si la
+    conexión se corta o el plazo vence, vuelve a la cola. Tras `intentos`
+    entregas fallidas se da por perdida. Un resultado repetido (de un
+    trabajador lento cuya unidad ya se reasignó) se descarta, igual que el de
+    una unidad que nunca se entregó a esa conexión.
+    """
+
+    def __init__(self, unidades, puerto=0, host="127.0.0.1", clave=None,
+                 plazo=PLAZO_UNIDAD_BARRIDO, intentos=INTENTOS_BARRIDO):
+        """
+        Inicializa el coordinador
+
+        Args:
+            unidades (list): Unidades de generar_unidades()
+            puerto (int): Puerto de escucha (0 elige uno libre)
+            host (str): Dirección de escucha ("0.0.0.0" para otras máquinas)
+            clave (str): Clave compartida que deben enviar los trabajadores (opcional)
+            plazo (float): Segundos que un trabajador puede tener una unidad
+            intentos (int): Entregas máximas por unidad
+        """
+        self.unidades = {u['id']: u for u in unidades}
+        self.host = host
+        self.puerto = puerto
+        self.clave = clave
+        self.plazo = plazo
+        self.intentos = intentos
+
+        self._condicion = threading.Condition()
+        self._pendientes = [u['id'] for u in reversed(unidades)]  # pila: se entrega la de menor id
+        self._prestadas = {}   # id -> (vencimiento, conexión)
+        self._entregas = {}    # id -> veces entregada
+        self._poseedores = {}  # id -> conexiones que la recibieron alguna vez
+        self.resultados = {}   # id -> resumen
+        self.perdidas = {}     # id -> motivo
+        self.reintentos = 0
+        self.trabajadores = set()
+        self._servidor = None
+        self._hilo = None
+
+    # ------------------------------------------------------------------
+    # Estado (siempre con la condición tomada)
+    # ------------------------------------------------------------------
+    def _terminado(self):
+        return len(self.resultados) + len(self.perdidas) == len(self.unidades)
+
+    def _devolver(self, unidad_id, motivo):
+        """Vuelve a encolar una unidad prestada (o la da por perdida)"""
+        self._prestadas.pop(unidad_id, None)
+        if unidad_id in self.resultados or unidad_id in self.perdidas:
+            return
+        if self._entregas[unidad_id] >= self.intentos:
+            self.perdidas[unidad_id] = motivo
+        else:
+            self.reintentos += 1
+            self._pendientes.append(unidad_id)
+        self._condicion.notify_all()
+
+    def _recuperar_vencidas(self):
+        ahora = time.monotonic()
+        for unidad_id, (vencimiento, _) in list(self._prestadas.items()):
+            if vencimiento <= ahora:
+                self._devolver(unidad_id, "plazo vencido")
+
+    def _prestar(self, conexion):
+        """
+        Returns:
+            dict: Mensaje para el trabajador
+        """
+        with self._condicion:
+            self._recuperar_vencidas()
+            if self._terminado():
+                return {'tipo': "fin"}
+            if not self._pendientes:
+                return {'tipo': "esperar", 'segundos': ESPERA_BARRIDO}
+            unidad_id = self._pendientes.pop()
+            self._entregas[unidad_id] = self._entregas.get(unidad_id, 0) + 1
+            self._prestadas[unidad_id] = (time.monotonic() + self.plazo, conexion)
+            self._poseedores.setdefault(unidad_id, set()).add(conexion)
+            return {'tipo': "unidad", 'unidad': self.unidades[unidad_id]}
+
+    def _recibir_resultado(self, unidad_id, conexion, resumen, trabajador):
+        """Guarda el resultado de una unidad que se entregó a esta conexión"""
+        with self._condicion:
+            if conexion not in self._poseedores.get(unidad_id, ()):
+                return
+            if self._prestadas.get(unidad_id, (None, None))[1] is conexion:
+                self._prestadas.pop(unidad_id)
+            if unidad_id not in self.resultados:
+                self.perdidas.pop(unidad_id, None)
+                self.resultados[unidad_id] = dict(resumen, trabajador=trabajador)
+                if unidad_id in self._pendientes:
+                    self._pendientes.remove(unidad_id)
+            self._condicion.notify_all()
+
+    def _fallo(self, unidad_id, conexion, motivo):
+        """Un trabajador no pudo simular una unidad que todavía es suya"""
+        with self._condicion:
+            if self._prestadas.get(unidad_id, (None, None))[1] is conexion:
+                self._devolver(unidad_id, motivo)
+
+    def _clave_valida(self, clave):
+        """Compara la clave del saludo en tiempo constante (como bytes: admite no ASCII)"""
+        if self.clave is None:
+            return True
+        return hmac.compare_digest(str(clave).encode("utf-8"), self.clave.encode("utf-8"))
+
+    def _registrar_trabajador(self, nombre):
+        with self._condicion:
+            self.trabajadores.add(nombre)
+
+    def _desconectado(self, conexion):
+        """Devuelve a la cola las unidades que tenía una conexión cortada"""
+        with self._condicion:
+            for unidad_id, (_, duena) in list(self._prestadas.items()):
+                if duena is conexion:
+                    self._devolver(unidad_id, "trabajador desconectado")
+
+    # ------------------------------------------------------------------
+    # Servidor
+    # ------------------------------------------------------------------
+    def _crear_manejador(self):
+        coordinador = self
+
+        class ManejadorBarrido(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    saludo = _recibir(self.rfile)
+                    if saludo.get('tipo') != "hola" or not coordinador._clave_valida(saludo.get('clave', "")):
+                        _enviar(self.wfile, {'tipo': "rechazado"})
+                        return
+                    nombre = str(saludo.get('trabajador', self.client_address[0]))
+                    coordinador._registrar_trabajador(nombre)
+                    _enviar(self.wfile, {'tipo': "bienvenido"})
+                    while True:
+                        mensaje = _recibir(self.rfile)
+                        if mensaje.get('tipo') == "pedir":
+                            respuesta = coordinador._prestar(self)
+                            _enviar(self.wfile, respuesta)
+                            if respuesta['tipo'] == "fin":
+                                return
+                        elif mensaje.get('tipo') == "resultado":
+                            coordinador._recibir_resultado(mensaje['id'], self, mensaje['resumen'], nombre)
+                        elif mensaje.get('tipo') == "error":
+                            coordinador._fallo(mensaje['id'], self, str(mensaje.get('mensaje')))
+                except (ConnectionError, OSError, ValueError, KeyError, TypeError, AttributeError):
+                    pass  # Conexión cortada o mensaje malformado: se descarta el trabajador
+                finally:
+                    coordinador._desconectado(self)
+
+        return ManejadorBarrido
+
+    def iniciar(self):
+        """Arranca el servidor en un hilo en segundo plano"""
+        self._servidor = socketserver.ThreadingTCPServer((self.host, self.puerto), self._crear_manejador())
+        self._servidor.daemon_threads = True
+        self.puerto = self._servidor.server_address[1]
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def esperar(self, timeout=None, progreso=None):
+        """
+        Espera a que todas las unidades terminen (o se pierdan)
+
+        Args:
+            timeout (float): Segundos máximos de espera (None = sin límite)
+            progreso (callable): Se llama con (hechas, total) cada vez que cambia el avance
+
+        Returns:
+            bool: True si no quedan unidades sin resolver
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        hechas = -1
+        with self._condicion:
+            while not self._terminado():
+                if progreso is not None and len(self.resultados) != hechas:
+                    hechas = len(self.resultados)
+                    progreso(hechas, len(self.unidades))
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                # Revisión periódica: los plazos vencen aunque ningún trabajador pida
+                self._condicion.wait(min(restante or ESPERA_BARRIDO, ESPERA_BARRIDO))
+                self._recuperar_vencidas()
+            if progreso is not None:
+                progreso(len(self.resultados), len(self.unidades))
+        return True
+
+    def detener(self):
+        """Detiene el servidor"""
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._hilo.join(timeout=2.0)
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    def filas(self):
+        """
+        Returns:
+            list: Un dict por unidad resuelta con sus parámetros, réplica y resumen
+        """
+        return [dict(self.unidades[i]['parametros'], replica=self.unidades[i]['replica'], **self.resultados[i])
+                for i in sorted(self.resultados)]
+
+    def agregados(self):
+        """
+        Promedia las réplicas de cada configuración
+
+        Returns:
+            list: Un dict por configuración con sus parámetros, 'replicas' y las medias de CAMPOS_RESUMEN
+        """
+        grupos = {}
+        for i in sorted(self.resultados):
+            parametros = self.unidades[i]['parametros']
+            clave = json.dumps(parametros, sort_keys=True)
+            grupos.setdefault(clave, (parametros, []))[1].append(self.resultados[i])
+        agregados = []
+        for parametros, resumenes in grupos.values():
+            medias = {campo: sum(r[campo] for r in resumenes) / len(resumenes) for campo in CAMPOS_RESUMEN}
+            agregados.append(dict(parametros, replicas=len(resumenes), **medias))
+        return agregados
+
+    def exportar(self, ruta):
+        """Escribe un CSV con una fila por unidad resuelta"""
+        filas = self.filas()
+        if not filas:
+            return
+        columnas = list(dict.fromkeys(c for fila in filas for c in fila))
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=columnas)
+            escritor.writeheader()
+            escritor.writerows(filas)
+
+
+class TrabajadorBarrido:
+    """Se conecta a un coordinador, pide unidades, las simula y devuelve sus resúmenes"""
+
+    def __init__(self, host, puerto, nombre=None, clave=None, reconexiones=RECONEXIONES_BARRIDO):
+        """
+        Inicializa el trabajador
+
+        Args:
+            host (str): Dirección del coordinador
+            puerto (int): Puerto del coordinador
+            nombre (str): Nombre con el que se presenta (por defecto, host:pid)
+            clave (str): Clave compartida del coordinador
+            reconexiones (int): Intentos de reconexión seguidos antes de rendirse
+        """
+        self.host = host
+        self.puerto = puerto
+        self.nombre = nombre or f"{socket.gethostname()}:{os.getpid()}"
+        self.clave = clave
+        self.reconexiones = reconexiones
+        self.completadas = 0
+
+    def ejecutar(self):
+        """
+        Trabaja hasta que el coordinador informa que no quedan unidades
+
+        Returns:
+            int: Unidades completadas por este trabajador
+        """
+        fallos = 0
+        while True:
+            try:
+                if self._sesion():
+                    return self.completadas
+                fallos = 0
+            except PermissionError:
+                raise
+            except (ConnectionError, OSError, ValueError):
+                fallos += 1
+                if fallos > self.reconexiones:
+                    return self.completadas
+                time.sleep(min(2 ** fallos * 0.1, 5.0))
+
+    def _sesion(self):
+        """
+        Una conexión con el coordinador
+
+        Returns:
+            bool: True si el coordinador dio el barrido por terminado
+        """
+        with socket.create_connection((self.host, self.puerto)) as conexion:
+            archivo = conexion.makefile("rwb")
+            _enviar(archivo, {'tipo': "hola", 'trabajador': self.nombre, 'clave': self.clave})
+            if _recibir(archivo).get('tipo') != "bienvenido":
+                raise PermissionError("El coordinador rechazó al trabajador (¿clave incorrecta?)")
+            while True:
+                _enviar(archivo, {'tipo': "pedir"})
+                mensaje = _recibir(archivo)
+                if mensaje['tipo'] == "fin":
+                    return True
+                if mensaje['tipo'] == "esperar":
+                    time.sleep(mensaje.get('segundos', ESPERA_BARRIDO))
+                    continue
+                unidad = mensaje['unidad']
+                try:
+                    resumen = ejecutar_unidad(unidad)
+                except Exception as e:  # Un error de la simulación no debe tumbar al trabajador
+                    _enviar(archivo, {'tipo': "error", 'id': unidad['id'], 'mensaje': repr(e)})
+                    continue
+                _enviar(archivo, {'tipo': "resultado", 'id': unidad['id'], 'resumen': resumen})
+                self.completadas += 1
@@ -0,0 +1,204 @@
+"""
+Generadores de carga de llegadas: uniformes, Poisson no homogéneo y trazas CSV
+
+Todas las cargas son iterables perezosos de tuplas (tiempo, prioridad, transaccion)
+ordenadas por tiempo, con el tiempo en segundos desde el inicio de la simulación
+y transaccion igual a None cuando debe elegirse al azar.
+"""
+
+import csv
+import heapq
+
+from utils.config import TIEMPO_ENTRE_CLIENTES_MIN, TIEMPO_ENTRE_CLIENTES_MAX
+
+
+def _exigir_generador(rng, fuente):
+    """Las fuentes sintéticas no sortean con un generador sin semilla"""
+    if rng is None:
+        raise ValueError(f"{fuente} necesita un generador de SecuenciaSemillas (rng)")
+    return rng
+
+
+class LlegadasUniformes:
+    """Intervalos uniformes entre llegadas (comportamiento original de la interfaz)"""
+
+    def __init__(self, proporcion_prioritarios=0.25, intervalo=(TIEMPO_ENTRE_CLIENTES_MIN / 1000,
+                                                               TIEMPO_ENTRE_CLIENTES_MAX / 1000),
+                 rng=None, inicio=0.0):
+        """
+        Args:
+            proporcion_prioritarios (float): Fracción de clientes prioritarios
+            intervalo (tuple): Intervalo (mín, máx) entre llegadas en segundos
+            rng (random.Random): Generador aleatorio (obligatorio)
+            inicio (float): Tiempo de partida
+        """
+        self.proporcion_prioritarios = proporcion_prioritarios
+        self.intervalo = intervalo
+        self.rng = _exigir_generador(rng, "LlegadasUniformes")
+        self.inicio = inicio
+
+    def __iter__(self):
+        rng, (a, b), p = self.rng, self.intervalo, self.proporcion_prioritarios
+        t = self.inicio
+        while True:
+            t += rng.uniform(a, b)
+            yield t, rng.random() < p, None
+
+
+class LlegadasPoisson:
+    """Llegadas de Poisson con tasa constante"""
+
+    def __init__(self, tasa, proporcion_prioritarios=0.25, rng=None, inicio=0.0):
+        """
+        Args:
+            tasa (float): Clientes por segundo
+            proporcion_prioritarios (float): Fracción de clientes prioritarios
+            rng (random.Random): Generador aleatorio (obligatorio)
+            inicio (float): Tiempo de partida
+        """
+        self.tasa = tasa
+        self.proporcion_prioritarios = proporcion_prioritarios
+        self.rng = _exigir_generador(rng, "LlegadasPoisson")
+        self.inicio = inicio
+
+    def __iter__(self):
+        rng, tasa, p = self.rng, self.tasa, self.proporcion_prioritarios
+        t = self.inicio
+        while True:
+            t += rng.expovariate(tasa)
+            yield t, rng.random() < p, None
+
+
+class LlegadasPoissonNoHomogeneo:
+    """
+    Llegadas de Poisson con tasa variable según una tabla horaria, generadas
+    por adelgazamiento (thinning) sobre la tasa máxima de la tabla
+    """
+
+    def __init__(self, tasas_horarias, proporcion_prioritarios=0.25, rng=None, repetir=False):
+        """
+        Args:
+            tasas_horarias (list): Clientes por hora para cada hora desde el inicio
+            proporcion_prioritarios (float | list): Fracción de prioritarios (fija o por hora)
+            rng (random.Random): Generador aleatorio (obligatorio)
+            repetir (bool): Si la tabla se repite cíclicamente (ej. 24 h)
+        """
+        if not tasas_horarias or max(tasas_horarias) <= 0:
+            raise ValueError("La tabla horaria necesita al menos una tasa positiva")
+        self.tasas = [t / 3600 for t in tasas_horarias]
+        if isinstance(proporcion_prioritarios, (int, float)):
+            proporcion_prioritarios = [proporcion_prioritarios] * len(self.tasas)
+        self.proporciones = list(proporcion_prioritarios)
+        self.rng = _exigir_generador(rng, "LlegadasPoissonNoHomogeneo")
+        self.repetir = repetir
+
+    def tasa(self, t):
+        """Tasa (clientes/s) vigente en el instante t"""
+        hora = int(t // 3600)
+        if self.repetir:
+            hora %= len(self.tasas)
+        return self.tasas[hora] if hora < len(self.tasas) else 0.0
+
+    def __iter__(self):
+        rng = self.rng
+        tasa_max = max(self.tasas)
+        fin = None if self.repetir else len(self.tasas) * 3600
+        t = 0.0
+        while True:
+            t += rng.expovariate(tasa_max)
+            if fin is not None and t >= fin:
+                return
+            hora = int(t // 3600) % len(self.tasas)
+            if rng.random() * tasa_max < self.tasas[hora]:
+                yield t, rng.random() < self.proporciones[hora], None
+
+
+class LlegadasTraza:
+    """
+    Reproduce llegadas reales desde un CSV leyendo fila a fila, sin cargar el archivo.
+
+    Columnas reconocidas: `tiempo` (segundos, o HH:MM[:SS]), `prioridad`
+    (1/0, true/false, si/no) y opcionalmente `transaccion`. Los tiempos se
+    expresan relativos a `origen` (por defecto, la primera fila).
+    """
+
+    VERDADEROS = {"1", "true", "si", "sí", "s", "yes", "y", "prioritario"}
+
+    def __init__(self, ruta, origen=None, escala=1.0, columna_tiempo="tiempo"):
+        """
+        Args:
+            ruta (str): Archivo CSV con cabecera
+            origen (float): Segundos que corresponden al inicio de la simulación
+            escala (float): Factor aplicado a los tiempos (ej. 0.5 duplica la velocidad)
+            columna_tiempo (str): Nombre de la columna de tiempo
+        """
+        self.ruta = ruta
+        self.origen = origen
+        self.escala = escala
+        self.columna_tiempo = columna_tiempo
+
+    @staticmethod
+    def _a_segundos(valor):
+        """Convierte '12.5' o 'HH:MM[:SS]' a segundos"""
+        if ":" in valor:
+            partes = [float(p) for p in valor.split(":")]
+            while len(partes) < 3:
+                partes.append(0.0)
+            return partes[0] * 3600 + partes[1] * 60 + partes[2]
+        return float(valor)
+
+    def __iter__(self):
+        origen = self.origen
+        anterior = None
+        with open(self.ruta, newline="", encoding="utf-8") as f:
+            for fila in csv.DictReader(f):
+                t = self._a_segundos(fila[self.columna_tiempo].strip())
+                if origen is None:
+                    origen = t
+                t = (t - origen) * self.escala
+                if t < 0:
+                    continue
+                if anterior is not None and t < anterior:
+                    raise ValueError(f"La traza {self.ruta} no está ordenada por tiempo ({t} < {anterior})")
+                anterior = t
+                prioridad = fila.get("prioridad", "0").strip().lower() in self.VERDADEROS
+                transaccion = (fila.get("transaccion") or "").strip() or None
+                yield t, prioridad, transaccion
+
+
+def combinar_cargas(*cargas):
+    """
+    Mezcla varias cargas en una sola secuencia ordenada por tiempo
+
+    Returns:
+        iterator: Llegadas de todas las cargas intercaladas
+    """
+    return heapq.merge(*cargas, key=lambda llegada: llegada[0])
+
+
+def crear_carga(proporcion_prioritarios=0.25, tasa=None, tasas_horarias=None, trazas=(),
+                rng=None, repetir=False):
+    """
+    Construye la carga de un escenario combinando sus fuentes
+
+    Args:
+        proporcion_prioritarios (float): Fracción de prioritarios de las fuentes sintéticas
+        tasa (float): Clientes por segundo (Poisson homogéneo)
+        tasas_horarias (list): Tabla de clientes por hora (Poisson no homogéneo)
+        trazas (list): Rutas de CSV a reproducir
+        rng (random.Random): Generador aleatorio de las fuentes sintéticas (obligatorio
+            si hay alguna)
+        repetir (bool): Si la tabla horaria se repite
+
+    Returns:
+        iterator: Llegadas ordenadas por tiempo. Sin fuentes, intervalos uniformes
+    """
+    fuentes = []
+    if tasas_horarias:
+        fuentes.append(LlegadasPoissonNoHomogeneo(tasas_horarias, proporcion_prioritarios, rng, repetir))
+    if tasa:
+        fuentes.append(LlegadasPoisson(tasa, proporcion_prioritarios, rng))
+    fuentes.extend(LlegadasTraza(ruta) for ruta in trazas)
+    if not fuentes:
+        fuentes.append(LlegadasUniformes(proporcion_prioritarios, rng=rng))
+    return iter(fuentes[0]) if len(fuentes) == 1 else combinar_cargas(*fuentes)
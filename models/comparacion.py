@@ -0,0 +1,191 @@
+"""
+Comparación pareada de dos configuraciones con reducción de varianza:
+números aleatorios comunes, variables antitéticas y variable de control
+"""
+
+import math
+
+from models.analitico import estimar_colas
+from models.estimacion import cuantil_t
+from models.persona import Persona
+from utils.aleatorio import secuencia
+from utils.config import (NUM_VENTANILLAS, TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX, PRECISION_RELATIVA,
+                          PRECISION_ABSOLUTA, CONFIANZA_ESTIMACION,
+                          DURACION_PAR, PARES_MIN, PARES_MAX)
+
+TECNICAS = (
+    ("Independientes", False, False, False),
+    ("Números comunes", True, False, False),
+    ("Comunes + antitéticas", True, True, False),
+    ("Comunes + antitéticas + control", True, True, True),
+)
+
+
+def utilizacion_esperada(parametros):
+    """
+    Utilización analítica λ·E[atención]/c de una configuración de SimuladorBanco
+
+    Args:
+        parametros (dict): Argumentos de SimuladorBanco
+
+    Returns:
+        float: Utilización esperada, o None si no se conoce en forma cerrada
+            (cargas externas, ventanillas con distinta velocidad, fila virtual)
+    """
+    if parametros.get('carga') is not None or parametros.get('velocidades') or \
+            parametros.get('fila_virtual') is not None:
+        return None
+    n = parametros.get('n_ventanillas', NUM_VENTANILLAS)
+    analitico = estimar_colas(n, parametros.get('tasa_llegada'),
+                              tiempo_atencion=parametros.get('tiempo_atencion',
+                                                             (TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX)))
+    servicio = parametros.get('servicio')
+    if servicio is None:
+        return analitico['utilizacion']
+    # Las transacciones se sortean de manera uniforme entre las conocidas
+    media = sum(servicio.media(t) for t in Persona.TRANSACCIONES) / len(Persona.TRANSACCIONES)
+    return analitico['tasa_llegada'] * media / n
+
+
+def _replica(parametros, semilla, duracion, metrica):
+    """
+    Ejecuta una réplica de una configuración
+
+    Returns:
+        tuple: (valor de la métrica, utilización observada, clientes atendidos)
+    """
+    # Importación local: simulador -> banco -> ... -> comparacion
+    from models.simulador import SimuladorBanco
+
+    configuracion = dict(parametros)
+    configuracion.setdefault('max_log', 1)
+    configuracion.setdefault('calentamiento', duracion * 0.1)
+    resultados = SimuladorBanco(semilla=semilla, servicio_por_cliente=True, **configuracion).ejecutar(duracion)
+    return resultados[metrica], resultados['utilizacion'], resultados['atendidos']
+
+
+def _intervalo(diferencias, controles, confianza):
+    """
+    Estimación e intervalo de la diferencia media, con o sin variable de control
+
+    Con control se ajusta la recta D = a + β·X por mínimos cuadrados y se estima
+    la diferencia en X = 0 (media conocida del control), es decir
+    D̄ - β·X̄, con la varianza del intercepto de la regresión.
+
+    Returns:
+        tuple: (estimación, semiancho, β o None)
+    """
+    n = len(diferencias)
+    media = sum(diferencias) / n
+    if controles is None:
+        varianza = sum((d - media) ** 2 for d in diferencias) / (n - 1)
+        return media, cuantil_t((1 + confianza) / 2, n - 1) * math.sqrt(varianza / n), None
+
+    media_x = sum(controles) / n
+    sxx = sum((x - media_x) ** 2 for x in controles)
+    if sxx == 0 or n < 4:
+        return _intervalo(diferencias, None, confianza)
+    beta = sum((x - media_x) * (d - media) for x, d in zip(controles, diferencias)) / sxx
+    residuos = sum((d - media - beta * (x - media_x)) ** 2 for x, d in zip(controles, diferencias))
+    varianza = residuos / (n - 2)
+    estimacion = media - beta * media_x
+    semiancho = cuantil_t((1 + confianza) / 2, n - 2) * math.sqrt(varianza * (1 / n + media_x ** 2 / sxx))
+    return estimacion, semiancho, beta
+
+
+def comparar_pareado(configuracion_a, configuracion_b, metrica="espera_promedio", comunes=True,
+                     antiteticas=True, control=True, precision=PRECISION_RELATIVA,
+                     precision_absoluta=PRECISION_ABSOLUTA, confianza=CONFIANZA_ESTIMACION,
+                     duracion=DURACION_PAR, pares_min=PARES_MIN, pares_max=PARES_MAX, semilla=0):
+    """
+    Estima la diferencia de una métrica entre dos configuraciones (A - B)
+    agregando pares de réplicas hasta alcanzar la precisión pedida
+
+    Args:
+        configuracion_a (dict): Argumentos de SimuladorBanco de la configuración A
+        configuracion_b (dict): Argumentos de SimuladorBanco de la configuración B
+        metrica (str): Clave de SimuladorBanco.resultados() a comparar
+        comunes (bool): Usar la misma semilla en A y B (números aleatorios comunes)
+        antiteticas (bool): Promediar cada par con su réplica antitética
+        control (bool): Corregir con la utilización observada menos la analítica
+        precision (float): Semiancho relativo objetivo de la diferencia
+        precision_absoluta (float): Semiancho que basta aunque la diferencia sea casi 0
+        confianza (float): Nivel del intervalo
+        duracion (float): Segundos simulados por réplica
+        pares_min (int): Pares mínimos antes de evaluar la precisión
+        pares_max (int): Pares máximos
+        semilla (int): Semilla maestra
+
+    Returns:
+        dict: diferencia, ic, semiancho, medias de A y B, pares, réplicas,
+            clientes simulados, β del control y si se alcanzó la precisión
+    """
+    semillas = secuencia(semilla)
+    esperadas = (utilizacion_esperada(configuracion_a), utilizacion_esperada(configuracion_b))
+    control = control and None not in esperadas
+
+    diferencias, controles = [], []
+    suma_a = suma_b = 0.0
+    clientes = replicas = 0
+    estimacion = semiancho = math.nan
+    beta = None
+    convergio = False
+    for par in range(pares_max):
+        base = semillas.hija("par", par)
+        variantes = (base, base.complemento()) if antiteticas else (base,)
+        diferencia = desvio = 0.0
+        for variante in variantes:
+            semilla_a, semilla_b = ((variante, variante) if comunes
+                                    else (variante.hija("A"), variante.hija("B")))
+            valor_a, utilizacion_a, atendidos_a = _replica(configuracion_a, semilla_a, duracion, metrica)
+            valor_b, utilizacion_b, atendidos_b = _replica(configuracion_b, semilla_b, duracion, metrica)
+            diferencia += (valor_a - valor_b) / len(variantes)
+            if control:
+                desvio += ((utilizacion_a - esperadas[0]) + (utilizacion_b - esperadas[1])) / len(variantes)
+            suma_a += valor_a
+            suma_b += valor_b
+            clientes += atendidos_a + atendidos_b
+            replicas += 2
+        diferencias.append(diferencia)
+        controles.append(desvio)
+
+        if len(diferencias) >= max(pares_min, 2):
+            estimacion, semiancho, beta = _intervalo(diferencias, controles if control else None, confianza)
+            if semiancho <= max(precision * abs(estimacion), precision_absoluta):
+                convergio = True
+                break
+
+    return {
+        'diferencia': estimacion,
+        'ic': (estimacion - semiancho, estimacion + semiancho),
+        'semiancho': semiancho,
+        'media_a': suma_a / (replicas / 2),
+        'media_b': suma_b / (replicas / 2),
+        'pares': len(diferencias),
+        'replicas': replicas,
+        'clientes': clientes,
+        'beta': beta,
+        'convergio': convergio
+    }
+
+
+def comparar_tecnicas(configuracion_a, configuracion_b, tecnicas=TECNICAS, **opciones):
+    """
+    Repite la comparación pareada con cada combinación de técnicas para ver
+    cuántos clientes simulados necesita cada una
+
+    Args:
+        configuracion_a (dict): Argumentos de SimuladorBanco de la configuración A
+        configuracion_b (dict): Argumentos de SimuladorBanco de la configuración B
+        tecnicas (tuple): (etiqueta, comunes, antitéticas, control)
+        **opciones: Argumentos de comparar_pareado
+
+    Returns:
+        list: Un dict de comparar_pareado por técnica, con su etiqueta en 'tecnica'
+    """
+    resultados = []
+    for etiqueta, comunes, antiteticas, control in tecnicas:
+        resultado = comparar_pareado(configuracion_a, configuracion_b, comunes=comunes,
+                                     antiteticas=antiteticas, control=control, **opciones)
+        resultados.append(dict(resultado, tecnica=etiqueta))
+    return resultados
@@ -0,0 +1,236 @@
+"""
+Políticas de descanso de las ventanillas tras cada cliente
+"""
+
+from utils.aleatorio import secuencia
+
+
+class DescansoFijo:
+    """Descanso fijo después de cada cliente (comportamiento original)"""
+
+    nombre = "fijo"
+
+    def __init__(self, segundos=None):
+        """
+        Args:
+            segundos (int): Duración del descanso (None = banco.tiempo_descanso)
+        """
+        self.segundos = segundos
+
+    def _base(self, banco):
+        return banco.tiempo_descanso if self.segundos is None else self.segundos
+
+    def duracion(self, banco, ventanilla):
+        """
+        Decide cuánto descansa la ventanilla que acaba de terminar de atender
+
+        Returns:
+            int: Segundos de descanso (0 = vuelve a quedar libre de inmediato)
+        """
+        return self._base(banco)
+
+    def reiniciar(self):
+        """Olvida el estado acumulado (ej. al reiniciar el sistema)"""
+
+
+class DescansoDiferido(DescansoFijo):
+    """
+    Pospone el descanso mientras la fila es larga y lo acumula como deuda que
+    se paga cuando la fila baja (o al llegar al máximo de aplazamientos)
+    """
+
+    nombre = "diferido"
+
+    def __init__(self, segundos=None, umbral_fila=None, max_aplazamientos=10, max_descanso=60):
+        """
+        Args:
+            segundos (int): Descanso por cliente (None = banco.tiempo_descanso)
+            umbral_fila (int): Largo de fila desde el que se pospone (None = nº de ventanillas)
+            max_aplazamientos (int): Descansos seguidos que pueden posponerse
+            max_descanso (int): Máximo de segundos de un descanso acumulado
+        """
+        super().__init__(segundos)
+        self.umbral_fila = umbral_fila
+        self.max_aplazamientos = max_aplazamientos
+        self.max_descanso = max_descanso
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.deuda = {}
+        self.aplazamientos = {}
+
+    def duracion(self, banco, ventanilla):
+        umbral = self.umbral_fila if self.umbral_fila is not None else len(banco.ventanillas)
+        deuda = self.deuda.get(ventanilla.id, 0) + self._base(banco)
+        aplazados = self.aplazamientos.get(ventanilla.id, 0)
+
+        if len(banco.fila) >= umbral and aplazados < self.max_aplazamientos:
+            self.deuda[ventanilla.id] = deuda
+            self.aplazamientos[ventanilla.id] = aplazados + 1
+            return 0
+
+        tomado = min(deuda, self.max_descanso)
+        self.deuda[ventanilla.id] = deuda - tomado
+        self.aplazamientos[ventanilla.id] = 0
+        return tomado
+
+
+class PresupuestoDescanso(DescansoFijo):
+    """
+    Cada ventanilla acumula un presupuesto de descanso por hora y lo gasta en
+    bloques cuando la fila está corta. Si el presupuesto llega al tope sin
+    haberse usado, el bloque se toma igual.
+    """
+
+    nombre = "presupuesto"
+
+    def __init__(self, segundos_por_hora=300, bloque=30, umbral_fila=2):
+        """
+        Args:
+            segundos_por_hora (float): Descanso que gana cada ventanilla por hora
+            bloque (int): Duración de cada descanso
+            umbral_fila (int): Largo de fila por debajo del cual se descansa
+        """
+        super().__init__(bloque)
+        self.segundos_por_hora = segundos_por_hora
+        self.bloque = bloque
+        self.umbral_fila = umbral_fila
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.saldo = {}
+        self.ultima_revision = {}
+
+    def duracion(self, banco, ventanilla):
+        ahora = banco.reloj()
+        anterior = self.ultima_revision.get(ventanilla.id, ahora)
+        self.ultima_revision[ventanilla.id] = ahora
+        saldo = min(self.saldo.get(ventanilla.id, 0.0) + (ahora - anterior) * self.segundos_por_hora / 3600,
+                    self.segundos_por_hora)
+
+        if saldo >= self.bloque and (len(banco.fila) < self.umbral_fila or saldo >= self.segundos_por_hora):
+            self.saldo[ventanilla.id] = saldo - self.bloque
+            return self.bloque
+        self.saldo[ventanilla.id] = saldo
+        return 0
+
+
+class DescansoEscalonado(DescansoFijo):
+    """
+    Limita cuántas ventanillas descansan a la vez; las demás posponen su
+    descanso y lo recuperan cuando hay lugar
+    """
+
+    nombre = "escalonado"
+
+    def __init__(self, segundos=None, max_simultaneos=1, max_descanso=60):
+        """
+        Args:
+            segundos (int): Descanso por cliente (None = banco.tiempo_descanso)
+            max_simultaneos (int): Ventanillas que pueden descansar al mismo tiempo
+            max_descanso (int): Máximo de segundos de un descanso acumulado
+        """
+        super().__init__(segundos)
+        self.max_simultaneos = max_simultaneos
+        self.max_descanso = max_descanso
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.deuda = {}
+
+    def duracion(self, banco, ventanilla):
+        deuda = self.deuda.get(ventanilla.id, 0) + self._base(banco)
+        descansando = sum(1 for v in banco.ventanillas if v.estado == "descansando" and v is not ventanilla)
+        if descansando >= self.max_simultaneos:
+            self.deuda[ventanilla.id] = deuda
+            return 0
+        tomado = min(deuda, self.max_descanso)
+        self.deuda[ventanilla.id] = deuda - tomado
+        return tomado
+
+
+POLITICAS_DESCANSO = {clase.nombre: clase for clase in
+                      (DescansoFijo, DescansoDiferido, PresupuestoDescanso, DescansoEscalonado)}
+
+
+def crear_politica(nombre="fijo", **parametros):
+    """
+    Crea una política de descanso por nombre
+
+    Args:
+        nombre (str): "fijo", "diferido", "presupuesto" o "escalonado"
+        **parametros: Argumentos del constructor de la política
+
+    Returns:
+        Política con métodos duracion(banco, ventanilla) y reiniciar()
+    """
+    if nombre not in POLITICAS_DESCANSO:
+        raise ValueError(f"Política de descanso desconocida: {nombre} "
+                         f"(opciones: {', '.join(POLITICAS_DESCANSO)})")
+    return POLITICAS_DESCANSO[nombre](**parametros)
+
+
+POLITICAS_COMPARADAS = (
+    ("Fijo", "fijo", {}),
+    ("Diferido", "diferido", {}),
+    ("Presupuesto 5 min/h", "presupuesto", {}),
+    ("Escalonado (1 a la vez)", "escalonado", {}),
+)
+
+
+# Cargas comparadas, como fracción de la capacidad con descanso fijo: por
+# debajo de 1 todas las políticas atienden a todos; entre 1 y la capacidad sin
+# descanso solo las que posponen descansos recuperan rendimiento
+FACTORES_CARGA = (0.9, 1.1, 1.2)
+
+
+def tasas_cerca_de_saturacion(n_ventanillas=3, factores=FACTORES_CARGA):
+    """
+    Tasas de llegada alrededor del punto en que el descanso fijo satura
+
+    Returns:
+        list: Clientes por segundo, uno por factor
+    """
+    # Importación local: analitico -> simulador -> banco -> descansos
+    from models.analitico import momentos_servicio
+
+    _, media_ocupacion, _ = momentos_servicio()
+    return [round(factor * n_ventanillas / media_ocupacion, 3) for factor in factores]
+
+
+def comparar_descansos(n_ventanillas=3, tasas=None, duracion=20000, replicas=3, semilla=0,
+                       politicas=POLITICAS_COMPARADAS):
+    """
+    Simula la misma carga con cada política de descanso
+
+    Args:
+        n_ventanillas (int): Número de ventanillas
+        tasas (list): Clientes por segundo a comparar (None = tasas_cerca_de_saturacion())
+        duracion (float): Segundos simulados por réplica
+        replicas (int): Réplicas (las mismas semillas para todas las políticas)
+        semilla (int): Semilla maestra
+        politicas (tuple): (etiqueta, nombre, parámetros) a comparar
+
+    Returns:
+        list: Un dict por tasa y política con rendimiento, esperas, descanso y fila final
+    """
+    # Importación local: simulador -> banco -> descansos
+    from models.simulador import SimuladorBanco
+
+    if tasas is None:
+        tasas = tasas_cerca_de_saturacion(n_ventanillas)
+    semillas = secuencia(semilla)
+    resultados = []
+    for tasa in tasas:
+        for etiqueta, nombre, parametros in politicas:
+            acumulado = {'rendimiento': 0.0, 'espera_promedio': 0.0, 'p95_prioritarios': 0.0,
+                         'p95_normales': 0.0, 'descanso_por_hora': 0.0, 'en_fila': 0.0}
+            for r in range(replicas):
+                simulador = SimuladorBanco(n_ventanillas, tasa_llegada=tasa,
+                                           semilla=semillas.hija("replica", r), calentamiento=duracion * 0.1,
+                                           politica_descanso=crear_politica(nombre, **parametros))
+                resultado = simulador.ejecutar(duracion)
+                for clave in acumulado:
+                    acumulado[clave] += resultado[clave] / replicas
+            resultados.append(dict(acumulado, politica=etiqueta, tasa=tasa))
+    return resultados
@@ -0,0 +1,149 @@
+"""
+Optimizador de dotación: mínimo de ventanillas por hora que cumple un SLA de espera
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from models.analitico import estimar_colas, momentos_servicio
+from models.simulador import SimuladorBanco
+from utils.aleatorio import secuencia
+from utils.config import TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX, TIEMPO_DESCANSO
+
+# SLA por defecto: p95 de espera en segundos por clase
+SLA_POR_DEFECTO = {'p95_prioritarios': 120, 'p95_normales': 600}
+
+
+def _simular_replica(tarea):
+    """
+    Ejecuta una réplica estacionaria (función de módulo para poder usarse en procesos)
+
+    Args:
+        tarea (tuple): (ventanillas, tasa, proporción, tiempo_atencion, descanso, duración,
+            SecuenciaSemillas de la réplica, claves del SLA)
+
+    Returns:
+        dict: Resultado de cada clave del SLA
+    """
+    ventanillas, tasa, proporcion, tiempo_atencion, descanso, duracion, semilla, claves = tarea
+    sim = SimuladorBanco(n_ventanillas=ventanillas, tasa_llegada=tasa,
+                         proporcion_prioritarios=proporcion, tiempo_atencion=tiempo_atencion,
+                         tiempo_descanso=descanso, semilla=semilla, calentamiento=duracion / 4,
+                         max_log=1)
+    resultados = sim.ejecutar(duracion + duracion / 4)
+    return {clave: resultados[clave] for clave in claves}
+
+
+def _promedio(valores):
+    """Promedio ignorando NaN (réplicas sin clientes de esa clase)"""
+    validos = [v for v in valores if not math.isnan(v)]
+    return sum(validos) / len(validos) if validos else math.nan
+
+
+def _cumple(valores, sla):
+    """Verifica que cada métrica esté por debajo de su objetivo (NaN = sin clientes = cumple)"""
+    return all(not valores[clave] > objetivo for clave, objetivo in sla.items())
+
+
+def cota_analitica(tasa, sla, proporcion_prioritarios=0.25,
+                   tiempo_atencion=(TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX),
+                   tiempo_descanso=TIEMPO_DESCANSO, max_ventanillas=200):
+    """
+    Menor número de ventanillas estable y menor número que cumple el SLA según el modelo analítico
+
+    Returns:
+        tuple: (mínimo_estable, mínimo_analítico)
+    """
+    _, media_ocupacion, _ = momentos_servicio(tiempo_atencion, tiempo_descanso)
+    estable = max(1, math.floor(tasa * media_ocupacion) + 1)
+    for c in range(estable, max_ventanillas + 1):
+        estimacion = estimar_colas(c, tasa, proporcion_prioritarios, tiempo_atencion,
+                                   tiempo_descanso, cv2_llegadas=1.0)
+        if _cumple(estimacion, sla):
+            return estable, c
+    return estable, max_ventanillas
+
+
+def planificar_dotacion(perfil_horario, sla=None, proporcion_prioritarios=0.25,
+                        tiempo_atencion=(TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX),
+                        tiempo_descanso=TIEMPO_DESCANSO, replicas=4, duracion=4 * 3600,
+                        procesos=None, semilla=0):
+    """
+    Calcula el mínimo de ventanillas por hora que cumple el SLA.
+
+    El modelo analítico da el punto de partida y descarta configuraciones
+    inestables; cada candidato se confirma con réplicas de simulación en
+    paralelo, bajando mientras se cumpla el SLA o subiendo si no se cumple.
+
+    Args:
+        perfil_horario (list): Llegadas por hora (clientes/hora) para cada hora
+        sla (dict): Objetivos, ej. {'p95_prioritarios': 120, 'p95_normales': 600}
+        proporcion_prioritarios (float): Fracción de clientes prioritarios
+        tiempo_atencion (tuple): Rango (mín, máx) del tiempo de atención en segundos
+        tiempo_descanso (int): Segundos de descanso tras cada cliente
+        replicas (int): Réplicas de simulación por candidato
+        duracion (float): Segundos simulados por réplica (tras el calentamiento)
+        procesos (int): Procesos de trabajo (por defecto, todos los núcleos)
+        semilla (int): Semilla maestra. Cada réplica recibe la secuencia hija (hora, réplica),
+            así los resultados no dependen del número de procesos ni del orden de ejecución
+            y los candidatos de una misma hora comparten números aleatorios
+
+    Returns:
+        list: Un dict por hora con 'hora', 'tasa', 'ventanillas', 'analitico' y 'p95'
+    """
+    sla = dict(sla or SLA_POR_DEFECTO)
+    semillas = secuencia(semilla)
+    estado = []
+    for hora, llegadas in enumerate(perfil_horario):
+        tasa = llegadas / 3600
+        if tasa <= 0:
+            estado.append({'hora': hora, 'tasa': 0.0, 'ventanillas': 0, 'analitico': 0,
+                           'p95': None, 'minimo': 0, 'candidato': None, 'aprobado': None})
+            continue
+        minimo, analitico = cota_analitica(tasa, sla, proporcion_prioritarios,
+                                           tiempo_atencion, tiempo_descanso)
+        estado.append({'hora': hora, 'tasa': tasa, 'ventanillas': None, 'analitico': analitico,
+                       'p95': None, 'minimo': minimo, 'candidato': analitico, 'aprobado': None})
+
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as ejecutor:
+        while True:
+            pendientes = [h for h in estado if h['candidato'] is not None]
+            if not pendientes:
+                break
+
+            # Todas las réplicas de todas las horas pendientes se lanzan juntas
+            tareas = [(h['candidato'], h['tasa'], proporcion_prioritarios, tuple(tiempo_atencion),
+                       tiempo_descanso, duracion, semillas.hija("hora", h['hora'], "replica", r), tuple(sla))
+                      for h in pendientes for r in range(replicas)]
+            resultados = list(ejecutor.map(_simular_replica, tareas, chunksize=1))
+
+            for i, h in enumerate(pendientes):
+                lote = resultados[i * replicas:(i + 1) * replicas]
+                p95 = {clave: _promedio([r[clave] for r in lote]) for clave in sla}
+                _avanzar_busqueda(h, p95, sla)
+
+    return [{clave: h[clave] for clave in ('hora', 'tasa', 'ventanillas', 'analitico', 'p95')}
+            for h in estado]
+
+
+def _avanzar_busqueda(hora, p95, sla):
+    """Actualiza la búsqueda de una hora con el resultado simulado del candidato"""
+    c = hora['candidato']
+    if _cumple(p95, sla):
+        hora['aprobado'] = c
+        hora['p95'] = p95
+        # Probar una ventanilla menos si sigue siendo estable y no se ha rechazado
+        if c - 1 >= hora['minimo'] and hora.get('rechazado') != c - 1:
+            hora['candidato'] = c - 1
+            return
+        hora['ventanillas'] = c
+        hora['candidato'] = None
+    else:
+        hora['rechazado'] = c
+        if hora['aprobado'] is not None:
+            # Ya hay un candidato aprobado justo por encima
+            hora['ventanillas'] = hora['aprobado']
+            hora['candidato'] = None
+        else:
+            hora['candidato'] = c + 1
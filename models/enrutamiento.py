@@ -0,0 +1,308 @@
+"""
+Topología de varias filas: una fila por ventanilla o por grupo de transacciones,
+con políticas de enrutamiento y robo de trabajo entre filas
+"""
+
+import heapq
+from collections import deque
+
+from models.persona import Persona
+from utils.aleatorio import secuencia
+from utils.config import GRUPOS_TRANSACCION
+
+TOPOLOGIAS = ("ventanilla", "transaccion")
+POLITICAS = ("jsq", "jsew", "dos_opciones")
+
+
+class _Fila:
+    """Fila individual con prioritarios adelante y las ventanillas que la atienden"""
+
+    def __init__(self, indice, nombre, transacciones):
+        self.indice = indice
+        self.nombre = nombre
+        self.transacciones = transacciones  # Las que recibe (para estimar su atención media)
+        self.prioritarios = deque()
+        self.normales = deque()
+        self.ventanillas = []
+        self.en_servicio = 0
+        self.ocupado_hasta = 0.0  # Instante estimado en que su ventanilla queda libre
+        self.version = 0
+
+    def esperando(self):
+        return len(self.prioritarios) + len(self.normales)
+
+    def en_sistema(self):
+        return self.esperando() + self.en_servicio
+
+    def tomar(self):
+        if self.prioritarios:
+            return self.prioritarios.popleft()
+        if self.normales:
+            return self.normales.popleft()
+        return None
+
+
+class EnrutadorFilas:
+    """
+    Reparte a los clientes que llegan entre varias filas y decide de qué fila
+    toma cada ventanilla que se libera.
+
+    Políticas (solo con una fila por ventanilla; con filas por transacción el
+    cliente va a la fila de su grupo):
+      - "jsq": fila con menos clientes en el sistema (en O(1) con cubetas por largo)
+      - "jsew": fila con menor espera estimada (en O(log n) con un montículo
+        de invalidación perezosa)
+      - "dos_opciones": la mejor de dos filas al azar según la espera estimada (O(1))
+
+    Con `robo=True` una ventanilla cuya fila está vacía atiende al primero de
+    la fila con más clientes esperando.
+    """
+
+    def __init__(self, banco, topologia="ventanilla", politica="jsew", robo=False, rng=None):
+        """
+        Inicializa el enrutador
+
+        Args:
+            banco (Banco): Banco cuyas ventanillas atienden las filas
+            topologia (str): "ventanilla" o "transaccion"
+            politica (str): "jsq", "jsew" o "dos_opciones"
+            robo (bool): Si las ventanillas ociosas toman clientes de otras filas
+            rng (random.Random): Generador para "dos_opciones" (de SecuenciaSemillas)
+        """
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"Topología desconocida: {topologia} (opciones: {', '.join(TOPOLOGIAS)})")
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconocida: {politica} (opciones: {', '.join(POLITICAS)})")
+        if rng is None:
+            raise ValueError("El enrutador necesita un generador de SecuenciaSemillas (rng)")
+        self.banco = banco
+        self.topologia = topologia
+        self.politica = politica
+        self.robo = robo
+        self.rng = rng
+
+        if topologia == "ventanilla":
+            self.filas = [_Fila(i, f"Ventanilla {v.id}", Persona.TRANSACCIONES)
+                          for i, v in enumerate(banco.ventanillas)]
+            for fila, ventanilla in zip(self.filas, banco.ventanillas):
+                fila.ventanillas.append(ventanilla)
+            self._grupo_de = {}
+        else:
+            grupos = list(GRUPOS_TRANSACCION)
+            if len(banco.ventanillas) < len(grupos):
+                raise ValueError(f"Se necesitan al menos {len(grupos)} ventanillas para filas por transacción")
+            self.filas = [_Fila(i, grupo, GRUPOS_TRANSACCION[grupo]) for i, grupo in enumerate(grupos)]
+            for i, ventanilla in enumerate(banco.ventanillas):
+                self.filas[i % len(grupos)].ventanillas.append(ventanilla)
+            self._grupo_de = {t: i for i, grupo in enumerate(grupos) for t in GRUPOS_TRANSACCION[grupo]}
+
+        self._fila_de_ventanilla = {v.id: fila for fila in self.filas for v in fila.ventanillas}
+        self.reiniciar()
+
+    # ------------------------------------------------------------------
+    # Estado auxiliar de las políticas
+    # ------------------------------------------------------------------
+    def reiniciar(self):
+        """Vacía todas las filas (ej. al reiniciar el sistema)"""
+        for fila in self.filas:
+            fila.prioritarios.clear()
+            fila.normales.clear()
+            fila.en_servicio = 0
+            fila.ocupado_hasta = 0.0
+            fila.version = 0
+        # jsq: cubetas largo -> filas con ese largo, y el largo mínimo ocupado
+        self._cubetas = {0: set(range(len(self.filas)))}
+        self._largo_min = 0
+        # jsew: (espera estimada absoluta, versión, índice)
+        self._monticulo = [(0.0, 0, i) for i in range(len(self.filas))]
+        heapq.heapify(self._monticulo)
+
+    def _ocupacion_media(self, fila):
+        """
+        Segundos que la fila tarda en despachar a cada cliente en espera: la
+        atención media de sus transacciones repartida entre la velocidad total
+        de sus ventanillas, más el descanso repartido entre ellas
+        """
+        media = sum(self.banco.media_atencion(t) for t in fila.transacciones) / len(fila.transacciones)
+        velocidad = sum(v.velocidad for v in fila.ventanillas)
+        return media / velocidad + self.banco.tiempo_descanso / len(fila.ventanillas)
+
+    def _espera_estimada(self, fila):
+        """
+        Instante absoluto estimado en que un cliente nuevo empezaría a ser
+        atendido. Un ocupado_hasta ya pasado (atención más larga que la media)
+        cuenta como ahora: la ventanilla no puede liberarse en el pasado.
+        """
+        inicio = max(fila.ocupado_hasta, self.banco.reloj())
+        return inicio + fila.esperando() * self._ocupacion_media(fila)
+
+    def _cambio(self, fila, delta_sistema=0):
+        """Actualiza las estructuras de las políticas tras un cambio en una fila"""
+        if delta_sistema:
+            largo = fila.en_sistema()
+            anterior = largo - delta_sistema
+            cubeta = self._cubetas[anterior]
+            cubeta.discard(fila.indice)
+            if not cubeta and anterior != 0:
+                del self._cubetas[anterior]
+            self._cubetas.setdefault(largo, set()).add(fila.indice)
+            if largo < self._largo_min:
+                self._largo_min = largo
+            # El mínimo solo se mueve de a una unidad
+            while not self._cubetas.get(self._largo_min):
+                self._largo_min += 1
+
+        if self.politica == "jsew":
+            fila.version += 1
+            heapq.heappush(self._monticulo, (self._espera_estimada(fila), fila.version, fila.indice))
+            if len(self._monticulo) > 4 * len(self.filas) + 16:
+                self._monticulo = [(self._espera_estimada(f), f.version, f.indice) for f in self.filas]
+                heapq.heapify(self._monticulo)
+
+    # ------------------------------------------------------------------
+    # Llegadas
+    # ------------------------------------------------------------------
+    def _elegir_fila(self, persona):
+        """Aplica la política de enrutamiento"""
+        if self.topologia == "transaccion":
+            return self.filas[self._grupo_de.get(persona.transaccion, 0)]
+        if self.politica == "jsq":
+            return self.filas[next(iter(self._cubetas[self._largo_min]))]
+        if self.politica == "jsew":
+            monticulo = self._monticulo
+            while True:
+                estimada, version, indice = monticulo[0]
+                fila = self.filas[indice]
+                if version != fila.version:
+                    heapq.heappop(monticulo)
+                    continue
+                # La estimación guardada pudo quedar vieja si su ocupado_hasta ya pasó
+                actual = self._espera_estimada(fila)
+                if actual <= estimada:
+                    return fila
+                fila.version += 1
+                heapq.heapreplace(monticulo, (actual, fila.version, indice))
+        a, b = self.rng.sample(self.filas, 2) if len(self.filas) > 1 else (self.filas[0],) * 2
+        return min(a, b, key=self._espera_estimada)
+
+    def encolar(self, persona):
+        """
+        Envía un cliente que acaba de llegar a una de las filas
+
+        Returns:
+            str: Nombre de la fila elegida
+        """
+        fila = self._elegir_fila(persona)
+        (fila.prioritarios if persona.prioridad else fila.normales).append(persona)
+        persona.fila_asignada = fila.indice
+        self._cambio(fila, +1)
+        return fila.nombre
+
+    def retirar(self, persona):
+        """Quita de su fila a un cliente que no será atendido"""
+        fila = self.filas[persona.fila_asignada]
+        try:
+            (fila.prioritarios if persona.prioridad else fila.normales).remove(persona)
+        except ValueError:
+            return
+        self._cambio(fila, -1)
+
+    # ------------------------------------------------------------------
+    # Ventanillas
+    # ------------------------------------------------------------------
+    def siguiente_para(self, ventanilla):
+        """
+        Saca el cliente que atenderá una ventanilla libre
+
+        Returns:
+            tuple: (Persona o None, True si fue robado de otra fila)
+        """
+        propia = self._fila_de_ventanilla[ventanilla.id]
+        origen = propia
+        cliente = propia.tomar()
+        if cliente is None and self.robo:
+            # Búsqueda lineal: solo ocurre con ventanillas ociosas y hay pocas filas
+            origen = max(self.filas, key=_Fila.esperando)
+            cliente = origen.tomar()
+        if cliente is None:
+            return None, False
+
+        robado = origen is not propia
+        if robado:
+            # El cliente pasa a contar en la fila de la ventanilla que lo atiende
+            self._cambio(origen, -1)
+        cliente.fila_asignada = propia.indice
+        propia.en_servicio += 1
+        propia.ocupado_hasta = (self.banco.reloj() + self.banco.tiempo_descanso +
+                                self.banco.media_atencion(cliente.transaccion) / ventanilla.velocidad)
+        self._cambio(propia, +1 if robado else 0)
+        return cliente, robado
+
+    def fin_atencion(self, ventanilla):
+        """La ventanilla terminó de atender: queda solo el descanso"""
+        fila = self._fila_de_ventanilla[ventanilla.id]
+        fila.en_servicio -= 1
+        fila.ocupado_hasta = self.banco.reloj() + self.banco.tiempo_descanso
+        self._cambio(fila, -1)
+
+    def largos(self):
+        """
+        Clientes esperando en cada fila
+
+        Returns:
+            dict: nombre de la fila -> clientes esperando
+        """
+        return {fila.nombre: fila.esperando() for fila in self.filas}
+
+
+CONFIGURACIONES_COMPARADAS = (
+    ("Fila única", None, "jsew", False),
+    ("Por ventanilla JSQ", "ventanilla", "jsq", False),
+    ("Por ventanilla JSEW", "ventanilla", "jsew", False),
+    ("Por ventanilla 2 opciones", "ventanilla", "dos_opciones", False),
+    ("Por ventanilla JSEW + robo", "ventanilla", "jsew", True),
+    ("Por transacción", "transaccion", "jsew", False),
+    ("Por transacción + robo", "transaccion", "jsew", True),
+)
+
+
+def comparar_topologias(n_ventanillas=6, tasa_llegada=0.3, duracion=20000, replicas=3, semilla=0,
+                        configuraciones=CONFIGURACIONES_COMPARADAS):
+    """
+    Simula la misma carga con cada topología y compara las colas de la espera
+
+    Args:
+        n_ventanillas (int): Número de ventanillas
+        tasa_llegada (float): Clientes por segundo
+        duracion (float): Segundos simulados por réplica
+        replicas (int): Réplicas con semillas distintas (compartidas entre configuraciones)
+        semilla (int): Semilla maestra
+        configuraciones (tuple): (nombre, topologia, politica, robo) a comparar
+
+    Returns:
+        list: Un dict por configuración con espera media, p95, p99 y máxima
+    """
+    # Importación local: simulador -> banco -> enrutamiento
+    from models.simulador import SimuladorBanco, percentil
+
+    semillas = secuencia(semilla)
+    resultados = []
+    for nombre, topologia, politica, robo in configuraciones:
+        esperas = []
+        for replica in range(replicas):
+            simulador = SimuladorBanco(n_ventanillas, tasa_llegada=tasa_llegada,
+                                       semilla=semillas.hija("replica", replica),
+                                       calentamiento=duracion * 0.1, topologia=topologia,
+                                       politica=politica, robo=robo)
+            simulador.ejecutar(duracion)
+            esperas.extend(simulador.esperas[True])
+            esperas.extend(simulador.esperas[False])
+        resultados.append({
+            'configuracion': nombre,
+            'atendidos': len(esperas),
+            'espera_media': sum(esperas) / len(esperas) if esperas else 0.0,
+            'p95': percentil(esperas, 95),
+            'p99': percentil(esperas, 99),
+            'maxima': max(esperas, default=0.0)
+        })
+    return resultados
@@ -0,0 +1,452 @@
+"""
+Escenarios declarativos en archivos JSON o TOML: se validan al cargarlos y se
+compilan en una secuencia precalculada de llegadas, guardada en caché según
+la huella del archivo y la semilla
+"""
+
+import hashlib
+import json
+import os
+import sys
+from array import array
+from collections import OrderedDict
+
+try:
+    import tomllib
+except ImportError:  # tomllib llegó en Python 3.11; sin él solo se leen escenarios JSON
+    tomllib = None
+
+from models.cargas import (LlegadasUniformes, LlegadasPoisson, LlegadasPoissonNoHomogeneo, LlegadasTraza,
+                           combinar_cargas)
+from models.descansos import POLITICAS_DESCANSO, crear_politica
+from models.persona import Persona
+from models.servicio import CatalogoServicio, crear_modelo
+from utils.aleatorio import secuencia
+from utils.config import (NUM_VENTANILLAS, TIEMPO_ENTRE_CLIENTES_MIN, TIEMPO_ENTRE_CLIENTES_MAX,
+                          TIEMPOS_TRANSACCION, POLITICA_DESCANSO, PARAMETROS_DESCANSO,
+                          DIRECTORIO_ESCENARIOS, CACHE_ESCENARIOS, MAX_CACHE_ESCENARIOS,
+                          DURACION_ESCENARIO)
+
+EXTENSIONES = (".toml", ".json")
+VERSION_COMPILADO = 1
+
+# Cliente de la fila inicial -> prioridad (None = se sortea al compilar)
+CLIENTES_INICIALES = {"normal": False, "prioritario": True, "aleatorio": None}
+TIPOS_LLEGADA = ("uniforme", "poisson", "horaria", "traza", "ninguna")
+CLAVES = {"nombre", "titulo", "descripcion", "boton", "color", "ventanillas", "duracion", "semilla",
+          "fila_inicial", "llegadas", "servicio", "descanso"}
+CLAVES_LLEGADAS = {"tipo", "proporcion_prioritarios", "retraso", "intervalo", "tasa", "tasas_horarias",
+                   "repetir", "trazas"}
+
+# Cargas ya compiladas en este proceso: clave -> CargaCompilada
+_COMPILADAS = OrderedDict()
+_MAX_COMPILADAS = 16
+
+
+class CargaCompilada:
+    """
+    Llegadas precalculadas en columnas (tiempo, prioridad, índice de
+    transacción). Se recorre como cualquier carga de models/cargas.py y
+    puede recorrerse varias veces.
+    """
+
+    def __init__(self, tiempos, prioridades, indices, transacciones):
+        """
+        Args:
+            tiempos (array): Segundos desde el inicio ('d')
+            prioridades (array): 1 prioritario, 0 normal ('b')
+            indices (array): Índice en `transacciones` ('h')
+            transacciones (list): Nombres de transacción
+        """
+        self.tiempos = tiempos
+        self.prioridades = prioridades
+        self.indices = indices
+        self.transacciones = transacciones
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def __iter__(self):
+        transacciones = self.transacciones
+        for t, prioridad, indice in zip(self.tiempos, self.prioridades, self.indices):
+            yield t, prioridad == 1, transacciones[indice]
+
+    def guardar(self, ruta):
+        """Escribe la carga en un archivo binario (cabecera JSON + columnas)"""
+        cabecera = json.dumps({'version': VERSION_COMPILADO, 'n': len(self), 'orden': sys.byteorder,
+                               'transacciones': self.transacciones}).encode("utf-8")
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(cabecera + b"\n")
+            self.tiempos.tofile(f)
+            self.prioridades.tofile(f)
+            self.indices.tofile(f)
+        # Reemplazo atómico: otro proceso nunca ve un archivo a medio escribir
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Lee una carga escrita con guardar()
+
+        Returns:
+            CargaCompilada: La carga, o None si el archivo no existe o es de otra versión
+        """
+        try:
+            with open(ruta, "rb") as f:
+                cabecera = json.loads(f.readline())
+                if cabecera.get('version') != VERSION_COMPILADO or cabecera.get('orden') != sys.byteorder:
+                    return None
+                columnas = []
+                for codigo in ("d", "b", "h"):
+                    columna = array(codigo)
+                    columna.fromfile(f, cabecera['n'])
+                    columnas.append(columna)
+        except (OSError, ValueError, EOFError):
+            return None
+        return cls(*columnas, cabecera['transacciones'])
+
+
+class Escenario:
+    """
+    Escenario validado: ventanillas, fila inicial, proceso de llegadas,
+    mezcla de prioridades, modelo de servicio, política de descanso y duración
+    """
+
+    def __init__(self, datos, ruta=None, huella=None):
+        """
+        Valida los datos de un escenario
+
+        Args:
+            datos (dict): Contenido del archivo
+            ruta (str): Archivo de origen (para los mensajes de error)
+            huella (str): SHA-256 del archivo y de sus trazas
+
+        Raises:
+            ValueError: Si el escenario no es válido
+        """
+        self.ruta = ruta
+        self.huella = huella
+        origen = ruta or "escenario"
+        desconocidas = set(datos) - CLAVES
+        if desconocidas:
+            raise ValueError(f"{origen}: claves desconocidas: {', '.join(sorted(desconocidas))}")
+
+        nombre_archivo = os.path.splitext(os.path.basename(ruta))[0] if ruta else None
+        self.nombre = _texto(datos.get("nombre", nombre_archivo), "nombre", origen)
+        self.titulo = _texto(datos.get("titulo", self.nombre), "titulo", origen)
+        self.boton = _texto(datos.get("boton", f"🎭 {self.titulo}"), "boton", origen)
+        self.color = _texto(datos.get("color", "#9b59b6"), "color", origen)
+        self.descripcion = [_texto(linea, "descripcion", origen) for linea in datos.get("descripcion", [])]
+        self.ventanillas = _numero(datos.get("ventanillas", NUM_VENTANILLAS), "ventanillas", origen,
+                                   minimo=1, entero=True)
+        self.duracion = _numero(datos.get("duracion", DURACION_ESCENARIO), "duracion", origen, minimo=0)
+        self.semilla = datos.get("semilla")
+        if self.semilla is not None:
+            self.semilla = _numero(self.semilla, "semilla", origen, minimo=0, entero=True)
+
+        self.fila_inicial = []
+        for cliente in datos.get("fila_inicial", []):
+            if cliente not in CLIENTES_INICIALES:
+                raise ValueError(f"{origen}: fila_inicial admite {', '.join(CLIENTES_INICIALES)} (no {cliente!r})")
+            self.fila_inicial.append(CLIENTES_INICIALES[cliente])
+
+        self.llegadas = self._validar_llegadas(dict(datos.get("llegadas", {})), origen)
+
+        self.servicio = dict(datos.get("servicio", {}))
+        for transaccion, especificacion in self.servicio.items():
+            if transaccion not in Persona.TRANSACCIONES:
+                raise ValueError(f"{origen}: transacción desconocida en servicio: {transaccion}")
+            try:
+                crear_modelo(especificacion)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{origen}: servicio de {transaccion!r} inválido: {e}") from None
+
+        if "descanso" in datos:
+            self.parametros_descanso = dict(datos["descanso"])
+            self.politica = self.parametros_descanso.pop("politica", "fijo")
+        else:
+            self.politica, self.parametros_descanso = POLITICA_DESCANSO, dict(PARAMETROS_DESCANSO)
+        if self.politica not in POLITICAS_DESCANSO:
+            raise ValueError(f"{origen}: política de descanso desconocida: {self.politica} "
+                             f"(opciones: {', '.join(POLITICAS_DESCANSO)})")
+        try:
+            self.politica_descanso()
+        except TypeError as e:
+            raise ValueError(f"{origen}: parámetros de descanso inválidos: {e}") from None
+
+    @staticmethod
+    def _validar_llegadas(llegadas, origen):
+        """Completa y valida la sección [llegadas]"""
+        desconocidas = set(llegadas) - CLAVES_LLEGADAS
+        if desconocidas:
+            raise ValueError(f"{origen}: claves desconocidas en llegadas: {', '.join(sorted(desconocidas))}")
+        tipo = llegadas.setdefault("tipo", "uniforme")
+        if tipo not in TIPOS_LLEGADA:
+            raise ValueError(f"{origen}: tipo de llegadas desconocido: {tipo} (opciones: {', '.join(TIPOS_LLEGADA)})")
+        llegadas["proporcion_prioritarios"] = _numero(llegadas.get("proporcion_prioritarios", 0.25),
+                                                      "proporcion_prioritarios", origen, minimo=0, maximo=1)
+        llegadas["retraso"] = _numero(llegadas.get("retraso", 0), "retraso", origen, minimo=0)
+        if tipo == "uniforme":
+            intervalo = llegadas.setdefault("intervalo", [TIEMPO_ENTRE_CLIENTES_MIN / 1000,
+                                                          TIEMPO_ENTRE_CLIENTES_MAX / 1000])
+            if len(intervalo) != 2 or not 0 < _numero(intervalo[0], "intervalo", origen) <= \
+                    _numero(intervalo[1], "intervalo", origen):
+                raise ValueError(f"{origen}: intervalo debe ser [mín, máx] con 0 < mín <= máx")
+        elif tipo == "poisson":
+            _numero(llegadas.get("tasa"), "tasa", origen, minimo=0, estricto=True)
+        elif tipo == "horaria":
+            tasas = llegadas.get("tasas_horarias")
+            if not tasas or max(_numero(t, "tasas_horarias", origen, minimo=0) for t in tasas) <= 0:
+                raise ValueError(f"{origen}: tasas_horarias necesita al menos una tasa positiva")
+        elif tipo == "traza":
+            if not llegadas.get("trazas"):
+                raise ValueError(f"{origen}: las llegadas de tipo traza necesitan la lista trazas")
+        return llegadas
+
+    # ------------------------------------------------------------------
+    # Piezas para el banco
+    # ------------------------------------------------------------------
+    def catalogo_servicio(self):
+        """Catálogo de TIEMPOS_TRANSACCION con los modelos del escenario encima"""
+        return CatalogoServicio.desde_config(dict(TIEMPOS_TRANSACCION, **self.servicio))
+
+    def politica_descanso(self):
+        """Nueva instancia de la política de descanso del escenario"""
+        return crear_politica(self.politica, **self.parametros_descanso)
+
+    def parametros_simulador(self, semilla=None):
+        """
+        Argumentos de SimuladorBanco para reproducir el escenario sin interfaz
+
+        Args:
+            semilla (int | SecuenciaSemillas): Semilla maestra de la ejecución
+
+        Returns:
+            dict: n_ventanillas, carga, servicio, politica_descanso y semilla
+        """
+        semillas = secuencia(semilla)
+        return {
+            'n_ventanillas': self.ventanillas,
+            'carga': self.compilar(semillas.hija("llegadas", self.nombre)),
+            'servicio': self.catalogo_servicio(),
+            'politica_descanso': self.politica_descanso(),
+            'semilla': semillas
+        }
+
+    # ------------------------------------------------------------------
+    # Compilación
+    # ------------------------------------------------------------------
+    def compilar(self, semilla=None, cache=CACHE_ESCENARIOS):
+        """
+        Precalcula todas las llegadas del escenario: primero la fila inicial en
+        t = 0 y luego el proceso de llegadas desde `retraso` hasta `duracion`,
+        con la transacción de cada cliente ya sorteada
+
+        El resultado se guarda en memoria y en `cache` con una clave formada
+        por la huella del archivo y la semilla, así que volver a iniciar el
+        mismo escenario (en la interfaz, el simulador o en otro proceso) no
+        repite el sorteo.
+
+        Args:
+            semilla (int | SecuenciaSemillas): Semilla del escenario (si el archivo
+                define `semilla`, se usa esa)
+            cache (str): Directorio de la caché en disco (None = solo en memoria)
+
+        Returns:
+            CargaCompilada: Llegadas precalculadas
+        """
+        semillas = secuencia(self.semilla if self.semilla is not None else semilla)
+        clave = hashlib.sha256(f"{self.huella}|{semillas!r}|{VERSION_COMPILADO}".encode("utf-8")).hexdigest()
+        carga = _COMPILADAS.get(clave)
+        ruta_cache = os.path.join(cache, f"{clave}.llegadas") if cache and self.huella else None
+        if carga is None and ruta_cache:
+            carga = CargaCompilada.cargar(ruta_cache)
+        if carga is None:
+            carga = self._sortear(semillas.generador())
+            if ruta_cache:
+                os.makedirs(cache, exist_ok=True)
+                carga.guardar(ruta_cache)
+                _podar_cache(cache)
+        _COMPILADAS[clave] = carga
+        _COMPILADAS.move_to_end(clave)
+        while len(_COMPILADAS) > _MAX_COMPILADAS:
+            _COMPILADAS.popitem(last=False)
+        return carga
+
+    def _sortear(self, rng):
+        """Genera las columnas de la carga compilada"""
+        transacciones = list(Persona.TRANSACCIONES)
+        indice = {nombre: i for i, nombre in enumerate(transacciones)}
+        tiempos, prioridades, indices = array("d"), array("b"), array("h")
+
+        def agregar(t, prioridad, transaccion):
+            if transaccion is None:
+                transaccion = rng.choice(Persona.TRANSACCIONES)
+            elif transaccion not in indice:
+                indice[transaccion] = len(transacciones)
+                transacciones.append(transaccion)
+            tiempos.append(t)
+            prioridades.append(1 if prioridad else 0)
+            indices.append(indice[transaccion])
+
+        for prioridad in self.fila_inicial:
+            agregar(0.0, rng.choice([True, False]) if prioridad is None else prioridad, None)
+
+        retraso = self.llegadas["retraso"]
+        for t, prioridad, transaccion in self._fuente(rng):
+            t += retraso
+            if t > self.duracion:
+                break
+            agregar(t, prioridad, transaccion)
+        return CargaCompilada(tiempos, prioridades, indices, transacciones)
+
+    def _fuente(self, rng):
+        """Proceso de llegadas de la sección [llegadas] (con tiempos desde 0)"""
+        llegadas = self.llegadas
+        tipo, p = llegadas["tipo"], llegadas["proporcion_prioritarios"]
+        if tipo == "uniforme":
+            return LlegadasUniformes(p, tuple(llegadas["intervalo"]), rng)
+        if tipo == "poisson":
+            return LlegadasPoisson(llegadas["tasa"], p, rng)
+        if tipo == "horaria":
+            return LlegadasPoissonNoHomogeneo(llegadas["tasas_horarias"], p, rng,
+                                              llegadas.get("repetir", False))
+        if tipo == "traza":
+            return combinar_cargas(*(LlegadasTraza(_ruta_relativa(ruta, self.ruta))
+                                     for ruta in llegadas["trazas"]))
+        return iter(())
+
+    def __repr__(self):
+        return f"Escenario({self.nombre!r}, ventanillas={self.ventanillas}, llegadas={self.llegadas['tipo']!r})"
+
+
+def _texto(valor, clave, origen):
+    if not isinstance(valor, str):
+        raise ValueError(f"{origen}: {clave} debe ser texto")
+    return valor
+
+
+def _numero(valor, clave, origen, minimo=None, maximo=None, entero=False, estricto=False):
+    """Valida un número (los booleanos no cuentan como números)"""
+    if isinstance(valor, bool) or not isinstance(valor, int if entero else (int, float)):
+        raise ValueError(f"{origen}: {clave} debe ser un número{' entero' if entero else ''}")
+    if minimo is not None and (valor <= minimo if estricto else valor < minimo):
+        raise ValueError(f"{origen}: {clave} debe ser {'mayor' if estricto else 'mayor o igual'} que {minimo}")
+    if maximo is not None and valor > maximo:
+        raise ValueError(f"{origen}: {clave} debe ser menor o igual que {maximo}")
+    return valor
+
+
+def _ruta_relativa(ruta, archivo_escenario):
+    """Las trazas se buscan junto al archivo del escenario"""
+    if os.path.isabs(ruta) or not archivo_escenario:
+        return ruta
+    return os.path.join(os.path.dirname(archivo_escenario), ruta)
+
+
+def _podar_cache(cache, maximo=MAX_CACHE_ESCENARIOS):
+    """Borra las cargas compiladas más antiguas si la caché supera `maximo` archivos"""
+    archivos = [os.path.join(cache, a) for a in os.listdir(cache) if a.endswith(".llegadas")]
+    if len(archivos) <= maximo:
+        return
+    archivos.sort(key=lambda a: os.path.getmtime(a) if os.path.exists(a) else 0)
+    for archivo in archivos[:len(archivos) - maximo]:
+        try:
+            os.remove(archivo)
+        except OSError:
+            pass  # Otro proceso ya la borró
+
+
+def cargar_escenario(ruta):
+    """
+    Lee y valida un archivo de escenario .toml o .json
+
+    Args:
+        ruta (str): Archivo del escenario
+
+    Returns:
+        Escenario: Escenario validado
+
+    Raises:
+        ValueError: Si el archivo no es válido
+    """
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    if ruta.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"{ruta}: leer escenarios TOML requiere Python 3.11 o superior")
+        try:
+            datos = tomllib.loads(contenido.decode("utf-8"))
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"{ruta}: TOML inválido: {e}") from None
+    else:
+        try:
+            datos = json.loads(contenido)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{ruta}: JSON inválido: {e}") from None
+    if not isinstance(datos, dict):
+        raise ValueError(f"{ruta}: el escenario debe ser un objeto")
+
+    # La huella incluye las trazas, para que editar un CSV invalide la caché
+    huella = hashlib.sha256(contenido)
+    llegadas = datos.get("llegadas")
+    for traza in llegadas.get("trazas", []) if isinstance(llegadas, dict) else []:
+        try:
+            with open(_ruta_relativa(traza, ruta), "rb") as f:
+                for bloque in iter(lambda: f.read(1 << 20), b""):
+                    huella.update(bloque)
+        except OSError as e:
+            raise ValueError(f"{ruta}: no se puede leer la traza {traza}: {e}") from None
+    return Escenario(datos, ruta, huella.hexdigest())
+
+
+def listar_escenarios(directorio=DIRECTORIO_ESCENARIOS, errores=None):
+    """
+    Carga todos los escenarios de un directorio, ordenados por nombre de archivo
+
+    Args:
+        directorio (str): Directorio con los archivos .toml y .json
+        errores (list): Si se indica, los archivos inválidos se omiten y se
+            agrega aquí (archivo, mensaje) en lugar de lanzar la excepción
+
+    Returns:
+        list: Escenarios válidos
+
+    Raises:
+        ValueError: Si algún archivo no es válido y no se pasó `errores`
+    """
+    if not os.path.isdir(directorio):
+        return []
+    escenarios = []
+    for archivo in sorted(os.listdir(directorio)):
+        if not archivo.endswith(EXTENSIONES):
+            continue
+        try:
+            escenarios.append(cargar_escenario(os.path.join(directorio, archivo)))
+        except ValueError as e:
+            if errores is None:
+                raise
+            errores.append((archivo, str(e)))
+    return escenarios
+
+
+def buscar_escenario(nombre, directorio=DIRECTORIO_ESCENARIOS):
+    """
+    Busca un escenario por ruta de archivo o por nombre dentro de `directorio`
+    (los demás archivos inválidos del directorio no impiden encontrarlo)
+
+    Raises:
+        ValueError: Si no existe o no es válido
+    """
+    if os.path.isfile(nombre):
+        return cargar_escenario(nombre)
+    errores = []
+    for escenario in listar_escenarios(directorio, errores):
+        if escenario.nombre == nombre:
+            return escenario
+    # El escenario pedido puede ser justamente uno de los inválidos
+    for archivo, mensaje in errores:
+        if os.path.splitext(archivo)[0] == nombre:
+            raise ValueError(mensaje)
+    raise ValueError(f"Escenario desconocido: {nombre}")
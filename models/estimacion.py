@@ -0,0 +1,190 @@
+"""
+Estimación secuencial de esperas: fin del calentamiento (MSER), medias
+por lotes y parada automática al alcanzar la precisión pedida
+"""
+
+import math
+from statistics import NormalDist
+
+from utils.aleatorio import secuencia
+from utils.config import (PRECISION_RELATIVA, PRECISION_ABSOLUTA, CONFIANZA_ESTIMACION,
+                          LOTES_ESTIMACION, PASO_ESTIMACION, DURACION_MAX_ESTIMACION,
+                          REVISIONES_INESTABLE)
+
+# Argumentos de SimuladorBanco que entiende el modelo analítico
+PARAMETROS_ANALITICOS = {'n_ventanillas', 'tasa_llegada', 'proporcion_prioritarios', 'tiempo_atencion',
+                         'tiempo_descanso'}
+
+
+def mser(serie, tamano=5):
+    """
+    Punto de truncamiento MSER-m: el inicio que minimiza el error estándar
+    de la media de lo que queda, evaluado sobre medias de lotes de `tamano`
+
+    Args:
+        serie (sequence): Observaciones en orden
+        tamano (int): Observaciones por lote (MSER-5 por defecto)
+
+    Returns:
+        int: Observaciones a descartar (None si el mínimo cae en la segunda
+            mitad, es decir, todavía no hay datos suficientes)
+    """
+    k = len(serie) // tamano
+    if k < 4:
+        return None
+    medias = [sum(serie[i * tamano:(i + 1) * tamano]) / tamano for i in range(k)]
+
+    # Sumas y sumas de cuadrados de cada sufijo, de atrás hacia adelante
+    mejor, mejor_d = math.inf, 0
+    suma = suma2 = 0.0
+    estadisticos = [0.0] * k
+    for d in range(k - 1, -1, -1):
+        suma += medias[d]
+        suma2 += medias[d] * medias[d]
+        n = k - d
+        estadisticos[d] = (suma2 - suma * suma / n) / (n * n)
+    for d in range(k // 2 + 1):
+        if estadisticos[d] < mejor:
+            mejor, mejor_d = estadisticos[d], d
+    if mejor_d >= k // 2:
+        return None
+    return mejor_d * tamano
+
+
+def cuantil_t(p, grados):
+    """
+    Cuantil p de la t de Student (expansión de Cornish-Fisher sobre la normal,
+    error < 0.01 desde 5 grados de libertad)
+    """
+    z = NormalDist().inv_cdf(p)
+    g = grados
+    return (z + (z ** 3 + z) / (4 * g) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * g ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * g ** 3))
+
+
+def medias_por_lotes(serie, lotes=LOTES_ESTIMACION, confianza=CONFIANZA_ESTIMACION, minimo_lote=10):
+    """
+    Intervalo de confianza de la media con el método de medias por lotes
+
+    Args:
+        serie (sequence): Observaciones estacionarias (ya truncadas)
+        lotes (int): Número de lotes
+        confianza (float): Nivel del intervalo
+        minimo_lote (int): Observaciones mínimas por lote
+
+    Returns:
+        dict: media, semiancho, tamaño de lote y autocorrelación de orden 1
+            de las medias de los lotes (None si los lotes serían más chicos que minimo_lote)
+    """
+    tamano = len(serie) // lotes
+    if tamano < max(2, minimo_lote):
+        return None
+    medias = [sum(serie[i * tamano:(i + 1) * tamano]) / tamano for i in range(lotes)]
+    media = sum(medias) / lotes
+    desvios = [m - media for m in medias]
+    varianza = sum(d * d for d in desvios) / (lotes - 1)
+    semiancho = cuantil_t((1 + confianza) / 2, lotes - 1) * math.sqrt(varianza / lotes)
+    autocorrelacion = (sum(a * b for a, b in zip(desvios, desvios[1:])) / (varianza * (lotes - 1))
+                       if varianza > 0 else 0.0)
+    return {
+        'media': media,
+        'semiancho': semiancho,
+        'tamano_lote': tamano,
+        'autocorrelacion': autocorrelacion
+    }
+
+
+def estimar_con_precision(precision=PRECISION_RELATIVA, precision_absoluta=PRECISION_ABSOLUTA,
+                          confianza=CONFIANZA_ESTIMACION, lotes=LOTES_ESTIMACION,
+                          paso=PASO_ESTIMACION, duracion_max=DURACION_MAX_ESTIMACION,
+                          semilla=None, **parametros):
+    """
+    Simula un único Banco sin interfaz hasta que el intervalo de confianza de
+    la espera de cada clase alcanza la precisión pedida
+
+    Periódicamente se recalcula, por clase, el truncamiento MSER-5 sobre las
+    esperas en orden de atención y las medias por lotes del resto. Las
+    revisiones se espacian al menos `paso` segundos y un 10 % de lo ya
+    simulado, para que su costo total crezca como n·log n y no como n². Se
+    detiene cuando todas las clases cumplen
+    semiancho <= max(precision · media, precision_absoluta), o al llegar a
+    duracion_max.
+
+    Un sistema inestable nunca tiene fin de calentamiento: si el modelo
+    analítico da ocupación >= 1 no se simula, y si la fila crece en
+    REVISIONES_INESTABLE revisiones seguidas sin que aparezca el truncamiento
+    de alguna clase se abandona la simulación. En ambos casos el resultado
+    lleva 'inestable' = True.
+
+    Args:
+        precision (float): Semiancho relativo objetivo (0.05 = ±5 %)
+        precision_absoluta (float): Semiancho en segundos que basta aunque la
+            media sea muy chica (clases que casi no esperan)
+        confianza (float): Nivel de los intervalos
+        lotes (int): Número de lotes del método de medias por lotes
+        paso (float): Segundos simulados mínimos entre revisiones
+        duracion_max (float): Segundos simulados máximos
+        semilla (int): Semilla maestra
+        **parametros: Argumentos de SimuladorBanco (ventanillas, tasa_llegada...)
+
+    Returns:
+        dict: Por clase ('prioritarios', 'normales') el truncamiento, las
+            observaciones usadas, la media, el intervalo y el semiancho relativo;
+            además 'duracion', 'atendidos', 'convergio' e 'inestable'
+    """
+    # Importación local: simulador -> banco -> ... -> estimacion
+    from models.analitico import estimar_colas
+    from models.simulador import SimuladorBanco
+
+    clases = {'prioritarios': True, 'normales': False}
+    resultado = {'confianza': confianza, 'precision': precision}
+
+    if set(parametros) <= PARAMETROS_ANALITICOS:
+        analitico = estimar_colas(**parametros)
+        if not analitico['estable']:
+            estimaciones = {nombre: _estimar_clase([], lotes, confianza, precision, precision_absoluta)
+                            for nombre in clases}
+            return dict(estimaciones, duracion=0.0, atendidos=0, convergio=False, inestable=True,
+                        ocupacion=analitico['ocupacion'], **resultado)
+
+    parametros.setdefault('max_log', 1)
+    simulador = SimuladorBanco(semilla=secuencia(semilla), calentamiento=0.0, **parametros)
+    fila_anterior, crecimientos = 0, 0
+
+    while True:
+        simulador.ejecutar_hasta(min(simulador.ahora + max(paso, simulador.ahora / 10), duracion_max))
+        estimaciones = {}
+        for nombre, clase in clases.items():
+            estimaciones[nombre] = _estimar_clase(simulador.esperas[clase], lotes, confianza,
+                                                  precision, precision_absoluta)
+        convergio = all(e['cumple'] for e in estimaciones.values())
+
+        fila = len(simulador.banco.fila)
+        sin_truncamiento = any(e['truncamiento'] is None for e in estimaciones.values())
+        crecimientos = crecimientos + 1 if sin_truncamiento and fila > fila_anterior else 0
+        fila_anterior = fila
+        inestable = crecimientos >= REVISIONES_INESTABLE
+        if convergio or inestable or simulador.ahora >= duracion_max:
+            break
+
+    return dict(estimaciones, duracion=simulador.ahora, atendidos=simulador.atendidos,
+                convergio=convergio, inestable=inestable, **resultado)
+
+
+def _estimar_clase(esperas, lotes, confianza, precision, precision_absoluta):
+    """Truncamiento, intervalo y cumplimiento de la precisión para una clase"""
+    truncamiento = mser(esperas)
+    estimacion = {'truncamiento': truncamiento, 'observaciones': len(esperas), 'media': math.nan,
+                  'ic': (math.nan, math.nan), 'semiancho_relativo': math.nan, 'cumple': False}
+    if truncamiento is None:
+        return estimacion
+    lote = medias_por_lotes(esperas[truncamiento:], lotes, confianza)
+    if lote is None:
+        return estimacion
+    media, semiancho = lote['media'], lote['semiancho']
+    estimacion.update(observaciones=len(esperas) - truncamiento, media=media,
+                      ic=(media - semiancho, media + semiancho),
+                      semiancho_relativo=semiancho / media if media > 0 else math.inf,
+                      tamano_lote=lote['tamano_lote'], autocorrelacion=lote['autocorrelacion'],
+                      cumple=semiancho <= max(precision * abs(media), precision_absoluta))
+    return estimacion
@@ -0,0 +1,210 @@
+"""
+Fila virtual: los clientes sacan un turno, esperan fuera de la sucursal y se
+les avisa cuando su inicio de atención estimado está cerca
+"""
+
+import heapq
+import itertools
+from collections import deque
+from itertools import chain
+
+from utils.config import (ANTICIPACION_AVISO, PROB_AUSENCIA, TOLERANCIA_AUSENCIA,
+                          RETRASO_PRESENTACION)
+
+
+class FilaVirtual:
+    """
+    Turnos remotos delante de la fila física del banco.
+
+    La previsión de inicio de cada turno se obtiene repartiendo, en orden de
+    atención, a los clientes de la fila física, a los que ya van en camino y
+    a los turnos remotos sobre un montículo con el instante en que cada
+    ventanilla queda libre. Solo se recorre la cabeza de la fila hasta el
+    primer turno que aún no debe avisarse, de modo que cada actualización
+    cuesta O((fila física + avisados) · log ventanillas) sin importar cuántos
+    turnos remotos haya.
+
+    El anfitrión (simulador o interfaz) aporta `programar(segundos, callback, *args)`
+    para las revisiones futuras, las presentaciones y las ausencias.
+    """
+
+    def __init__(self, banco, programar, avisar=None, anticipacion=ANTICIPACION_AVISO,
+                 prob_ausencia=PROB_AUSENCIA, tolerancia_ausencia=TOLERANCIA_AUSENCIA,
+                 retraso_presentacion=RETRASO_PRESENTACION, rng=None):
+        """
+        Inicializa la fila virtual
+
+        Args:
+            banco (Banco): Banco con la fila física y las ventanillas
+            programar (callable): programar(segundos, callback, *args) del anfitrión
+            avisar (callable): avisar(persona, inicio_estimado, ventanilla_id) al notificar
+            anticipacion (float): Segundos de anticipación del aviso
+            prob_ausencia (float): Probabilidad de que un cliente avisado no se presente
+            tolerancia_ausencia (float): Segundos que se espera a un avisado antes de darlo por ausente
+            retraso_presentacion (tuple): Rango (mín, máx) de segundos hasta presentarse
+            rng (random.Random): Generador para presentaciones y ausencias (obligatorio)
+        """
+        if rng is None:
+            raise ValueError("La fila virtual necesita un generador de SecuenciaSemillas (rng)")
+        self.banco = banco
+        self.programar = programar
+        self.avisar = avisar
+        self.anticipacion = anticipacion
+        self.prob_ausencia = prob_ausencia
+        self.tolerancia_ausencia = tolerancia_ausencia
+        self.retraso_presentacion = retraso_presentacion
+        self.rng = rng
+        self._tickets = itertools.count(1)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta turnos y estadísticas (ej. al reiniciar el sistema)"""
+        self.prioritarios = deque()
+        self.normales = deque()
+        self.en_camino = {}
+        self._revision_en = None
+        self.emitidos = 0
+        self.avisados = 0
+        self.presentados = 0
+        self.ausentes = 0
+        self.espera_remota_total = 0.0
+        self.fila_fisica_max = 0
+
+    def __len__(self):
+        return len(self.prioritarios) + len(self.normales)
+
+    # ------------------------------------------------------------------
+    # Turnos
+    # ------------------------------------------------------------------
+    def emitir_ticket(self, persona):
+        """
+        Entrega un turno remoto a un cliente que acaba de llegar
+
+        Returns:
+            int: Número de turno
+        """
+        persona.ticket = next(self._tickets)
+        persona.tiempo_ticket = self.banco.reloj()
+        persona.estado = "en_espera_remota"
+        (self.prioritarios if persona.prioridad else self.normales).append(persona)
+        self.emitidos += 1
+        self.actualizar()
+        return persona.ticket
+
+    def _ocupacion(self, persona):
+        """Segundos que el cliente ocupará una ventanilla (atención media + descanso)"""
+        return self.banco.media_atencion(persona.transaccion) + self.banco.tiempo_descanso
+
+    def _estimar(self, ahora):
+        """
+        Recorre los turnos remotos en orden de atención con su inicio estimado
+
+        Yields:
+            tuple: (persona, inicio_estimado, ventanilla_id)
+        """
+        monticulo = [(ahora if v.esta_libre() else max(v.libre_estimado, ahora), v.id)
+                     for v in self.banco.ventanillas]
+        if not monticulo:
+            return
+        heapq.heapify(monticulo)
+        # Los clientes en la sucursal y los que vienen en camino se atienden antes
+        for persona in chain(self.banco.fila, self.en_camino.values()):
+            t, vid = monticulo[0]
+            heapq.heapreplace(monticulo, (t + self._ocupacion(persona), vid))
+        for persona in chain(self.prioritarios, self.normales):
+            t, vid = monticulo[0]
+            yield persona, t, vid
+            heapq.heapreplace(monticulo, (t + self._ocupacion(persona), vid))
+
+    def previsiones(self, limite=10):
+        """
+        Inicio estimado de los primeros turnos remotos
+
+        Returns:
+            list: (persona, inicio_estimado, ventanilla_id) en orden de atención
+        """
+        return list(itertools.islice(self._estimar(self.banco.reloj()), limite))
+
+    def actualizar(self):
+        """Avisa a los turnos cuyo inicio estimado entra en la anticipación y programa la próxima revisión"""
+        ahora = self.banco.reloj()
+        horizonte = ahora + self.anticipacion
+        avisar = []
+        for persona, inicio, ventanilla_id in self._estimar(ahora):
+            if inicio > horizonte:
+                self._programar_revision(inicio - self.anticipacion, ahora)
+                break
+            avisar.append((persona, inicio, ventanilla_id))
+        # Se avisa después del recorrido para no modificar las colas mientras se iteran
+        for persona, inicio, ventanilla_id in avisar:
+            self._avisar(persona, inicio, ventanilla_id, ahora)
+
+    def _programar_revision(self, instante, ahora):
+        """Programa una revisión, salvo que ya haya una igual o anterior pendiente"""
+        if self._revision_en is not None and self._revision_en <= instante:
+            return
+        self._revision_en = instante
+        self.programar(max(0.0, instante - ahora), self._revisar, instante)
+
+    def _revisar(self, instante):
+        if self._revision_en != instante:
+            return  # Reemplazada por una revisión anterior
+        self._revision_en = None
+        self.actualizar()
+
+    # ------------------------------------------------------------------
+    # Avisos, presentaciones y ausencias
+    # ------------------------------------------------------------------
+    def _avisar(self, persona, inicio, ventanilla_id, ahora):
+        """Pasa un turno remoto a 'en camino' y decide si se presentará"""
+        (self.prioritarios if persona.prioridad else self.normales).popleft()
+        self.en_camino[persona.ticket] = persona
+        persona.estado = "avisado"
+        self.avisados += 1
+        self.espera_remota_total += ahora - persona.tiempo_ticket
+        self.banco.log.append(f"[VIRTUAL] 📲 Turno {persona.ticket} avisado: inicio estimado en "
+                              f"{max(0, inicio - ahora):.0f}s (Ventanilla {ventanilla_id} aprox.)")
+        if self.avisar:
+            self.avisar(persona, inicio, ventanilla_id)
+
+        if self.rng.random() < self.prob_ausencia:
+            self.programar(self.tolerancia_ausencia, self._ausencia, persona)
+        else:
+            self.programar(self.rng.uniform(*self.retraso_presentacion), self._presentarse, persona)
+
+    def _presentarse(self, persona):
+        """El cliente avisado llega a la sucursal y pasa a la fila física"""
+        if self.en_camino.pop(persona.ticket, None) is None:
+            return
+        self.presentados += 1
+        self.banco.agregar_persona(persona)
+        self.fila_fisica_max = max(self.fila_fisica_max, len(self.banco.fila))
+        self.actualizar()
+
+    def _ausencia(self, persona):
+        """El cliente avisado no se presentó dentro de la tolerancia"""
+        if self.en_camino.pop(persona.ticket, None) is None:
+            return
+        persona.estado = "ausente"
+        self.ausentes += 1
+        if self.banco.registro is not None:
+            self.banco.registro.registrar(persona)
+        self.banco.log.append(f"[VIRTUAL] 🚫 Turno {persona.ticket} no se presentó")
+        self.actualizar()
+
+    def estadisticas(self):
+        """
+        Resumen de la fila virtual
+
+        Returns:
+            dict: Turnos emitidos, en espera, en camino, presentados, ausentes y espera remota media
+        """
+        return {
+            'emitidos': self.emitidos,
+            'en_espera': len(self),
+            'en_camino': len(self.en_camino),
+            'presentados': self.presentados,
+            'ausentes': self.ausentes,
+            'espera_remota_media': self.espera_remota_total / self.avisados if self.avisados else 0.0,
+            'fila_fisica_max': self.fila_fisica_max
+        }
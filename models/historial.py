@@ -0,0 +1,296 @@
+"""
+Historial de ejecuciones en SQLite: metadatos, métricas resumen y, opcionalmente,
+una fila por cliente
+"""
+
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+
+from models.registro_clientes import _tiempo
+from utils.config import RUTA_HISTORIAL, LOTE_HISTORIAL, CAPACIDAD_HISTORIAL, ESPERA_HISTORIAL
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    id INTEGER PRIMARY KEY,
+    inicio TEXT NOT NULL,
+    fin TEXT,
+    escenario TEXT,
+    ventanillas INTEGER,
+    semilla TEXT,
+    politica TEXT,
+    parametros TEXT
+);
+CREATE TABLE IF NOT EXISTS metricas (
+    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id),
+    nombre TEXT NOT NULL,
+    valor REAL,
+    PRIMARY KEY (ejecucion_id, nombre)
+);
+CREATE TABLE IF NOT EXISTS clientes (
+    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id),
+    id INTEGER,
+    prioridad INTEGER,
+    transaccion TEXT,
+    ventanilla INTEGER,
+    llegada REAL,
+    inicio_atencion REAL,
+    fin_atencion REAL
+);
+CREATE INDEX IF NOT EXISTS idx_ejecuciones_escenario_inicio ON ejecuciones (escenario, inicio);
+CREATE INDEX IF NOT EXISTS idx_ejecuciones_inicio ON ejecuciones (inicio);
+CREATE INDEX IF NOT EXISTS idx_clientes_ejecucion ON clientes (ejecucion_id);
+"""
+
+_FIN = object()
+
+
+def _ahora_iso():
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class HistorialEjecuciones:
+    """
+    Base SQLite con las ejecuciones pasadas.
+
+    Todas las escrituras pasan por una cola hacia un único hilo escritor que
+    es dueño de la conexión: los clientes llegan en lotes y cada lote se
+    inserta con un `executemany` dentro de una transacción. La base usa WAL,
+    de modo que las consultas (con su propia conexión) no bloquean al escritor.
+    """
+
+    def __init__(self, ruta=RUTA_HISTORIAL, capacidad=CAPACIDAD_HISTORIAL):
+        """
+        Abre (o crea) la base e inicia el hilo escritor
+
+        Args:
+            ruta (str): Archivo SQLite
+            capacidad (int): Lotes pendientes máximos; si se llena, quien escribe
+                espera (se prefiere frenar a perder registros o agotar la memoria)
+        """
+        self.ruta = ruta
+        self._cola = queue.Queue(maxsize=capacidad)
+        self.filas_escritas = 0
+        self.error = None
+
+        conexion = self._conectar()
+        conexion.executescript(ESQUEMA)
+        conexion.close()
+
+        self._hilo = threading.Thread(target=self._escribir, daemon=True)
+        self._hilo.start()
+
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        return conexion
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def iniciar_ejecucion(self, escenario=None, ventanillas=None, semilla=None, politica=None,
+                          **parametros):
+        """
+        Registra el inicio de una ejecución
+
+        Args:
+            escenario (str): Escenario o modo (ej. "con_prioridad", "terminal")
+            ventanillas (int): Número de ventanillas
+            semilla (int): Semilla maestra efectiva (para repetir la ejecución)
+            politica (str): Política de descanso o de enrutamiento
+            **parametros: Otros parámetros, guardados como JSON
+
+        Returns:
+            int: Id de la ejecución
+
+        Raises:
+            RuntimeError: Si el escritor falló o no respondió a tiempo
+        """
+        if not self._hilo.is_alive():
+            raise RuntimeError(f"El escritor del historial se detuvo: {self.error}")
+        respuesta = queue.SimpleQueue()
+        self._cola.put((
+            "INSERT INTO ejecuciones (inicio, escenario, ventanillas, semilla, politica, parametros) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(_ahora_iso(), escenario, ventanillas, None if semilla is None else str(semilla), politica,
+              json.dumps(parametros, default=str))],
+            respuesta))
+        try:
+            ejecucion_id = respuesta.get(timeout=ESPERA_HISTORIAL)
+        except queue.Empty:
+            raise RuntimeError(f"El escritor del historial no respondió en {ESPERA_HISTORIAL:g}s") from None
+        if isinstance(ejecucion_id, Exception):
+            raise RuntimeError(f"No se pudo registrar la ejecución: {ejecucion_id}") from ejecucion_id
+        return ejecucion_id
+
+    def finalizar_ejecucion(self, ejecucion_id, metricas, escenario=None):
+        """
+        Guarda las métricas resumen y la hora de fin de una ejecución
+
+        Args:
+            ejecucion_id (int): Id devuelto por iniciar_ejecucion
+            metricas (dict): nombre -> valor; se guardan solo los valores numéricos finitos
+            escenario (str): Reemplaza el escenario guardado al iniciar (ej. el último
+                escenario elegido en la interfaz)
+        """
+        filas = [(ejecucion_id, nombre, float(valor)) for nombre, valor in metricas.items()
+                 if isinstance(valor, (int, float)) and math.isfinite(valor)]
+        self._cola.put(("INSERT OR REPLACE INTO metricas (ejecucion_id, nombre, valor) VALUES (?, ?, ?)",
+                        filas, None))
+        self._cola.put(("UPDATE ejecuciones SET fin = ? WHERE id = ?", [(_ahora_iso(), ejecucion_id)], None))
+        if escenario is not None:
+            self._cola.put(("UPDATE ejecuciones SET escenario = ? WHERE id = ?", [(escenario, ejecucion_id)], None))
+
+    def registro_clientes(self, ejecucion_id, siguiente=None):
+        """
+        Crea un registro de clientes (misma interfaz que RegistroClientes.registrar)
+        que escribe en esta base
+
+        Args:
+            ejecucion_id (int): Ejecución a la que pertenecen los clientes
+            siguiente: Otro registro que también recibe cada cliente (opcional)
+
+        Returns:
+            RegistroSQLite: Registro a pasar como `registro` al Banco o al simulador
+        """
+        return RegistroSQLite(self, ejecucion_id, siguiente)
+
+    def _insertar_clientes(self, filas):
+        self._cola.put(("INSERT INTO clientes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", filas, None))
+
+    def _escribir(self):
+        """Hilo escritor: agrupa en una transacción todo lo que encuentra en la cola"""
+        conexion = self._conectar()
+        try:
+            while True:
+                pendientes = [self._cola.get()]
+                while len(pendientes) < 64:
+                    try:
+                        pendientes.append(self._cola.get_nowait())
+                    except queue.Empty:
+                        break
+                fin = any(p is _FIN for p in pendientes)
+                try:
+                    with conexion:
+                        for pedido in pendientes:
+                            if pedido is _FIN:
+                                continue
+                            sql, filas, respuesta = pedido
+                            if respuesta is not None:
+                                respuesta.put(conexion.execute(sql, filas[0]).lastrowid)
+                            else:
+                                conexion.executemany(sql, filas)
+                                if sql.startswith("INSERT INTO clientes"):
+                                    self.filas_escritas += len(filas)
+                except Exception as e:
+                    # Cualquier fallo (no solo de SQLite) se informa a quien espera
+                    # respuesta; el hilo sigue atendiendo la cola
+                    self.error = e
+                    for pedido in pendientes:
+                        if pedido is not _FIN and pedido[2] is not None:
+                            pedido[2].put(e)
+                if fin:
+                    return
+        finally:
+            conexion.close()
+
+    def cerrar(self, timeout=30.0):
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        self._cola.put(_FIN)
+        self._hilo.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def ejecuciones(self, escenario=None, desde=None, hasta=None, limite=20):
+        """
+        Ejecuciones más recientes con sus métricas (usa los índices por escenario y fecha)
+
+        Args:
+            escenario (str): Filtrar por escenario
+            desde (str): Fecha ISO mínima de inicio (ej. "2024-05-01")
+            hasta (str): Fecha ISO máxima de inicio
+            limite (int): Ejecuciones máximas
+
+        Returns:
+            list: Un dict por ejecución con sus columnas y un dict 'metricas'
+        """
+        condiciones, valores = [], []
+        if escenario is not None:
+            condiciones.append("escenario = ?")
+            valores.append(escenario)
+        if desde is not None:
+            condiciones.append("inicio >= ?")
+            valores.append(desde)
+        if hasta is not None:
+            condiciones.append("inicio <= ?")
+            valores.append(hasta)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        conexion = self._conectar()
+        conexion.row_factory = sqlite3.Row
+        try:
+            filas = [dict(f) for f in conexion.execute(
+                f"SELECT * FROM ejecuciones {donde} ORDER BY inicio DESC, id DESC LIMIT ?",
+                valores + [limite])]
+            for fila in filas:
+                fila['metricas'] = dict(conexion.execute(
+                    "SELECT nombre, valor FROM metricas WHERE ejecucion_id = ?", (fila['id'],)).fetchall())
+                fila['parametros'] = json.loads(fila['parametros'] or "{}")
+        finally:
+            conexion.close()
+        return filas
+
+    def clientes(self, ejecucion_id):
+        """
+        Recorre los clientes guardados de una ejecución
+
+        Yields:
+            tuple: (id, prioridad, transaccion, ventanilla, llegada, inicio_atencion, fin_atencion)
+        """
+        conexion = self._conectar()
+        try:
+            yield from conexion.execute(
+                "SELECT id, prioridad, transaccion, ventanilla, llegada, inicio_atencion, fin_atencion "
+                "FROM clientes WHERE ejecucion_id = ?", (ejecucion_id,))
+        finally:
+            conexion.close()
+
+
+class RegistroSQLite:
+    """
+    Acumula clientes en una lista y entrega al escritor un lote cada
+    `tamano_lote` clientes: en el hilo de la simulación solo se arma una tupla
+    """
+
+    def __init__(self, historial, ejecucion_id, siguiente=None, tamano_lote=LOTE_HISTORIAL):
+        self.historial = historial
+        self.ejecucion_id = ejecucion_id
+        self.siguiente = siguiente
+        self.tamano_lote = tamano_lote
+        self.total = 0
+        self._lote = []
+
+    def registrar(self, persona, ventanilla_id=0):
+        """Registra un cliente (ver RegistroClientes.registrar)"""
+        self._lote.append((self.ejecucion_id, persona.id, 1 if persona.prioridad else 0, persona.transaccion,
+                           ventanilla_id, _tiempo(persona.tiempo_llegada),
+                           _tiempo(persona.tiempo_inicio_atencion), _tiempo(persona.tiempo_fin_atencion)))
+        self.total += 1
+        if len(self._lote) >= self.tamano_lote:
+            self.vaciar()
+        if self.siguiente is not None:
+            self.siguiente.registrar(persona, ventanilla_id)
+
+    def vaciar(self):
+        """Entrega al escritor los clientes acumulados"""
+        if self._lote:
+            self.historial._insertar_clientes(self._lote)
+            self._lote = []
+
+    def __len__(self):
+        return self.total
@@ -0,0 +1,251 @@
+"""
+Ingreso concurrente de clientes desde productores externos (kioscos, dispensadores
+de turnos, aplicación móvil) hacia el banco
+"""
+
+import json
+import socketserver
+import threading
+import time
+from collections import deque
+
+from models.banco import Banco
+from models.persona import Persona
+from utils.config import CAPACIDAD_INGESTA, LOTE_INGESTA
+from utils.metricas import Contador, Histograma
+
+BUCKETS_ESPERA_INGESTA = (0.001, 0.01, 0.05, 0.1, 0.5, 1)
+
+
+class ColaIngesta:
+    """
+    Buzón seguro entre hilos delante de Banco.agregar_persona.
+
+    Los productores solo hacen `deque.append`, que es atómico en CPython, de
+    modo que no compiten por ningún candado en el camino normal. Los Persona
+    se crean al drenar, en el hilo del motor (Tk o simulador), porque el banco
+    y la interfaz no son seguros entre hilos.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_INGESTA, tamano_lote=LOTE_INGESTA, registro_metricas=None):
+        """
+        Inicializa la cola
+
+        Args:
+            capacidad (int): Solicitudes pendientes máximas (aproximado: el control
+                no toma candado y puede excederse por pocas unidades)
+            tamano_lote (int): Solicitudes máximas que procesa cada drenado
+            registro_metricas (RegistroMetricas): Donde publicar las métricas (opcional)
+        """
+        self.capacidad = capacidad
+        self.tamano_lote = tamano_lote
+        self._cola = deque()
+
+        self.ingresados = Contador("banco_ingesta_clientes_total",
+                                   "Clientes recibidos de productores externos", ("origen",))
+        self.rechazados = Contador("banco_ingesta_rechazados_total",
+                                   "Solicitudes rechazadas por cola de ingreso llena", ("origen",))
+        self.espera = Histograma("banco_ingesta_espera_segundos",
+                                 "Tiempo desde el ingreso hasta que el motor crea el cliente", (),
+                                 BUCKETS_ESPERA_INGESTA)
+        if registro_metricas is not None:
+            for metrica in (self.ingresados, self.rechazados, self.espera):
+                registro_metricas.agregar(metrica)
+
+    def ingresar(self, prioridad=False, transaccion=None, origen="kiosco"):
+        """
+        Solicita un turno. Puede llamarse desde cualquier hilo y nunca bloquea
+
+        Args:
+            prioridad (bool): Si el cliente es prioritario
+            transaccion (str): Transacción solicitada (aleatoria si es None)
+            origen (str): Productor que emite la solicitud
+
+        Returns:
+            bool: False si la cola estaba llena y la solicitud se descartó
+        """
+        if len(self._cola) >= self.capacidad:
+            self.rechazados.inc(origen=origen)
+            return False
+        self._cola.append((time.monotonic(), bool(prioridad), transaccion, origen))
+        return True
+
+    def pendientes(self):
+        """Solicitudes aún no drenadas"""
+        return len(self._cola)
+
+    def drenar(self, banco, maximo=None):
+        """
+        Crea en el banco los clientes pendientes, en lotes. Debe llamarse
+        desde el hilo que maneja el banco
+
+        Args:
+            banco (Banco): Banco que recibe a los clientes
+            maximo (int): Solicitudes máximas a procesar (por defecto tamano_lote)
+
+        Returns:
+            list: Personas agregadas a la fila
+        """
+        cola = self._cola
+        limite = self.tamano_lote if maximo is None else maximo
+        lote = []
+        while len(lote) < limite:
+            try:
+                lote.append(cola.popleft())
+            except IndexError:
+                break
+        if not lote:
+            return []
+
+        ahora = time.monotonic()
+        personas = []
+        por_origen = {}
+        for creada, prioridad, transaccion, origen in lote:
+            self.espera.observar(ahora - creada)
+            por_origen[origen] = por_origen.get(origen, 0) + 1
+            banco.contador_personas += 1
+            persona = Persona(banco.contador_personas, prioridad, transaccion, banco.rng_transacciones)
+            banco.agregar_persona(persona)
+            personas.append(persona)
+
+        detalle = ", ".join(f"{origen}: {n}" for origen, n in por_origen.items())
+        for origen, n in por_origen.items():
+            self.ingresados.inc(n, origen=origen)
+        banco.log.append(f"[INGESTA] 📥 {len(personas)} clientes recibidos ({detalle})")
+        return personas
+
+    def vaciar(self):
+        """Descarta las solicitudes pendientes (ej. al reiniciar el sistema)"""
+        self._cola.clear()
+
+
+class ServidorIngesta:
+    """
+    Servidor TCP local para kioscos: cada línea recibida es una solicitud JSON
+    como {"prioridad": true, "transaccion": "Retiro de efectivo", "origen": "kiosco-2"}
+    (o simplemente "P" / "N") y se responde "OK" o "LLENO" por línea
+    """
+
+    def __init__(self, cola, puerto=0, host="127.0.0.1"):
+        """
+        Inicializa el servidor
+
+        Args:
+            cola (ColaIngesta): Cola donde se depositan las solicitudes
+            puerto (int): Puerto de escucha (0 elige uno libre)
+            host (str): Dirección donde escucha el servidor
+        """
+        self.cola = cola
+        self.puerto = puerto
+        self.host = host
+        self._servidor = None
+        self._hilo = None
+
+    def iniciar(self):
+        """Arranca el servidor en un hilo en segundo plano"""
+        self._servidor = socketserver.ThreadingTCPServer((self.host, self.puerto), self._crear_manejador())
+        self._servidor.daemon_threads = True
+        self.puerto = self._servidor.server_address[1]
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Detiene el servidor"""
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._hilo.join(timeout=2.0)
+
+    @staticmethod
+    def interpretar(linea):
+        """
+        Convierte una línea recibida en (prioridad, transaccion, origen)
+
+        Raises:
+            ValueError: Si la línea no es una solicitud válida o pide una
+                transacción que el banco no ofrece
+        """
+        linea = linea.strip()
+        if linea.upper() in ("P", "N"):
+            return linea.upper() == "P", None, "socket"
+        datos = json.loads(linea)
+        if not isinstance(datos, dict):
+            raise ValueError("Se esperaba un objeto JSON")
+        transaccion = datos.get("transaccion")
+        if transaccion is not None and transaccion not in Persona.TRANSACCIONES:
+            raise ValueError(f"Transacción desconocida: {transaccion!r}")
+        return bool(datos.get("prioridad", False)), transaccion, str(datos.get("origen", "socket"))
+
+    def _crear_manejador(self):
+        cola = self.cola
+        interpretar = self.interpretar
+
+        class ManejadorIngesta(socketserver.StreamRequestHandler):
+            def handle(self):
+                for crudo in self.rfile:
+                    linea = crudo.decode("utf-8", "replace")
+                    if not linea.strip():
+                        continue
+                    try:
+                        prioridad, transaccion, origen = interpretar(linea)
+                    except ValueError:
+                        self.wfile.write(b"ERROR\n")
+                        continue
+                    self.wfile.write(b"OK\n" if cola.ingresar(prioridad, transaccion, origen) else b"LLENO\n")
+
+        return ManejadorIngesta
+
+
+def medir_rendimiento(productores=(1, 2, 4, 8, 16), solicitudes=200000, tamano_lote=LOTE_INGESTA):
+    """
+    Mide las solicitudes por segundo que atraviesan la cola con varios hilos
+    productores y un consumidor que drena hacia un Banco sin interfaz
+
+    Args:
+        productores (tuple): Cantidades de hilos productores a probar
+        solicitudes (int): Solicitudes totales por prueba (repartidas entre productores)
+        tamano_lote (int): Tamaño de lote del drenado
+
+    Returns:
+        list: Un dict por prueba con productores, solicitudes/s y espera media
+    """
+    resultados = []
+    for n in productores:
+        cola = ColaIngesta(capacidad=solicitudes + 1, tamano_lote=tamano_lote)
+        banco = Banco(max_log=1000)
+        # Sin ventanillas libres la fila solo crece: se mide la ingesta, no la atención
+        banco.ventanillas = []
+        por_productor = solicitudes // n
+        total = por_productor * n
+        barrera = threading.Barrier(n + 1)
+
+        def producir(indice):
+            origen = f"kiosco-{indice}"
+            barrera.wait()
+            for i in range(por_productor):
+                cola.ingresar(i % 4 == 0, "Consulta de saldo", origen)
+
+        hilos = [threading.Thread(target=producir, args=(i,)) for i in range(n)]
+        for hilo in hilos:
+            hilo.start()
+        barrera.wait()
+        inicio = time.perf_counter()
+        drenados = 0
+        while drenados < total:
+            lote = cola.drenar(banco)
+            if not lote:
+                time.sleep(0)
+            drenados += len(lote)
+        duracion = time.perf_counter() - inicio
+        for hilo in hilos:
+            hilo.join()
+
+        cantidad, suma = cola.espera.resumen()
+        resultados.append({
+            'productores': n,
+            'solicitudes': total,
+            'por_segundo': total / duracion,
+            'espera_media_ms': suma / cantidad * 1000 if cantidad else 0.0
+        })
+    return resultados
@@ -1,4 +1,3 @@
-import random
 
 class Persona:
     """
@@ -19,23 +18,36 @@ class Persona:
         "Cambio de moneda"
     ]
     
-    def __init__(self, id, prioridad=False):
+    def __init__(self, id, prioridad=False, transaccion=None, rng=None):
         """
         Inicializa una nueva persona
         
         Args:
             id (int): Identificador único del cliente
             prioridad (bool): Si el cliente tiene atención prioritaria
+            transaccion (str): Transacción solicitada (aleatoria si es None)
+            rng (random.Random): Generador para sortear la transacción (obligatorio si
+                `transaccion` es None, ej. banco.rng_transacciones)
+
+        Raises:
+            ValueError: Si hay que sortear la transacción y no se da un generador
         """
         self.id = id
         self.prioridad = prioridad
         self.estado = "esperando"
-        self.transaccion = self._asignar_transaccion_aleatoria()
+        if transaccion is None and rng is None:
+            raise ValueError("Sortear la transacción requiere un generador de SecuenciaSemillas")
+        self.transaccion = transaccion or self._asignar_transaccion_aleatoria(rng)
         self.notificacion_enviada = False
+        
+        # Marcas de tiempo (segundos según el reloj del banco)
+        self.tiempo_llegada = None
+        self.tiempo_inicio_atencion = None
+        self.tiempo_fin_atencion = None
     
-    def _asignar_transaccion_aleatoria(self):
+    def _asignar_transaccion_aleatoria(self, rng):
         """Asigna una transacción aleatoria al cliente"""
-        return random.choice(self.TRANSACCIONES)
+        return rng.choice(self.TRANSACCIONES)
     
     def __str__(self):
         """Representación en string de la persona"""
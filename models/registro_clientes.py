@@ -0,0 +1,194 @@
+"""
+Registro columnar de clientes atendidos y exportación masiva
+"""
+
+import csv
+import math
+import struct
+import sys
+import zipfile
+from array import array
+
+from models.persona import Persona
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional
+    pa = None
+    pq = None
+
+TAMANO_BLOQUE = 65536
+
+# Columna -> código de tipo de array
+COLUMNAS = (
+    ("id", "q"),
+    ("prioridad", "b"),
+    ("transaccion", "h"),
+    ("ventanilla", "i"),
+    ("llegada", "d"),
+    ("inicio_atencion", "d"),
+    ("fin_atencion", "d"),
+)
+
+_INDICE_TRANSACCION = {nombre: i for i, nombre in enumerate(Persona.TRANSACCIONES)}
+
+
+class RegistroClientes:
+    """
+    Guarda un registro por cliente en bloques columnares preasignados.
+
+    Cada bloque contiene un array por columna con TAMANO_BLOQUE posiciones;
+    registrar un cliente solo escribe valores en la posición libre, sin crear
+    objetos por fila. Las exportaciones recorren los bloques uno a uno.
+    """
+
+    def __init__(self, tamano_bloque=TAMANO_BLOQUE):
+        """
+        Inicializa el registro
+
+        Args:
+            tamano_bloque (int): Filas por bloque preasignado
+        """
+        self.tamano_bloque = tamano_bloque
+        self.bloques = []
+        self._posicion = tamano_bloque  # Fuerza la creación del primer bloque
+        self.total = 0
+
+    def _nuevo_bloque(self):
+        """Reserva un bloque con todas sus columnas inicializadas a cero"""
+        bloque = {nombre: array(codigo, bytes(self.tamano_bloque * array(codigo).itemsize))
+                  for nombre, codigo in COLUMNAS}
+        self.bloques.append(bloque)
+        self._posicion = 0
+        return bloque
+
+    def registrar(self, persona, ventanilla_id=0):
+        """
+        Registra un cliente
+
+        Args:
+            persona (Persona): Cliente con sus marcas de tiempo
+            ventanilla_id (int): Ventanilla que lo atendió (0 si no fue atendido)
+        """
+        if self._posicion >= self.tamano_bloque:
+            bloque = self._nuevo_bloque()
+        else:
+            bloque = self.bloques[-1]
+
+        i = self._posicion
+        bloque["id"][i] = persona.id
+        bloque["prioridad"][i] = 1 if persona.prioridad else 0
+        bloque["transaccion"][i] = _INDICE_TRANSACCION.get(persona.transaccion, -1)
+        bloque["ventanilla"][i] = ventanilla_id
+        bloque["llegada"][i] = _tiempo(persona.tiempo_llegada)
+        bloque["inicio_atencion"][i] = _tiempo(persona.tiempo_inicio_atencion)
+        bloque["fin_atencion"][i] = _tiempo(persona.tiempo_fin_atencion)
+
+        self._posicion += 1
+        self.total += 1
+
+    def limpiar(self):
+        """Descarta todos los registros"""
+        self.bloques.clear()
+        self._posicion = self.tamano_bloque
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def iterar_bloques(self):
+        """
+        Recorre los bloques con datos
+
+        Yields:
+            tuple: (bloque, filas_usadas)
+        """
+        for i, bloque in enumerate(self.bloques):
+            usadas = self._posicion if i == len(self.bloques) - 1 else self.tamano_bloque
+            if usadas:
+                yield bloque, usadas
+
+    def exportar(self, ruta):
+        """
+        Exporta según la extensión del archivo (.csv, .npz o .parquet)
+
+        Args:
+            ruta (str): Archivo de destino
+        """
+        if ruta.endswith(".csv"):
+            self.exportar_csv(ruta)
+        elif ruta.endswith(".npz"):
+            self.exportar_npz(ruta)
+        elif ruta.endswith(".parquet"):
+            self.exportar_parquet(ruta)
+        else:
+            raise ValueError(f"Formato de exportación no soportado: {ruta}")
+
+    def exportar_csv(self, ruta):
+        """Exporta a CSV escribiendo bloque por bloque"""
+        nombres = [nombre for nombre, _ in COLUMNAS]
+        transacciones = tuple(Persona.TRANSACCIONES)
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(nombres)
+            for bloque, usadas in self.iterar_bloques():
+                columnas = [bloque[nombre][:usadas] for nombre in nombres]
+                columnas[2] = [transacciones[c] if c >= 0 else "" for c in columnas[2]]
+                writer.writerows(zip(*columnas))
+
+    def exportar_npz(self, ruta):
+        """
+        Exporta a un archivo .npz de NumPy (un .npy por columna) copiando los
+        bytes de cada bloque directamente, sin necesitar NumPy instalado
+        """
+        with zipfile.ZipFile(ruta, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for nombre, codigo in COLUMNAS:
+                descr = _DESCRIPTORES[codigo]
+                with zf.open(f"{nombre}.npy", "w", force_zip64=True) as f:
+                    f.write(_cabecera_npy(descr, self.total))
+                    for bloque, usadas in self.iterar_bloques():
+                        f.write(memoryview(bloque[nombre])[:usadas])
+
+            # Catálogo para traducir los códigos de transacción
+            ancho = max(len(t) for t in Persona.TRANSACCIONES)
+            with zf.open("catalogo_transacciones.npy", "w") as f:
+                f.write(_cabecera_npy(f"{_ORDEN}U{ancho}", len(Persona.TRANSACCIONES)))
+                for transaccion in Persona.TRANSACCIONES:
+                    f.write(transaccion.ljust(ancho, "\0").encode(_CODIFICACION_UNICODE))
+
+    def exportar_parquet(self, ruta):
+        """Exporta a Parquet escribiendo un grupo de filas por bloque (requiere pyarrow)"""
+        if pa is None:
+            raise RuntimeError("La exportación a Parquet requiere pyarrow")
+
+        tipos = {"q": pa.int64(), "b": pa.int8(), "h": pa.int16(), "i": pa.int32(), "d": pa.float64()}
+        esquema = pa.schema([(nombre, tipos[codigo]) for nombre, codigo in COLUMNAS],
+                            metadata={"transacciones": "|".join(Persona.TRANSACCIONES)})
+        with pq.ParquetWriter(ruta, esquema) as writer:
+            for bloque, usadas in self.iterar_bloques():
+                arrays = [pa.Array.from_buffers(tipos[codigo], usadas,
+                                                [None, pa.py_buffer(bloque[nombre])])
+                          for nombre, codigo in COLUMNAS]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=esquema))
+
+
+def _tiempo(valor):
+    """Convierte una marca de tiempo opcional a float (NaN si falta)"""
+    return math.nan if valor is None else valor
+
+
+_ORDEN = "<" if sys.byteorder == "little" else ">"
+_CODIFICACION_UNICODE = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+_DESCRIPTORES = {"q": f"{_ORDEN}i8", "b": "|i1", "h": f"{_ORDEN}i2",
+                 "i": f"{_ORDEN}i4", "d": f"{_ORDEN}f8"}
+
+
+def _cabecera_npy(descr, filas):
+    """Construye la cabecera de formato .npy versión 1.0 para un vector"""
+    cabecera = repr({"descr": descr, "fortran_order": False, "shape": (filas,)})
+    # Magia (6) + versión (2) + longitud (2) + cabecera + '\n' alineado a 64 bytes
+    relleno = 64 - (10 + len(cabecera) + 1) % 64
+    cabecera = cabecera + " " * relleno + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(cabecera)) + cabecera.encode("latin1")
+
@@ -0,0 +1,166 @@
+"""
+Modelos de tiempo de atención por transacción, configurables o ajustados a datos registrados
+"""
+
+import csv
+import math
+
+from models.persona import Persona
+from utils.config import TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX
+
+
+class ServicioUniforme:
+    """Tiempo uniforme entre un mínimo y un máximo (modelo original del banco)"""
+
+    def __init__(self, minimo, maximo):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.media = (minimo + maximo) / 2
+
+    def muestrear(self, rng):
+        return rng.uniform(self.minimo, self.maximo)
+
+    def __repr__(self):
+        return f"ServicioUniforme({self.minimo}, {self.maximo})"
+
+
+class ServicioLognormal:
+    """Tiempo log-normal dado por su media y coeficiente de variación (colas largas)"""
+
+    def __init__(self, media, cv):
+        self.media = media
+        self.cv = cv
+        self._sigma = math.sqrt(math.log(1 + cv * cv))
+        self._mu = math.log(media) - self._sigma ** 2 / 2
+
+    def muestrear(self, rng):
+        return rng.lognormvariate(self._mu, self._sigma)
+
+    def __repr__(self):
+        return f"ServicioLognormal(media={self.media:.1f}, cv={self.cv:.2f})"
+
+
+class ServicioEmpirico:
+    """Remuestrea tiempos observados (bootstrap)"""
+
+    def __init__(self, muestras):
+        if not muestras:
+            raise ValueError("Se necesita al menos una muestra")
+        self.muestras = list(muestras)
+        self.media = sum(self.muestras) / len(self.muestras)
+
+    def muestrear(self, rng):
+        return rng.choice(self.muestras)
+
+    def __repr__(self):
+        return f"ServicioEmpirico(n={len(self.muestras)}, media={self.media:.1f})"
+
+
+_TIPOS = {"uniforme": ServicioUniforme, "lognormal": ServicioLognormal}
+
+
+def crear_modelo(especificacion):
+    """
+    Crea un modelo desde una tupla de configuración
+
+    Args:
+        especificacion (tuple): ("uniforme", mín, máx) o ("lognormal", media, cv)
+
+    Returns:
+        Modelo con atributo `media` y método `muestrear(rng)`
+    """
+    tipo, *parametros = especificacion
+    if tipo not in _TIPOS:
+        raise ValueError(f"Modelo de servicio desconocido: {tipo} (opciones: {', '.join(_TIPOS)})")
+    return _TIPOS[tipo](*parametros)
+
+
+class CatalogoServicio:
+    """
+    Modelo de tiempo de atención de cada transacción. Las transacciones sin
+    modelo propio usan el modelo por defecto.
+    """
+
+    def __init__(self, modelos=None, por_defecto=None):
+        """
+        Inicializa el catálogo
+
+        Args:
+            modelos (dict): transacción -> modelo
+            por_defecto: Modelo de las transacciones no listadas
+        """
+        self.modelos = dict(modelos or {})
+        self.por_defecto = por_defecto or ServicioUniforme(TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX)
+
+    @classmethod
+    def desde_config(cls, tiempos):
+        """
+        Crea el catálogo desde un diccionario como TIEMPOS_TRANSACCION
+
+        Args:
+            tiempos (dict): transacción -> ("uniforme", mín, máx) o ("lognormal", media, cv)
+        """
+        return cls({transaccion: crear_modelo(espec) for transaccion, espec in tiempos.items()})
+
+    @classmethod
+    def desde_registro(cls, registro, velocidades=None, minimo_muestras=30):
+        """
+        Ajusta un modelo empírico por transacción a partir de un RegistroClientes
+
+        Args:
+            registro (RegistroClientes): Clientes atendidos registrados
+            velocidades (dict): ventanilla -> factor de velocidad con que se registraron;
+                los tiempos se normalizan a velocidad 1
+            minimo_muestras (int): Muestras mínimas para ajustar una transacción
+
+        Returns:
+            CatalogoServicio: Catálogo ajustado
+        """
+        filas = []
+        for bloque, usadas in registro.iterar_bloques():
+            for i in range(usadas):
+                codigo = bloque["transaccion"][i]
+                if codigo >= 0:
+                    filas.append((Persona.TRANSACCIONES[codigo], bloque["ventanilla"][i],
+                                  bloque["inicio_atencion"][i], bloque["fin_atencion"][i]))
+        return cls._ajustar(filas, velocidades, minimo_muestras)
+
+    @classmethod
+    def desde_csv(cls, ruta, velocidades=None, minimo_muestras=30):
+        """
+        Ajusta el catálogo desde un CSV exportado con RegistroClientes.exportar_csv
+
+        Args:
+            ruta (str): Archivo CSV con columnas transaccion, ventanilla,
+                inicio_atencion y fin_atencion
+        """
+        with open(ruta, newline="", encoding="utf-8") as f:
+            filas = [(fila["transaccion"], int(fila["ventanilla"] or 0),
+                      float(fila["inicio_atencion"] or "nan"), float(fila["fin_atencion"] or "nan"))
+                     for fila in csv.DictReader(f)]
+        return cls._ajustar(filas, velocidades, minimo_muestras)
+
+    @classmethod
+    def _ajustar(cls, filas, velocidades, minimo_muestras):
+        """Agrupa duraciones por transacción y crea los modelos empíricos"""
+        velocidades = velocidades or {}
+        duraciones = {}
+        for transaccion, ventanilla, inicio, fin in filas:
+            if not transaccion or ventanilla <= 0 or math.isnan(inicio) or math.isnan(fin):
+                continue
+            duraciones.setdefault(transaccion, []).append((fin - inicio) * velocidades.get(ventanilla, 1.0))
+
+        todas = [d for lista in duraciones.values() for d in lista]
+        modelos = {t: ServicioEmpirico(lista) for t, lista in duraciones.items() if len(lista) >= minimo_muestras}
+        return cls(modelos, ServicioEmpirico(todas) if todas else None)
+
+    def modelo(self, transaccion):
+        return self.modelos.get(transaccion, self.por_defecto)
+
+    def media(self, transaccion):
+        """Tiempo medio de atención de una transacción a velocidad 1"""
+        return self.modelo(transaccion).media
+
+    def muestrear(self, transaccion, rng):
+        """Muestrea un tiempo de atención a velocidad 1"""
+        return self.modelo(transaccion).muestrear(rng)
@@ -0,0 +1,265 @@
+"""
+Motor de simulación por eventos discretos sin interfaz gráfica
+"""
+
+import heapq
+import math
+from array import array
+
+from models.banco import Banco
+from models.cargas import crear_carga
+from models.fila_virtual import FilaVirtual
+from models.persona import Persona
+from utils.aleatorio import secuencia
+from utils.config import (NUM_VENTANILLAS, TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX,
+                          TIEMPO_DESCANSO)
+
+
+class SimuladorBanco:
+    """
+    Ejecuta un Banco real con reloj simulado y sin Tkinter.
+
+    El simulador se registra como la "interfaz" del banco: recibe los mismos
+    avisos que la interfaz gráfica (inicio de atención, cambios de fila) y en
+    lugar de temporizadores de Tk programa eventos en una cola de prioridad.
+    """
+
+    def __init__(self, n_ventanillas=NUM_VENTANILLAS, tasa_llegada=None,
+                 proporcion_prioritarios=0.25,
+                 tiempo_atencion=(TIEMPO_ATENCION_MIN, TIEMPO_ATENCION_MAX),
+                 tiempo_descanso=TIEMPO_DESCANSO, semilla=None, calentamiento=0.0,
+                 metricas=None, registro=None, max_log=1000, carga=None,
+                 topologia=None, politica="jsew", robo=False,
+                 servicio=None, velocidades=None, habilidades=None, politica_descanso=None,
+                 fila_virtual=None, servicio_por_cliente=False):
+        """
+        Inicializa el simulador
+
+        Args:
+            n_ventanillas (int): Número de ventanillas
+            tasa_llegada (float): Clientes por segundo (llegadas de Poisson).
+                Si es None se usan los intervalos uniformes de utils/config.py
+            proporcion_prioritarios (float): Fracción de clientes prioritarios
+            tiempo_atencion (tuple): Rango (mín, máx) del tiempo de atención en segundos
+            tiempo_descanso (int): Segundos de descanso tras cada cliente
+            semilla (int | SecuenciaSemillas): Semilla maestra; llegadas, transacciones,
+                tiempos de atención y enrutamiento usan flujos independientes derivados de ella
+            calentamiento (float): Segundos iniciales excluidos de las estadísticas
+            metricas (MetricasBanco): Métricas a actualizar (opcional)
+            registro (RegistroClientes): Registro columnar de clientes (opcional)
+            max_log (int): Líneas de log a conservar en memoria
+            carga (iterable): Llegadas (tiempo, prioridad, transaccion) a usar en
+                lugar de tasa_llegada/proporcion_prioritarios (ver models/cargas.py)
+            topologia (str): None (fila única), "ventanilla" o "transaccion"
+            politica (str): Política de enrutamiento con varias filas
+            robo (bool): Si las ventanillas ociosas toman clientes de otras filas
+            servicio (CatalogoServicio): Tiempos de atención por transacción (opcional)
+            velocidades (dict): id de ventanilla -> factor de velocidad
+            habilidades (dict): id de ventanilla -> transacciones que atiende
+            politica_descanso: Política de models/descansos.py (por defecto, descanso fijo)
+            fila_virtual (dict): Opciones de FilaVirtual para que los clientes esperen
+                fuera con turno ({} usa la configuración; None la desactiva)
+            servicio_por_cliente (bool): Sortear el tiempo de atención de cada cliente con
+                su propia semilla, para comparar configuraciones con números aleatorios comunes
+        """
+        self.ahora = 0.0
+        self.calentamiento = calentamiento
+        self.semillas = secuencia(semilla)
+        self.rng = self.semillas.hija("llegadas").generador()
+
+        self.banco = Banco(n_ventanillas, interfaz=self, metricas=metricas,
+                           reloj=self._reloj, registro=registro, max_log=max_log,
+                           semillas=self.semillas)
+        self.banco.tiempo_atencion = tuple(tiempo_atencion)
+        self.banco.tiempo_descanso = tiempo_descanso
+        self.banco.configurar_filas(topologia, politica, robo,
+                                    self.semillas.hija("enrutamiento").generador())
+        self.banco.configurar_servicio(servicio, velocidades, habilidades)
+        self.banco.servicio_por_cliente = servicio_por_cliente
+        if politica_descanso is not None:
+            self.banco.politica_descanso = politica_descanso
+        self.fila_virtual = None
+        if fila_virtual is not None:
+            self.fila_virtual = FilaVirtual(self.banco, self._programar,
+                                            rng=self.semillas.hija("virtual").generador(), **fila_virtual)
+
+        self._eventos = []
+        self._secuencia = 0
+        self.eventos_procesados = 0
+
+        # Estadísticas
+        self.esperas = {True: array("d"), False: array("d")}
+        self.tiempo_ocupado = 0.0
+        self.tiempo_descansado = 0.0
+        self.atendidos = 0
+
+        if carga is None:
+            carga = crear_carga(proporcion_prioritarios, tasa=tasa_llegada, rng=self.rng)
+        self._carga = iter(carga)
+        self._programar_siguiente_llegada()
+
+    def _reloj(self):
+        return self.ahora
+
+    # ------------------------------------------------------------------
+    # Cola de eventos
+    # ------------------------------------------------------------------
+    def _programar(self, retardo, accion, *args):
+        """Programa una acción dentro de `retardo` segundos simulados"""
+        self._programar_en(self.ahora + retardo, accion, *args)
+
+    def programar(self, retardo, accion, *args):
+        """
+        Programa una acción externa (ej. un muestreo periódico) dentro de
+        `retardo` segundos simulados, en orden con los eventos del banco
+        """
+        self._programar(retardo, accion, *args)
+
+    def _programar_en(self, tiempo, accion, *args):
+        """Programa una acción en un instante simulado absoluto"""
+        self._secuencia += 1
+        heapq.heappush(self._eventos, (tiempo, self._secuencia, accion, args))
+
+    def pendientes(self):
+        """Eventos programados que todavía no ocurrieron"""
+        return len(self._eventos)
+
+    def ejecutar_hasta(self, tiempo):
+        """
+        Procesa todos los eventos hasta el tiempo simulado indicado
+
+        Args:
+            tiempo (float): Instante final en segundos simulados
+        """
+        eventos = self._eventos
+        while eventos and eventos[0][0] <= tiempo:
+            self.ahora, _, accion, args = heapq.heappop(eventos)
+            accion(*args)
+            self.eventos_procesados += 1
+        self.ahora = max(self.ahora, tiempo)
+        # Los resúmenes del log agregado se escriben aunque no vuelva a asignarse nadie
+        self.banco.agregador_log.vaciar()
+        return self
+
+    def ejecutar(self, duracion):
+        """
+        Ejecuta la simulación durante `duracion` segundos simulados
+
+        Returns:
+            dict: Resultados de la simulación
+        """
+        self.ejecutar_hasta(self.ahora + duracion)
+        self.banco.agregador_log.vaciar(forzar=True)
+        return self.resultados()
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+    def _programar_siguiente_llegada(self):
+        """Toma la siguiente llegada de la carga (si queda alguna) y la programa"""
+        llegada = next(self._carga, None)
+        if llegada is not None:
+            self._programar_en(max(llegada[0], self.ahora), self._llegada, llegada)
+
+    def _llegada(self, llegada):
+        """Llega un nuevo cliente y se programa el siguiente"""
+        _, prioridad, transaccion = llegada
+        self.banco.contador_personas += 1
+        persona = Persona(self.banco.contador_personas, prioridad, transaccion, self.banco.rng_transacciones)
+        if self.fila_virtual is not None:
+            self.fila_virtual.emitir_ticket(persona)
+        else:
+            self.banco.agregar_persona(persona)
+        self._programar_siguiente_llegada()
+
+    def _fin_atencion(self, ventanilla):
+        """Termina la atención y comienza el descanso de la ventanilla"""
+        descanso = self.banco.terminar_atencion(ventanilla)
+        if descanso:
+            if self.ahora >= self.calentamiento:
+                self.tiempo_descansado += descanso
+            self._programar(descanso, self._fin_descanso, ventanilla)
+        if self.fila_virtual is not None:
+            self.fila_virtual.actualizar()
+
+    def _fin_descanso(self, ventanilla):
+        """La ventanilla vuelve a estar disponible"""
+        self.banco.liberar_ventanilla(ventanilla)
+
+    # ------------------------------------------------------------------
+    # Avisos del banco (misma interfaz que InterfazBanco)
+    # ------------------------------------------------------------------
+    def iniciar_temporizador_ventanilla(self, ventanilla):
+        """El banco asignó un cliente: se programa el fin de la atención"""
+        cliente = ventanilla.cliente
+        if cliente.tiempo_llegada >= self.calentamiento:
+            self.esperas[cliente.prioridad].append(cliente.tiempo_inicio_atencion - cliente.tiempo_llegada)
+            self.tiempo_ocupado += ventanilla.tiempo_restante
+            self.atendidos += 1
+        self._programar(ventanilla.tiempo_restante, self._fin_atencion, ventanilla)
+
+    def agregar_persona_a_fila_visual(self, persona):
+        pass
+
+    def eliminar_persona_de_fila(self, persona):
+        pass
+
+    def actualizar_estado_ventanillas(self):
+        pass
+
+    def actualizar_log(self):
+        pass
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    def resultados(self):
+        """
+        Resume la simulación
+
+        Returns:
+            dict: Esperas por clase, utilización y rendimiento
+        """
+        duracion = max(self.ahora - self.calentamiento, 1e-9)
+        prioritarios, normales = self.esperas[True], self.esperas[False]
+        todas = list(prioritarios) + list(normales)
+        return {
+            'duracion': duracion,
+            'atendidos': self.atendidos,
+            'rendimiento': self.atendidos / duracion,
+            'utilizacion': self.tiempo_ocupado / (duracion * len(self.banco.ventanillas)),
+            'descanso_por_hora': self.tiempo_descansado / (duracion * len(self.banco.ventanillas)) * 3600,
+            'espera_prioritarios': _media(prioritarios),
+            'espera_normales': _media(normales),
+            'espera_promedio': _media(todas),
+            'p95_prioritarios': percentil(prioritarios, 95),
+            'p95_normales': percentil(normales, 95),
+            'en_fila': len(self.banco.fila),
+            'eventos': self.eventos_procesados,
+            'fila_virtual': self.fila_virtual.estadisticas() if self.fila_virtual is not None else None
+        }
+
+
+def _media(valores):
+    return sum(valores) / len(valores) if len(valores) else math.nan
+
+
+def percentil(valores, p):
+    """
+    Calcula el percentil p (0-100) por interpolación lineal
+
+    Args:
+        valores (iterable): Observaciones
+        p (float): Percentil deseado
+
+    Returns:
+        float: Valor del percentil (NaN si no hay datos)
+    """
+    ordenados = sorted(valores)
+    if not ordenados:
+        return math.nan
+    posicion = (len(ordenados) - 1) * p / 100
+    inferior = math.floor(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fraccion = posicion - inferior
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * fraccion
@@ -1,20 +1,27 @@
+from utils.config import TIEMPO_DESCANSO
+
 class Ventanilla:
     """
     Representa una ventanilla de atención en el banco
     """
     
-    def __init__(self, id):
+    def __init__(self, id, velocidad=1.0, habilidades=None):
         """
         Inicializa una nueva ventanilla
         
         Args:
             id (int): Identificador único de la ventanilla
+            velocidad (float): Factor de velocidad (2.0 atiende en la mitad del tiempo)
+            habilidades (iterable): Transacciones que puede atender (None = todas)
         """
         self.id = id
         self.ocupada = False
         self.cliente = None
         self.tiempo_restante = 0
         self.estado = "libre"  # libre, atendiendo, descansando
+        self.velocidad = velocidad
+        self.habilidades = frozenset(habilidades) if habilidades is not None else None
+        self.libre_estimado = 0.0  # Instante estimado en que vuelve a quedar libre
     
     def asignar_cliente(self, cliente, tiempo_atencion):
         """
@@ -30,12 +37,21 @@ class Ventanilla:
         self.tiempo_restante = tiempo_atencion
         cliente.estado = "siendo_atendido"
     
-    def liberar(self):
-        """Libera la ventanilla después de atender un cliente"""
+    def liberar(self, tiempo_descanso=TIEMPO_DESCANSO):
+        """
+        Libera la ventanilla después de atender un cliente
+        
+        Args:
+            tiempo_descanso (int): Segundos de descanso antes de quedar libre
+        """
         self.ocupada = False
         self.estado = "descansando"
         self.cliente = None
-        self.tiempo_restante = 3  # Tiempo de descanso
+        self.tiempo_restante = tiempo_descanso
+    
+    def puede_atender(self, transaccion):
+        """Verifica si la ventanilla atiende esa transacción"""
+        return self.habilidades is None or transaccion in self.habilidades
     
     def esta_libre(self):
         """Verifica si la ventanilla está disponible"""
@@ -0,0 +1,68 @@
+"""
+Secuencias de semillas y pares antitéticos
+"""
+
+import pytest
+
+from models.cargas import LlegadasPoisson, LlegadasUniformes, crear_carga
+from models.persona import Persona
+from models.simulador import SimuladorBanco
+from utils.aleatorio import GeneradorAntitetico, SecuenciaSemillas, secuencia
+
+
+def test_misma_ruta_mismo_flujo():
+    a = SecuenciaSemillas(42).hija("llegadas").generador()
+    b = secuencia(42).hija("llegadas").generador()
+    assert [a.random() for _ in range(5)] == [b.random() for _ in range(5)]
+
+
+def test_rutas_distintas_flujos_distintos():
+    semillas = SecuenciaSemillas(42)
+    assert semillas.hija("llegadas").estado() != semillas.hija("servicio").estado()
+    assert [s.ruta for s in semillas.spawn(2)] == [(0,), (1,)]
+    assert [s.ruta for s in semillas.spawn(1)] == [(2,)]
+
+
+def test_par_antitetico():
+    comun = SecuenciaSemillas(7).hija("replica", 3)
+    antitetica = comun.complemento()
+    assert antitetica.antitetica and isinstance(antitetica.generador(), GeneradorAntitetico)
+
+    g, h = comun.generador(), antitetica.generador()
+    for _ in range(100):
+        assert g.random() + h.random() == 1.0
+    for _ in range(100):
+        assert g.randint(10, 15) + h.randint(10, 15) == 25
+    g, h = comun.generador(), antitetica.generador()
+    opciones = list(range(10))
+    for _ in range(100):
+        assert g.choice(opciones) + h.choice(opciones) == 9
+
+
+def test_hijas_de_una_antitetica_tambien_lo_son():
+    antitetica = SecuenciaSemillas(7).complemento()
+    hija = antitetica.hija("servicio")
+    assert hija.antitetica
+    assert hija.estado() == SecuenciaSemillas(7).hija("servicio").estado()
+    assert not antitetica.complemento().antitetica
+
+
+@pytest.mark.parametrize("crear", [
+    lambda: Persona(1),
+    lambda: LlegadasPoisson(0.1),
+    lambda: LlegadasUniformes(),
+    lambda: crear_carga(tasa=0.1),
+])
+def test_sin_generador_no_hay_flujo_sin_semilla(crear):
+    with pytest.raises(ValueError):
+        crear()
+
+
+def test_misma_semilla_misma_simulacion():
+    def resumen(semilla):
+        resultados = SimuladorBanco(3, tasa_llegada=0.2, semilla=semilla, topologia="ventanilla",
+                                    politica="dos_opciones", max_log=1).ejecutar(3000)
+        return resultados['atendidos'], resultados['espera_promedio']
+
+    assert resumen(11) == resumen(11)
+    assert resumen(11) != resumen(12)
@@ -0,0 +1,35 @@
+"""
+Fórmula de Erlang C del modelo analítico
+"""
+
+import math
+
+import pytest
+
+from models.analitico import erlang_c, estimar_colas
+
+
+def _erlang_c_directo(c, carga):
+    """Erlang C con la fórmula cerrada"""
+    ultimo = carga ** c / math.factorial(c) * c / (c - carga)
+    return ultimo / (sum(carga ** k / math.factorial(k) for k in range(c)) + ultimo)
+
+
+@pytest.mark.parametrize("c, carga, esperado", [
+    (1, 0.5, 0.5),          # M/M/1: la probabilidad de esperar es ρ
+    (2, 1.0, 1 / 3),
+    (10, 8.0, 0.409),       # Valor de tabla
+])
+def test_erlang_c_valores_conocidos(c, carga, esperado):
+    assert erlang_c(c, carga) == pytest.approx(esperado, abs=5e-4)
+
+
+@pytest.mark.parametrize("c", [1, 3, 7, 20, 50])
+def test_erlang_c_coincide_con_la_formula_cerrada(c):
+    for rho in (0.1, 0.5, 0.9, 0.99):
+        assert erlang_c(c, rho * c) == pytest.approx(_erlang_c_directo(c, rho * c), rel=1e-9)
+
+
+def test_erlang_c_inestable():
+    assert erlang_c(3, 3.0) == 1.0
+    assert estimar_colas(3, 0.5)['estable'] is False
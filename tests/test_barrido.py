@@ -0,0 +1,138 @@
+"""
+Reintentos del coordinador de barridos
+"""
+
+import json
+import socket
+import threading
+
+import pytest
+
+from models.barrido import CoordinadorBarrido, TrabajadorBarrido, generar_unidades
+
+
+@pytest.fixture
+def unidades():
+    return generar_unidades({'ventanillas': [2, 3]}, replicas=2, duracion=500, semilla=1)
+
+
+def _conectar(coordinador, clave=None):
+    """Trabajador a mano: saluda y devuelve el archivo de la conexión"""
+    conexion = socket.create_connection(("127.0.0.1", coordinador.puerto), timeout=5)
+    archivo = conexion.makefile("rwb")
+    saludo = {'tipo': "hola", 'trabajador': "prueba"}
+    if clave is not None:
+        saludo['clave'] = clave
+    archivo.write(json.dumps(saludo).encode("utf-8") + b"\n")
+    archivo.flush()
+    return conexion, archivo, json.loads(archivo.readline())
+
+
+def _cerrar(conexion, archivo):
+    """Corta la conexión (el archivo también mantiene abierto el socket)"""
+    archivo.close()
+    conexion.close()
+
+
+def _pedir(archivo):
+    archivo.write(b'{"tipo": "pedir"}\n')
+    archivo.flush()
+    return json.loads(archivo.readline())
+
+
+def _trabajador(coordinador, clave=None):
+    hilo = threading.Thread(target=TrabajadorBarrido("127.0.0.1", coordinador.puerto, clave=clave).ejecutar,
+                            daemon=True)
+    hilo.start()
+    return hilo
+
+
+def test_unidad_de_un_trabajador_caido_se_reintenta(unidades):
+    coordinador = CoordinadorBarrido(unidades).iniciar()
+    try:
+        conexion, archivo, respuesta = _conectar(coordinador)
+        assert respuesta['tipo'] == "bienvenido"
+        tomada = _pedir(archivo)['unidad']['id']
+        _cerrar(conexion, archivo)  # Se cae con la unidad prestada
+
+        _trabajador(coordinador)
+        assert coordinador.esperar(timeout=60)
+        assert sorted(coordinador.resultados) == [u['id'] for u in unidades]
+        assert tomada in coordinador.resultados
+        assert coordinador.reintentos >= 1 and not coordinador.perdidas
+    finally:
+        coordinador.detener()
+
+
+def test_plazo_vencido_y_resultado_tardio(unidades):
+    coordinador = CoordinadorBarrido(unidades, plazo=0.2).iniciar()
+    try:
+        conexion, archivo, _ = _conectar(coordinador)
+        tomada = _pedir(archivo)['unidad']['id']  # La retiene sin responder
+
+        _trabajador(coordinador)
+        assert coordinador.esperar(timeout=60)
+        assert coordinador.reintentos >= 1
+        original = dict(coordinador.resultados[tomada])
+
+        # Su resultado llega tarde: se descarta porque la unidad ya está resuelta
+        archivo.write(json.dumps({'tipo': "resultado", 'id': tomada, 'resumen': {'atendidos': -1}})
+                      .encode("utf-8") + b"\n")
+        archivo.flush()
+        assert _pedir(archivo)['tipo'] == "fin"
+        assert coordinador.resultados[tomada] == original
+        _cerrar(conexion, archivo)
+    finally:
+        coordinador.detener()
+
+
+def test_unidad_perdida_tras_agotar_intentos(unidades):
+    coordinador = CoordinadorBarrido(unidades[:1], intentos=1).iniciar()
+    try:
+        conexion, archivo, _ = _conectar(coordinador)
+        tomada = _pedir(archivo)['unidad']['id']
+        _cerrar(conexion, archivo)
+        assert coordinador.esperar(timeout=10)
+        assert coordinador.perdidas == {tomada: "trabajador desconectado"}
+        assert coordinador.reintentos == 0
+    finally:
+        coordinador.detener()
+
+
+def test_clave_incorrecta_se_rechaza(unidades):
+    coordinador = CoordinadorBarrido(unidades, clave="clavé").iniciar()
+    try:
+        for clave in ("otra", "ñandú", None):
+            conexion, archivo, respuesta = _conectar(coordinador, clave)
+            assert respuesta['tipo'] == "rechazado"
+            _cerrar(conexion, archivo)
+        conexion, archivo, respuesta = _conectar(coordinador, "clavé")
+        assert respuesta['tipo'] == "bienvenido"
+        _cerrar(conexion, archivo)
+    finally:
+        coordinador.detener()
+
+
+def test_resultado_de_una_unidad_ajena_se_ignora(unidades):
+    coordinador = CoordinadorBarrido(unidades).iniciar()
+    try:
+        conexion_a, archivo_a, _ = _conectar(coordinador)
+        conexion_b, archivo_b, _ = _conectar(coordinador)
+        tomada = _pedir(archivo_a)['unidad']['id']
+
+        # B envía un resultado de la unidad de A: no cuenta ni le quita el préstamo
+        archivo_b.write(json.dumps({'tipo': "resultado", 'id': tomada, 'resumen': {'atendidos': -1}})
+                        .encode("utf-8") + b"\n")
+        archivo_b.flush()
+        assert _pedir(archivo_b)['unidad']['id'] != tomada
+        assert tomada not in coordinador.resultados
+
+        archivo_a.write(json.dumps({'tipo': "resultado", 'id': tomada, 'resumen': {'atendidos': 7}})
+                        .encode("utf-8") + b"\n")
+        archivo_a.flush()
+        _pedir(archivo_a)
+        assert coordinador.resultados[tomada]['atendidos'] == 7
+        _cerrar(conexion_a, archivo_a)
+        _cerrar(conexion_b, archivo_b)
+    finally:
+        coordinador.detener()
@@ -0,0 +1,86 @@
+"""
+Cargas de llegada variables en el tiempo y reproducidas desde trazas
+"""
+
+import itertools
+import random
+
+import pytest
+
+from models.cargas import (LlegadasPoisson, LlegadasPoissonNoHomogeneo, LlegadasTraza, LlegadasUniformes,
+                           combinar_cargas, crear_carga)
+from models.registro_clientes import RegistroClientes
+from models.simulador import SimuladorBanco
+
+
+def _hasta(carga, fin):
+    return list(itertools.takewhile(lambda llegada: llegada[0] < fin, carga))
+
+
+def test_poisson_respeta_la_tasa_y_la_proporcion():
+    llegadas = _hasta(LlegadasPoisson(0.5, 0.25, random.Random(1)), 40000)
+    assert len(llegadas) / 40000 == pytest.approx(0.5, rel=0.03)
+    assert sum(p for _, p, _ in llegadas) / len(llegadas) == pytest.approx(0.25, abs=0.02)
+    assert all(a[0] < b[0] for a, b in zip(llegadas, llegadas[1:]))
+
+
+def test_uniformes_dentro_del_intervalo():
+    llegadas = _hasta(LlegadasUniformes(intervalo=(2, 5), rng=random.Random(1)), 1000)
+    intervalos = [b[0] - a[0] for a, b in zip(llegadas, llegadas[1:])]
+    assert all(2 <= i <= 5 for i in intervalos)
+
+
+def test_no_homogeneo_sigue_la_tabla_horaria():
+    carga = LlegadasPoissonNoHomogeneo([360, 0, 1800], 0.0, random.Random(2))
+    llegadas = list(carga)  # Sin repetir, termina con la tabla
+    por_hora = [sum(1 for t, _, _ in llegadas if h * 3600 <= t < (h + 1) * 3600) for h in range(3)]
+    assert por_hora[1] == 0
+    assert por_hora[0] == pytest.approx(360, rel=0.2) and por_hora[2] == pytest.approx(1800, rel=0.1)
+    assert carga.tasa(3 * 3600) == 0.0
+
+
+def test_no_homogeneo_ciclico_y_tabla_invalida():
+    carga = LlegadasPoissonNoHomogeneo([100, 200], rng=random.Random(3), repetir=True)
+    assert carga.tasa(2 * 3600 + 1) == pytest.approx(100 / 3600)
+    assert _hasta(carga, 5 * 3600)[-1][0] > 4 * 3600
+    with pytest.raises(ValueError):
+        LlegadasPoissonNoHomogeneo([0, 0], rng=random.Random(3))
+
+
+def _traza(tmp_path, filas, nombre="traza.csv"):
+    ruta = tmp_path / nombre
+    ruta.write_text("tiempo,prioridad,transaccion\n" + "".join(f"{f}\n" for f in filas), encoding="utf-8")
+    return str(ruta)
+
+
+def test_traza_con_horas_origen_y_escala(tmp_path):
+    ruta = _traza(tmp_path, ["09:00,si,Consulta de saldo", "09:00:30,0,", "09:01,true,Apertura de cuenta"])
+    assert list(LlegadasTraza(ruta)) == [
+        (0.0, True, "Consulta de saldo"),
+        (30.0, False, None),
+        (60.0, True, "Apertura de cuenta"),
+    ]
+    assert [t for t, _, _ in LlegadasTraza(ruta, origen=9 * 3600 + 30, escala=0.5)] == [0.0, 15.0]
+
+
+def test_traza_desordenada(tmp_path):
+    with pytest.raises(ValueError):
+        list(LlegadasTraza(_traza(tmp_path, ["0,0,", "10,0,", "5,0,"])))
+
+
+def test_combinar_cargas_intercala_por_tiempo(tmp_path):
+    traza = LlegadasTraza(_traza(tmp_path, ["0,1,", "100,1,", "200,1,"]))
+    combinada = _hasta(combinar_cargas(traza, LlegadasPoisson(0.05, 0.0, random.Random(4))), 300)
+    tiempos = [t for t, _, _ in combinada]
+    assert tiempos == sorted(tiempos)
+    assert sum(p for _, p, _ in combinada) == 3
+
+
+def test_simulador_reproduce_la_traza(tmp_path):
+    filas = [f"{10 * i},{i % 2},{'Consulta de saldo' if i % 3 else ''}" for i in range(50)]
+    registro = RegistroClientes()
+    simulador = SimuladorBanco(3, carga=crear_carga(trazas=[_traza(tmp_path, filas)]), semilla=1,
+                               registro=registro)
+    simulador.ejecutar(2000)
+    assert simulador.banco.contador_personas == 50
+    assert simulador.resultados()['atendidos'] == 50
@@ -0,0 +1,53 @@
+"""
+Comparación pareada con números comunes, antitéticas y variable de control
+"""
+
+import pytest
+
+from models.comparacion import _intervalo, comparar_pareado, comparar_tecnicas, utilizacion_esperada
+from models.servicio import CatalogoServicio, ServicioUniforme
+
+A = {'n_ventanillas': 3, 'tasa_llegada': 0.2}
+B = {'n_ventanillas': 4, 'tasa_llegada': 0.2}
+
+
+def test_utilizacion_esperada():
+    assert utilizacion_esperada({'n_ventanillas': 4, 'tasa_llegada': 0.1, 'tiempo_atencion': (10, 30)}) == \
+        pytest.approx(0.1 * 20 / 4)
+    servicio = CatalogoServicio(por_defecto=ServicioUniforme(40, 40))
+    assert utilizacion_esperada({'n_ventanillas': 2, 'tasa_llegada': 0.01, 'servicio': servicio}) == \
+        pytest.approx(0.01 * 40 / 2)
+    assert utilizacion_esperada(dict(A, velocidades={1: 2.0})) is None
+    assert utilizacion_esperada(dict(A, fila_virtual={})) is None
+
+
+def test_control_elimina_la_parte_explicada():
+    controles = [-0.2, -0.1, 0.0, 0.1, 0.2, 0.3, -0.3, 0.05]
+    ruido = [0.01, -0.02, 0.015, -0.01, 0.0, 0.02, -0.015, 0.005]
+    diferencias = [2 + 30 * x + e for x, e in zip(controles, ruido)]
+    sin_control, semiancho_sin, beta_sin = _intervalo(diferencias, None, 0.95)
+    estimacion, semiancho, beta = _intervalo(diferencias, controles, 0.95)
+    assert beta_sin is None and beta == pytest.approx(30, rel=0.01)
+    assert estimacion == pytest.approx(2, abs=0.05)
+    assert semiancho < semiancho_sin / 10
+
+
+def test_numeros_comunes_anulan_la_diferencia_entre_configuraciones_iguales():
+    opciones = dict(duracion=2000, pares_min=3, pares_max=3, antiteticas=False, control=False)
+    comunes = comparar_pareado(A, dict(A), **opciones)
+    assert comunes['diferencia'] == 0.0 and comunes['semiancho'] == 0.0 and comunes['convergio']
+    assert comunes['pares'] == 3 and comunes['replicas'] == 6
+
+    independientes = comparar_pareado(A, dict(A), comunes=False, **opciones)
+    assert independientes['diferencia'] != 0.0 and independientes['semiancho'] > 0
+
+
+def test_reduccion_de_varianza_acorta_el_intervalo():
+    opciones = dict(duracion=3000, pares_min=8, pares_max=8, semilla=0)
+    independientes, reducidas = comparar_tecnicas(
+        A, B, tecnicas=(("Independientes", False, False, False), ("Comunes + antitéticas", True, True, False)),
+        **opciones)
+    assert independientes['tecnica'] == "Independientes" and reducidas['replicas'] == 2 * independientes['replicas']
+    assert reducidas['semiancho'] < independientes['semiancho'] / 1.5
+    # Con 3 ventanillas se espera más que con 4
+    assert reducidas['diferencia'] > 0 and reducidas['media_a'] > reducidas['media_b']
@@ -0,0 +1,76 @@
+"""
+Políticas de descanso de las ventanillas
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from models.descansos import (DescansoDiferido, DescansoEscalonado, DescansoFijo, PresupuestoDescanso,
+                              comparar_descansos, crear_politica, tasas_cerca_de_saturacion)
+from models.simulador import SimuladorBanco
+from models.ventanilla import Ventanilla
+
+
+def _banco(fila=0, ventanillas=3, ahora=0.0, descanso=5):
+    return SimpleNamespace(tiempo_descanso=descanso, fila=[None] * fila,
+                           ventanillas=[Ventanilla(i + 1) for i in range(ventanillas)], reloj=lambda: ahora)
+
+
+def test_fijo_usa_el_descanso_del_banco():
+    banco = _banco()
+    assert DescansoFijo().duracion(banco, banco.ventanillas[0]) == 5
+    assert DescansoFijo(8).duracion(banco, banco.ventanillas[0]) == 8
+
+
+def test_diferido_acumula_deuda_y_la_paga_con_la_fila_corta():
+    politica = DescansoDiferido(max_aplazamientos=3, max_descanso=12)
+    larga, corta = _banco(fila=10), _banco(fila=0)
+    ventanilla = larga.ventanillas[0]
+    assert [politica.duracion(larga, ventanilla) for _ in range(2)] == [0, 0]
+    assert politica.duracion(corta, ventanilla) == 12       # 15 s de deuda, tope 12
+    assert politica.duracion(corta, ventanilla) == 3 + 5    # Resto de la deuda más el de ahora
+    # Tras max_aplazamientos seguidos descansa aunque la fila siga larga
+    assert [politica.duracion(larga, ventanilla) for _ in range(4)] == [0, 0, 0, 12]
+
+
+def test_presupuesto_gasta_bloques_cuando_hay_saldo():
+    politica = PresupuestoDescanso(segundos_por_hora=360, bloque=30, umbral_fila=2)
+    ventanilla = Ventanilla(1)
+    assert politica.duracion(_banco(ahora=0), ventanilla) == 0
+    assert politica.duracion(_banco(ahora=200), ventanilla) == 0            # 20 s de saldo
+    assert politica.duracion(_banco(fila=5, ahora=400), ventanilla) == 0    # Fila larga: espera
+    assert politica.duracion(_banco(fila=0, ahora=400), ventanilla) == 30   # 40 s: toma un bloque
+    # Con el saldo en el tope el bloque se toma aunque la fila sea larga
+    assert politica.duracion(_banco(fila=50, ahora=10_000), ventanilla) == 30
+
+
+def test_escalonado_limita_los_descansos_simultaneos():
+    politica = DescansoEscalonado(max_simultaneos=1)
+    banco = _banco()
+    banco.ventanillas[1].estado = "descansando"
+    assert politica.duracion(banco, banco.ventanillas[0]) == 0
+    banco.ventanillas[1].estado = "libre"
+    assert politica.duracion(banco, banco.ventanillas[0]) == 10  # Recupera el pospuesto
+
+
+def test_crear_politica():
+    assert isinstance(crear_politica("diferido", max_descanso=5), DescansoDiferido)
+    with pytest.raises(ValueError):
+        crear_politica("siesta")
+
+
+def test_descanso_cero_libera_la_ventanilla_al_instante():
+    simulador = SimuladorBanco(1, tasa_llegada=0.05, semilla=2, politica_descanso=DescansoFijo(0))
+    resultado = simulador.ejecutar(3000)
+    assert resultado['descanso_por_hora'] == 0
+    assert all(v.estado != "descansando" for v in simulador.banco.ventanillas)
+
+
+def test_posponer_descansos_recupera_rendimiento_cerca_de_saturacion():
+    tasa = tasas_cerca_de_saturacion(3, factores=(1.2,))
+    filas = comparar_descansos(3, tasas=tasa, duracion=6000, replicas=1,
+                               politicas=(("Fijo", "fijo", {}), ("Presupuesto", "presupuesto", {})))
+    fijo, presupuesto = filas
+    assert presupuesto['rendimiento'] > fijo['rendimiento'] * 1.05
+    assert presupuesto['descanso_por_hora'] < fijo['descanso_por_hora']
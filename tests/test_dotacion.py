@@ -0,0 +1,52 @@
+"""
+Optimizador de dotación por hora contra un SLA de espera
+"""
+
+import math
+
+import pytest
+
+from models.dotacion import _avanzar_busqueda, _cumple, cota_analitica, planificar_dotacion
+
+
+def _buscar(candidato, minimo, cumple_desde):
+    """Recorre la búsqueda con un SLA que se cumple desde `cumple_desde` ventanillas"""
+    hora = {'candidato': candidato, 'minimo': minimo, 'aprobado': None, 'ventanillas': None, 'p95': None}
+    probados = []
+    while hora['candidato'] is not None:
+        c = hora['candidato']
+        probados.append(c)
+        _avanzar_busqueda(hora, {'p95_normales': 100 if c >= cumple_desde else 900}, {'p95_normales': 600})
+    return hora['ventanillas'], probados
+
+
+@pytest.mark.parametrize("candidato, minimo, cumple_desde, ventanillas, probados", [
+    (5, 2, 3, 3, [5, 4, 3, 2]),     # Baja mientras cumple
+    (3, 2, 5, 5, [3, 4, 5]),        # Sube hasta cumplir
+    (4, 4, 2, 4, [4]),              # No baja por debajo del mínimo estable
+])
+def test_busqueda_del_minimo(candidato, minimo, cumple_desde, ventanillas, probados):
+    assert _buscar(candidato, minimo, cumple_desde) == (ventanillas, probados)
+
+
+def test_nan_cuenta_como_cumplido():
+    assert _cumple({'p95_prioritarios': math.nan}, {'p95_prioritarios': 60})
+    assert not _cumple({'p95_prioritarios': 61.0}, {'p95_prioritarios': 60})
+
+
+def test_cota_analitica_crece_con_la_carga():
+    sla = {'p95_prioritarios': 120, 'p95_normales': 600}
+    estable_baja, analitico_baja = cota_analitica(60 / 3600, sla)
+    estable_alta, analitico_alta = cota_analitica(600 / 3600, sla)
+    assert estable_baja <= analitico_baja <= analitico_alta
+    assert estable_alta > 600 / 3600 * 12.5  # Más ventanillas que la carga ofrecida (ρ < 1)
+
+
+def test_plan_cumple_el_sla_y_no_depende_de_los_procesos():
+    sla = {'espera_promedio': 60, 'p95_normales': 300}
+    argumentos = dict(perfil_horario=[0, 400], sla=sla, replicas=2, duracion=1800, semilla=3)
+    plan = planificar_dotacion(procesos=1, **argumentos)
+    assert plan[0]['ventanillas'] == 0
+    assert plan[1]['ventanillas'] >= 1
+    assert all(plan[1]['p95'][clave] <= objetivo for clave, objetivo in sla.items())
+    assert planificar_dotacion(procesos=2, **argumentos) == plan
@@ -0,0 +1,89 @@
+"""
+Enrutamiento entre varias filas (JSQ, JSEW, dos opciones y robo)
+"""
+
+import random
+
+import pytest
+
+from models.banco import Banco
+from models.persona import Persona
+from models.servicio import CatalogoServicio, ServicioUniforme
+from utils.config import GRUPOS_TRANSACCION
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def _banco(n, politica, topologia="ventanilla", robo=False, velocidades=None):
+    reloj = Reloj()
+    banco = Banco(n, reloj=reloj, max_log=50, semillas=1)
+    banco.configurar_servicio(CatalogoServicio(por_defecto=ServicioUniforme(100, 100)), velocidades=velocidades)
+    banco.configurar_filas(topologia, politica, robo, random.Random(5))
+    return banco, reloj
+
+
+def _llega(banco, transaccion=Persona.TRANSACCIONES[0], prioridad=False):
+    banco.contador_personas += 1
+    persona = Persona(banco.contador_personas, prioridad, transaccion)
+    banco.agregar_persona(persona)
+    return persona
+
+
+def _esperando(banco):
+    return [fila.esperando() for fila in banco.enrutador.filas]
+
+
+@pytest.mark.parametrize("politica", ["jsq", "jsew", "dos_opciones"])
+def test_filas_iguales_se_reparten_parejo(politica):
+    banco, _ = _banco(3, politica)
+    for _ in range(3 + 9):  # Tres entran a atención y nueve esperan
+        _llega(banco)
+    # Con dos opciones puede haber una diferencia de uno
+    assert max(_esperando(banco)) - min(_esperando(banco)) <= (0 if politica != "dos_opciones" else 1)
+    assert sum(_esperando(banco)) == 9
+
+
+def test_jsew_considera_la_velocidad_de_las_ventanillas():
+    banco, _ = _banco(2, "jsew", velocidades={1: 4.0, 2: 1.0})
+    for _ in range(2 + 10):
+        _llega(banco)
+    rapida, lenta = _esperando(banco)
+    # La ventanilla 4 veces más rápida recibe bastante más que la mitad
+    assert rapida >= 7 and rapida + lenta == 10
+
+
+def test_jsew_no_estima_liberaciones_en_el_pasado():
+    banco, reloj = _banco(2, "jsew")
+    for _ in range(2):
+        _llega(banco)
+    reloj.ahora = 10_000.0  # Muy después del fin estimado de ambas atenciones
+    enrutador = banco.enrutador
+    assert all(enrutador._espera_estimada(f) == reloj.ahora for f in enrutador.filas)
+
+
+def test_filas_por_transaccion_van_a_su_grupo():
+    banco, _ = _banco(len(GRUPOS_TRANSACCION), "jsew", topologia="transaccion")
+    for grupo, transacciones in GRUPOS_TRANSACCION.items():
+        for _ in range(2):
+            _llega(banco, transacciones[0])
+    assert banco.enrutador.largos() == {grupo: 1 for grupo in GRUPOS_TRANSACCION}
+
+
+def test_robo_atiende_clientes_de_otra_fila():
+    banco, _ = _banco(2, "jsq", robo=True)
+    enrutador = banco.enrutador
+    for _ in range(2 + 4):
+        _llega(banco)
+    ventanilla = banco.ventanillas[0]
+    propia = enrutador._fila_de_ventanilla[ventanilla.id]
+    banco.retirar_de_fila(list(propia.normales))  # Su fila queda vacía
+    ajena = enrutador.filas[1].normales[0]
+    cliente, robado = enrutador.siguiente_para(ventanilla)
+    assert robado and cliente is ajena
+    assert _esperando(banco) == [0, 1]
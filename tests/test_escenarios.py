@@ -0,0 +1,117 @@
+"""
+Escenarios declarativos: validación, búsqueda y compilación en caché
+"""
+
+import json
+
+import pytest
+
+from models import escenarios
+from models.escenarios import (CargaCompilada, Escenario, buscar_escenario, cargar_escenario,
+                               listar_escenarios)
+from models.persona import Persona
+from models.simulador import SimuladorBanco
+from utils.config import DIRECTORIO_ESCENARIOS
+
+
+def _escribir(directorio, nombre, datos):
+    ruta = directorio / nombre
+    ruta.write_text(datos if isinstance(datos, str) else json.dumps(datos), encoding="utf-8")
+    return str(ruta)
+
+
+@pytest.mark.parametrize("datos, mensaje", [
+    ({"ventanillas": 0}, "ventanillas"),
+    ({"ventanillas": True}, "ventanillas"),
+    ({"colores": "rojo"}, "claves desconocidas"),
+    ({"fila_inicial": ["vip"]}, "fila_inicial"),
+    ({"llegadas": {"tipo": "poisson"}}, "tasa"),
+    ({"llegadas": {"tipo": "uniforme", "intervalo": [5, 1]}}, "intervalo"),
+    ({"llegadas": {"tipo": "horaria", "tasas_horarias": [0, 0]}}, "tasas_horarias"),
+    ({"llegadas": {"proporcion_prioritarios": 1.5}}, "proporcion_prioritarios"),
+    ({"servicio": {"Depósito": ["uniforme", 10, 20]}}, "transacción desconocida"),
+    ({"servicio": {Persona.TRANSACCIONES[0]: ["gamma", 2]}}, "servicio de"),
+    ({"descanso": {"politica": "siesta"}}, "política de descanso"),
+])
+def test_escenarios_invalidos(datos, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        Escenario(dict(datos, nombre="prueba"))
+
+
+def test_listar_omite_los_invalidos_si_se_piden_errores(tmp_path):
+    _escribir(tmp_path, "a.json", {"ventanillas": 2})
+    _escribir(tmp_path, "b.json", "{no es json")
+    _escribir(tmp_path, "c.json", {"ventanillas": -1})
+    _escribir(tmp_path, "notas.txt", "ignorado")
+    errores = []
+    assert [e.nombre for e in listar_escenarios(str(tmp_path), errores)] == ["a"]
+    assert [archivo for archivo, _ in errores] == ["b.json", "c.json"]
+    assert "JSON inválido" in errores[0][1]
+    with pytest.raises(ValueError):
+        listar_escenarios(str(tmp_path))
+    assert listar_escenarios(str(tmp_path / "no_existe")) == []
+
+
+def test_buscar_por_nombre_o_ruta(tmp_path):
+    ruta = _escribir(tmp_path, "a.json", {"ventanillas": 2, "nombre": "manana"})
+    _escribir(tmp_path, "roto.json", {"ventanillas": 0})
+    assert buscar_escenario("manana", str(tmp_path)).ventanillas == 2
+    assert buscar_escenario(ruta, str(tmp_path)).nombre == "manana"
+    with pytest.raises(ValueError, match="ventanillas"):
+        buscar_escenario("roto", str(tmp_path))  # Se informa por qué no es válido
+    with pytest.raises(ValueError, match="desconocido"):
+        buscar_escenario("tarde", str(tmp_path))
+
+
+def test_compilar_y_reutilizar_la_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(escenarios, "_COMPILADAS", escenarios.OrderedDict())
+    ruta = _escribir(tmp_path, "a.json", {
+        "ventanillas": 2, "duracion": 3600, "fila_inicial": ["prioritario", "normal"],
+        "llegadas": {"tipo": "poisson", "tasa": 0.05, "retraso": 60}})
+    cache = str(tmp_path / "cache")
+    escenario = cargar_escenario(ruta)
+    carga = escenario.compilar(7, cache=cache)
+    llegadas = list(carga)
+    assert llegadas[:2] == [(0.0, True, llegadas[0][2]), (0.0, False, llegadas[1][2])]
+    assert all(60 <= t <= 3600 for t, _, _ in llegadas[2:])
+    assert all(transaccion in Persona.TRANSACCIONES for _, _, transaccion in llegadas)
+    assert escenario.compilar(7, cache=cache) is carga  # Caché en memoria
+
+    # Otro proceso: sin la caché en memoria se lee el archivo compilado
+    escenarios._COMPILADAS.clear()
+    desde_disco = cargar_escenario(ruta).compilar(7, cache=cache)
+    assert desde_disco is not carga and list(desde_disco) == llegadas
+    assert list(escenario.compilar(8, cache=cache)) != llegadas
+
+    # Editar el archivo cambia la huella
+    _escribir(tmp_path, "a.json", {"ventanillas": 2, "duracion": 3600, "llegadas": {"tipo": "poisson",
+                                                                                     "tasa": 0.05}})
+    assert len(cargar_escenario(ruta).compilar(7, cache=cache)) != len(carga)
+
+
+def test_archivo_compilado_de_otra_version_se_ignora(tmp_path):
+    ruta = tmp_path / "x.llegadas"
+    ruta.write_bytes(b'{"version": 0, "n": 0, "orden": "little", "transacciones": []}\n')
+    assert CargaCompilada.cargar(str(ruta)) is None
+    assert CargaCompilada.cargar(str(tmp_path / "no_existe")) is None
+
+
+def test_parametros_simulador_reproducen_el_escenario():
+    escenario = Escenario({"nombre": "prueba", "ventanillas": 3, "duracion": 2000,
+                           "llegadas": {"tipo": "poisson", "tasa": 0.1},
+                           "servicio": {Persona.TRANSACCIONES[0]: ["uniforme", 30, 30]}})
+
+    def ejecutar():
+        return SimuladorBanco(max_log=1, **escenario.parametros_simulador(5)).ejecutar(2500)
+
+    resultados = ejecutar()
+    assert len(SimuladorBanco(max_log=1, **escenario.parametros_simulador(5)).banco.ventanillas) == 3
+    assert resultados['atendidos'] > 0
+    assert resultados == ejecutar()
+
+
+@pytest.mark.skipif(escenarios.tomllib is None, reason="leer TOML requiere Python 3.11")
+def test_escenarios_incluidos_son_validos():
+    errores = []
+    assert len(listar_escenarios(DIRECTORIO_ESCENARIOS, errores)) == 4
+    assert errores == []
@@ -0,0 +1,49 @@
+"""
+Truncamiento MSER y medias por lotes sobre series sintéticas
+"""
+
+import random
+
+import pytest
+
+from models.estimacion import estimar_con_precision, medias_por_lotes, mser
+
+
+def test_mser_encuentra_el_fin_del_transitorio():
+    rng = random.Random(1)
+    serie = [100.0 - i / 2 + rng.gauss(0, 1) for i in range(200)] + [rng.gauss(10, 1) for _ in range(5000)]
+    truncamiento = mser(serie)
+    assert truncamiento is not None
+    assert 150 <= truncamiento <= 250
+
+
+def test_mser_sin_transitorio_no_descarta_casi_nada():
+    rng = random.Random(2)
+    assert mser([rng.gauss(10, 1) for _ in range(5000)]) < 500
+
+
+def test_mser_con_pocos_datos():
+    assert mser([1.0] * 10) is None
+    # Una serie que crece sin parar nunca se estabiliza
+    assert mser([float(i) for i in range(1000)]) is None
+
+
+def test_medias_por_lotes_cubre_la_media():
+    rng = random.Random(3)
+    serie = [rng.gauss(5, 2) for _ in range(20000)]
+    lote = medias_por_lotes(serie, lotes=20, confianza=0.95)
+    assert lote['tamano_lote'] == 1000
+    assert lote['media'] - lote['semiancho'] <= 5 <= lote['media'] + lote['semiancho']
+    # Semiancho ≈ t(0.975, 19) · σ / √n
+    assert lote['semiancho'] == pytest.approx(2.093 * 2 / 20000 ** 0.5, rel=0.5)
+    assert abs(lote['autocorrelacion']) < 0.5
+
+
+def test_medias_por_lotes_con_lotes_chicos():
+    assert medias_por_lotes([1.0] * 100, lotes=20) is None
+
+
+def test_estimacion_inestable_no_simula():
+    resultado = estimar_con_precision(n_ventanillas=1, tasa_llegada=0.5)
+    assert resultado['inestable'] and not resultado['convergio']
+    assert resultado['atendidos'] == 0
@@ -0,0 +1,88 @@
+"""
+Fila virtual con avisos anticipados y ausencias
+"""
+
+import random
+
+import pytest
+
+from models.banco import Banco
+from models.fila_virtual import FilaVirtual
+from models.persona import Persona
+from models.servicio import CatalogoServicio, ServicioUniforme
+from models.simulador import SimuladorBanco
+
+
+class Anfitrion:
+    """Reloj manual y eventos programados como los del simulador"""
+
+    def __init__(self):
+        self.ahora = 0.0
+        self.eventos = []
+
+    def __call__(self):
+        return self.ahora
+
+    def programar(self, segundos, callback, *args):
+        self.eventos.append((self.ahora + segundos, callback, args))
+
+
+def _fila_virtual(n_ventanillas=1, **opciones):
+    anfitrion = Anfitrion()
+    banco = Banco(n_ventanillas, reloj=anfitrion, max_log=100, semillas=1)
+    banco.configurar_servicio(CatalogoServicio(por_defecto=ServicioUniforme(100, 100)))
+    avisos = []
+    fila = FilaVirtual(banco, anfitrion.programar, lambda p, inicio, v: avisos.append((p.id, inicio, v)),
+                       rng=random.Random(1), **opciones)
+    return fila, banco, anfitrion, avisos
+
+
+def _persona(i):
+    return Persona(i, transaccion=Persona.TRANSACCIONES[0])
+
+
+def test_previsiones_en_orden_de_atencion():
+    fila, banco, _, avisos = _fila_virtual(anticipacion=0)
+    banco.agregar_persona(_persona(1))  # Ocupa la ventanilla
+    for i in (2, 3, 4):
+        fila.emitir_ticket(_persona(i))
+    ocupacion = 100 + banco.tiempo_descanso
+    inicios = [inicio for _, inicio, _ in fila.previsiones()]
+    assert inicios == pytest.approx([ocupacion, 2 * ocupacion, 3 * ocupacion])
+    assert avisos == []
+
+
+def test_avisa_dentro_de_la_anticipacion_y_programa_la_revision():
+    fila, banco, anfitrion, avisos = _fila_virtual(anticipacion=150, prob_ausencia=0.0)
+    banco.agregar_persona(_persona(1))
+    for i in (2, 3):
+        fila.emitir_ticket(_persona(i))
+    # El turno 2 empieza en ~105 s (dentro de la anticipación); el 3 en ~210 s
+    assert [a[0] for a in avisos] == [2]
+    assert fila.estadisticas()['en_camino'] == 1 and len(fila) == 1
+    revisiones = [e for e in anfitrion.eventos if e[1] == fila._revisar]
+    assert len(revisiones) == 1 and revisiones[0][0] == pytest.approx(2 * (100 + banco.tiempo_descanso) - 150)
+
+
+def test_ausente_no_llega_a_la_fila_fisica():
+    fila, banco, anfitrion, _ = _fila_virtual(prob_ausencia=1.0, tolerancia_ausencia=30)
+    fila.emitir_ticket(_persona(1))
+    momento, callback, args = anfitrion.eventos[-1]
+    assert momento == 30 and callback == fila._ausencia
+    anfitrion.ahora = momento
+    callback(*args)
+    assert fila.estadisticas()['ausentes'] == 1 and not banco.fila
+    assert args[0].estado == "ausente"
+
+
+def test_simulacion_con_fila_virtual_cuadra_los_turnos():
+    simulador = SimuladorBanco(3, tasa_llegada=0.2, semilla=4, fila_virtual={'prob_ausencia': 0.1})
+    simulador.ejecutar(20000)
+    estadisticas = simulador.fila_virtual.estadisticas()
+    assert estadisticas['emitidos'] == (estadisticas['en_espera'] + estadisticas['en_camino'] +
+                                        estadisticas['presentados'] + estadisticas['ausentes'])
+    assert estadisticas['ausentes'] / estadisticas['emitidos'] == pytest.approx(0.1, abs=0.03)
+
+    # Sin fila virtual la misma carga deja decenas de clientes esperando en el salón
+    sin_virtual = SimuladorBanco(3, tasa_llegada=0.2, semilla=4).ejecutar(20000)
+    assert estadisticas['fila_fisica_max'] < sin_virtual['en_fila']
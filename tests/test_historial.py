@@ -0,0 +1,64 @@
+"""
+Historial SQLite con escritor en segundo plano
+"""
+
+import math
+import queue
+
+import pytest
+
+from models.historial import HistorialEjecuciones
+from models.persona import Persona
+
+
+@pytest.fixture
+def historial(tmp_path):
+    historial = HistorialEjecuciones(str(tmp_path / "historial.db"))
+    yield historial
+    historial.cerrar()
+
+
+def _persona(i):
+    persona = Persona(i, prioridad=i % 2 == 0, transaccion=Persona.TRANSACCIONES[i % len(Persona.TRANSACCIONES)])
+    persona.tiempo_llegada = float(i)
+    persona.tiempo_inicio_atencion = i + 0.5
+    persona.tiempo_fin_atencion = i + 2.0
+    return persona
+
+
+def test_clientes_en_lotes_y_metricas(historial):
+    ejecucion_id = historial.iniciar_ejecucion(escenario="prueba", ventanillas=3, semilla=7, tasa_llegada=0.2)
+    otra_id = historial.iniciar_ejecucion(escenario="otra")
+    registro = historial.registro_clientes(ejecucion_id)
+    registro.tamano_lote = 4
+    for i in range(10):
+        registro.registrar(_persona(i), ventanilla_id=i % 3 + 1)
+    registro.vaciar()
+    historial.finalizar_ejecucion(ejecucion_id, {'atendidos': 10, 'espera': 1.5, 'nan': math.nan,
+                                                 'texto': "x"})
+    historial.cerrar()
+
+    assert historial.filas_escritas == 10 and historial.error is None
+    [ejecucion] = historial.ejecuciones(escenario="prueba")
+    assert ejecucion['id'] == ejecucion_id != otra_id
+    assert ejecucion['semilla'] == "7" and ejecucion['fin'] is not None
+    assert ejecucion['parametros'] == {'tasa_llegada': 0.2}
+    assert ejecucion['metricas'] == {'atendidos': 10.0, 'espera': 1.5}  # Solo valores numéricos finitos
+    clientes = list(historial.clientes(ejecucion_id))
+    assert [c[0] for c in clientes] == list(range(10))
+    assert clientes[3][4:] == (3.0, 3.5, 5.0)
+
+
+def test_error_del_escritor_llega_a_quien_espera(historial):
+    respuesta = queue.SimpleQueue()
+    historial._cola.put(("INSERT INTO ejecuciones (inicio) VALUES (?)", None, respuesta))  # No es un error de SQLite
+    assert isinstance(respuesta.get(timeout=5), TypeError)
+    assert isinstance(historial.error, TypeError)
+    # El hilo escritor sigue vivo
+    assert isinstance(historial.iniciar_ejecucion(escenario="despues"), int)
+
+
+def test_escritor_detenido_no_bloquea(historial):
+    historial.cerrar()
+    with pytest.raises(RuntimeError):
+        historial.iniciar_ejecucion(escenario="tarde")
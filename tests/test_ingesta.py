@@ -0,0 +1,90 @@
+"""
+Ingreso de clientes desde productores externos
+"""
+
+import socket
+import threading
+
+import pytest
+
+from models.banco import Banco
+from models.ingesta import ColaIngesta, ServidorIngesta
+from models.persona import Persona
+
+
+def _banco():
+    banco = Banco(max_log=100, semillas=3)
+    banco.ventanillas = []  # Sin ventanillas la fila solo crece
+    return banco
+
+
+@pytest.mark.parametrize("linea, esperado", [
+    ("P\n", (True, None, "socket")),
+    (" n ", (False, None, "socket")),
+    ('{"prioridad": true, "transaccion": "Consulta de saldo", "origen": "app"}',
+     (True, "Consulta de saldo", "app")),
+    ("{}", (False, None, "socket")),
+])
+def test_interpretar_lineas_validas(linea, esperado):
+    assert ServidorIngesta.interpretar(linea) == esperado
+
+
+@pytest.mark.parametrize("linea", [
+    "hola",
+    "[1, 2]",
+    '{"transaccion": "Depósito"}',
+    '{"transaccion": 5}',
+])
+def test_interpretar_rechaza_solicitudes_invalidas(linea):
+    with pytest.raises(ValueError):
+        ServidorIngesta.interpretar(linea)
+
+
+def test_cola_llena_rechaza_y_cuenta_por_origen():
+    cola = ColaIngesta(capacidad=2)
+    assert cola.ingresar(origen="a") and cola.ingresar(origen="a")
+    assert not cola.ingresar(origen="b")
+    assert cola.rechazados.valor(origen="b") == 1 and cola.pendientes() == 2
+
+
+def test_drenar_en_lotes_respeta_orden_y_datos():
+    banco = _banco()
+    cola = ColaIngesta(tamano_lote=3)
+    for i in range(5):
+        cola.ingresar(i == 0, Persona.TRANSACCIONES[i], origen="kiosco")
+    primeras = cola.drenar(banco)
+    assert [p.transaccion for p in primeras] == list(Persona.TRANSACCIONES[:3])
+    assert primeras[0].prioridad and not primeras[1].prioridad
+    assert len(cola.drenar(banco)) == 2 and cola.drenar(banco) == []
+    assert len(banco.fila) == 5 and cola.ingresados.valor(origen="kiosco") == 5
+    assert cola.espera.resumen()[0] == 5
+
+
+def test_productores_concurrentes_no_pierden_solicitudes():
+    cola = ColaIngesta(capacidad=100000)
+    hilos = [threading.Thread(target=lambda: [cola.ingresar(origen="hilo") for _ in range(2000)])
+             for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    banco = _banco()
+    while cola.drenar(banco, maximo=5000):
+        pass
+    assert len(banco.fila) == 16000
+    assert len({p.id for p in banco.fila}) == 16000
+
+
+def test_servidor_responde_por_linea():
+    cola = ColaIngesta(capacidad=1)
+    servidor = ServidorIngesta(cola).iniciar()
+    try:
+        with socket.create_connection(("127.0.0.1", servidor.puerto), timeout=5) as conexion:
+            archivo = conexion.makefile("rwb")
+            archivo.write(b'{"transaccion": "Nada"}\nP\nN\n')
+            archivo.flush()
+            respuestas = [archivo.readline() for _ in range(3)]
+            archivo.close()
+        assert respuestas == [b"ERROR\n", b"OK\n", b"LLENO\n"]
+    finally:
+        servidor.detener()
@@ -0,0 +1,52 @@
+"""
+Vista compacta de ventanillas: solo se redibujan las celdas que cambiaron
+"""
+
+import pytest
+
+pytest.importorskip("PIL")
+pytest.importorskip("tkinter")
+
+from models.banco import Banco  # noqa: E402
+from models.persona import Persona  # noqa: E402
+from views.interfaz_banco import InterfazBanco  # noqa: E402
+
+
+class CanvasFalso:
+    def __init__(self):
+        self.cambios = []
+
+    def itemconfigure(self, item, **opciones):
+        self.cambios.append((item, opciones))
+
+
+class InterfazSinVentana(InterfazBanco):
+    """La lógica de la vista compacta sin crear la ventana de Tk"""
+
+    def __init__(self, n_ventanillas):
+        self.banco = Banco(n_ventanillas, max_log=10, semillas=1)
+        self.vista_compacta = True
+        self.canvas_ventanillas = CanvasFalso()
+        self.ventanillas_gui = [{'rect': ("rect", v.id), 'texto': ("texto", v.id), 'ventanilla': v,
+                                 'ultimo_estado': None} for v in self.banco.ventanillas]
+
+    def actualizar_estadisticas(self):
+        pass
+
+
+def test_solo_se_redibujan_las_ventanillas_que_cambiaron():
+    interfaz = InterfazSinVentana(12)
+    interfaz.actualizar_estado_ventanillas()
+    assert len(interfaz.canvas_ventanillas.cambios) == 2 * 12
+
+    interfaz.canvas_ventanillas.cambios.clear()
+    interfaz.actualizar_estado_ventanillas()
+    assert interfaz.canvas_ventanillas.cambios == []
+
+    ventanilla = interfaz.banco.ventanillas[4]
+    ventanilla.asignar_cliente(Persona(1, transaccion=Persona.TRANSACCIONES[0]), 12)
+    interfaz.actualizar_estado_ventanillas()
+    assert interfaz.canvas_ventanillas.cambios == [
+        (("rect", 5), {'fill': "#e74c3c"}),
+        (("texto", 5), {'text': "V5\n12s"}),
+    ]
@@ -0,0 +1,71 @@
+"""
+Agregación y limitación de frecuencia del log
+"""
+
+import pytest
+
+from models.simulador import SimuladorBanco
+from utils.log_agregado import AgregadorLog
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+@pytest.fixture
+def reloj():
+    return Reloj()
+
+
+def test_agregado_escribe_la_primera_y_resume_el_resto(reloj):
+    log = []
+    agregador = AgregadorLog(log, {'ESPERA': "agregado"}, ventana=10, reloj=reloj)
+    for fila in (3, 7, 5):
+        agregador.registrar("ESPERA", f"fila {fila}", fila=fila)
+        reloj.ahora += 1
+    assert log == ["fila 3"]
+
+    reloj.ahora = 10
+    agregador.vaciar()
+    assert log == ["fila 3", "[ESPERA] ×2 en los últimos 10 s, fila máx 7"]
+
+
+def test_sin_repeticiones_no_hay_resumen(reloj):
+    log = []
+    agregador = AgregadorLog(log, {'ESPERA': "agregado"}, ventana=10, reloj=reloj)
+    agregador.registrar("ESPERA", "única")
+    agregador.vaciar(forzar=True)
+    assert log == ["única"]
+
+
+def test_mensajes_perezosos_y_niveles(reloj):
+    log = []
+    llamadas = []
+
+    def lineas():
+        llamadas.append(1)
+        return ["a", "b"]
+
+    agregador = AgregadorLog(log, {'ESPERA': "agregado", 'MONITOREO': "silencio"}, reloj=reloj)
+    for _ in range(50):
+        agregador.registrar("ESPERA", lineas)
+        agregador.registrar("MONITOREO", lineas)
+    agregador.registrar("OTRA", "completa")
+    assert log == ["a", "b", "completa"]
+    assert len(llamadas) == 1  # Los mensajes repetidos no se formatean
+
+
+def test_nivel_invalido(reloj):
+    with pytest.raises(ValueError):
+        AgregadorLog([], {'ESPERA': "todo"}, reloj=reloj)
+
+
+def test_simulador_cierra_la_ultima_ventana():
+    simulador = SimuladorBanco(1, tasa_llegada=0.5, semilla=1, max_log=None)
+    simulador.ejecutar(600)
+    resumenes = [linea for linea in simulador.banco.log if "×" in linea]
+    assert resumenes and simulador.banco.agregador_log._ventanas == {}
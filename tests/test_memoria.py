@@ -0,0 +1,82 @@
+"""
+Perfil de memoria: conteos, crecimiento por hora y líneas que crecen
+"""
+
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from models.persona import Persona
+from utils.memoria import PerfilMemoria, _pendiente_por_hora, resumir_reporte
+
+
+class BancoFalso:
+    def __init__(self):
+        self.ahora = 0.0
+        self.log = []
+
+    def reloj(self):
+        return self.ahora
+
+
+def test_pendiente_por_hora():
+    assert _pendiente_por_hora([(0, 5)]) is None
+    assert _pendiente_por_hora([(0, 1), (0, 2)]) is None
+    assert _pendiente_por_hora([(0, 10), (1800, 15), (3600, 20)]) == pytest.approx(10)
+
+
+def test_fuga_aparece_en_el_crecimiento_y_en_las_lineas(tmp_path):
+    banco = BancoFalso()
+    fugados = []
+    gc.collect()
+    perfil = PerfilMemoria(banco, contadores={'pendientes': lambda: len(fugados)}).iniciar()
+    try:
+        for hora in range(1, 4):
+            banco.ahora = hora * 3600.0
+            for i in range(200):
+                fugados.append(Persona(i, transaccion=Persona.TRANSACCIONES[0]))
+                fugados.append(bytearray(1024))
+            banco.log.append("evento")
+            gc.collect()  # Basura cíclica de otras pruebas no debe mover los conteos
+            perfil.muestrear()
+        crecimiento = perfil.crecimiento_por_hora()
+        assert crecimiento['pendientes'] == pytest.approx(400)
+        assert crecimiento['Persona'] == pytest.approx(200)
+        assert crecimiento['log_banco'] == pytest.approx(1)
+        assert crecimiento['memoria_kb'] > 200  # Al menos los bytearray de 1 KB
+
+        reporte = perfil.reporte()
+        assert reporte['horas'] == 3 and reporte['muestras'] == 4
+        assert len(reporte['serie']) == 4 and reporte['serie'][-1]['pendientes'] == 1200
+        assert any(__file__ in d['linea'] and d['delta_kb'] > 0 for d in reporte['lineas_desde_inicio'])
+
+        ruta = tmp_path / "memoria.json"
+        perfil.guardar(str(ruta))
+        assert json.loads(ruta.read_text(encoding="utf-8"))['muestras'] == 4
+        assert resumir_reporte(reporte)[0].startswith("4 muestras en 3.00 h")
+    finally:
+        perfil.detener()
+    assert not tracemalloc.is_tracing()
+
+
+def test_sin_fuga_no_hay_crecimiento_de_objetos():
+    banco = BancoFalso()
+    gc.collect()
+    perfil = PerfilMemoria(banco).iniciar()
+    try:
+        for hora in range(1, 4):
+            banco.ahora = hora * 3600.0
+            temporales = [Persona(i, transaccion=Persona.TRANSACCIONES[0]) for i in range(200)]
+            del temporales
+            gc.collect()
+            perfil.muestrear()
+        assert perfil.crecimiento_por_hora()['Persona'] == 0
+    finally:
+        perfil.detener()
+
+
+def test_reporte_vacio():
+    assert PerfilMemoria(BancoFalso()).reporte() == {}
+    assert resumir_reporte({}) == ["(sin muestras)"]
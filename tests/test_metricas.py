@@ -0,0 +1,64 @@
+"""
+Formato de exposición de texto de Prometheus
+"""
+
+import math
+
+import pytest
+
+from utils.metricas import Contador, Histograma, Medidor, RegistroMetricas, _formatear_valor
+
+
+@pytest.mark.parametrize("valor, texto", [
+    (1234567, "1234567"),
+    (2 ** 60, "1152921504606846976"),
+    (0.1, "0.1"),
+    (1 / 3, "0.3333333333333333"),
+    (math.inf, "+Inf"),
+    (-math.inf, "-Inf"),
+    (math.nan, "NaN"),
+])
+def test_valores_sin_perder_precision(valor, texto):
+    assert _formatear_valor(valor) == texto
+    if isinstance(valor, float) and not math.isinf(valor) and valor == valor:
+        assert float(texto) == valor
+
+
+def test_etiquetas_escapadas():
+    contador = Contador("clientes_total", "Clientes\npor origen", ("origen",))
+    contador.inc(origen='caja "2" \\ norte\nsur')
+    assert contador.exponer() == [
+        "# HELP clientes_total Clientes\\npor origen",
+        "# TYPE clientes_total counter",
+        'clientes_total{origen="caja \\"2\\" \\\\ norte\\nsur"} 1',
+    ]
+
+
+def test_medidor_y_contador():
+    medidor = Medidor("fila", "Fila", ("prioridad",))
+    medidor.inc(3, prioridad="normal")
+    medidor.dec(prioridad="normal")
+    medidor.fijar(2.5, prioridad="prioritario")
+    assert medidor.valor(prioridad="normal") == 2
+    assert 'fila{prioridad="prioritario"} 2.5' in medidor.exponer()
+
+
+def test_histograma_acumulado():
+    histograma = Histograma("espera", "Espera", buckets=(10, 60))
+    for valor in (5, 10, 30, 100):
+        histograma.observar(valor)
+    assert histograma.exponer()[2:] == [
+        'espera_bucket{le="10"} 2',   # El límite es inclusivo
+        'espera_bucket{le="60"} 3',
+        'espera_bucket{le="+Inf"} 4',
+        "espera_sum 145.0",
+        "espera_count 4",
+    ]
+    assert histograma.resumen() == (4, 145.0)
+
+
+def test_registro_termina_en_salto_de_linea():
+    registro = RegistroMetricas()
+    registro.agregar(Contador("a_total", "A")).inc()
+    texto = registro.exponer()
+    assert texto.endswith("\n") and texto.count("\n") == 3
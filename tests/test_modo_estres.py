@@ -0,0 +1,104 @@
+"""
+Modo de estrés sobre una interfaz sin ventana
+"""
+
+import json
+import time
+
+from models.banco import Banco
+from utils.temporizadores import RegistroTemporizadores
+from views.modo_estres import ModoEstres
+
+
+class RaizFalsa:
+    """after/after_cancel de Tk: los callbacks se disparan a mano"""
+
+    def __init__(self):
+        self.programados = {}
+        self._siguiente = 0
+
+    def after(self, retardo_ms, funcion, *args):
+        self._siguiente += 1
+        self.programados[self._siguiente] = (funcion, args)
+        return self._siguiente
+
+    def after_cancel(self, after_id):
+        self.programados.pop(after_id, None)
+
+    def disparar_todo(self, maximo=100):
+        for _ in range(maximo):
+            if not self.programados:
+                return
+            after_id = min(self.programados)
+            funcion, args = self.programados.pop(after_id)
+            funcion(*args)
+
+
+class InterfazFalsa:
+    def __init__(self):
+        self.raiz = RaizFalsa()
+        self.temporizadores = RegistroTemporizadores(self.raiz)
+        self.banco = Banco(3, max_log=100, semillas=1)
+        self.simulacion_activa = False
+        self.escenario_activo = None
+
+    def reiniciar_sistema(self, mostrar_mensajes=True):
+        self.banco.fila.clear()
+
+    def limpiar_fila_automatica(self):
+        self.banco.retirar_de_fila(self.banco.fila[:10])
+
+    def actualizar_estado_ventanillas(self):
+        time.sleep(0.01)
+        self.actualizar_estadisticas()
+
+    def actualizar_estadisticas(self):
+        time.sleep(0.01)
+
+    def actualizar_log(self):
+        pass
+
+    def actualizar_posiciones_fila(self):
+        pass
+
+
+def test_llamadas_anidadas_no_se_cuentan_dos_veces(tmp_path):
+    interfaz = InterfazFalsa()
+    estres = ModoEstres(interfaz, tasas=(10,), duracion_paso=60, ruta_reporte=str(tmp_path / "r.json"))
+    estres.iniciar()
+    inicio = time.perf_counter()
+    interfaz.actualizar_estado_ventanillas()
+    total = time.perf_counter() - inicio
+
+    paso = estres._paso
+    assert paso['llamadas']['actualizar_estado_ventanillas'] == 1
+    assert paso['llamadas']['actualizar_estadisticas'] == 1
+    assert paso['tiempos']['actualizar_estadisticas'] == 0.0  # Ya está dentro de la externa
+    assert sum(paso['tiempos'].values()) <= total
+
+
+def test_recorre_las_tasas_y_escribe_el_reporte(tmp_path):
+    interfaz = InterfazFalsa()
+    ruta = tmp_path / "reporte.json"
+    estres = ModoEstres(interfaz, tasas=(10, 100), duracion_paso=0, umbral_lag_ms=10_000, ruta_reporte=str(ruta))
+    estres.iniciar()
+    interfaz.raiz.disparar_todo()
+
+    reporte = json.loads(ruta.read_text(encoding="utf-8"))
+    assert reporte['motivo'] == "se completaron todas las tasas"
+    assert [p['tasa_objetivo'] for p in reporte['pasos']] == [10, 100]
+    assert reporte['capacidad_llegadas_por_segundo'] == 100
+    assert not interfaz.simulacion_activa and interfaz.temporizadores.pendientes() == 0
+    assert "actualizar_log" not in vars(interfaz)  # Se quitaron los envoltorios
+
+
+def test_se_detiene_al_superar_el_umbral(tmp_path):
+    interfaz = InterfazFalsa()
+    ruta = tmp_path / "reporte.json"
+    estres = ModoEstres(interfaz, tasas=(10, 100), duracion_paso=0, umbral_lag_ms=-1, ruta_reporte=str(ruta))
+    estres.iniciar()
+    interfaz.raiz.disparar_todo()
+
+    reporte = json.loads(ruta.read_text(encoding="utf-8"))
+    assert len(reporte['pasos']) == 1 and reporte['motivo'].startswith("retraso p95")
+    assert reporte['capacidad_llegadas_por_segundo'] == 0
@@ -0,0 +1,101 @@
+"""
+Entrega asíncrona de notificaciones por lotes
+"""
+
+import json
+import threading
+import time
+
+from utils.notificaciones import DespachadorNotificaciones, Notificacion, SumideroArchivo, SumideroPantalla
+
+
+def _notificacion(i):
+    return Notificacion(i, "Consulta de saldo", 1, f"Cliente {i}: listo")
+
+
+def _esperar(condicion, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while not condicion():
+        assert time.monotonic() < limite, "tiempo de espera agotado"
+        time.sleep(0.01)
+
+
+class SumideroLento:
+    """Bloquea cada entrega hasta que se libere el evento"""
+
+    nombre = "lento"
+    trabajadores = 1
+
+    def __init__(self):
+        self.liberar = threading.Event()
+        self.lotes = []
+
+    def entregar(self, lote):
+        self.liberar.wait(5)
+        self.lotes.append(list(lote))
+
+
+class SumideroFallido:
+    nombre = "fallido"
+
+    def __init__(self, fallos):
+        self.fallos = fallos
+        self.intentos = 0
+
+    def entregar(self, lote):
+        self.intentos += 1
+        if self.intentos <= self.fallos:
+            raise OSError("sin conexión")
+
+
+def test_entrega_por_lotes_a_pantalla_y_archivo(tmp_path):
+    pantalla = SumideroPantalla()
+    ruta = tmp_path / "notificaciones.jsonl"
+    despachador = DespachadorNotificaciones([pantalla, SumideroArchivo(str(ruta))], tamano_lote=5)
+    try:
+        for i in range(12):
+            assert despachador.enviar(_notificacion(i))
+        recibidas = []
+        _esperar(lambda: recibidas.extend(pantalla.drenar()) or len(recibidas) == 12)
+        _esperar(lambda: despachador.estadisticas()['archivo']['entregadas'] == 12)
+    finally:
+        despachador.detener()
+    assert sorted(n.cliente_id for n in recibidas) == list(range(12))
+    # Un solo trabajador en el archivo: las líneas quedan en orden y sin intercalar
+    lineas = [json.loads(linea) for linea in ruta.read_text(encoding="utf-8").splitlines()]
+    assert [linea['cliente'] for linea in lineas] == list(range(12))
+
+
+def test_sumidero_lento_descarta_sin_bloquear_a_los_demas():
+    lento, pantalla = SumideroLento(), SumideroPantalla()
+    despachador = DespachadorNotificaciones([lento, pantalla], capacidad=2, tamano_lote=1)
+    try:
+        aceptadas = []
+        for i in range(10):
+            inicio = time.monotonic()
+            aceptadas.append(despachador.enviar(_notificacion(i)))
+            assert time.monotonic() - inicio < 0.1  # Encolar nunca espera al sumidero lento
+            time.sleep(0.02)
+        assert not all(aceptadas)
+        _esperar(lambda: despachador.estadisticas()['pantalla']['entregadas'] == 10)
+        incidencias = despachador.drenar_incidencias()
+        assert incidencias and all(s == "lento" and motivo == "cola llena" for s, _, motivo in incidencias)
+        assert despachador.estadisticas()['lento']['descartadas'] == len(incidencias)
+    finally:
+        lento.liberar.set()
+        despachador.detener()
+
+
+def test_reintentos_y_lote_perdido():
+    recuperable, perdido = SumideroFallido(fallos=1), SumideroFallido(fallos=10)
+    perdido.nombre = "perdido"
+    despachador = DespachadorNotificaciones([recuperable, perdido], trabajadores=1, reintentos=2)
+    try:
+        despachador.enviar(_notificacion(1))
+        _esperar(lambda: despachador.estadisticas()['perdido']['fallidas'] == 1)
+        _esperar(lambda: despachador.estadisticas()['fallido']['entregadas'] == 1)
+    finally:
+        despachador.detener()
+    assert perdido.intentos == 3 and recuperable.intentos == 2
+    [(sumidero, lote, motivo)] = despachador.drenar_incidencias()
+    assert sumidero == "perdido" and lote[0].cliente_id == 1 and "3 intentos" in motivo
@@ -0,0 +1,68 @@
+"""
+Exportación .npz del registro columnar
+"""
+
+import ast
+import math
+import struct
+import zipfile
+from array import array
+
+import pytest
+
+from models.persona import Persona
+from models.registro_clientes import COLUMNAS, RegistroClientes
+
+
+def _registro(n=5, tamano_bloque=2):
+    """Registro con varios bloques (el último a medio llenar) y un cliente sin atender"""
+    registro = RegistroClientes(tamano_bloque=tamano_bloque)
+    for i in range(n):
+        persona = Persona(i + 1, prioridad=i % 2 == 0, transaccion=Persona.TRANSACCIONES[i])
+        persona.tiempo_llegada = 10.0 * i
+        if i < n - 1:
+            persona.tiempo_inicio_atencion = 10.0 * i + 1.5
+            persona.tiempo_fin_atencion = 10.0 * i + 12.25
+        registro.registrar(persona, ventanilla_id=i % 3 + 1 if i < n - 1 else 0)
+    return registro
+
+
+def _leer_npy(datos):
+    """Lector mínimo de .npy 1.0 (vectores) para no depender de NumPy"""
+    assert datos[:8] == b"\x93NUMPY\x01\x00"
+    largo = struct.unpack("<H", datos[8:10])[0]
+    assert (10 + largo) % 64 == 0
+    cabecera = ast.literal_eval(datos[10:10 + largo].decode("latin1"))
+    return cabecera, datos[10 + largo:]
+
+
+def test_npz_cabeceras_y_datos(tmp_path):
+    ruta = str(tmp_path / "registro.npz")
+    _registro().exportar(ruta)
+
+    with zipfile.ZipFile(ruta) as zf:
+        assert set(zf.namelist()) == {f"{nombre}.npy" for nombre, _ in COLUMNAS} | {"catalogo_transacciones.npy"}
+        for nombre, codigo in COLUMNAS:
+            cabecera, cuerpo = _leer_npy(zf.read(f"{nombre}.npy"))
+            assert cabecera['shape'] == (5,) and cabecera['fortran_order'] is False
+            valores = array(codigo, cuerpo)
+            assert len(valores) == 5
+            if nombre == "id":
+                assert list(valores) == [1, 2, 3, 4, 5]
+            elif nombre == "inicio_atencion":
+                assert valores[:4].tolist() == [1.5, 11.5, 21.5, 31.5] and math.isnan(valores[4])
+
+
+def test_npz_ida_y_vuelta_con_numpy(tmp_path):
+    np = pytest.importorskip("numpy")
+    ruta = str(tmp_path / "registro.npz")
+    _registro().exportar(ruta)
+
+    with np.load(ruta) as datos:
+        assert datos["id"].tolist() == [1, 2, 3, 4, 5]
+        assert datos["prioridad"].dtype == np.int8
+        assert datos["ventanilla"].tolist() == [1, 2, 3, 1, 0]
+        assert datos["fin_atencion"][:4].tolist() == [12.25, 22.25, 32.25, 42.25]
+        assert np.isnan(datos["fin_atencion"][4])
+        catalogo = datos["catalogo_transacciones"]
+        assert [catalogo[c] for c in datos["transaccion"]] == Persona.TRANSACCIONES[:5]
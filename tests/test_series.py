@@ -0,0 +1,94 @@
+"""
+Series multirresolución y reducción de puntos para dibujar
+"""
+
+import pytest
+
+from models.banco import Banco
+from models.persona import Persona
+from utils.series import SerieMultiresolucion, SeriesBanco, lttb, minmax
+
+RESOLUCIONES = ((1, 10), (10, 6))
+
+
+def test_niveles_agregan_y_conservan_memoria_constante():
+    serie = SerieMultiresolucion(RESOLUCIONES)
+    for t in range(200):
+        serie.agregar(t, t % 10)
+    fino, grueso = serie.niveles
+    assert len(fino.cubetas) == 10 and len(grueso.cubetas) == 6
+    # Cada cubeta de 10 s resume los valores 0..9
+    assert all(c[1:] == (0, 9, 4.5, 10) for c in grueso.cubetas)
+    assert [c[0] for c in grueso.cubetas] == [130, 140, 150, 160, 170, 180]
+    # La cubeta de 190 s aún no recibe el segundo 199, abierto en el nivel fino
+    assert grueso.abierta() == (190, 0, 8, 4.0, 9)
+
+
+def test_ventana_elige_el_nivel_que_la_cubre():
+    serie = SerieMultiresolucion(RESOLUCIONES)
+    for t in range(100):
+        serie.agregar(t, float(t))
+    assert [c[0] for c in serie.ventana(5, 99)] == [94, 95, 96, 97, 98, 99]  # Nivel de 1 s, con la abierta
+    larga = serie.ventana(50, 99)
+    assert [c[0] for c in larga] == [50, 60, 70, 80, 90]  # Nivel de 10 s
+    assert larga[0][1:] == (50.0, 59.0, 54.5)
+
+
+def test_minmax_conserva_los_picos_en_orden():
+    cubetas = [(t, 0.0, 0.0, 0.0) for t in range(100)]
+    cubetas[37] = (37, -5.0, 0.0, -1.0)
+    cubetas[12] = (12, 0.0, 8.0, 1.0)
+    puntos = minmax(cubetas, 10)
+    assert len(puntos) == 10
+    assert (12, 8.0) in puntos and (37, -5.0) in puntos
+    assert [t for t, _ in puntos] == sorted(t for t, _ in puntos)
+
+
+def test_lttb_conserva_extremos_y_forma():
+    puntos = [(t, 0.0) for t in range(1000)]
+    puntos[500] = (500, 100.0)
+    reducidos = lttb(puntos, 20)
+    assert len(reducidos) == 20
+    assert reducidos[0] == puntos[0] and reducidos[-1] == puntos[-1]
+    assert (500, 100.0) in reducidos
+    assert lttb(puntos[:10], 20) == puntos[:10]
+
+
+def test_puntos_respeta_el_maximo():
+    serie = SerieMultiresolucion(((1, 500),))
+    for t in range(500):
+        serie.agregar(t, t % 7)
+    assert len(serie.puntos(500, 499, 50, metodo="lttb")) == 50
+    assert len(serie.puntos(500, 499, 50)) == 50
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_series_banco_muestrea_fila_y_rendimiento():
+    reloj = Reloj()
+    banco = Banco(1, reloj=reloj, max_log=50, semillas=1)
+    series = SeriesBanco(banco, RESOLUCIONES)
+    for i, prioridad in enumerate((False, True, False), start=1):
+        banco.agregar_persona(Persona(i, prioridad, Persona.TRANSACCIONES[0]))
+    series.muestrear()
+    assert series.series['ocupadas'].ultimo == 1
+    assert series.series['fila_prioritarios'].ultimo == 1 and series.series['fila_normales'].ultimo == 1
+    assert series.series['rendimiento'].ultimo is None  # Hace falta una muestra anterior
+
+    reloj.ahora = 30.0
+    banco.clientes_atendidos += 2
+    series.muestrear()
+    assert series.series['rendimiento'].ultimo == pytest.approx(4.0)  # 2 clientes en medio minuto
+
+    reloj.ahora = 60.0
+    banco.clientes_atendidos = 0  # Reinicio del sistema
+    series.muestrear()
+    assert series.series['rendimiento'].ultimo == 0
+    series.reiniciar()
+    assert series.series['ocupadas'].ultimo is None
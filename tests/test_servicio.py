@@ -0,0 +1,78 @@
+"""
+Servicio por transacción y ventanillas heterogéneas
+"""
+
+import pytest
+
+from models.banco import Banco
+from models.persona import Persona
+from models.servicio import CatalogoServicio, ServicioEmpirico, ServicioUniforme
+
+T = Persona.TRANSACCIONES
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def _banco(n=2):
+    reloj = Reloj()
+    return Banco(n, reloj=reloj, max_log=50, semillas=1), reloj
+
+
+def _cliente(banco, transaccion, prioridad=False):
+    banco.contador_personas += 1
+    persona = Persona(banco.contador_personas, prioridad, transaccion)
+    banco.agregar_persona(persona)
+    return persona
+
+
+def test_velocidad_divide_el_tiempo_y_estima_el_fin():
+    banco, reloj = _banco(1)
+    reloj.ahora = 100.0
+    banco.configurar_servicio(CatalogoServicio(por_defecto=ServicioEmpirico([200, 400])), velocidades={1: 2.0})
+    _cliente(banco, T[0])
+    ventanilla = banco.ventanillas[0]
+    assert ventanilla.tiempo_restante in (100, 200)  # La media (150) nunca sale
+    # Estimación con el tiempo sorteado (no con la media) más el descanso
+    assert ventanilla.libre_estimado == 100.0 + ventanilla.tiempo_restante + banco.tiempo_descanso
+
+
+def test_asignacion_heterogenea_prefiere_la_ventanilla_rapida():
+    banco, _ = _banco(2)
+    banco.configurar_servicio(CatalogoServicio(por_defecto=ServicioUniforme(100, 100)),
+                              velocidades={1: 0.5, 2: 2.0})
+    _cliente(banco, T[0])
+    assert banco.ventanillas[1].cliente is not None and banco.ventanillas[0].esta_libre()
+
+
+def test_habilidades_envian_cada_transaccion_a_su_ventanilla():
+    banco, _ = _banco(2)
+    banco.configurar_servicio(habilidades={1: [T[0]], 2: T[1:]})
+    _cliente(banco, T[1])
+    _cliente(banco, T[0])
+    assert banco.ventanillas[1].cliente.transaccion == T[1]
+    assert banco.ventanillas[0].cliente.transaccion == T[0]
+
+
+@pytest.mark.parametrize("habilidades", [
+    {1: ["Depósito"], 2: T},            # Transacción desconocida
+    {1: T, 3: T},                       # Ventanilla inexistente
+    {1: [T[0]], 2: [T[0]]},             # Transacciones sin ventanilla
+])
+def test_habilidades_invalidas(habilidades):
+    banco, _ = _banco(2)
+    with pytest.raises(ValueError):
+        banco.configurar_servicio(habilidades=habilidades)
+
+
+def test_cliente_que_nadie_atiende_se_rechaza():
+    banco, _ = _banco(2)
+    banco.configurar_servicio(habilidades={1: T, 2: T})
+    _cliente(banco, "Trámite inexistente")
+    assert not banco.fila and all(v.esta_libre() for v in banco.ventanillas)
+    assert any("[RECHAZO]" in linea for linea in banco.log)
@@ -0,0 +1,61 @@
+"""
+Tablero de terminal: avance de la simulación y agregados por cuadro
+"""
+
+import pytest
+
+from models.ingesta import ColaIngesta
+from models.simulador import SimuladorBanco
+from views.tablero_terminal import TableroTerminal
+
+
+class Publicador:
+    def __init__(self):
+        self.cuadros = 0
+
+    def publicar(self, banco):
+        self.cuadros += 1
+
+
+def _tablero(**opciones):
+    simulador = SimuladorBanco(3, tasa_llegada=0.2, semilla=3, max_log=50)
+    return TableroTerminal(simulador, **opciones), simulador
+
+
+def test_avanzar_respeta_la_duracion_y_publica_cada_cuadro():
+    web = Publicador()
+    tablero, simulador = _tablero(duracion=500, web=web)
+    tablero._avanzar(300)
+    assert simulador.ahora == 300
+    tablero._avanzar(300)
+    assert simulador.ahora == 500 and web.cuadros == 2
+
+
+def test_avanzar_drena_la_ingesta():
+    cola = ColaIngesta()
+    tablero, simulador = _tablero(ingesta=cola)
+    for _ in range(5):
+        cola.ingresar(origen="kiosco-1")
+    tablero._avanzar(1)
+    assert cola.pendientes() == 0
+    assert any("[INGESTA]" in linea for linea in simulador.banco.log)
+
+
+def test_espera_media_incremental_coincide_con_la_total():
+    tablero, simulador = _tablero()
+    for _ in range(5):
+        tablero._avanzar(2000)
+        esperas = list(simulador.esperas[True]) + list(simulador.esperas[False])
+        assert tablero.espera_media() == pytest.approx(sum(esperas) / len(esperas))
+    # Sin esperas nuevas el valor no cambia ni se vuelve a sumar
+    assert tablero.espera_media() == pytest.approx(sum(esperas) / len(esperas))
+
+
+def test_rendimiento_y_utilizacion():
+    tablero, simulador = _tablero()
+    assert tablero.rendimiento() == 0.0 and tablero.utilizacion() == 0.0
+    for _ in range(20):
+        tablero._avanzar(500)
+    # 0.2 clientes/s son 720 por hora; la ventana reciente deja margen de ruido
+    assert tablero.rendimiento() == pytest.approx(720, rel=0.35)
+    assert tablero.utilizacion() == pytest.approx(simulador.resultados()['utilizacion'])
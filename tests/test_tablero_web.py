@@ -0,0 +1,136 @@
+"""
+Tablero web: cambios por cuadro, anillo de marcos y flujo Server-Sent Events
+"""
+
+import http.client
+import json
+
+import pytest
+
+from models.banco import Banco
+from models.persona import Persona
+from views.tablero_web import PublicadorPeriodico, ServidorTablero, SumideroWeb
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class Notificacion:
+    def __init__(self, texto):
+        self.texto = texto
+
+    def como_dict(self):
+        return {'texto': self.texto}
+
+
+def _banco(n=2):
+    reloj = Reloj()
+    return Banco(n, reloj=reloj, max_log=50, semillas=1), reloj
+
+
+def _cliente(banco, prioridad=False):
+    banco.contador_personas += 1
+    banco.agregar_persona(Persona(banco.contador_personas, prioridad, Persona.TRANSACCIONES[0]))
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorTablero()
+    yield servidor
+    servidor.detener()
+
+
+def test_publicar_envia_solo_los_cambios(servidor):
+    banco, reloj = _banco()
+    primero = servidor.publicar(banco)
+    assert set(primero['ventanillas']) == {"1", "2"}
+
+    reloj.ahora = 5.0
+    assert servidor.publicar(banco) == {}  # Solo avanzó el reloj
+
+    _cliente(banco)
+    cambios = servidor.publicar(banco)
+    assert cambios['ventanillas'] == {"1": ["atendiendo", 1]}
+    assert cambios['clientes'] == 1 and 'fila' not in cambios
+
+    servidor.sumidero.entregar([Notificacion("turno 1")])
+    assert servidor.publicar(banco) == {'notificaciones': [{'texto': "turno 1"}]}
+    assert servidor.sumidero.drenar() == []
+
+
+def test_espectador_atrasado_se_desconecta():
+    servidor = ServidorTablero(marcos=2)
+    banco, _ = _banco(1)
+    secuencia, _ = servidor._suscribir()
+    for _ in range(3):
+        _cliente(banco)
+        servidor.publicar(banco)
+    assert servidor._esperar_marcos(secuencia) is None
+    assert [s for s, _ in servidor._esperar_marcos(secuencia + 1)] == [2, 3]
+
+
+def test_flujo_http_de_estado_y_cambios(servidor):
+    banco, _ = _banco()
+    servidor.publicar(banco)
+    servidor.iniciar()
+
+    conexion = http.client.HTTPConnection(servidor.host, servidor.puerto, timeout=5)
+    conexion.request("GET", "/estado")
+    assert json.loads(conexion.getresponse().read())['fila'] == 0
+    conexion.close()
+
+    conexion = http.client.HTTPConnection(servidor.host, servidor.puerto, timeout=5)
+    conexion.request("GET", "/eventos")
+    respuesta = conexion.getresponse()
+    assert respuesta.getheader("Content-Type") == "text/event-stream"
+
+    def leer_evento():
+        lineas = []
+        while True:
+            linea = respuesta.fp.readline().decode("utf-8").rstrip("\n")
+            if not linea:
+                return lineas
+            lineas.append(linea)
+
+    estado = leer_evento()
+    assert "event: estado" in estado
+    _cliente(banco, prioridad=True)
+    _cliente(banco)
+    _cliente(banco)
+    servidor.publicar(banco)
+    delta = leer_evento()
+    assert delta[:2] == ["id: 2", "event: delta"]  # El cuadro 1 es el estado inicial
+    datos = json.loads(delta[2][len("data: "):])
+    assert datos['fila'] == 1 and datos['clientes'] == 3
+    assert servidor.espectadores.valor() == 1
+    conexion.close()
+
+
+def test_publicador_reprograma_el_siguiente_cuadro():
+    programados = []
+
+    class Servidor:
+        cuadros = 0
+
+        def publicar(self, banco):
+            self.cuadros += 1
+
+    servidor = Servidor()
+    publicador = PublicadorPeriodico(servidor, None, lambda ms, callback: programados.append((ms, callback)),
+                                     fps=10).iniciar()
+    assert servidor.cuadros == 1
+    ms, callback = programados[-1]
+    assert 1 <= ms <= 100 and callback == publicador._cuadro
+    callback()
+    assert servidor.cuadros == 2 and len(programados) == 2
+
+
+def test_sumidero_web_conserva_solo_las_ultimas():
+    sumidero = SumideroWeb(maximo=2)
+    sumidero.entregar([Notificacion(str(i)) for i in range(3)])
+    assert sumidero.drenar() == [{'texto': "1"}, {'texto': "2"}]
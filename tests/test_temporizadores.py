@@ -0,0 +1,76 @@
+"""
+Registro de temporizadores cancelables por ámbito
+"""
+
+import itertools
+
+from utils.temporizadores import RegistroTemporizadores
+
+
+class RaizFalsa:
+    """Imita after/after_cancel de Tk con un reloj manual"""
+
+    def __init__(self):
+        self.ahora = 0
+        self._ids = itertools.count()
+        self.programados = {}
+
+    def after(self, retardo_ms, funcion, *args):
+        after_id = f"after#{next(self._ids)}"
+        self.programados[after_id] = (self.ahora + retardo_ms, funcion, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        del self.programados[after_id]
+
+    def avanzar(self, ms):
+        self.ahora += ms
+        for after_id, (momento, funcion, args) in sorted(self.programados.items(), key=lambda e: e[1][0]):
+            if momento <= self.ahora and after_id in self.programados:
+                del self.programados[after_id]
+                funcion(*args)
+
+
+def test_cancelar_un_ambito_y_sus_hijos():
+    raiz = RaizFalsa()
+    registro = RegistroTemporizadores(raiz)
+    disparados = []
+    registro.programar(("ventanilla", 1), 100, disparados.append, "v1")
+    registro.programar(("ventanilla", 2), 100, disparados.append, "v2")
+    registro.programar(("escenario",), 100, disparados.append, "escenario")
+    assert registro.resumen() == {'ventanilla': 2, 'escenario': 1}
+
+    assert registro.cancelar_ambito(("ventanilla",)) == 2
+    assert registro.pendientes() == 1 and len(raiz.programados) == 1
+    raiz.avanzar(100)
+    assert disparados == ["escenario"] and registro.pendientes() == 0
+
+
+def test_cancelar_token_y_disparo_tardio():
+    raiz = RaizFalsa()
+    registro = RegistroTemporizadores(raiz)
+    disparados = []
+    token = registro.programar(("dispositivo", 3), 50, disparados.append, 1)
+    assert registro.cancelar(token) and not registro.cancelar(token)
+
+    # Un callback ya encolado por Tk cuyo temporizador se canceló no se ejecuta
+    token = registro.programar(("dispositivo", 3), 50, disparados.append, 2)
+    _, funcion, args = raiz.programados[next(iter(raiz.programados))]
+    registro._pendientes.pop(token)
+    funcion(*args)
+    assert disparados == []
+
+
+def test_reiniciar_no_deja_temporizadores_vivos():
+    raiz = RaizFalsa()
+    registro = RegistroTemporizadores(raiz)
+
+    def ciclo(i):
+        registro.programar(("ventanilla", i), 10, ciclo, i)
+
+    for i in range(5):
+        ciclo(i)
+    raiz.avanzar(35)
+    assert registro.pendientes(("ventanilla",)) == 5
+    registro.cancelar_ambito(("ventanilla",), ("escenario",))
+    assert registro.pendientes() == 0 and raiz.programados == {}
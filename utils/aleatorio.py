@@ -0,0 +1,114 @@
+"""
+Flujos aleatorios independientes y reproducibles derivados de una semilla maestra
+"""
+
+import hashlib
+import random
+import secrets
+
+
+class GeneradorAntitetico(random.Random):
+    """
+    Generador que devuelve el complemento de cada número de su flujo: 1 - U
+    en lugar de U y n - 1 - k en lugar de k para los enteros. Con la misma
+    semilla que un generador común produce la réplica antitética, negativamente
+    correlacionada con la original.
+    """
+
+    def random(self):
+        return 1.0 - super().random()
+
+    def _randbelow(self, n):
+        return n - 1 - self._randbelow_with_getrandbits(n)
+
+
+class SecuenciaSemillas:
+    """
+    Equivalente con la biblioteca estándar de numpy.random.SeedSequence.
+
+    Cada secuencia queda identificada por la entropía maestra y una ruta de
+    claves; el estado del generador es el SHA-256 de ambas, de modo que dos
+    rutas distintas producen flujos estadísticamente independientes y la
+    misma ruta reproduce siempre el mismo flujo, sin importar el proceso ni
+    el orden en que se creen.
+
+    Las hijas pueden derivarse por posición (`spawn`, como en NumPy) o por
+    nombre (`hija("llegadas")`), que no depende del orden de creación.
+    Una secuencia antitética (y todas sus hijas) produce los complementos
+    de los flujos de la secuencia común con la misma ruta.
+    """
+
+    def __init__(self, entropia=None, ruta=(), antitetica=False):
+        """
+        Inicializa la secuencia
+
+        Args:
+            entropia (int): Semilla maestra (None toma 128 bits del sistema)
+            ruta (tuple): Claves que identifican a la secuencia dentro del árbol
+            antitetica (bool): Si sus generadores devuelven los complementos
+        """
+        if entropia is None:
+            entropia = secrets.randbits(128)
+        self.entropia = int(entropia)
+        self.ruta = tuple(ruta)
+        self.antitetica = antitetica
+        self._hijas_creadas = 0
+
+    def spawn(self, n):
+        """
+        Crea n secuencias hijas numeradas a continuación de las ya creadas
+
+        Returns:
+            list: Secuencias hijas
+        """
+        inicio = self._hijas_creadas
+        self._hijas_creadas += n
+        return [SecuenciaSemillas(self.entropia, self.ruta + (i,), self.antitetica)
+                for i in range(inicio, inicio + n)]
+
+    def hija(self, *claves):
+        """
+        Deriva una secuencia hija por nombre (ej. hija("servicio") o hija("replica", 3))
+
+        Returns:
+            SecuenciaSemillas: Secuencia hija
+        """
+        return SecuenciaSemillas(self.entropia, self.ruta + claves, self.antitetica)
+
+    def complemento(self):
+        """
+        Secuencia pareja con los mismos flujos complementados (réplica antitética)
+
+        Returns:
+            SecuenciaSemillas: Secuencia con la misma ruta y el indicador invertido
+        """
+        return SecuenciaSemillas(self.entropia, self.ruta, not self.antitetica)
+
+    def estado(self):
+        """Entero de 256 bits que siembra el generador de esta secuencia"""
+        clave = repr((self.entropia, self.ruta)).encode("utf-8")
+        return int.from_bytes(hashlib.sha256(clave).digest(), "big")
+
+    def generador(self):
+        """
+        Crea el generador de esta secuencia
+
+        Returns:
+            random.Random: Generador sembrado con el estado de la secuencia
+                (GeneradorAntitetico si la secuencia es antitética)
+        """
+        return (GeneradorAntitetico if self.antitetica else random.Random)(self.estado())
+
+    def __repr__(self):
+        antitetica = ", antitetica=True" if self.antitetica else ""
+        return f"SecuenciaSemillas(entropia={self.entropia}, ruta={self.ruta}{antitetica})"
+
+
+def secuencia(semilla):
+    """
+    Normaliza una semilla entera, None o SecuenciaSemillas a SecuenciaSemillas
+
+    Returns:
+        SecuenciaSemillas: Secuencia equivalente
+    """
+    return semilla if isinstance(semilla, SecuenciaSemillas) else SecuenciaSemillas(semilla)
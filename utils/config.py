@@ -2,6 +2,15 @@
 Configuración global del sistema bancario
 """
 
+import os
+
+# Directorio del proyecto, para que las rutas no dependan del directorio de trabajo
+DIRECTORIO_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Configuración del banco
+SEMILLA_MAESTRA = None  # Entero para repetir exactamente una ejecución (None = al azar)
+NUM_VENTANILLAS = 3
+
 # Configuración de tiempos
 TIEMPO_ATENCION_MIN = 10
 TIEMPO_ATENCION_MAX = 15
@@ -9,11 +18,142 @@ TIEMPO_DESCANSO = 3
 TIEMPO_ENTRE_CLIENTES_MIN = 2000  # ms
 TIEMPO_ENTRE_CLIENTES_MAX = 5000  # ms
 
+# Modelos de tiempo de atención por transacción (segundos a velocidad 1):
+# ("uniforme", mín, máx) o ("lognormal", media, coeficiente de variación)
+TIEMPOS_TRANSACCION = {
+    "Retiro de efectivo": ("uniforme", 6, 12),
+    "Depósito de dinero": ("uniforme", 6, 12),
+    "Pago de servicios": ("uniforme", 8, 14),
+    "Consulta de saldo": ("uniforme", 3, 6),
+    "Transferencia bancaria": ("uniforme", 8, 15),
+    "Solicitud de préstamo": ("lognormal", 30, 0.5),
+    "Pago de tarjeta de crédito": ("uniforme", 6, 12),
+    "Apertura de cuenta": ("lognormal", 25, 0.4),
+    "Certificación financiera": ("uniforme", 10, 18),
+    "Cambio de moneda": ("uniforme", 5, 10)
+}
+VELOCIDADES_VENTANILLA = {}        # id -> factor (ej. {1: 1.3} atiende un 30% más rápido)
+HABILIDADES_VENTANILLA = {}        # id -> transacciones que atiende (sin entrada = todas)
+BUSQUEDA_ASIGNACION = 50           # clientes revisados por asignación con ventanillas heterogéneas
+
+# Política de descanso de las ventanillas: "fijo", "diferido", "presupuesto" o "escalonado"
+POLITICA_DESCANSO = "fijo"
+PARAMETROS_DESCANSO = {}           # Argumentos de la política (ver models/descansos.py)
+
+# Escenarios declarativos (archivos .toml o .json, ver models/escenarios.py)
+DIRECTORIO_ESCENARIOS = os.path.join(DIRECTORIO_PROYECTO, "escenarios")
+CACHE_ESCENARIOS = os.path.join(DIRECTORIO_ESCENARIOS, ".cache")  # cargas compiladas por huella y semilla
+MAX_CACHE_ESCENARIOS = 200              # archivos compilados conservados
+DURACION_ESCENARIO = 28800              # segundos de llegadas precalculadas (una jornada de 8 h)
+
+# Configuración de la topología de filas
+TOPOLOGIA_FILAS = None             # None (fila única), "ventanilla" o "transaccion"
+POLITICA_ENRUTAMIENTO = "jsew"     # "jsq", "jsew" o "dos_opciones"
+ROBO_ENTRE_FILAS = True            # Ventanillas ociosas atienden clientes de otras filas
+GRUPOS_TRANSACCION = {
+    "Caja": ["Retiro de efectivo", "Depósito de dinero", "Pago de servicios",
+             "Pago de tarjeta de crédito", "Cambio de moneda"],
+    "Consultas": ["Consulta de saldo", "Transferencia bancaria", "Certificación financiera"],
+    "Asesoría": ["Solicitud de préstamo", "Apertura de cuenta"]
+}
+
+# Configuración de la fila virtual (turnos remotos con aviso al celular)
+FILA_VIRTUAL = False               # Los clientes esperan fuera y se les avisa
+ANTICIPACION_AVISO = 60            # segundos antes del inicio estimado
+PROB_AUSENCIA = 0.05               # fracción de avisados que no se presentan
+TOLERANCIA_AUSENCIA = 120          # segundos que se espera a un avisado
+RETRASO_PRESENTACION = (5, 45)     # segundos que tarda un avisado en llegar
+
+# Configuración de la estimación secuencial (simulación sin interfaz)
+PRECISION_RELATIVA = 0.05          # semiancho del intervalo / media
+PRECISION_ABSOLUTA = 0.1           # segundos de semiancho que siempre bastan
+CONFIANZA_ESTIMACION = 0.95
+LOTES_ESTIMACION = 20              # lotes del método de medias por lotes
+PASO_ESTIMACION = 5000             # segundos simulados mínimos entre revisiones
+DURACION_MAX_ESTIMACION = 2000000  # segundos simulados antes de rendirse
+REVISIONES_INESTABLE = 5           # revisiones seguidas con la fila creciendo y sin calentamiento
+
+# Configuración de las comparaciones pareadas (reducción de varianza)
+DURACION_PAR = 20000               # segundos simulados por réplica
+PARES_MIN = 5                      # pares antes de evaluar la precisión
+PARES_MAX = 200                    # pares máximos por comparación
+
 # Configuración de la interfaz
-TAMANO_VENTANILLAS = 3
+TAMANO_VENTANILLAS = NUM_VENTANILLAS
+UMBRAL_VISTA_COMPACTA = 6  # Más ventanillas que esto -> vista en cuadrícula
+COLUMNAS_VISTA_COMPACTA = 6
+MAX_DISPOSITIVOS_MOVILES = 6
 MAX_CLIENTES_FILA = 25
 UMBRAL_LIMPIEZA_FILA = 30
 
+# Configuración del registro de actividad
+VENTANA_AGREGACION_LOG = 10  # segundos
+NIVELES_LOG = {              # completo | agregado | silencio (por defecto completo)
+    'ESPERA': 'agregado',
+    'MONITOREO': 'agregado',
+    'GENERACION': 'completo'
+}
+
+# Configuración de notificaciones
+DURACION_NOTIFICACION = 8          # segundos visibles en el dispositivo
+INTERVALO_NOTIFICACIONES = 100     # ms entre revisiones del buzón de pantalla
+CAPACIDAD_COLA_NOTIFICACIONES = 1000
+TRABAJADORES_NOTIFICACIONES = 2
+LOTE_NOTIFICACIONES = 20
+REINTENTOS_NOTIFICACIONES = 3
+
+# Configuración del ingreso de clientes desde kioscos y otros productores
+CAPACIDAD_INGESTA = 5000           # solicitudes pendientes máximas
+LOTE_INGESTA = 200                 # solicitudes procesadas por drenado
+INTERVALO_INGESTA = 100            # ms entre drenados en la interfaz
+
+# Configuración del modo de estrés
+TASAS_ESTRES = (10, 100, 1000, 10000)  # llegadas por segundo en cada paso
+DURACION_PASO_ESTRES = 10              # segundos por paso
+UMBRAL_LAG_ESTRES_MS = 250             # p95 de retraso del bucle que detiene la prueba
+INTERVALO_LATIDO_ESTRES = 50           # ms entre mediciones de retraso
+TICK_ESTRES = 20                       # ms entre lotes de llegadas
+
+# Configuración del tablero de terminal (servidores sin pantalla)
+FPS_TERMINAL = 4                   # cuadros por segundo del tablero
+VELOCIDAD_TERMINAL = 10.0          # segundos simulados por segundo real
+VENTANA_RENDIMIENTO_TERMINAL = 300 # segundos simulados del rendimiento reciente
+EVENTOS_TERMINAL = 8               # líneas del registro visibles
+
+# Configuración del tablero web (Server-Sent Events)
+FPS_WEB = 5                        # cuadros de cambios por segundo
+MARCOS_WEB = 50                    # cuadros conservados para espectadores atrasados
+TIMEOUT_ESCRITURA_WEB = 5.0        # segundos antes de desconectar a un espectador bloqueado
+LATIDO_WEB = 15.0                  # segundos sin cambios entre latidos
+
+# Configuración de las series de tiempo y sus sparklines
+RESOLUCIONES_SERIES = ((1, 300), (10, 360), (60, 1440), (600, 1008))  # (segundos por cubeta, cubetas)
+VENTANAS_SERIES = (300, 3600, 86400, 604800)  # 5 min, 1 h, 1 día, 1 semana
+INTERVALO_SERIES = 1000            # ms entre muestras (y redibujos)
+PUNTOS_SPARKLINE = 120             # puntos máximos por línea
+ALTO_SPARKLINE = 28                # píxeles por sparkline
+
+# Configuración del historial de ejecuciones (SQLite)
+RUTA_HISTORIAL = os.path.join(DIRECTORIO_PROYECTO, "historial.db")  # base por defecto de --historial
+LOTE_HISTORIAL = 5000              # clientes por executemany
+CAPACIDAD_HISTORIAL = 64           # lotes pendientes antes de frenar a la simulación
+ESPERA_HISTORIAL = 30.0            # segundos máximos esperando al escritor
+
+# Configuración de los barridos distribuidos (coordinador y trabajadores por TCP)
+PUERTO_BARRIDO = 8765              # puerto por defecto del coordinador
+REPLICAS_BARRIDO = 3               # réplicas por configuración
+DURACION_BARRIDO = 20000           # segundos simulados por réplica
+PLAZO_UNIDAD_BARRIDO = 300.0       # segundos antes de reasignar una unidad sin respuesta
+INTENTOS_BARRIDO = 3               # entregas máximas de una unidad
+ESPERA_BARRIDO = 1.0               # segundos que espera un trabajador si no hay unidades libres
+RECONEXIONES_BARRIDO = 5           # reconexiones seguidas de un trabajador antes de rendirse
+
+# Configuración del perfil de memoria (--perfil-memoria)
+INTERVALO_MEMORIA = 10000          # ms entre muestras en la interfaz
+INTERVALO_MEMORIA_SIMULADO = 600   # segundos simulados entre muestras sin interfaz
+LINEAS_MEMORIA = 10                # líneas de código en las diferencias de tracemalloc
+MARCOS_MEMORIA = 1                 # marcos de pila guardados por asignación
+
 # Colores de la interfaz
 COLORES = {
     'primary': '#3498db',
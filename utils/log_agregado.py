@@ -0,0 +1,134 @@
+"""
+Agregación y limitación de frecuencia del registro de actividad
+"""
+
+import time
+
+# Niveles de detalle por categoría
+NIVEL_COMPLETO = "completo"    # Todas las líneas de cada evento
+NIVEL_AGREGADO = "agregado"    # Una línea por ventana de tiempo + resumen con repeticiones
+NIVEL_SILENCIO = "silencio"    # No se registra nada
+
+NIVELES_VALIDOS = (NIVEL_COMPLETO, NIVEL_AGREGADO, NIVEL_SILENCIO)
+
+
+class AgregadorLog:
+    """
+    Capa de agregación delante de la lista de log del banco.
+
+    En nivel agregado, la primera ocurrencia de una categoría dentro de la
+    ventana de tiempo se escribe completa; las siguientes solo se cuentan y al
+    vencer la ventana se escribe una única línea de resumen, por ejemplo
+    "[ESPERA] ×57 en los últimos 10 s, fila máx 42".
+    """
+
+    def __init__(self, destino, niveles=None, ventana=10, reloj=time.monotonic):
+        """
+        Inicializa el agregador
+
+        Args:
+            destino (list): Lista donde se escriben las líneas (ej. Banco.log)
+            niveles (dict): Nivel de detalle por categoría (por defecto completo)
+            ventana (float): Duración de la ventana de agregación en segundos
+            reloj (callable): Función que devuelve el tiempo actual en segundos
+        """
+        self.destino = destino
+        self.niveles = {}
+        for categoria, nivel in (niveles or {}).items():
+            self.configurar(categoria, nivel)
+        self.ventana = ventana
+        self.reloj = reloj
+        self._ventanas = {}  # categoria -> [inicio, repeticiones, maximos]
+
+    def configurar(self, categoria, nivel):
+        """
+        Cambia el nivel de detalle de una categoría
+
+        Args:
+            categoria (str): Categoría del log (ej. "ESPERA")
+            nivel (str): Uno de NIVELES_VALIDOS
+        """
+        if nivel not in NIVELES_VALIDOS:
+            raise ValueError(f"Nivel de log inválido para {categoria}: {nivel}")
+        self.niveles[categoria] = nivel
+
+    def nivel(self, categoria):
+        """Devuelve el nivel de detalle configurado para una categoría"""
+        return self.niveles.get(categoria, NIVEL_COMPLETO)
+
+    def registrar(self, categoria, mensaje, **metricas):
+        """
+        Registra un evento de la categoría indicada
+
+        Args:
+            categoria (str): Categoría del evento
+            mensaje (callable | str): Texto o función que devuelve la(s) línea(s).
+                Si es una función solo se evalúa cuando la línea se escribe.
+            **metricas: Valores numéricos cuyo máximo se informa en el resumen
+        """
+        nivel = self.nivel(categoria)
+        if nivel == NIVEL_SILENCIO:
+            return
+
+        if nivel == NIVEL_COMPLETO:
+            self._escribir(mensaje)
+            return
+
+        ahora = self.reloj()
+        actual = self._ventanas.get(categoria)
+
+        if actual is not None and ahora - actual[0] >= self.ventana:
+            self._cerrar_ventana(categoria, actual)
+            actual = None
+
+        if actual is None:
+            # Primera ocurrencia de la ventana: se escribe completa
+            self._ventanas[categoria] = [ahora, 0, dict(metricas)]
+            self._escribir(mensaje)
+            return
+
+        # Ocurrencia repetida: solo se acumula
+        actual[1] += 1
+        maximos = actual[2]
+        for nombre, valor in metricas.items():
+            if valor > maximos.get(nombre, valor - 1):
+                maximos[nombre] = valor
+
+    def vaciar(self, forzar=False):
+        """
+        Escribe los resúmenes de las ventanas vencidas
+
+        Args:
+            forzar (bool): Si cierra también las ventanas aún abiertas
+        """
+        if not self._ventanas:
+            return
+        ahora = self.reloj()
+        for categoria, actual in list(self._ventanas.items()):
+            if forzar or ahora - actual[0] >= self.ventana:
+                self._cerrar_ventana(categoria, actual)
+
+    def reiniciar(self):
+        """Descarta las ventanas abiertas sin escribir resúmenes"""
+        self._ventanas.clear()
+
+    def _cerrar_ventana(self, categoria, actual):
+        """Escribe el resumen de una ventana si hubo repeticiones y la elimina"""
+        del self._ventanas[categoria]
+        _, repeticiones, maximos = actual
+        if repeticiones == 0:
+            return
+
+        resumen = f"[{categoria}] ×{repeticiones} en los últimos {self.ventana:g} s"
+        if maximos:
+            resumen += ", " + ", ".join(f"{nombre} máx {valor}" for nombre, valor in maximos.items())
+        self.destino.append(resumen)
+
+    def _escribir(self, mensaje):
+        """Evalúa el mensaje y lo agrega al destino"""
+        if callable(mensaje):
+            mensaje = mensaje()
+        if isinstance(mensaje, str):
+            self.destino.append(mensaje)
+        else:
+            self.destino.extend(mensaje)
@@ -0,0 +1,190 @@
+"""
+Perfil de memoria para sesiones largas: instantáneas de tracemalloc
+comparadas por línea de código, conteo de objetos del banco y de la
+interfaz, y crecimiento por hora simulada
+"""
+
+import gc
+import json
+import tracemalloc
+
+from utils.config import LINEAS_MEMORIA, MARCOS_MEMORIA
+
+# Clases cuyas instancias vivas se cuentan (por nombre, para no importar los modelos)
+CLASES_CONTADAS = ("Persona", "Ventanilla")
+
+# Asignaciones del propio perfilador y de la maquinaria de importación
+FILTROS_MEMORIA = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _pendiente_por_hora(muestras):
+    """Pendiente por mínimos cuadrados de (t, valor), expresada por hora de t"""
+    if len(muestras) < 2:
+        return None
+    n = len(muestras)
+    media_t = sum(t for t, _ in muestras) / n
+    media_v = sum(v for _, v in muestras) / n
+    stt = sum((t - media_t) ** 2 for t, _ in muestras)
+    if stt == 0:
+        return None
+    return sum((t - media_t) * (v - media_v) for t, v in muestras) / stt * 3600
+
+
+def _diferencias(actual, anterior, lineas):
+    """Las `lineas` líneas de código cuya memoria más cambió entre dos instantáneas"""
+    return [{
+        'linea': f"{d.traceback[0].filename}:{d.traceback[0].lineno}",
+        'kb': d.size / 1024,
+        'delta_kb': d.size_diff / 1024,
+        'delta_bloques': d.count_diff
+    } for d in actual.compare_to(anterior, "lineno")[:lineas]]
+
+
+class PerfilMemoria:
+    """
+    Toma muestras periódicas del uso de memoria de una sesión.
+
+    Cada muestra guarda la memoria rastreada por tracemalloc, las instancias
+    vivas de Persona y Ventanilla, las líneas de Banco.log y los contadores
+    extra que aporte quien lo use (ítems de los Canvas, líneas del Text,
+    temporizadores pendientes...). Solo se conservan dos instantáneas de
+    tracemalloc (la inicial y la anterior), así que el perfilador no crece
+    con la duración de la sesión salvo por las muestras numéricas.
+    """
+
+    def __init__(self, banco, contadores=None, lineas=LINEAS_MEMORIA, marcos=MARCOS_MEMORIA):
+        """
+        Inicializa el perfil
+
+        Args:
+            banco (Banco): Banco cuyo reloj (simulado o real) fecha las muestras
+            contadores (dict): nombre -> función sin argumentos que devuelve un entero
+            lineas (int): Líneas de código a mostrar en las diferencias
+            marcos (int): Marcos de pila que guarda tracemalloc por asignación
+        """
+        self.banco = banco
+        self.contadores = dict(contadores or {})
+        self.lineas = lineas
+        self.marcos = marcos
+        self.muestras = []     # {'t', 'memoria', 'pico', 'conteos'}
+        self.ultimo = None     # Diferencias de la última muestra
+        self._inicial = None
+        self._anterior = None
+        self._iniciado_aqui = False
+
+    def iniciar(self):
+        """Empieza a rastrear asignaciones y toma la muestra inicial"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.marcos)
+            self._iniciado_aqui = True
+        self._inicial = self._anterior = self._instantanea()
+        self.muestrear()
+        return self
+
+    def _instantanea(self):
+        return tracemalloc.take_snapshot().filter_traces(FILTROS_MEMORIA)
+
+    def contar(self):
+        """
+        Returns:
+            dict: nombre -> cantidad actual de cada contador
+        """
+        conteos = dict.fromkeys(CLASES_CONTADAS, 0)
+        for objeto in gc.get_objects():
+            nombre = type(objeto).__name__
+            if nombre in conteos:
+                conteos[nombre] += 1
+        conteos['log_banco'] = len(self.banco.log)
+        for nombre, contador in self.contadores.items():
+            conteos[nombre] = contador()
+        return conteos
+
+    def muestrear(self):
+        """
+        Toma una muestra y la compara con la anterior
+
+        Returns:
+            dict: Última muestra con las diferencias por línea respecto de la
+                anterior ('diferencias') y del inicio ('desde_inicio')
+        """
+        actual_bytes, pico = tracemalloc.get_traced_memory()
+        muestra = {'t': self.banco.reloj(), 'memoria': actual_bytes, 'pico': pico, 'conteos': self.contar()}
+        self.muestras.append(muestra)
+
+        instantanea = self._instantanea()
+        self.ultimo = dict(muestra, diferencias=_diferencias(instantanea, self._anterior, self.lineas),
+                           desde_inicio=_diferencias(instantanea, self._inicial, self.lineas))
+        self._anterior = instantanea
+        return self.ultimo
+
+    def crecimiento_por_hora(self):
+        """
+        Pendiente de cada serie por hora del reloj del banco (simulada en el
+        simulador, real en la interfaz)
+
+        Returns:
+            dict: 'memoria_kb' y cada contador -> crecimiento por hora (None sin datos)
+        """
+        crecimiento = {'memoria_kb': _pendiente_por_hora([(m['t'], m['memoria'] / 1024) for m in self.muestras])}
+        for nombre in (self.muestras[-1]['conteos'] if self.muestras else {}):
+            crecimiento[nombre] = _pendiente_por_hora([(m['t'], m['conteos'].get(nombre, 0))
+                                                      for m in self.muestras])
+        return crecimiento
+
+    def reporte(self):
+        """
+        Returns:
+            dict: Duración cubierta, memoria inicial/final/pico, crecimiento por
+                hora, conteos finales y las líneas que más crecieron desde el inicio
+        """
+        if not self.muestras:
+            return {}
+        primera, ultima = self.muestras[0], self.muestras[-1]
+        return {
+            'horas': (ultima['t'] - primera['t']) / 3600,
+            'muestras': len(self.muestras),
+            'memoria_inicial_kb': primera['memoria'] / 1024,
+            'memoria_final_kb': ultima['memoria'] / 1024,
+            'pico_kb': max(m['pico'] for m in self.muestras) / 1024,
+            'crecimiento_por_hora': self.crecimiento_por_hora(),
+            'conteos': ultima['conteos'],
+            'lineas_desde_inicio': self.ultimo['desde_inicio'],
+            'serie': [{'t': m['t'], 'memoria_kb': m['memoria'] / 1024, **m['conteos']} for m in self.muestras]
+        }
+
+    def guardar(self, ruta):
+        """Escribe el reporte en un archivo JSON"""
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.reporte(), f, ensure_ascii=False, indent=2)
+
+    def detener(self):
+        """Deja de rastrear (si el rastreo lo inició este perfil)"""
+        if self._iniciado_aqui:
+            tracemalloc.stop()
+            self._iniciado_aqui = False
+        self._inicial = self._anterior = None
+
+
+def resumir_reporte(reporte, lineas=5):
+    """
+    Texto breve de un reporte para la consola
+
+    Returns:
+        list: Líneas de texto
+    """
+    if not reporte:
+        return ["(sin muestras)"]
+    crecimiento = reporte['crecimiento_por_hora']
+    texto = [f"{reporte['muestras']} muestras en {reporte['horas']:.2f} h · memoria "
+             f"{reporte['memoria_inicial_kb'] / 1024:.1f} → {reporte['memoria_final_kb'] / 1024:.1f} MB "
+             f"(pico {reporte['pico_kb'] / 1024:.1f} MB)"]
+    texto.append("Crecimiento por hora: " + ", ".join(
+        f"{nombre} {valor:+,.1f}" for nombre, valor in crecimiento.items() if valor is not None))
+    texto.extend(f"  {d['delta_kb']:+10.1f} KB  {d['linea']}" for d in reporte['lineas_desde_inicio'][:lineas])
+    return texto
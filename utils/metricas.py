@@ -0,0 +1,334 @@
+"""
+Exportador opcional de métricas en formato de texto de Prometheus
+"""
+
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Límites (segundos) de los histogramas de espera
+BUCKETS_ESPERA = (5, 10, 30, 60, 120, 300, 600, 1200)
+
+
+def _formatear_valor(valor):
+    """
+    Valor de una muestra sin perder precisión (los enteros tal cual, los
+    flotantes con repr, que conserva los 17 dígitos significativos)
+    """
+    if isinstance(valor, int):
+        return str(valor)
+    if valor != valor:
+        return "NaN"
+    if valor in (float("inf"), float("-inf")):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor))
+
+
+def _escapar_etiqueta(valor):
+    """Escapa \\, comillas y saltos de línea en el valor de una etiqueta"""
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escapar_ayuda(texto):
+    """Escapa \\ y saltos de línea en el texto de # HELP"""
+    return texto.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+class _Metrica:
+    """Base de las métricas: nombre, ayuda, etiquetas y un candado propio"""
+
+    tipo = "untyped"
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+        self._valores = {}
+
+    def _clave(self, etiquetas):
+        """Convierte las etiquetas recibidas en una tupla ordenada"""
+        return tuple(str(etiquetas[e]) for e in self.etiquetas)
+
+    def _formatear_etiquetas(self, clave, extra=""):
+        """Formatea las etiquetas al estilo {a="x",b="y"}"""
+        pares = [f'{e}="{_escapar_etiqueta(v)}"' for e, v in zip(self.etiquetas, clave)]
+        if extra:
+            pares.append(extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+
+    def exponer(self):
+        """Devuelve las líneas de texto de la métrica"""
+        lineas = [f"# HELP {self.nombre} {_escapar_ayuda(self.ayuda)}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            valores = list(self._valores.items())
+        for clave, valor in valores:
+            lineas.append(f"{self.nombre}{self._formatear_etiquetas(clave)} {_formatear_valor(valor)}")
+        return lineas
+
+
+class Contador(_Metrica):
+    """Contador monótono creciente"""
+
+    tipo = "counter"
+
+    def inc(self, valor=1, **etiquetas):
+        """Incrementa el contador"""
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + valor
+
+    def valor(self, **etiquetas):
+        """Devuelve el valor actual"""
+        with self._lock:
+            return self._valores.get(self._clave(etiquetas), 0)
+
+
+class Medidor(Contador):
+    """Valor que puede subir y bajar"""
+
+    tipo = "gauge"
+
+    def dec(self, valor=1, **etiquetas):
+        """Decrementa el medidor"""
+        self.inc(-valor, **etiquetas)
+
+    def fijar(self, valor, **etiquetas):
+        """Fija el medidor en un valor"""
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = valor
+
+
+class Histograma(_Metrica):
+    """Histograma con buckets fijos; cada observación toca un solo bucket"""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_ESPERA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+
+    def observar(self, valor, **etiquetas):
+        """Registra una observación"""
+        clave = self._clave(etiquetas)
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            datos = self._valores.get(clave)
+            if datos is None:
+                # [conteos por bucket (+Inf al final), suma, total]
+                datos = self._valores[clave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            datos[0][indice] += 1
+            datos[1] += valor
+            datos[2] += 1
+
+    def resumen(self, **etiquetas):
+        """
+        Devuelve el total de observaciones y su suma
+
+        Returns:
+            tuple: (total, suma)
+        """
+        with self._lock:
+            datos = self._valores.get(self._clave(etiquetas))
+            return (datos[2], datos[1]) if datos else (0, 0.0)
+
+    def exponer(self):
+        """Devuelve las líneas con buckets acumulados, suma y total"""
+        lineas = [f"# HELP {self.nombre} {_escapar_ayuda(self.ayuda)}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            valores = [(clave, list(d[0]), d[1], d[2]) for clave, d in self._valores.items()]
+        for clave, conteos, suma, total in valores:
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + (float("inf"),), conteos):
+                acumulado += conteo
+                le = _formatear_valor(limite)
+                etiquetas = self._formatear_etiquetas(clave, f'le="{le}"')
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{self._formatear_etiquetas(clave)} {_formatear_valor(suma)}")
+            lineas.append(f"{self.nombre}_count{self._formatear_etiquetas(clave)} {total}")
+        return lineas
+
+
+class RegistroMetricas:
+    """Colección de métricas que se exponen juntas"""
+
+    def __init__(self):
+        self.metricas = []
+
+    def agregar(self, metrica):
+        """Registra una métrica y la devuelve"""
+        self.metricas.append(metrica)
+        return metrica
+
+    def exponer(self):
+        """Genera el texto completo en formato Prometheus"""
+        lineas = []
+        for metrica in self.metricas:
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+class MetricasBanco:
+    """
+    Métricas del banco actualizadas de forma incremental desde la simulación
+    """
+
+    def __init__(self, registro=None):
+        """
+        Inicializa las métricas del banco
+
+        Args:
+            registro (RegistroMetricas): Registro donde se publican las métricas
+        """
+        self.registro = registro or RegistroMetricas()
+        r = self.registro
+        self.fila = r.agregar(Medidor(
+            "banco_fila_clientes", "Clientes esperando en fila por prioridad", ("prioridad",)))
+        self.ventanillas = r.agregar(Medidor(
+            "banco_ventanillas", "Ventanillas por estado", ("estado",)))
+        self.atendidos = r.agregar(Contador(
+            "banco_clientes_atendidos_total", "Clientes atendidos"))
+        self.rechazados = r.agregar(Contador(
+            "banco_clientes_rechazados_total", "Clientes retirados de la fila sin ser atendidos"))
+        self.espera = r.agregar(Histograma(
+            "banco_espera_segundos", "Tiempo de espera en fila por prioridad", ("prioridad",)))
+        self.eventos = r.agregar(Contador(
+            "banco_eventos_total", "Eventos procesados por el motor"))
+        self.eventos_por_segundo = r.agregar(Medidor(
+            "banco_eventos_por_segundo", "Eventos procesados por segundo"))
+
+    @staticmethod
+    def _prioridad(persona):
+        return "prioritario" if persona.prioridad else "normal"
+
+    def llegada(self, persona):
+        """Un cliente se une a la fila"""
+        self.fila.inc(prioridad=self._prioridad(persona))
+        self.eventos.inc()
+
+    def inicio_atencion(self, persona, espera):
+        """Un cliente sale de la fila hacia una ventanilla"""
+        prioridad = self._prioridad(persona)
+        self.fila.dec(prioridad=prioridad)
+        self.espera.observar(espera, prioridad=prioridad)
+        self.eventos.inc()
+
+    def fin_atencion(self):
+        """Un cliente termina su atención"""
+        self.atendidos.inc()
+        self.eventos.inc()
+
+    def cambio_ventanilla(self, anterior, nuevo):
+        """Una ventanilla cambia de estado"""
+        if anterior == nuevo:
+            return
+        self.ventanillas.dec(estado=anterior)
+        self.ventanillas.inc(estado=nuevo)
+
+    def rechazo(self, personas):
+        """Clientes retirados de la fila sin atención"""
+        for persona in personas:
+            self.fila.dec(prioridad=self._prioridad(persona))
+        self.rechazados.inc(len(personas))
+
+    def sincronizar(self, banco):
+        """Recalcula los medidores a partir del estado real (tras un reinicio)"""
+        prioritarios = sum(1 for p in banco.fila if p.prioridad)
+        self.fila.fijar(prioritarios, prioridad="prioritario")
+        self.fila.fijar(len(banco.fila) - prioritarios, prioridad="normal")
+        for estado in ("libre", "atendiendo", "descansando"):
+            self.ventanillas.fijar(sum(1 for v in banco.ventanillas if v.estado == estado),
+                                   estado=estado)
+
+
+class ExportadorMetricas:
+    """
+    Publica un RegistroMetricas por HTTP local y/o en un archivo de texto
+    reescrito periódicamente, usando hilos en segundo plano
+    """
+
+    def __init__(self, metricas, puerto=None, archivo=None, intervalo=5.0, host="127.0.0.1"):
+        """
+        Inicializa el exportador
+
+        Args:
+            metricas (MetricasBanco): Métricas a exportar
+            puerto (int): Puerto HTTP local (None para desactivar)
+            archivo (str): Ruta del archivo de texto (None para desactivar)
+            intervalo (float): Segundos entre escrituras y cálculo de eventos/s
+            host (str): Dirección donde escucha el servidor
+        """
+        self.metricas = metricas
+        self.puerto = puerto
+        self.archivo = archivo
+        self.intervalo = intervalo
+        self.host = host
+        self._servidor = None
+        self._detener = threading.Event()
+        self._hilos = []
+
+    def iniciar(self):
+        """Arranca los hilos del servidor y del muestreo periódico"""
+        if self.puerto is not None:
+            self._servidor = ThreadingHTTPServer((self.host, self.puerto), self._crear_manejador())
+            self._servidor.daemon_threads = True
+            self.puerto = self._servidor.server_address[1]
+            self._lanzar(self._servidor.serve_forever)
+        self._lanzar(self._bucle_periodico)
+        return self
+
+    def detener(self):
+        """Detiene los hilos en segundo plano"""
+        self._detener.set()
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+        for hilo in self._hilos:
+            hilo.join(timeout=self.intervalo + 1)
+
+    def _lanzar(self, objetivo):
+        hilo = threading.Thread(target=objetivo, daemon=True)
+        hilo.start()
+        self._hilos.append(hilo)
+
+    def _bucle_periodico(self):
+        """Calcula eventos por segundo y reescribe el archivo de texto"""
+        anterior, t_anterior = self.metricas.eventos.valor(), time.monotonic()
+        while not self._detener.wait(self.intervalo):
+            actual, t_actual = self.metricas.eventos.valor(), time.monotonic()
+            self.metricas.eventos_por_segundo.fijar((actual - anterior) / (t_actual - t_anterior))
+            anterior, t_anterior = actual, t_actual
+            if self.archivo:
+                self._escribir_archivo()
+        if self.archivo:
+            self._escribir_archivo()
+
+    def _escribir_archivo(self):
+        """Escribe el archivo de forma atómica (temporal + reemplazo)"""
+        temporal = f"{self.archivo}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(self.metricas.registro.exponer())
+        os.replace(temporal, self.archivo)
+
+    def _crear_manejador(self):
+        registro = self.metricas.registro
+
+        class ManejadorMetricas(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                cuerpo = registro.exponer().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                pass
+
+        return ManejadorMetricas
@@ -0,0 +1,294 @@
+"""
+Entrega asíncrona y por lotes de notificaciones a los clientes
+"""
+
+import json
+import queue
+import smtplib
+import threading
+import time
+import urllib.request
+from email.message import EmailMessage
+
+from utils.metricas import Contador, Histograma
+
+BUCKETS_LATENCIA = (0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+
+
+class Notificacion:
+    """
+    Aviso de transacción completada para un cliente
+    """
+
+    def __init__(self, cliente_id, transaccion, ventanilla_id, mensaje):
+        """
+        Inicializa la notificación
+
+        Args:
+            cliente_id (int): Cliente notificado
+            transaccion (str): Transacción completada
+            ventanilla_id (int): Ventanilla que atendió al cliente
+            mensaje (str): Texto a mostrar
+        """
+        self.cliente_id = cliente_id
+        self.transaccion = transaccion
+        self.ventanilla_id = ventanilla_id
+        self.mensaje = mensaje
+        self.creada = time.monotonic()
+        self.hora = time.strftime("%H:%M:%S")
+
+    def como_dict(self):
+        """Representación serializable"""
+        return {
+            'cliente': self.cliente_id,
+            'transaccion': self.transaccion,
+            'ventanilla': self.ventanilla_id,
+            'mensaje': self.mensaje,
+            'timestamp': self.hora
+        }
+
+
+class SumideroPantalla:
+    """
+    Deja las notificaciones en un buzón que el hilo de Tk vacía periódicamente
+    (los widgets solo pueden tocarse desde el hilo de la interfaz)
+    """
+
+    nombre = "pantalla"
+
+    def __init__(self):
+        self.buzon = queue.SimpleQueue()
+
+    def entregar(self, lote):
+        for notificacion in lote:
+            self.buzon.put(notificacion)
+
+    def drenar(self):
+        """Devuelve y retira todas las notificaciones pendientes del buzón"""
+        pendientes = []
+        while True:
+            try:
+                pendientes.append(self.buzon.get_nowait())
+            except queue.Empty:
+                return pendientes
+
+
+class SumideroArchivo:
+    """Agrega las notificaciones a un archivo JSON Lines, una escritura por lote"""
+
+    nombre = "archivo"
+    trabajadores = 1  # Un solo hilo: dos escrituras simultáneas podrían intercalar líneas
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def entregar(self, lote):
+        lineas = "".join(json.dumps(n.como_dict(), ensure_ascii=False) + "\n" for n in lote)
+        with open(self.ruta, "a", encoding="utf-8") as f:
+            f.write(lineas)
+
+
+class SumideroHTTP:
+    """Envía cada lote como un arreglo JSON por POST a un servicio local"""
+
+    nombre = "http"
+
+    def __init__(self, url, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def entregar(self, lote):
+        cuerpo = json.dumps([n.como_dict() for n in lote], ensure_ascii=False).encode("utf-8")
+        peticion = urllib.request.Request(self.url, data=cuerpo, method="POST",
+                                          headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(peticion, timeout=self.timeout) as respuesta:
+            respuesta.read()
+
+
+class SumideroSMTP:
+    """Envía el lote por SMTP reutilizando una sola conexión (ej. un servidor de pruebas local)"""
+
+    nombre = "smtp"
+
+    def __init__(self, host="localhost", puerto=1025, remitente="banco@localhost",
+                 destinatario="clientes@localhost", timeout=2.0):
+        self.host = host
+        self.puerto = puerto
+        self.remitente = remitente
+        self.destinatario = destinatario
+        self.timeout = timeout
+
+    def entregar(self, lote):
+        with smtplib.SMTP(self.host, self.puerto, timeout=self.timeout) as smtp:
+            for notificacion in lote:
+                correo = EmailMessage()
+                correo["From"] = self.remitente
+                correo["To"] = self.destinatario
+                correo["Subject"] = f"Cliente {notificacion.cliente_id}: {notificacion.transaccion}"
+                correo.set_content(notificacion.mensaje)
+                smtp.send_message(correo)
+
+
+class DespachadorNotificaciones:
+    """
+    Cola de salida acotada con trabajadores por sumidero, lotes y reintentos.
+
+    Encolar nunca bloquea: si la cola de un sumidero está llena la
+    notificación se descarta y se cuenta, de modo que un sumidero lento no
+    retrasa el fin de atención de las ventanillas ni a los demás sumideros.
+    Los descartes y los lotes perdidos quedan además en un buzón de
+    incidencias (sumidero, notificaciones, motivo) que el hilo de la interfaz
+    vacía con drenar_incidencias().
+    """
+
+    def __init__(self, sumideros, capacidad=1000, trabajadores=2, tamano_lote=20,
+                 espera_lote=0.05, reintentos=3, registro_metricas=None):
+        """
+        Inicializa el despachador y arranca sus hilos
+
+        Args:
+            sumideros (list): Objetos con atributo `nombre` y método `entregar(lote)`
+            capacidad (int): Notificaciones pendientes máximas por sumidero
+            trabajadores (int): Hilos de entrega por sumidero (un sumidero puede
+                fijar los suyos con el atributo `trabajadores`)
+            tamano_lote (int): Notificaciones máximas por lote
+            espera_lote (float): Segundos que se espera para completar un lote
+            reintentos (int): Reintentos por lote fallido (con espera exponencial)
+            registro_metricas (RegistroMetricas): Donde publicar las métricas (opcional)
+        """
+        self.sumideros = list(sumideros)
+        self.tamano_lote = tamano_lote
+        self.espera_lote = espera_lote
+        self.reintentos = reintentos
+        self._detener = threading.Event()
+        self._colas = {s.nombre: queue.Queue(maxsize=capacidad) for s in self.sumideros}
+        self._hilos = []
+        self._incidencias = queue.SimpleQueue()
+
+        self.entregadas = Contador("banco_notificaciones_entregadas_total",
+                                   "Notificaciones entregadas", ("sumidero",))
+        self.fallidas = Contador("banco_notificaciones_fallidas_total",
+                                 "Notificaciones perdidas tras agotar reintentos", ("sumidero",))
+        self.descartadas = Contador("banco_notificaciones_descartadas_total",
+                                    "Notificaciones descartadas por cola llena", ("sumidero",))
+        self.latencia = Histograma("banco_notificaciones_latencia_segundos",
+                                   "Tiempo desde el encolado hasta la entrega", ("sumidero",),
+                                   BUCKETS_LATENCIA)
+        if registro_metricas is not None:
+            for metrica in (self.entregadas, self.fallidas, self.descartadas, self.latencia):
+                registro_metricas.agregar(metrica)
+
+        for sumidero in self.sumideros:
+            for _ in range(getattr(sumidero, "trabajadores", trabajadores)):
+                hilo = threading.Thread(target=self._trabajar, args=(sumidero,), daemon=True)
+                hilo.start()
+                self._hilos.append(hilo)
+
+    def enviar(self, notificacion):
+        """
+        Encola una notificación para todos los sumideros sin bloquear
+
+        Returns:
+            bool: True si todos los sumideros la aceptaron
+        """
+        aceptada = True
+        for nombre, cola in self._colas.items():
+            try:
+                cola.put_nowait(notificacion)
+            except queue.Full:
+                self.descartadas.inc(sumidero=nombre)
+                self._incidencias.put((nombre, [notificacion], "cola llena"))
+                aceptada = False
+        return aceptada
+
+    def drenar_incidencias(self):
+        """
+        Devuelve y retira las incidencias pendientes
+
+        Returns:
+            list: (sumidero, notificaciones, motivo) por cada descarte o lote perdido
+        """
+        incidencias = []
+        while True:
+            try:
+                incidencias.append(self._incidencias.get_nowait())
+            except queue.Empty:
+                return incidencias
+
+    def pendientes(self):
+        """Notificaciones aún en cola por sumidero"""
+        return {nombre: cola.qsize() for nombre, cola in self._colas.items()}
+
+    def vaciar_colas(self):
+        """Descarta las notificaciones pendientes (ej. al reiniciar el sistema)"""
+        for cola in self._colas.values():
+            while True:
+                try:
+                    cola.get_nowait()
+                except queue.Empty:
+                    break
+
+    def estadisticas(self):
+        """
+        Resumen de entrega por sumidero
+
+        Returns:
+            dict: sumidero -> entregadas, fallidas, descartadas y latencia media
+        """
+        resumen = {}
+        for sumidero in self.sumideros:
+            nombre = sumidero.nombre
+            total, suma = self.latencia.resumen(sumidero=nombre)
+            resumen[nombre] = {
+                'entregadas': self.entregadas.valor(sumidero=nombre),
+                'fallidas': self.fallidas.valor(sumidero=nombre),
+                'descartadas': self.descartadas.valor(sumidero=nombre),
+                'latencia_media': suma / total if total else 0.0
+            }
+        return resumen
+
+    def detener(self, timeout=2.0):
+        """Detiene los trabajadores tras entregar lo que alcance en `timeout`"""
+        self._detener.set()
+        for hilo in self._hilos:
+            hilo.join(timeout=timeout)
+
+    def _trabajar(self, sumidero):
+        """Bucle de un trabajador: arma lotes y los entrega con reintentos"""
+        cola = self._colas[sumidero.nombre]
+        while not (self._detener.is_set() and cola.empty()):
+            try:
+                lote = [cola.get(timeout=0.2)]
+            except queue.Empty:
+                continue
+
+            limite = time.monotonic() + self.espera_lote
+            while len(lote) < self.tamano_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(cola.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            self._entregar_con_reintentos(sumidero, lote)
+
+    def _entregar_con_reintentos(self, sumidero, lote):
+        """Intenta entregar un lote, esperando 0.1, 0.2, 0.4... s entre intentos"""
+        for intento in range(self.reintentos + 1):
+            try:
+                sumidero.entregar(lote)
+            except Exception as e:
+                if intento == self.reintentos or self._detener.is_set():
+                    self.fallidas.inc(len(lote), sumidero=sumidero.nombre)
+                    self._incidencias.put((sumidero.nombre, lote, f"error tras {intento + 1} intentos: {e}"))
+                    return
+                time.sleep(0.1 * 2 ** intento)
+                continue
+
+            ahora = time.monotonic()
+            for notificacion in lote:
+                self.latencia.observar(ahora - notificacion.creada, sumidero=sumidero.nombre)
+            self.entregadas.inc(len(lote), sumidero=sumidero.nombre)
+            return
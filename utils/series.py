@@ -0,0 +1,206 @@
+"""
+Series de tiempo en anillos de tamaño fijo a varias resoluciones, con
+reducción de puntos (LTTB o mín/máx) para dibujarlas
+"""
+
+from collections import deque
+
+from utils.config import RESOLUCIONES_SERIES
+
+
+class _Nivel:
+    """Anillo de cubetas (t, mín, máx, media) de una resolución"""
+
+    def __init__(self, paso, capacidad):
+        self.paso = paso
+        self.cubetas = deque(maxlen=capacidad)
+        self._inicio = None
+        self._minimo = self._maximo = self._suma = 0.0
+        self._n = 0
+
+    def agregar(self, t, minimo, maximo, media, n=1):
+        """
+        Acumula una observación (o una cubeta del nivel anterior)
+
+        Returns:
+            tuple: Cubeta cerrada (t, mín, máx, media, n), o None si la cubeta sigue abierta
+        """
+        cerrada = None
+        if self._inicio is not None and t >= self._inicio + self.paso:
+            cerrada = self._cerrar()
+        if self._inicio is None:
+            self._inicio = t - t % self.paso
+            self._minimo, self._maximo, self._suma, self._n = minimo, maximo, 0.0, 0
+        self._minimo = min(self._minimo, minimo)
+        self._maximo = max(self._maximo, maximo)
+        self._suma += media * n
+        self._n += n
+        return cerrada
+
+    def _cerrar(self):
+        cubeta = (self._inicio, self._minimo, self._maximo, self._suma / self._n, self._n)
+        self.cubetas.append(cubeta)
+        self._inicio = None
+        return cubeta
+
+    def abierta(self):
+        """Cubeta en curso (aún no cerrada), o None"""
+        if self._inicio is None:
+            return None
+        return (self._inicio, self._minimo, self._maximo, self._suma / self._n, self._n)
+
+    def cobertura(self):
+        """Segundos que abarca el anillo completo"""
+        return self.paso * self.cubetas.maxlen
+
+
+class SerieMultiresolucion:
+    """
+    Serie de tiempo con memoria constante: cada nivel guarda un anillo de
+    cubetas de su resolución y, al cerrar una cubeta, la entrega al nivel
+    siguiente. Con las resoluciones por defecto se conservan 5 minutos a 1 s,
+    1 hora a 10 s, 1 día a 1 min y 1 semana a 10 min.
+    """
+
+    def __init__(self, resoluciones=RESOLUCIONES_SERIES):
+        """
+        Args:
+            resoluciones (tuple): (segundos por cubeta, cubetas) de cada nivel, de fino a grueso
+        """
+        self.niveles = [_Nivel(paso, capacidad) for paso, capacidad in resoluciones]
+        self.ultimo = None
+
+    def agregar(self, t, valor):
+        """Registra el valor observado en el instante t (segundos)"""
+        self.ultimo = valor
+        cubeta = (t, valor, valor, valor, 1)
+        for nivel in self.niveles:
+            cubeta = nivel.agregar(*cubeta)
+            if cubeta is None:
+                break
+
+    def ventana(self, segundos, ahora):
+        """
+        Cubetas del nivel más fino que cubre los últimos `segundos`
+
+        Returns:
+            list: (t, mín, máx, media) en orden temporal, incluida la cubeta abierta
+        """
+        nivel = next((n for n in self.niveles if n.cobertura() >= segundos), self.niveles[-1])
+        desde = ahora - segundos
+        cubetas = [c[:4] for c in nivel.cubetas if c[0] >= desde]
+        abierta = nivel.abierta()
+        if abierta is not None:
+            cubetas.append(abierta[:4])
+        return cubetas
+
+    def puntos(self, segundos, ahora, maximo, metodo="minmax"):
+        """
+        Puntos (t, valor) de la ventana reducidos a lo sumo a `maximo`
+
+        Args:
+            segundos (float): Largo de la ventana
+            ahora (float): Instante final de la ventana
+            maximo (int): Puntos máximos a devolver
+            metodo (str): "minmax" (conserva picos) o "lttb" (conserva la forma)
+        """
+        cubetas = self.ventana(segundos, ahora)
+        if metodo == "lttb":
+            return lttb([(t, media) for t, _, _, media in cubetas], maximo)
+        return minmax(cubetas, maximo)
+
+
+def minmax(cubetas, maximo):
+    """
+    Agrupa cubetas (t, mín, máx, media) en maximo // 2 grupos y emite el
+    mínimo y el máximo de cada uno en el orden en que ocurrieron
+
+    Returns:
+        list: Puntos (t, valor)
+    """
+    grupos = max(1, maximo // 2)
+    if len(cubetas) <= grupos:
+        return [p for t, minimo, maximo_c, _ in cubetas for p in ((t, minimo), (t, maximo_c))]
+    puntos = []
+    tamano = len(cubetas) / grupos
+    for g in range(grupos):
+        grupo = cubetas[int(g * tamano):int((g + 1) * tamano)]
+        bajo = min(grupo, key=lambda c: c[1])
+        alto = max(grupo, key=lambda c: c[2])
+        primero, segundo = ((bajo[0], bajo[1]), (alto[0], alto[2]))
+        if alto[0] < bajo[0]:
+            primero, segundo = segundo, primero
+        puntos.extend((primero, segundo))
+    return puntos
+
+
+def lttb(puntos, maximo):
+    """
+    Largest-Triangle-Three-Buckets: elige en cada cubeta el punto que forma el
+    triángulo de mayor área con el punto elegido antes y el promedio de la
+    cubeta siguiente
+
+    Args:
+        puntos (list): (t, valor) en orden temporal
+        maximo (int): Puntos a conservar (>= 3)
+
+    Returns:
+        list: Puntos conservados, siempre con el primero y el último
+    """
+    n = len(puntos)
+    if maximo >= n or maximo < 3:
+        return list(puntos)
+    elegidos = [puntos[0]]
+    tamano = (n - 2) / (maximo - 2)
+    a = 0
+    for i in range(maximo - 2):
+        inicio, fin = int(i * tamano) + 1, int((i + 1) * tamano) + 1
+        siguiente = puntos[fin:min(int((i + 2) * tamano) + 1, n)] or [puntos[-1]]
+        media_t = sum(p[0] for p in siguiente) / len(siguiente)
+        media_v = sum(p[1] for p in siguiente) / len(siguiente)
+        ta, va = puntos[a]
+        mejor, mejor_area = inicio, -1.0
+        for j in range(inicio, fin):
+            tj, vj = puntos[j]
+            area = abs((ta - media_t) * (vj - va) - (ta - tj) * (media_v - va))
+            if area > mejor_area:
+                mejor, mejor_area = j, area
+        elegidos.append(puntos[mejor])
+        a = mejor
+    elegidos.append(puntos[-1])
+    return elegidos
+
+
+class SeriesBanco:
+    """
+    Muestrea el banco a intervalos regulares: fila por clase, ventanillas
+    ocupadas y clientes atendidos por minuto
+    """
+
+    SERIES = ('fila_prioritarios', 'fila_normales', 'ocupadas', 'rendimiento')
+
+    def __init__(self, banco, resoluciones=RESOLUCIONES_SERIES):
+        self.banco = banco
+        self.resoluciones = resoluciones
+        self.reiniciar()
+
+    def muestrear(self):
+        """Toma una muestra de cada serie en el instante actual del banco"""
+        banco = self.banco
+        t = banco.reloj()
+        prioritarios = sum(1 for p in banco.fila if p.prioridad)
+        self.series['fila_prioritarios'].agregar(t, prioritarios)
+        self.series['fila_normales'].agregar(t, len(banco.fila) - prioritarios)
+        self.series['ocupadas'].agregar(t, sum(1 for v in banco.ventanillas if v.estado == "atendiendo"))
+
+        atendidos = banco.clientes_atendidos
+        if self._anterior is not None and t > self._anterior[0]:
+            t0, a0 = self._anterior
+            # Un reinicio del sistema pone el contador en cero: no es un rendimiento negativo
+            self.series['rendimiento'].agregar(t, max(0, atendidos - a0) / (t - t0) * 60)
+        self._anterior = (t, atendidos)
+
+    def reiniciar(self):
+        """Olvida las series (ej. al reiniciar el sistema)"""
+        self.series = {nombre: SerieMultiresolucion(self.resoluciones) for nombre in self.SERIES}
+        self._anterior = None  # (t, atendidos)
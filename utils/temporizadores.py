@@ -0,0 +1,101 @@
+"""
+Registro central de temporizadores de Tkinter (root.after) agrupados por ámbito
+"""
+
+import itertools
+
+
+class RegistroTemporizadores:
+    """
+    Programa callbacks con `after` y recuerda a qué ámbito pertenecen para
+    poder cancelarlos en bloque (por ventanilla, dispositivo, escenario...).
+
+    Los ámbitos son tuplas, por ejemplo ("ventanilla", 2) o ("escenario",).
+    Cancelar un ámbito parcial como ("ventanilla",) cancela todos los que
+    empiezan por él.
+    """
+
+    def __init__(self, widget):
+        """
+        Inicializa el registro
+
+        Args:
+            widget: Widget de Tk usado para programar (normalmente la raíz)
+        """
+        self.widget = widget
+        self._contador = itertools.count()
+        self._pendientes = {}  # token -> (ambito, after_id)
+
+    def programar(self, ambito, retardo_ms, callback, *args):
+        """
+        Programa un callback dentro de un ámbito
+
+        Args:
+            ambito (tuple): Ámbito al que pertenece el temporizador
+            retardo_ms (int): Retardo en milisegundos
+            callback (callable): Función a ejecutar
+            *args: Argumentos del callback
+
+        Returns:
+            int: Token para cancelar el temporizador individualmente
+        """
+        token = next(self._contador)
+        after_id = self.widget.after(retardo_ms, self._disparar, token, callback, args)
+        self._pendientes[token] = (tuple(ambito), after_id)
+        return token
+
+    def _disparar(self, token, callback, args):
+        """Ejecuta el callback si el temporizador sigue registrado"""
+        if self._pendientes.pop(token, None) is None:
+            return
+        callback(*args)
+
+    def cancelar(self, token):
+        """
+        Cancela un temporizador concreto
+
+        Returns:
+            bool: True si estaba pendiente
+        """
+        entrada = self._pendientes.pop(token, None)
+        if entrada is None:
+            return False
+        self.widget.after_cancel(entrada[1])
+        return True
+
+    def cancelar_ambito(self, *ambitos):
+        """
+        Cancela todos los temporizadores de uno o varios ámbitos (o prefijos)
+
+        Returns:
+            int: Número de temporizadores cancelados
+        """
+        prefijos = [tuple(a) for a in ambitos]
+        tokens = [token for token, (ambito, _) in self._pendientes.items()
+                  if any(ambito[:len(p)] == p for p in prefijos)]
+        for token in tokens:
+            self.cancelar(token)
+        return len(tokens)
+
+    def pendientes(self, ambito=()):
+        """
+        Cuenta los temporizadores pendientes de un ámbito (todos por defecto)
+
+        Returns:
+            int: Temporizadores pendientes
+        """
+        prefijo = tuple(ambito)
+        return sum(1 for a, _ in self._pendientes.values() if a[:len(prefijo)] == prefijo)
+
+    def resumen(self):
+        """
+        Pendientes agrupados por tipo de ámbito
+
+        Returns:
+            dict: tipo (primer elemento del ámbito) -> cantidad
+        """
+        conteo = {}
+        for ambito, _ in self._pendientes.values():
+            tipo = ambito[0] if ambito else ""
+            conteo[tipo] = conteo.get(tipo, 0) + 1
+        return conteo
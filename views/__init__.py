@@ -2,6 +2,13 @@
 Paquete de vistas del sistema bancario
 """
 
-from .interfaz_banco import InterfazBanco
+from .tablero_terminal import TableroTerminal
+from .tablero_web import ServidorTablero
 
-__all__ = ['InterfazBanco']
\ No newline at end of file
+try:
+    from .interfaz_banco import InterfazBanco
+    from .modo_estres import ModoEstres
+except ImportError:  # Sin Tk o PIL (servidores sin pantalla): solo el tablero de terminal
+    InterfazBanco = ModoEstres = None
+
+__all__ = ['InterfazBanco', 'ModoEstres', 'TableroTerminal', 'ServidorTablero']
@@ -1,29 +1,98 @@
 import tkinter as tk
-import random
 import time
 from PIL import Image, ImageTk, ImageDraw
 
 from models.banco import Banco
 from models.persona import Persona
+from models.servicio import CatalogoServicio
+from models.descansos import crear_politica
+from models.fila_virtual import FilaVirtual
+from models.escenarios import listar_escenarios
+from views.tablero_web import PublicadorPeriodico
+from views.sparklines import PanelSparklines
+from views.panel_memoria import PanelMemoria
+from utils.config import (NUM_VENTANILLAS, UMBRAL_VISTA_COMPACTA,
+                          COLUMNAS_VISTA_COMPACTA, MAX_DISPOSITIVOS_MOVILES,
+                          DURACION_NOTIFICACION, INTERVALO_NOTIFICACIONES,
+                          CAPACIDAD_COLA_NOTIFICACIONES, TRABAJADORES_NOTIFICACIONES,
+                          LOTE_NOTIFICACIONES, REINTENTOS_NOTIFICACIONES,
+                          INTERVALO_INGESTA, TOPOLOGIA_FILAS, POLITICA_ENRUTAMIENTO,
+                          ROBO_ENTRE_FILAS, TIEMPOS_TRANSACCION, VELOCIDADES_VENTANILLA,
+                          HABILIDADES_VENTANILLA, SEMILLA_MAESTRA, POLITICA_DESCANSO,
+                          PARAMETROS_DESCANSO, FILA_VIRTUAL, INTERVALO_SERIES, INTERVALO_MEMORIA,
+                          VENTANA_AGREGACION_LOG)
+from utils.notificaciones import Notificacion, SumideroPantalla, DespachadorNotificaciones
+from utils.temporizadores import RegistroTemporizadores
+from utils.aleatorio import secuencia
+from utils.series import SeriesBanco
+from utils.memoria import PerfilMemoria
 
 class InterfazBanco:
     """
     Interfaz gráfica para el sistema de gestión bancaria
     """
     
-    def __init__(self, root):
+    def __init__(self, root, metricas=None, registro=None, sumideros_notificacion=(), ingesta=None,
+                 semilla=SEMILLA_MAESTRA, fila_virtual=FILA_VIRTUAL, web=None, perfil_memoria=False):
         """
         Inicializa la interfaz gráfica
+        
+        Args:
+            root (tk.Tk): Ventana raíz de Tkinter
+            metricas (MetricasBanco): Métricas a exportar (opcional)
+            registro (RegistroClientes): Registro columnar de clientes (opcional)
+            sumideros_notificacion (list): Sumideros adicionales a la pantalla
+            ingesta (ColaIngesta): Cola de clientes de productores externos (opcional)
+            semilla (int): Semilla maestra de todos los flujos aleatorios (None = al azar)
+            fila_virtual (bool): Si los clientes sacan turno y esperan fuera de la sucursal
+            web (ServidorTablero): Tablero web al que publicar el estado (opcional; su
+                sumidero debe estar entre sumideros_notificacion)
+            perfil_memoria (bool): Si se mide la memoria y se abre el panel de depuración
         """
         self.root = root
+        self.metricas = metricas
+        self.registro = registro
+        self.sumideros_notificacion = list(sumideros_notificacion)
+        self.ingesta = ingesta
+        self.semillas = secuencia(semilla)
+        self.usar_fila_virtual = fila_virtual
+        self.temporizadores = RegistroTemporizadores(root)
+        # Un archivo inválido no impide abrir la interfaz: se omite y se avisa en el log
+        errores_escenarios = []
+        self.escenarios = listar_escenarios(errores=errores_escenarios)
         self.setup_ventana_principal()
         self.setup_estilos()
         self.setup_imagenes()
         self.setup_banco()
+        for _, mensaje in errores_escenarios:
+            print(f"⚠️ Escenario omitido: {mensaje}")
+            self.banco.log.append(f"[SISTEMA] ⚠️ Escenario omitido: {mensaje}")
+        self.setup_notificaciones()
+        self.series = SeriesBanco(self.banco)
         self.setup_interfaz()
+        self.temporizadores.programar(("sistema", "series"), INTERVALO_SERIES, self._muestrear_series)
+        self.temporizadores.programar(("sistema", "log"), VENTANA_AGREGACION_LOG * 1000, self._vaciar_log_agregado)
+        if self.ingesta is not None:
+            self.temporizadores.programar(("sistema", "ingesta"), INTERVALO_INGESTA, self._procesar_ingesta)
+        self.perfil_memoria = None
+        if perfil_memoria:
+            self.perfil_memoria = PerfilMemoria(self.banco, self._contadores_memoria()).iniciar()
+            self.panel_memoria = PanelMemoria(self.root, self.perfil_memoria)
+            self.panel_memoria.actualizar()
+            # El panel se puede cerrar: el botón y F12 lo vuelven a abrir
+            tk.Button(self.log_controls_frame, text="🧪 Memoria (F12)",
+                      command=self.panel_memoria.mostrar,
+                      font=("Arial", 8),
+                      bg='#8e44ad', fg='white',
+                      padx=10, pady=2).pack(side=tk.LEFT, padx=(5, 0))
+            self.root.bind("<F12>", lambda evento: self.panel_memoria.mostrar())
+            self.temporizadores.programar(("sistema", "memoria"), INTERVALO_MEMORIA, self._muestrear_memoria)
+        if web is not None:
+            PublicadorPeriodico(web, self.banco,
+                                lambda ms, cb: self.temporizadores.programar(("sistema", "web"), ms, cb)).iniciar()
         
         # Control de escenario activo
-        self.escenario_activo = None  # None, "con_prioridad", "sin_prioridad"
+        self.escenario_activo = None  # None o el nombre del escenario en curso
         self.simulacion_activa = False
 
     def setup_ventana_principal(self):
@@ -112,10 +181,40 @@ class InterfazBanco:
     
     def setup_banco(self):
         """Inicializa el sistema bancario"""
-        self.banco = Banco(n_ventanillas=3, interfaz=self)
+        self.banco = Banco(n_ventanillas=NUM_VENTANILLAS, interfaz=self, metricas=self.metricas,
+                           registro=self.registro, semillas=self.semillas.hija("banco"))
+        self.banco.configurar_filas(TOPOLOGIA_FILAS, POLITICA_ENRUTAMIENTO, ROBO_ENTRE_FILAS,
+                                    self.semillas.hija("enrutamiento").generador())
+        self.banco.configurar_servicio(CatalogoServicio.desde_config(TIEMPOS_TRANSACCION),
+                                       VELOCIDADES_VENTANILLA, HABILIDADES_VENTANILLA)
+        self.banco.politica_descanso = crear_politica(POLITICA_DESCANSO, **PARAMETROS_DESCANSO)
+        self.fila_virtual = None
+        if self.usar_fila_virtual:
+            self.fila_virtual = FilaVirtual(self.banco, self._programar_fila_virtual,
+                                            avisar=self.avisar_turno,
+                                            rng=self.semillas.hija("virtual").generador())
         self.personas_en_fila_gui = []
         self.ventanillas_gui = []
+        self.vista_compacta = len(self.banco.ventanillas) > UMBRAL_VISTA_COMPACTA
         self.dispositivos_moviles = []
+        self.dispositivos_por_ventanilla = {}
+    
+    def setup_notificaciones(self):
+        """Crea el despachador asíncrono de notificaciones y su sondeo en pantalla"""
+        self.sumidero_pantalla = SumideroPantalla()
+        self.notificaciones = DespachadorNotificaciones(
+            [self.sumidero_pantalla] + self.sumideros_notificacion,
+            capacidad=CAPACIDAD_COLA_NOTIFICACIONES,
+            trabajadores=TRABAJADORES_NOTIFICACIONES,
+            tamano_lote=LOTE_NOTIFICACIONES,
+            reintentos=REINTENTOS_NOTIFICACIONES,
+            registro_metricas=self.metricas.registro if self.metricas else None)
+        self.temporizadores.programar(("sistema", "notificaciones"), INTERVALO_NOTIFICACIONES,
+                                      self._procesar_notificaciones)
+    
+    def cerrar(self):
+        """Detiene los servicios en segundo plano de la interfaz"""
+        self.notificaciones.detener()
     
     def setup_interfaz(self):
         """Configura todos los elementos de la interfaz gráfica"""
@@ -163,10 +262,52 @@ class InterfazBanco:
         ventanillas_frame = tk.Frame(self.panel1, bg='#34495e')
         ventanillas_frame.pack(fill=tk.BOTH, expand=True, pady=10)
 
+        # Con muchas ventanillas se dibuja una cuadrícula en un solo canvas
+        if self.vista_compacta:
+            self._crear_vista_compacta(ventanillas_frame)
+            return
+
         # Crear interfaz para cada ventanilla
         for ventanilla in self.banco.ventanillas:
             self._crear_ventanilla_gui(ventanilla, ventanillas_frame)
     
+    def _crear_vista_compacta(self, parent_frame):
+        """
+        Crea la vista en cuadrícula: un rectángulo y un texto por ventanilla
+        dibujados sobre un único canvas
+        """
+        v_scrollbar = tk.Scrollbar(parent_frame)
+        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.canvas_ventanillas = tk.Canvas(parent_frame, bg='#34495e',
+                                            highlightthickness=0,
+                                            yscrollcommand=v_scrollbar.set)
+        self.canvas_ventanillas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+        v_scrollbar.config(command=self.canvas_ventanillas.yview)
+        
+        ancho_celda, alto_celda, margen = 58, 46, 4
+        for i, ventanilla in enumerate(self.banco.ventanillas):
+            fila, columna = divmod(i, COLUMNAS_VISTA_COMPACTA)
+            x0 = columna * (ancho_celda + margen)
+            y0 = fila * (alto_celda + margen)
+            
+            rect_id = self.canvas_ventanillas.create_rectangle(
+                x0, y0, x0 + ancho_celda, y0 + alto_celda,
+                fill='#3498db', outline='#2c3e50', width=2)
+            texto_id = self.canvas_ventanillas.create_text(
+                x0 + ancho_celda // 2, y0 + alto_celda // 2,
+                text=f"V{ventanilla.id}", font=("Arial", 8, "bold"),
+                fill='white', justify=tk.CENTER)
+            
+            self.ventanillas_gui.append({
+                'rect': rect_id,
+                'texto': texto_id,
+                'ventanilla': ventanilla,
+                'ultimo_estado': None
+            })
+        
+        self.canvas_ventanillas.configure(scrollregion=self.canvas_ventanillas.bbox("all"))
+    
     def _crear_ventanilla_gui(self, ventanilla, parent_frame):
         """Crea la interfaz gráfica para una ventanilla individual"""
         vent_frame = tk.Frame(parent_frame, bg='#2c3e50', relief='solid', bd=1)
@@ -230,7 +371,8 @@ class InterfazBanco:
             'transaccion': transaccion_label,
             'tiempo': tiempo_label,
             'imagen': img_label,
-            'ventanilla': ventanilla
+            'ventanilla': ventanilla,
+            'ultimo_estado': None
         })
     
     def setup_panel2_fila_notificaciones(self):
@@ -288,14 +430,16 @@ class InterfazBanco:
         dispositivos_frame = tk.Frame(notif_frame, bg='#34495e')
         dispositivos_frame.pack(fill=tk.BOTH, expand=True, pady=10)
 
-        # Crear dispositivos móviles para cada ventanilla
-        for i in range(3):
-            self._crear_dispositivo_movil(dispositivos_frame, i + 1)
+        # Crear dispositivos móviles para cada ventanilla (hasta el máximo configurado)
+        for i, ventanilla in enumerate(self.banco.ventanillas[:MAX_DISPOSITIVOS_MOVILES]):
+            self._crear_dispositivo_movil(dispositivos_frame, ventanilla.id, i)
     
-    def _crear_dispositivo_movil(self, parent_frame, ventanilla_id):
+    def _crear_dispositivo_movil(self, parent_frame, ventanilla_id, posicion=0):
         """Crea un dispositivo móvil para una ventanilla específica"""
         dispositivo_frame = tk.Frame(parent_frame, bg='#34495e')
-        dispositivo_frame.pack(side=tk.LEFT, expand=True, fill=tk.BOTH, padx=8)
+        fila, columna = divmod(posicion, 3)
+        dispositivo_frame.grid(row=fila, column=columna, sticky='nsew', padx=8)
+        parent_frame.grid_columnconfigure(columna, weight=1)
         
         # Etiqueta de la ventanilla
         tk.Label(dispositivo_frame, text=f"Ventanilla {ventanilla_id}", 
@@ -329,14 +473,17 @@ class InterfazBanco:
         estado_label.pack(pady=5)
 
         # Almacenar referencia al dispositivo
-        self.dispositivos_moviles.append({
+        dispositivo = {
             'frame': dispositivo_frame,
             'celular': celular_frame,
             'notificacion': notificacion_label,
             'estado': estado_label,
             'ventanilla_id': ventanilla_id,
-            'ultima_notificacion': None
-        })
+            'ultima_notificacion': None,
+            'expira': None
+        }
+        self.dispositivos_moviles.append(dispositivo)
+        self.dispositivos_por_ventanilla[ventanilla_id] = dispositivo
     
     def setup_panel3_estadisticas_controles(self):
         """Configura el PANEL 3: Estadísticas + Controles"""
@@ -348,11 +495,15 @@ class InterfazBanco:
         tk.Label(stats_frame, text="ESTADÍSTICAS EN TIEMPO REAL", 
                 font=("Arial", 14, "bold"), bg='#2c3e50', fg='white').pack(pady=10)
 
+        total = len(self.banco.ventanillas)
         self.stats_label = tk.Label(stats_frame, 
-                text="Ventanillas libres: 3/3\nClientes en fila: 0\nClientes atendidos: 0",
+                text=f"Ventanillas libres: {total}/{total}\nClientes en fila: 0\nClientes atendidos: 0",
                 font=("Arial", 12), bg='#2c3e50', fg='#ecf0f1', justify=tk.LEFT)
         self.stats_label.pack(pady=10)
 
+        self.sparklines = PanelSparklines(stats_frame, self.series)
+        self.sparklines.pack(padx=5, pady=(0, 10))
+
         # Separador
         separator = tk.Frame(self.panel3, height=2, bg='#7f8c8d')
         separator.pack(fill=tk.X, padx=20, pady=10)
@@ -376,22 +527,11 @@ class InterfazBanco:
             'height': 1           # Altura fija mínima
         }
 
-        # Botones de demostración COMPACTOS
-        tk.Button(controls_frame, text="🎭 1 - Con Prioridad", 
-                command=self.demo_escenario_1, bg='#9b59b6', fg='white',
-                **compact_button_style).pack(fill=tk.X, pady=2)  # Menos espacio entre botones
-
-        tk.Button(controls_frame, text="🎭 2 - Sin Prioridad", 
-                command=self.demo_escenario_2, bg='#3498db', fg='white',
-                **compact_button_style).pack(fill=tk.X, pady=2)
-
-        tk.Button(controls_frame, text="👑 3 - Solo Prioritarios", 
-                command=self.demo_escenario_3, bg='#e67e22', fg='white',
-                **compact_button_style).pack(fill=tk.X, pady=2)
-
-        tk.Button(controls_frame, text="🔴 4 - Ventanillas Ocupadas", 
-                command=self.demo_escenario_4, bg='#e74c3c', fg='white',
-                **compact_button_style).pack(fill=tk.X, pady=2)
+        # Un botón por archivo de escenarios/
+        for escenario in self.escenarios:
+            tk.Button(controls_frame, text=escenario.boton,
+                    command=lambda e=escenario: self.iniciar_escenario(e), bg=escenario.color, fg='white',
+                    **compact_button_style).pack(fill=tk.X, pady=2)
 
         # Botón adicional para limpiar/reiniciar (opcional)
         tk.Button(controls_frame, text="🔄 Reiniciar Sistema", 
@@ -454,11 +594,11 @@ class InterfazBanco:
         self.setup_log_tags()
 
         # Frame para controles simples del log
-        log_controls_frame = tk.Frame(log_frame, bg='#34495e')
-        log_controls_frame.pack(fill=tk.X, pady=(5, 0))
+        self.log_controls_frame = tk.Frame(log_frame, bg='#34495e')
+        self.log_controls_frame.pack(fill=tk.X, pady=(5, 0))
 
         # Solo botón para limpiar (scroll siempre es manual)
-        tk.Button(log_controls_frame, text="📜 Limpiar Log", 
+        tk.Button(self.log_controls_frame, text="📜 Limpiar Log", 
                 command=self.limpiar_log,
                 font=("Arial", 8),
                 bg='#7f8c8d', fg='white',
@@ -491,208 +631,199 @@ class InterfazBanco:
         en_fila = len(self.banco.fila)
         atendidos = self.banco.clientes_atendidos
         
-        stats_text = (f"Ventanillas libres: {ventanillas_libres}/3\n"
+        total = len(self.banco.ventanillas)
+        stats_text = (f"Ventanillas libres: {ventanillas_libres}/{total}\n"
                      f"Clientes en fila: {en_fila}\n"
-                     f"Clientes atendidos: {atendidos}")
+                     + (f"Turnos remotos: {len(self.fila_virtual)} "
+                        f"({len(self.fila_virtual.en_camino)} en camino)\n" if self.fila_virtual is not None else "") +
+                     f"Clientes atendidos: {atendidos}\n"
+                     f"Temporizadores pendientes: {self.temporizadores.pendientes()}")
         
         self.stats_label.config(text=stats_text)
 
+    def _muestrear_series(self):
+        """Agrega una muestra a las series y redibuja las sparklines"""
+        self.series.muestrear()
+        self.sparklines.actualizar()
+        self.temporizadores.programar(("sistema", "series"), INTERVALO_SERIES, self._muestrear_series)
+    
+    def _vaciar_log_agregado(self):
+        """Escribe los resúmenes de las ventanas de log vencidas aunque no lleguen más eventos"""
+        antes = len(self.banco.log)
+        self.banco.agregador_log.vaciar()
+        if len(self.banco.log) != antes:
+            self.actualizar_log()
+        self.temporizadores.programar(("sistema", "log"), VENTANA_AGREGACION_LOG * 1000, self._vaciar_log_agregado)
+    
+    def _contadores_memoria(self):
+        """Contadores de la interfaz que sigue el perfil de memoria"""
+        return {
+            'personas_en_fila_gui': lambda: len(self.personas_en_fila_gui),
+            'items_canvas_fila': lambda: len(self.canvas_fila.find_all()),
+            'items_canvas_ventanillas': lambda: len(self.canvas_ventanillas.find_all()),
+            'items_sparklines': lambda: len(self.sparklines.canvas.find_all()),
+            'lineas_log_texto': lambda: int(self.log_text.index("end-1c").split(".")[0]),
+            'temporizadores': self.temporizadores.pendientes,
+            # Incluye los `after` que no pasan por el registro (posibles fugas)
+            'after_tk': lambda: len(self.root.tk.splitlist(self.root.tk.call("after", "info"))),
+        }
+
+    def _muestrear_memoria(self):
+        """Toma una muestra del perfil de memoria y actualiza el panel"""
+        self.perfil_memoria.muestrear()
+        self.panel_memoria.actualizar()
+        self.temporizadores.programar(("sistema", "memoria"), INTERVALO_MEMORIA, self._muestrear_memoria)
+
+    def _programar_fila_virtual(self, segundos, callback, *args):
+        """Temporizador de la fila virtual (revisiones, presentaciones y ausencias)"""
+        self.temporizadores.programar(("virtual",), int(segundos * 1000), callback, *args)
+    
+    def avisar_turno(self, persona, inicio_estimado, ventanilla_id):
+        """Avisa al celular del cliente que su turno está cerca"""
+        faltan = max(0, int(inicio_estimado - self.banco.reloj()))
+        mensaje = (f"🎫 Turno {persona.ticket}\nAcérquese a la sucursal\n"
+                  f"Atención en ~{faltan}s\nVentanilla {ventanilla_id} aprox.")
+        # Los descartes se registran en el log al vaciar las incidencias del despachador
+        self.notificaciones.enviar(Notificacion(persona.id, persona.transaccion, ventanilla_id, mensaje))
+    
     def enviar_notificacion(self, cliente, ventanilla_id):
-        """Envía notificación al dispositivo específico de la ventanilla"""
-        dispositivo = next((disp for disp in self.dispositivos_moviles 
-                          if disp['ventanilla_id'] == ventanilla_id), None)
-        
-        if dispositivo:
-            mensaje = (f"✅ Transacción completada\nCliente: {cliente.id}\n"
-                      f"Transacción: {cliente.transaccion}\nVentanilla: {ventanilla_id}\n¡Gracias!")
-            
-            dispositivo['notificacion'].config(text=mensaje, fg='#27ae60')
+        """Encola la notificación del cliente; la entrega ocurre fuera del fin de atención"""
+        mensaje = (f"✅ Transacción completada\nCliente: {cliente.id}\n"
+                  f"Transacción: {cliente.transaccion}\nVentanilla: {ventanilla_id}\n¡Gracias!")
+        # El log de entrega y de descarte lo escribe _procesar_notificaciones
+        self.notificaciones.enviar(Notificacion(cliente.id, cliente.transaccion, ventanilla_id, mensaje))
+    
+    def _procesar_notificaciones(self):
+        """Muestra las notificaciones entregadas a pantalla, registra las perdidas y limpia las vencidas"""
+        ahora = time.monotonic()
+        
+        for sumidero, notificaciones, motivo in self.notificaciones.drenar_incidencias():
+            clientes = ", ".join(str(n.cliente_id) for n in notificaciones)
+            self.banco.log.append(f"[ERROR] Sumidero {sumidero}: {len(notificaciones)} notificación(es) "
+                                  f"perdida(s) ({motivo}) - clientes {clientes}")
+        
+        for notificacion in self.sumidero_pantalla.drenar():
+            self.banco.log.append(f"[NOTIFICACION] Cliente {notificacion.cliente_id} notificado en dispositivo "
+                                  f"{notificacion.ventanilla_id}: {notificacion.transaccion}")
+            dispositivo = self.dispositivos_por_ventanilla.get(notificacion.ventanilla_id)
+            if dispositivo is None:
+                continue
+            dispositivo['notificacion'].config(text=notificacion.mensaje, fg='#27ae60')
             dispositivo['estado'].config(text="🔔 Notificado", fg='#9b59b6')
             dispositivo['ultima_notificacion'] = {
-                'cliente': cliente.id,
-                'transaccion': cliente.transaccion,
-                'timestamp': time.strftime("%H:%M:%S")
+                'cliente': notificacion.cliente_id,
+                'transaccion': notificacion.transaccion,
+                'timestamp': notificacion.hora
             }
-            
-            self.banco.log.append(f"[NOTIFICACION] Cliente {cliente.id} notificado en dispositivo {ventanilla_id}: {cliente.transaccion}")
-            
+            dispositivo['expira'] = ahora + DURACION_NOTIFICACION
+        
+        # Limpiar notificaciones que ya cumplieron su tiempo en pantalla
+        for dispositivo in self.dispositivos_moviles:
+            if dispositivo['expira'] is not None and dispositivo['expira'] <= ahora:
+                self.limpiar_notificacion_dispositivo(dispositivo['ventanilla_id'])
+        
+        self.temporizadores.programar(("sistema", "notificaciones"), INTERVALO_NOTIFICACIONES,
+                                      self._procesar_notificaciones)
+    
+    def _procesar_ingesta(self):
+        """Crea en el hilo de Tk los clientes que llegaron desde kioscos u otros productores"""
+        if self.ingesta.drenar(self.banco):
+            if len(self.banco.fila) > 30:
+                self.limpiar_fila_automatica()
             self.actualizar_estadisticas()
-            
-            # Limpiar notificación después de 8 segundos
-            self.root.after(8000, lambda: self.limpiar_notificacion_dispositivo(ventanilla_id))
+        self.temporizadores.programar(("sistema", "ingesta"), INTERVALO_INGESTA, self._procesar_ingesta)
     
     def limpiar_notificacion_dispositivo(self, ventanilla_id):
         """Limpia la notificación de un dispositivo específico"""
-        for disp in self.dispositivos_moviles:
-            if disp['ventanilla_id'] == ventanilla_id:
-                disp['notificacion'].config(text="Esperando...", fg='#7f8c8d')
-                disp['estado'].config(text="🟢 Listo", fg='#27ae60')
-                break
-
-    def demo_escenario_1(self):
-        """Demostración del Escenario 1: Atención con prioridad - Clientes mezclados"""
-        self.reiniciar_sistema(False)  # 🔥 NO mostrar mensajes de reinicio
-        self.escenario_activo = "con_prioridad"
-        
-        # Log de inicio
-        self.banco.log.extend([
-            "[DEMO] 🎭 INICIANDO ESCENARIO 1: ATENCIÓN CON PRIORIDAD",
-            "        📝 Clientes normales + prioritarios en fila", 
-            "        🎯 Prioritarios avanzan al frente"
-        ])
-        
-        # Iniciar simulación
-        self.simulacion_activa = True
-        self.iniciar_simulacion()
-        
-        # Agregar clientes MEZCLADOS para el escenario 1
-        tipos_clientes = [False, False, True, False]  # Normal, Normal, Prioritario, Normal
-        for prioridad in tipos_clientes:
-            self.banco.contador_personas += 1
-            cliente = Persona(self.banco.contador_personas, prioridad)
-            self.banco.agregar_persona(cliente)
-        
-        self.actualizar_estadisticas()
-        self.actualizar_log()
+        disp = self.dispositivos_por_ventanilla.get(ventanilla_id)
+        if disp:
+            disp['notificacion'].config(text="Esperando...", fg='#7f8c8d')
+            disp['estado'].config(text="🟢 Listo", fg='#27ae60')
+            disp['expira'] = None
 
-    def demo_escenario_2(self):
-        """Demostración del Escenario 2: Atención sin prioridad - SOLO normales"""
-        self.reiniciar_sistema(False)  # 🔥 NO mostrar mensajes de reinicio
-        self.escenario_activo = "sin_prioridad"
-        
-        # Log de inicio
-        self.banco.log.extend([
-            "[DEMO] 🎭 INICIANDO ESCENARIO 2: ATENCIÓN SIN PRIORIDAD",
-            "        📝 Solo clientes normales en fila",
-            "        🔄 Orden estricto FIFO (primero en llegar, primero en ser atendido)"
-        ])
-        
-        # Iniciar simulación
-        self.simulacion_activa = True
-        self.iniciar_simulacion()
-        
-        # Agregar SOLO clientes NORMALES para el escenario 2
-        for _ in range(4):
-            self.banco.contador_personas += 1
-            cliente = Persona(self.banco.contador_personas, prioridad=False)
-            self.banco.agregar_persona(cliente)
-        
-        self.actualizar_estadisticas()
-        self.actualizar_log()
-    
-    def demo_escenario_3(self):
-        """Demostración del Escenario 3: SOLO clientes prioritarios"""
-        self.reiniciar_sistema(False)  # 🔥 NO mostrar mensajes de reinicio
-        self.escenario_activo = "solo_prioritarios"
-        
-        # Log de inicio
-        self.banco.log.extend([
-            "[DEMO] 🎭 INICIANDO ESCENARIO 3: SOLO CLIENTES PRIORITARIOS",
-            "        👑 Todos los clientes tienen atención preferencial",
-            "        🔄 Orden secuencial equitativo (todos son prioritarios)",
-            "        ⚡ Asignación inmediata sin diferenciación de prioridades"
-        ])
-        
-        # Iniciar simulación
-        self.simulacion_activa = True
-        self.iniciar_simulacion()
-        
-        # Agregar SOLO clientes PRIORITARIOS para el escenario 3
-        for i in range(4):
-            self.banco.contador_personas += 1
-            cliente = Persona(self.banco.contador_personas, prioridad=True)
-            self.banco.agregar_persona(cliente)
-            self.banco.log.append(f"[PRIORIDAD] 👑 Cliente {self.banco.contador_personas} (PRIORITARIO) agregado - Todos tienen prioridad")
-        
-        self.actualizar_estadisticas()
-        self.actualizar_log()
+    def iniciar_escenario(self, escenario):
+        """
+        Reinicia el sistema y reproduce un escenario declarativo
 
-    def demo_escenario_4(self):
-        """Demostración del Escenario 4: Todas las ventanillas ocupadas"""
+        Args:
+            escenario (Escenario): Escenario de models/escenarios.py
+        """
         self.reiniciar_sistema(False)  # 🔥 NO mostrar mensajes de reinicio
-        self.escenario_activo = "ventanillas_ocupadas"
-        
+        self.escenario_activo = escenario.nombre
+
         # Log de inicio
-        self.banco.log.extend([
-            "[DEMO] 🎭 INICIANDO ESCENARIO 4: TODAS LAS VENTANILLAS OCUPADAS",
-            "        🔴 Todas las ventanillas en servicio activo",
-            "        ⏳ Clientes en espera hasta que se libere una ventanilla",
-            "        📊 Monitoreo constante del tiempo restante de atención",
-            "        🎯 Asignación inmediata al liberarse ventanilla (prioritarios primero)"
-        ])
-        
-        # Iniciar simulación
+        self.banco.log.append(f"[DEMO] 🎭 INICIANDO {escenario.titulo}")
+        self.banco.log.extend(f"        {linea}" for linea in escenario.descripcion)
+        if escenario.ventanillas != len(self.banco.ventanillas):
+            self.banco.log.append(f"[SISTEMA] ⚠️ El escenario pide {escenario.ventanillas} ventanillas; "
+                                  f"la interfaz tiene {len(self.banco.ventanillas)}")
+
+        self.banco.configurar_servicio(escenario.catalogo_servicio(), VELOCIDADES_VENTANILLA,
+                                       HABILIDADES_VENTANILLA)
+        self.banco.politica_descanso = escenario.politica_descanso()
+
+        # Las llegadas ya están precalculadas: la fila inicial entra en t = 0
         self.simulacion_activa = True
-        
-        # Agregar clientes rápidamente para ocupar todas las ventanillas
-        clientes_iniciales = []
-        for i in range(3):  # Ocupar las 3 ventanillas
-            self.banco.contador_personas += 1
-            cliente = Persona(self.banco.contador_personas, prioridad=random.choice([True, False]))
-            clientes_iniciales.append(cliente)
-            self.banco.agregar_persona(cliente)
-        
-        # Agregar más clientes a la fila (mezcla de normales y prioritarios)
-        tipos_clientes = [True, False, True, False, True]  # Mezcla para demostrar prioridad
-        for prioridad in tipos_clientes:
-            self.banco.contador_personas += 1
-            cliente = Persona(self.banco.contador_personas, prioridad)
-            self.banco.agregar_persona(cliente)
-            tipo = "PRIORITARIO" if prioridad else "NORMAL"
-            self.banco.log.append(f"[ESPERA] Cliente {self.banco.contador_personas} ({tipo}) en fila de espera")
-        
-        # Verificar estado de ventanillas
-        ventanillas_ocupadas = sum(1 for v in self.banco.ventanillas if v.estado == "atendiendo")
-        self.banco.log.append(f"[ESTADO] 🏦 {ventanillas_ocupadas}/3 ventanillas ocupadas - {len(self.banco.fila)} clientes en espera")
-        
-        if ventanillas_ocupadas == 3:
-            self.banco.log.append("[MONITOREO] 🔄 Sistema monitoreando liberación de ventanillas...")
-        
+        self.carga = iter(escenario.compilar(self.semillas.hija("llegadas", escenario.nombre)))
+        self.tiempo_carga = 0.0
+        self._programar_siguiente_llegada()
+
+        ocupadas = sum(1 for v in self.banco.ventanillas if v.estado == "atendiendo")
+        self.banco.log.append(f"[ESTADO] 🏦 {ocupadas}/{len(self.banco.ventanillas)} ventanillas ocupadas - "
+                              f"{len(self.banco.fila)} clientes en espera")
         self.actualizar_estadisticas()
         self.actualizar_log()
-        
-        # Iniciar generación automática después de 5 segundos
-        self.root.after(5000, self.iniciar_simulacion)
 
-    def iniciar_simulacion(self):
-        """Inicia simulación automática"""
-        if self.simulacion_activa:
-            delay_llegada = random.randint(2000, 5000)
-            self.root.after(delay_llegada, self.generar_persona_aleatoria)
+    def _programar_siguiente_llegada(self):
+        """Programa la siguiente llegada de la carga respetando su tiempo relativo"""
+        llegada = next(self.carga, None)
+        while llegada is not None:
+            retardo_ms = max(0, int((llegada[0] - self.tiempo_carga) * 1000))
+            self.tiempo_carga = llegada[0]
+            if retardo_ms > 0:
+                self.temporizadores.programar(("escenario",), retardo_ms, self.generar_persona_aleatoria, llegada)
+                return
+            # Fila inicial y llegadas simultáneas: entran en el acto, sin pasar por el bucle de Tk
+            self._agregar_llegada(llegada)
+            llegada = next(self.carga, None)
+        self.banco.log.append("[SISTEMA] 📭 Carga de llegadas agotada")
 
-    def generar_persona_aleatoria(self):
-        """Genera cliente aleatorio - Controlado por escenario"""
+    def generar_persona_aleatoria(self, llegada):
+        """
+        Genera el cliente de una llegada de la carga - Controlado por escenario
+        
+        Args:
+            llegada (tuple): (tiempo, prioridad, transaccion) de models/cargas.py
+        """
         if not self.simulacion_activa:
             return
-            
+        self._agregar_llegada(llegada)
+
+        # Programar siguiente generación
+        if self.simulacion_activa:
+            self._programar_siguiente_llegada()
+
+    def _agregar_llegada(self, llegada):
+        """Crea el cliente de una llegada y lo pone en la fila (o le da turno)"""
         self.banco.contador_personas += 1
-        
-        # Controlar prioridad según escenario
-        if self.escenario_activo == "sin_prioridad":
-            prioridad = False  # Solo normales
-        elif self.escenario_activo == "solo_prioritarios":
-            prioridad = True   # Solo prioritarios
-        elif self.escenario_activo == "ventanillas_ocupadas":
-            # Para el escenario 4, mezcla de normales y prioritarios
-            prioridad = random.choice([True, False, True, False])  # 50% cada uno
-        else:
-            prioridad = random.choice([False, False, False, True])  # 75% normales, 25% prioritarios
+        _, prioridad, transaccion = llegada
         
         tipo = "PRIORITARIO" if prioridad else "NORMAL"
-        self.banco.log.append(f"[GENERACION] ➕ Cliente {self.banco.contador_personas} ({tipo}) generado automáticamente")
+        numero = self.banco.contador_personas
+        self.banco.agregador_log.registrar(
+            "GENERACION", lambda: f"[GENERACION] ➕ Cliente {numero} ({tipo}) generado automáticamente")
         
-        persona = Persona(self.banco.contador_personas, prioridad)
-        self.banco.agregar_persona(persona)
+        persona = Persona(self.banco.contador_personas, prioridad, transaccion, self.banco.rng_transacciones)
+        if self.fila_virtual is not None:
+            self.fila_virtual.emitir_ticket(persona)
+        else:
+            self.banco.agregar_persona(persona)
 
         # Limpiar fila si es muy larga
         if len(self.banco.fila) > 30:
             self.limpiar_fila_automatica()
 
         self.actualizar_estadisticas()
-        
-        # Programar siguiente generación
-        if self.simulacion_activa:
-            self.root.after(random.randint(2000, 5000), self.generar_persona_aleatoria)
 
     def reiniciar_sistema(self, mostrar_mensajes=True):
         """Reinicia completamente el sistema para empezar desde cero
@@ -700,22 +831,31 @@ class InterfazBanco:
         Args:
             mostrar_mensajes (bool): Si muestra mensajes de reinicio o no
         """
-        # Detener simulación actual
+        # Detener simulación actual y cancelar sus temporizadores pendientes
         self.simulacion_activa = False
+        cancelados = self.temporizadores.cancelar_ambito(("ventanilla",), ("escenario",), ("virtual",))
+        if self.fila_virtual is not None:
+            self.fila_virtual.reiniciar()
         
         # Reiniciar banco
         self.banco.fila.clear()
+        if self.banco.enrutador:
+            self.banco.enrutador.reiniciar()
+        self.banco.politica_descanso.reiniciar()
+        self.series.reiniciar()
         self.banco.contador_personas = 0
         self.banco.clientes_atendidos = 0
         
         # Limpiar los logs del banco
         self.banco.log.clear()
+        self.banco.agregador_log.reiniciar()
         
         # 🔥 SOLO AGREGAR MENSAJES SI SE SOLICITA EXPLÍCITAMENTE
         if mostrar_mensajes:
             self.banco.log.append("[SISTEMA] 🔄 SISTEMA REINICIADO")
             self.banco.log.append("[SISTEMA] 📊 Empezando desde Cliente 1")
             self.banco.log.append("[SISTEMA] 🏦 Sistema listo para nuevo escenario")
+            self.banco.log.append(f"[SISTEMA] 🧹 {cancelados} temporizadores cancelados")
         
         # Liberar todas las ventanillas
         for ventanilla in self.banco.ventanillas:
@@ -724,6 +864,9 @@ class InterfazBanco:
             ventanilla.tiempo_restante = 0
             ventanilla.estado = "libre"
         
+        if self.banco.metricas:
+            self.banco.metricas.sincronizar(self.banco)
+        
         # Limpiar la interfaz visual de logs
         self.log_text.delete("1.0", tk.END)
         
@@ -743,20 +886,20 @@ class InterfazBanco:
         # Actualizar estadísticas
         self.actualizar_estadisticas()
 
-        def limpiar_fila_automatica(self):
-            """Limpia la fila automáticamente cuando es muy larga"""
-            if self.simulacion_activa and len(self.banco.fila) > 30:
-                clientes_eliminados = len(self.banco.fila) - 15
-                self.banco.fila = self.banco.fila[:15]
-                self.banco.log.append(f"[SISTEMA] Fila limpiada automáticamente: {clientes_eliminados} clientes eliminados. Manteniendo 15 en fila.")
-                
-                # Limpiar elementos visuales
-                for icon_id, texto_id, _ in self.personas_en_fila_gui[15:]:
-                    self.canvas_fila.delete(icon_id)
-                    self.canvas_fila.delete(texto_id)
-                self.personas_en_fila_gui = self.personas_en_fila_gui[:15]
-                self.actualizar_posiciones_fila()
-                self.actualizar_estadisticas()
+    def limpiar_fila_automatica(self):
+        """Limpia la fila automáticamente cuando es muy larga"""
+        if self.simulacion_activa and len(self.banco.fila) > 30:
+            clientes_eliminados = len(self.banco.fila) - 15
+            self.banco.retirar_de_fila(self.banco.fila[15:])
+            self.banco.log.append(f"[SISTEMA] Fila limpiada automáticamente: {clientes_eliminados} clientes eliminados. Manteniendo 15 en fila.")
+            
+            # Limpiar elementos visuales
+            for icon_id, texto_id, _ in self.personas_en_fila_gui[15:]:
+                self.canvas_fila.delete(icon_id)
+                self.canvas_fila.delete(texto_id)
+            self.personas_en_fila_gui = self.personas_en_fila_gui[:15]
+            self.actualizar_posiciones_fila()
+            self.actualizar_estadisticas()
 
     def limpiar_interfaz_visual(self):
         """Limpia todos los elementos visuales de la interfaz"""
@@ -766,20 +909,14 @@ class InterfazBanco:
             self.canvas_fila.delete(texto_id)
         self.personas_en_fila_gui.clear()
         
-        # Limpiar notificaciones de dispositivos móviles
-        for dispositivo in self.dispositivos_moviles:
-            dispositivo['notificacion'].config(text="Esperando...", fg='#7f8c8d')
-            dispositivo['estado'].config(text="🟢 Listo", fg='#27ae60')
-            dispositivo['ultima_notificacion'] = None
-        
-        # Actualizar estado de ventanillas
-        self.actualizar_estado_ventanillas()
-            
-        # Limpiar notificaciones de dispositivos móviles
+        # Limpiar notificaciones de dispositivos móviles (incluidas las aún no entregadas)
+        self.notificaciones.vaciar_colas()
+        self.sumidero_pantalla.drenar()
         for dispositivo in self.dispositivos_moviles:
             dispositivo['notificacion'].config(text="Esperando...", fg='#7f8c8d')
             dispositivo['estado'].config(text="🟢 Listo", fg='#27ae60')
             dispositivo['ultima_notificacion'] = None
+            dispositivo['expira'] = None
         
         # Actualizar estado de ventanillas
         self.actualizar_estado_ventanillas()
@@ -829,23 +966,41 @@ class InterfazBanco:
             self.canvas_fila.coords(icon_id, x, y)
             self.canvas_fila.coords(texto_id, x, y + 25)
 
+    def _apariencia_estado(self, ventanilla):
+        """
+        Obtiene los colores y el texto asociados al estado de una ventanilla
+        
+        Returns:
+            tuple: (color_estado, texto_estado, color_header)
+        """
+        if ventanilla.estado == "atendiendo":
+            return "#e74c3c", "ATENDIENDO", "#e74c3c"
+        elif ventanilla.estado == "descansando":
+            return "#f39c12", "DESCANSANDO", "#f39c12"
+        return "#27ae60", "DISPONIBLE", "#3498db"
+    
+    def _firma_ventanilla(self, ventanilla):
+        """Resume el estado visible de una ventanilla para detectar cambios"""
+        cliente = ventanilla.cliente
+        return (ventanilla.estado, ventanilla.tiempo_restante,
+                cliente.id if cliente else None,
+                cliente.prioridad if cliente else None)
+    
     def actualizar_estado_ventanillas(self):
-        """Actualizar el estado visual de las ventanillas"""
+        """Actualizar el estado visual de las ventanillas (solo las que cambiaron)"""
         for vent_gui in self.ventanillas_gui:
             vent = vent_gui['ventanilla']
             
-            if vent.estado == "atendiendo":
-                color_estado = "#e74c3c"
-                texto_estado = "ATENDIENDO"
-                color_header = "#e74c3c"
-            elif vent.estado == "descansando":
-                color_estado = "#f39c12"
-                texto_estado = "DESCANSANDO"
-                color_header = "#f39c12"
-            else:
-                color_estado = "#27ae60"
-                texto_estado = "DISPONIBLE"
-                color_header = "#3498db"
+            firma = self._firma_ventanilla(vent)
+            if firma == vent_gui['ultimo_estado']:
+                continue
+            vent_gui['ultimo_estado'] = firma
+            
+            if self.vista_compacta:
+                self._actualizar_celda_compacta(vent_gui)
+                continue
+            
+            color_estado, texto_estado, color_header = self._apariencia_estado(vent)
             
             vent_gui['header'].configure(bg=color_header)
             for widget in vent_gui['header'].winfo_children():
@@ -865,6 +1020,18 @@ class InterfazBanco:
                 vent_gui['tiempo'].configure(text="")
         
         self.actualizar_estadisticas()
+    
+    def _actualizar_celda_compacta(self, vent_gui):
+        """Redibuja la celda de una ventanilla en la vista compacta"""
+        vent = vent_gui['ventanilla']
+        _, _, color_header = self._apariencia_estado(vent)
+        
+        texto = f"V{vent.id}"
+        if vent.estado != "libre":
+            texto += f"\n{vent.tiempo_restante}s"
+        
+        self.canvas_ventanillas.itemconfigure(vent_gui['rect'], fill=color_header)
+        self.canvas_ventanillas.itemconfigure(vent_gui['texto'], text=texto)
 
     def actualizar_log(self):
         """Actualizar el registro de actividad - SOLO AGREGAR NUEVAS LÍNEAS"""
@@ -939,30 +1106,31 @@ class InterfazBanco:
         if ventanilla.tiempo_restante > 0:
             ventanilla.tiempo_restante -= 1
             self.actualizar_estado_ventanillas()
-            self.root.after(1000, lambda: self._ejecutar_temporizador(ventanilla))
+            self.temporizadores.programar(("ventanilla", ventanilla.id), 1000,
+                                          self._ejecutar_temporizador, ventanilla)
         else:
             if ventanilla.estado == "atendiendo":
-                self.terminar_atencion(ventanilla)
-                self.iniciar_descanso_ventanilla(ventanilla)
+                # Sin descanso el banco ya la liberó (y quizá le asignó otro cliente)
+                if self.terminar_atencion(ventanilla):
+                    self.iniciar_descanso_ventanilla(ventanilla)
             elif ventanilla.estado == "descansando":
                 self.banco.liberar_ventanilla(ventanilla)
     
     def terminar_atencion(self, ventanilla):
         """
         Termina la atención en una ventanilla y envía notificación al dispositivo correspondiente
+        
+        Returns:
+            int: Segundos de descanso que siguen (0 = ya está libre)
         """
         if ventanilla.cliente:
-            self.banco.clientes_atendidos += 1
-            cliente = ventanilla.cliente
-            
-            self.enviar_notificacion(cliente, ventanilla.id)
-            
-            self.banco.log.append(f"[ATENCION COMPLETADA] Cliente {cliente.id} finalizado - {cliente.transaccion}")
-            cliente.estado = "atendido"
+            self.enviar_notificacion(ventanilla.cliente, ventanilla.id)
         
-        ventanilla.liberar()
-        self.banco.log.append(f"[DESCANSO] Ventanilla {ventanilla.id} en pausa por {ventanilla.tiempo_restante} segundos")
-        self.actualizar_interfaz()
+        # El banco registra la atención, libera la ventanilla y refresca la interfaz
+        descanso = self.banco.terminar_atencion(ventanilla)
+        if self.fila_virtual is not None:
+            self.fila_virtual.actualizar()
+        return descanso
     
     def iniciar_descanso_ventanilla(self, ventanilla):
         """Inicia el temporizador de descanso para una ventanilla"""
@@ -973,7 +1141,8 @@ class InterfazBanco:
         if ventanilla.tiempo_restante > 0:
             ventanilla.tiempo_restante -= 1
             self.actualizar_estado_ventanillas()
-            self.root.after(1000, lambda: self._ejecutar_descanso(ventanilla))
+            self.temporizadores.programar(("ventanilla", ventanilla.id), 1000,
+                                          self._ejecutar_descanso, ventanilla)
         else:
             self.banco.liberar_ventanilla(ventanilla)
     
@@ -0,0 +1,223 @@
+"""
+Modo de estrés: sube la tasa de llegadas sobre la interfaz real hasta saturarla
+"""
+
+import json
+import sys
+import time
+
+from models.persona import Persona
+from models.simulador import percentil
+from utils.config import (TASAS_ESTRES, DURACION_PASO_ESTRES, UMBRAL_LAG_ESTRES_MS,
+                          INTERVALO_LATIDO_ESTRES, TICK_ESTRES)
+
+try:
+    import resource
+except ImportError:  # No disponible en Windows
+    resource = None
+
+
+class ModoEstres:
+    """
+    Aumenta la tasa de llegadas por pasos (10/s, 100/s, 1000/s...) sobre la
+    InterfazBanco en ejecución y mide en cada paso el retraso del bucle
+    principal, el tiempo gastado en los métodos actualizar_*, el largo de la
+    fila y la memoria. Se detiene al superar el umbral de retraso y escribe
+    un reporte JSON.
+    """
+
+    METODOS_MEDIDOS = ('actualizar_estado_ventanillas', 'actualizar_log',
+                       'actualizar_estadisticas', 'actualizar_posiciones_fila')
+
+    def __init__(self, interfaz, tasas=TASAS_ESTRES, duracion_paso=DURACION_PASO_ESTRES,
+                 umbral_lag_ms=UMBRAL_LAG_ESTRES_MS, ruta_reporte="reporte_estres.json"):
+        """
+        Inicializa el modo de estrés
+
+        Args:
+            interfaz (InterfazBanco): Interfaz en ejecución
+            tasas (tuple): Llegadas por segundo de cada paso
+            duracion_paso (float): Segundos que dura cada paso
+            umbral_lag_ms (float): p95 de retraso del bucle que detiene la prueba
+            ruta_reporte (str): Archivo JSON donde se escribe el reporte
+        """
+        self.interfaz = interfaz
+        self.tasas = list(tasas)
+        self.duracion_paso = duracion_paso
+        self.umbral_lag_ms = umbral_lag_ms
+        self.ruta_reporte = ruta_reporte
+        self.pasos = []
+        self._originales = {}
+        self._profundidad = 0  # actualizar_* anidados en curso
+        self._paso = None
+
+    # ------------------------------------------------------------------
+    # Ciclo de la prueba
+    # ------------------------------------------------------------------
+    def iniciar(self):
+        """Reinicia el sistema y comienza el primer paso"""
+        interfaz = self.interfaz
+        interfaz.reiniciar_sistema(False)
+        interfaz.escenario_activo = "estres"
+        interfaz.simulacion_activa = True
+        interfaz.banco.log.append("[SISTEMA] 🔥 MODO ESTRÉS: tasas " + ", ".join(f"{t}/s" for t in self.tasas))
+
+        self._instrumentar()
+        self._indice = -1
+        self._siguiente_paso()
+
+        self._latido_esperado = time.perf_counter() + INTERVALO_LATIDO_ESTRES / 1000
+        interfaz.temporizadores.programar(("estres",), INTERVALO_LATIDO_ESTRES, self._latido)
+
+    def _siguiente_paso(self):
+        """Cierra el paso actual y arranca el siguiente o termina la prueba"""
+        if self._paso is not None:
+            resumen = self._cerrar_paso()
+            self.pasos.append(resumen)
+            if resumen['lag_p95_ms'] > self.umbral_lag_ms:
+                self._terminar(f"retraso p95 {resumen['lag_p95_ms']:.0f} ms > {self.umbral_lag_ms} ms")
+                return
+
+        self._indice += 1
+        if self._indice >= len(self.tasas):
+            self._terminar("se completaron todas las tasas")
+            return
+
+        ahora = time.perf_counter()
+        self._paso = {
+            'tasa': self.tasas[self._indice],
+            'inicio': ahora,
+            'ultimo_tick': ahora,
+            'acumulado': 0.0,
+            'generados': 0,
+            'lags': [],
+            'fila_max': 0,
+            'tiempos': dict.fromkeys(self.METODOS_MEDIDOS, 0.0),
+            'llamadas': dict.fromkeys(self.METODOS_MEDIDOS, 0)
+        }
+        self.interfaz.banco.log.append(f"[SISTEMA] 🔥 Paso de estrés: {self._paso['tasa']} llegadas/s")
+        self.interfaz.temporizadores.programar(("estres",), TICK_ESTRES, self._tick)
+
+    def _tick(self):
+        """Genera las llegadas que corresponden al tiempo real transcurrido"""
+        paso = self._paso
+        ahora = time.perf_counter()
+        paso['acumulado'] += paso['tasa'] * (ahora - paso['ultimo_tick'])
+        paso['ultimo_tick'] = ahora
+
+        cantidad = int(paso['acumulado'])
+        paso['acumulado'] -= cantidad
+        for _ in range(cantidad):
+            self._generar_cliente()
+        paso['generados'] += cantidad
+        paso['fila_max'] = max(paso['fila_max'], len(self.interfaz.banco.fila))
+
+        if ahora - paso['inicio'] >= self.duracion_paso:
+            self._siguiente_paso()
+        else:
+            self.interfaz.temporizadores.programar(("estres",), TICK_ESTRES, self._tick)
+
+    def _generar_cliente(self):
+        """Agrega un cliente como lo haría la generación automática"""
+        interfaz = self.interfaz
+        interfaz.banco.contador_personas += 1
+        prioridad = interfaz.banco.contador_personas % 4 == 0
+        interfaz.banco.agregar_persona(Persona(interfaz.banco.contador_personas, prioridad,
+                                               rng=interfaz.banco.rng_transacciones))
+        if len(interfaz.banco.fila) > 30:
+            interfaz.limpiar_fila_automatica()
+
+    def _latido(self):
+        """Mide cuánto tarde llega el bucle principal a un callback periódico"""
+        ahora = time.perf_counter()
+        if self._paso is not None:
+            self._paso['lags'].append(max(0.0, (ahora - self._latido_esperado) * 1000))
+        self._latido_esperado = ahora + INTERVALO_LATIDO_ESTRES / 1000
+        self.interfaz.temporizadores.programar(("estres",), INTERVALO_LATIDO_ESTRES, self._latido)
+
+    def _cerrar_paso(self):
+        """Resume las mediciones del paso actual"""
+        paso = self._paso
+        transcurrido = max(time.perf_counter() - paso['inicio'], 1e-9)
+        lags = paso['lags']
+        return {
+            'tasa_objetivo': paso['tasa'],
+            'tasa_real': paso['generados'] / transcurrido,
+            'generados': paso['generados'],
+            'lag_medio_ms': sum(lags) / len(lags) if lags else 0.0,
+            'lag_p95_ms': percentil(lags, 95) if lags else 0.0,
+            'lag_max_ms': max(lags) if lags else 0.0,
+            'fila_max': paso['fila_max'],
+            'tiempo_actualizar_ms': {m: t * 1000 for m, t in paso['tiempos'].items()},
+            'llamadas_actualizar': dict(paso['llamadas']),
+            'fraccion_en_actualizar': sum(paso['tiempos'].values()) / transcurrido,
+            'memoria_max_mb': self._memoria_mb()
+        }
+
+    def _terminar(self, motivo):
+        """Detiene la prueba, restaura la interfaz y escribe el reporte"""
+        self.interfaz.temporizadores.cancelar_ambito(("estres",))
+        self.interfaz.simulacion_activa = False
+        self._restaurar()
+        self._paso = None
+
+        sostenibles = [p['tasa_objetivo'] for p in self.pasos if p['lag_p95_ms'] <= self.umbral_lag_ms]
+        reporte = {
+            'motivo': motivo,
+            'umbral_lag_ms': self.umbral_lag_ms,
+            'capacidad_llegadas_por_segundo': max(sostenibles) if sostenibles else 0,
+            'pasos': self.pasos
+        }
+        with open(self.ruta_reporte, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False)
+
+        self.interfaz.banco.log.append(
+            f"[SISTEMA] 🔥 Estrés terminado ({motivo}). Capacidad: "
+            f"{reporte['capacidad_llegadas_por_segundo']}/s - reporte en {self.ruta_reporte}")
+        self.interfaz.actualizar_log()
+        return reporte
+
+    # ------------------------------------------------------------------
+    # Instrumentación
+    # ------------------------------------------------------------------
+    def _instrumentar(self):
+        """Envuelve los métodos actualizar_* de la instancia para medir su tiempo"""
+        for nombre in self.METODOS_MEDIDOS:
+            original = getattr(self.interfaz, nombre)
+            self._originales[nombre] = original
+            setattr(self.interfaz, nombre, self._medir(nombre, original))
+
+    def _medir(self, nombre, original):
+        """
+        Solo se cronometra la llamada más externa: si un actualizar_* llama a
+        otro, su tiempo ya está dentro del de quien lo llamó y sumarlo de nuevo
+        contaría dos veces (fraccion_en_actualizar podría superar 1)
+        """
+        def medido(*args, **kwargs):
+            externa = self._profundidad == 0
+            self._profundidad += 1
+            inicio = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._profundidad -= 1
+                if self._paso is not None:
+                    if externa:
+                        self._paso['tiempos'][nombre] += time.perf_counter() - inicio
+                    self._paso['llamadas'][nombre] += 1
+        return medido
+
+    def _restaurar(self):
+        """Quita los envoltorios de medición"""
+        for nombre in self._originales:
+            delattr(self.interfaz, nombre)
+        self._originales.clear()
+
+    @staticmethod
+    def _memoria_mb():
+        """Memoria máxima residente del proceso en MB (None si no se puede medir)"""
+        if resource is None:
+            return None
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa en KB; macOS en bytes
+        return maximo / (1024 * 1024) if sys.platform == "darwin" else maximo / 1024
@@ -0,0 +1,68 @@
+"""
+Panel de depuración con el perfil de memoria de la sesión
+"""
+
+import tkinter as tk
+
+
+class PanelMemoria:
+    """
+    Ventana secundaria que muestra la última muestra de un PerfilMemoria:
+    contadores con su crecimiento por hora y las líneas de código cuya
+    memoria más cambió. El texto se reemplaza entero en cada actualización,
+    así que el panel no acumula líneas.
+    """
+
+    def __init__(self, root, perfil):
+        """
+        Args:
+            root (tk.Tk): Ventana principal
+            perfil (PerfilMemoria): Perfil a mostrar
+        """
+        self.perfil = perfil
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("🧪 Perfil de memoria")
+        self.ventana.geometry("760x520")
+        self.ventana.configure(bg='#2c3e50')
+        self.texto = tk.Text(self.ventana, bg='#1e272e', fg='#ecf0f1', font=("Courier", 9),
+                             wrap=tk.NONE, borderwidth=0)
+        self.texto.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        self.texto.tag_configure("titulo", foreground='#f39c12', font=("Courier", 9, "bold"))
+        self.texto.tag_configure("crece", foreground='#e74c3c')
+        # Cerrar la ventana solo la oculta; el perfil sigue midiendo
+        self.ventana.protocol("WM_DELETE_WINDOW", self.ventana.withdraw)
+
+    def mostrar(self):
+        """Vuelve a abrir el panel (si se cerró) y lo trae al frente"""
+        self.ventana.deiconify()
+        self.ventana.lift()
+        self.actualizar()
+
+    def actualizar(self):
+        """Redibuja el panel con la última muestra del perfil"""
+        ultimo = self.perfil.ultimo
+        if ultimo is None:
+            return
+        crecimiento = self.perfil.crecimiento_por_hora()
+        texto = self.texto
+        texto.configure(state=tk.NORMAL)
+        texto.delete("1.0", tk.END)
+
+        texto.insert(tk.END, f"MEMORIA  {ultimo['memoria'] / 1048576:.2f} MB  (pico {ultimo['pico'] / 1048576:.2f} MB)"
+                             f"  ·  {len(self.perfil.muestras)} muestras\n", "titulo")
+        por_hora = crecimiento['memoria_kb']
+        texto.insert(tk.END, f"Crecimiento: {'-' if por_hora is None else f'{por_hora:+,.1f} KB/h'}\n\n")
+
+        texto.insert(tk.END, f"{'CONTADOR':<28}{'ACTUAL':>10}{'POR HORA':>14}\n", "titulo")
+        for nombre, valor in ultimo['conteos'].items():
+            pendiente = crecimiento.get(nombre)
+            marca = "crece" if pendiente is not None and pendiente > 0 else ()
+            texto.insert(tk.END, f"{nombre:<28}{valor:>10,}"
+                                 f"{'-' if pendiente is None else f'{pendiente:+,.1f}':>14}\n", marca)
+
+        for titulo, clave in (("DESDE LA MUESTRA ANTERIOR", 'diferencias'), ("DESDE EL INICIO", 'desde_inicio')):
+            texto.insert(tk.END, f"\n{titulo}\n", "titulo")
+            for d in ultimo[clave]:
+                texto.insert(tk.END, f"{d['delta_kb']:+10.1f} KB {d['delta_bloques']:+8,} bloques  {d['linea']}\n",
+                             "crece" if d['delta_kb'] > 0 else ())
+        texto.configure(state=tk.DISABLED)
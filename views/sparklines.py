@@ -0,0 +1,103 @@
+"""
+Mini gráficos (sparklines) de las series del banco sobre un único Canvas de Tk
+"""
+
+import tkinter as tk
+
+from utils.config import VENTANAS_SERIES, PUNTOS_SPARKLINE, ALTO_SPARKLINE
+
+# (serie, etiqueta, color, método de reducción)
+LINEAS_SPARKLINE = (
+    ('fila_prioritarios', "Fila prioritarios", '#f39c12', "minmax"),
+    ('fila_normales', "Fila normales", '#3498db', "minmax"),
+    ('ocupadas', "Ventanillas ocupadas", '#e74c3c', "minmax"),
+    ('rendimiento', "Atendidos/min", '#27ae60', "lttb"),
+)
+
+
+class PanelSparklines:
+    """
+    Dibuja una sparkline por serie en un solo Canvas. Los ítems (línea y
+    textos) se crean una vez; cada actualización solo cambia sus
+    coordenadas y textos con a lo sumo PUNTOS_SPARKLINE puntos por línea,
+    así que el costo no depende de cuánto lleve la simulación.
+
+    Un clic sobre el panel cambia la ventana de tiempo mostrada.
+    """
+
+    def __init__(self, parent, series, ancho=440, alto_linea=ALTO_SPARKLINE,
+                 ventanas=VENTANAS_SERIES, puntos=PUNTOS_SPARKLINE):
+        """
+        Args:
+            parent (tk.Widget): Contenedor del Canvas
+            series (SeriesBanco): Series a dibujar
+            ancho (int): Ancho del Canvas en píxeles
+            alto_linea (int): Alto de cada sparkline
+            ventanas (tuple): Ventanas de tiempo (segundos) entre las que alterna el clic
+            puntos (int): Puntos máximos por línea
+        """
+        self.series = series
+        self.ventanas = ventanas
+        self.indice_ventana = 0
+        self.puntos = puntos
+        self.alto_linea = alto_linea
+        self.margen_izq = 150
+        self.ancho_grafico = ancho - self.margen_izq - 50
+        separacion = alto_linea + 14
+
+        self.canvas = tk.Canvas(parent, width=ancho, height=separacion * len(LINEAS_SPARKLINE) + 18,
+                                bg='#2c3e50', highlightthickness=0)
+        self.canvas.bind("<Button-1>", self._cambiar_ventana)
+        self.titulo = self.canvas.create_text(4, 2, anchor=tk.NW, fill='#bdc3c7', font=("Arial", 9))
+
+        self.items = {}
+        for i, (nombre, etiqueta, color, metodo) in enumerate(LINEAS_SPARKLINE):
+            y = 18 + i * separacion
+            self.canvas.create_text(4, y + alto_linea / 2, anchor=tk.W, text=etiqueta,
+                                    fill='#ecf0f1', font=("Arial", 9))
+            self.canvas.create_line(self.margen_izq, y + alto_linea, self.margen_izq + self.ancho_grafico,
+                                    y + alto_linea, fill='#34495e')
+            linea = self.canvas.create_line(0, 0, 0, 0, fill=color, width=1.5)
+            valor = self.canvas.create_text(self.margen_izq + self.ancho_grafico + 6, y + alto_linea / 2,
+                                            anchor=tk.W, fill=color, font=("Arial", 9, "bold"))
+            maximo = self.canvas.create_text(self.margen_izq + self.ancho_grafico, y, anchor=tk.NE,
+                                             fill='#7f8c8d', font=("Arial", 7))
+            self.items[nombre] = (linea, valor, maximo, y, metodo)
+
+    def pack(self, **opciones):
+        self.canvas.pack(**opciones)
+
+    def _cambiar_ventana(self, _evento=None):
+        self.indice_ventana = (self.indice_ventana + 1) % len(self.ventanas)
+        self.actualizar()
+
+    @staticmethod
+    def _formatear_ventana(segundos):
+        if segundos >= 86400:
+            return f"{segundos / 86400:g} d"
+        if segundos >= 3600:
+            return f"{segundos / 3600:g} h"
+        return f"{segundos / 60:g} min"
+
+    def actualizar(self):
+        """Recalcula las líneas a partir de las series (no crea ítems nuevos)"""
+        ventana = self.ventanas[self.indice_ventana]
+        ahora = self.series.banco.reloj()
+        desde = ahora - ventana
+        self.canvas.itemconfig(self.titulo, text=f"Últimos {self._formatear_ventana(ventana)} "
+                                                 f"(clic para cambiar)")
+        escala_t = self.ancho_grafico / ventana
+
+        for nombre, (linea, valor, maximo_item, y, metodo) in self.items.items():
+            serie = self.series.series[nombre]
+            puntos = serie.puntos(ventana, ahora, self.puntos, metodo)
+            tope = max((v for _, v in puntos), default=0) or 1
+            coordenadas = []
+            for t, v in puntos:
+                coordenadas.append(self.margen_izq + max(0.0, t - desde) * escala_t)
+                coordenadas.append(y + self.alto_linea - v / tope * self.alto_linea)
+            if len(coordenadas) < 4:
+                coordenadas = [0, 0, 0, 0]  # Línea invisible hasta tener dos puntos
+            self.canvas.coords(linea, *coordenadas)
+            self.canvas.itemconfig(valor, text="-" if serie.ultimo is None else f"{serie.ultimo:g}")
+            self.canvas.itemconfig(maximo_item, text=f"máx {tope:g}")
@@ -0,0 +1,232 @@
+"""
+Tablero de terminal (curses) para seguir una simulación en servidores sin pantalla
+"""
+
+import itertools
+import time
+from collections import Counter, deque
+
+from utils.config import (FPS_TERMINAL, VELOCIDAD_TERMINAL, VENTANA_RENDIMIENTO_TERMINAL,
+                          EVENTOS_TERMINAL)
+
+try:
+    import curses
+except ImportError:  # No disponible en Windows sin windows-curses
+    curses = None
+
+SIMBOLOS_ESTADO = {"libre": "🟢", "atendiendo": "🔴", "descansando": "🟡"}
+ANCHO_CELDA = 20
+
+
+class TableroTerminal:
+    """
+    Muestra el estado de un SimuladorBanco en la terminal.
+
+    El simulador avanza a `velocidad` segundos simulados por segundo real y
+    la pantalla se redibuja a un número fijo de cuadros por segundo a partir
+    del estado agregado del banco (no una vez por evento), de modo que el
+    costo de dibujar no depende de la tasa de llegadas. Entre cuadros el
+    proceso queda bloqueado esperando una tecla, sin consumir CPU.
+
+    Teclas: q salir, p pausar, + / - cambiar la velocidad.
+    """
+
+    def __init__(self, simulador, fps=FPS_TERMINAL, velocidad=VELOCIDAD_TERMINAL,
+                 ingesta=None, duracion=None, web=None, perfil=None):
+        """
+        Inicializa el tablero
+
+        Args:
+            simulador (SimuladorBanco): Simulación a mostrar
+            fps (float): Cuadros por segundo
+            velocidad (float): Segundos simulados por segundo real
+            ingesta (ColaIngesta): Cola de kioscos a drenar en cada cuadro (opcional)
+            duracion (float): Segundos simulados tras los que termina (None = hasta salir)
+            web (ServidorTablero): Tablero web al que publicar cada cuadro (opcional)
+            perfil (PerfilMemoria): Perfil de memoria a resumir en pantalla (opcional)
+        """
+        self.simulador = simulador
+        self.banco = simulador.banco
+        self.intervalo = 1.0 / fps
+        self.velocidad = velocidad
+        self.ingesta = ingesta
+        self.duracion = duracion
+        self.web = web
+        self.perfil = perfil
+        self.pausado = False
+        self.cuadros = 0
+        self.cpu = 0.0
+        self._muestras = deque()  # (tiempo simulado, clientes atendidos)
+        self._esperas_leidas = {True: 0, False: 0}
+        self._suma_esperas = 0.0
+
+    # ------------------------------------------------------------------
+    # Ciclo principal
+    # ------------------------------------------------------------------
+    def ejecutar(self):
+        """Toma la terminal hasta que se presione q (o termine la duración)"""
+        if curses is None:
+            raise RuntimeError("El módulo curses no está disponible en este sistema")
+        curses.wrapper(self._bucle)
+        return self.simulador.resultados()
+
+    def _bucle(self, pantalla):
+        curses.curs_set(0)
+        if curses.has_colors():
+            curses.use_default_colors()
+            for par, color in enumerate((curses.COLOR_GREEN, curses.COLOR_RED, curses.COLOR_YELLOW,
+                                         curses.COLOR_CYAN), start=1):
+                curses.init_pair(par, color, -1)
+
+        anterior = time.monotonic()
+        cpu_anterior = time.process_time()
+        proximo_cuadro = anterior
+        while True:
+            ahora = time.monotonic()
+            if not self.pausado:
+                self._avanzar((ahora - anterior) * self.velocidad)
+            anterior = ahora
+
+            cpu = time.process_time()
+            self.cpu = 0.8 * self.cpu + 0.2 * (cpu - cpu_anterior) / self.intervalo
+            cpu_anterior = cpu
+            self._dibujar(pantalla)
+            self.cuadros += 1
+            if self.duracion is not None and self.simulador.ahora >= self.duracion:
+                return
+
+            # Espera bloqueante hasta el próximo cuadro; una tecla la interrumpe
+            proximo_cuadro = max(proximo_cuadro + self.intervalo, time.monotonic())
+            pantalla.timeout(max(1, int((proximo_cuadro - time.monotonic()) * 1000)))
+            tecla = pantalla.getch()
+            if tecla in (ord("q"), ord("Q")):
+                return
+            if tecla in (ord("p"), ord("P")):
+                self.pausado = not self.pausado
+            elif tecla == ord("+"):
+                self.velocidad *= 2
+            elif tecla == ord("-"):
+                self.velocidad = max(0.125, self.velocidad / 2)
+
+    def _avanzar(self, segundos):
+        """Avanza la simulación y registra una muestra de rendimiento"""
+        if self.ingesta is not None:
+            self.ingesta.drenar(self.banco)
+        objetivo = self.simulador.ahora + segundos
+        if self.duracion is not None:
+            objetivo = min(objetivo, self.duracion)
+        self.simulador.ejecutar_hasta(objetivo)
+        if self.web is not None:
+            self.web.publicar(self.banco)
+
+        muestras = self._muestras
+        muestras.append((self.simulador.ahora, self.banco.clientes_atendidos))
+        while len(muestras) > 2 and muestras[1][0] <= self.simulador.ahora - VENTANA_RENDIMIENTO_TERMINAL:
+            muestras.popleft()
+
+    def espera_media(self):
+        """Espera media acumulada, sumando solo las esperas nuevas desde el cuadro anterior"""
+        cantidad = 0
+        for clase, esperas in self.simulador.esperas.items():
+            leidas = self._esperas_leidas[clase]
+            self._suma_esperas += sum(esperas[leidas:])
+            self._esperas_leidas[clase] = len(esperas)
+            cantidad += len(esperas)
+        return self._suma_esperas / cantidad if cantidad else 0.0
+
+    def utilizacion(self):
+        """Fracción del tiempo (tras el calentamiento) en que las ventanillas atendieron"""
+        simulador = self.simulador
+        duracion = simulador.ahora - simulador.calentamiento
+        if duracion <= 0 or not self.banco.ventanillas:
+            return 0.0
+        return simulador.tiempo_ocupado / (duracion * len(self.banco.ventanillas))
+
+    def rendimiento(self):
+        """Clientes por hora en la ventana reciente de tiempo simulado"""
+        if len(self._muestras) < 2:
+            return 0.0
+        (t0, a0), (t1, a1) = self._muestras[0], self._muestras[-1]
+        return (a1 - a0) / (t1 - t0) * 3600 if t1 > t0 else 0.0
+
+    # ------------------------------------------------------------------
+    # Dibujo
+    # ------------------------------------------------------------------
+    def _escribir(self, pantalla, y, x, texto, atributos=0):
+        """Escribe recortando al ancho de la pantalla (curses falla fuera de ella)"""
+        alto, ancho = pantalla.getmaxyx()
+        if 0 <= y < alto and x < ancho - 1:
+            try:
+                pantalla.addnstr(y, x, texto, ancho - 1 - x, atributos)
+            except curses.error:
+                pass
+
+    def _color(self, par):
+        return curses.color_pair(par) if curses.has_colors() else 0
+
+    def _dibujar(self, pantalla):
+        banco = self.banco
+        alto, ancho = pantalla.getmaxyx()
+        pantalla.erase()
+
+        estado = " ⏸ PAUSADO" if self.pausado else ""
+        self._escribir(pantalla, 0, 0, f"🏦 SISTEMA DE GESTIÓN BANCARIA - t={self.simulador.ahora:,.0f}s "
+                                       f"x{self.velocidad:g}{estado}", curses.A_BOLD)
+        self._escribir(pantalla, 1, 0, f"Cuadro {self.cuadros} · {1 / self.intervalo:g} fps · "
+                                       f"CPU {self.cpu:.0%} · q salir  p pausa  +/- velocidad")
+
+        # Ventanillas en cuadrícula
+        y = 3
+        por_estado = Counter(v.estado for v in banco.ventanillas)
+        self._escribir(pantalla, y, 0, f"VENTANILLAS  libres {por_estado['libre']}  atendiendo "
+                                       f"{por_estado['atendiendo']}  descansando {por_estado['descansando']}",
+                       curses.A_BOLD)
+        y += 1
+        columnas = max(1, (ancho - 1) // ANCHO_CELDA)
+        filas_disponibles = max(1, alto - y - EVENTOS_TERMINAL - 8)
+        colores = {"libre": 1, "atendiendo": 2, "descansando": 3}
+        for i, v in enumerate(banco.ventanillas[:columnas * filas_disponibles]):
+            detalle = f"C{v.cliente.id}" if v.cliente else ""
+            self._escribir(pantalla, y + i // columnas, (i % columnas) * ANCHO_CELDA,
+                           f"{SIMBOLOS_ESTADO.get(v.estado, '?')} V{v.id:<3} {detalle}",
+                           self._color(colores.get(v.estado, 4)))
+        y += min(filas_disponibles, -(-len(banco.ventanillas) // columnas)) + 1
+
+        # Composición de la fila
+        prioritarios = sum(1 for p in banco.fila if p.prioridad)
+        self._escribir(pantalla, y, 0, f"FILA  {len(banco.fila)} clientes  ({prioritarios} prioritarios, "
+                                       f"{len(banco.fila) - prioritarios} normales)", curses.A_BOLD)
+        y += 1
+        transacciones = Counter(p.transaccion for p in banco.fila).most_common(3)
+        self._escribir(pantalla, y, 2, "  ".join(f"{t}: {n}" for t, n in transacciones) or "(vacía)")
+        fila_virtual = self.simulador.fila_virtual
+        if fila_virtual is not None:
+            y += 1
+            self._escribir(pantalla, y, 2, f"Turnos remotos: {len(fila_virtual)} "
+                                           f"({len(fila_virtual.en_camino)} en camino)")
+        y += 2
+
+        # Rendimiento
+        self._escribir(pantalla, y, 0, "RENDIMIENTO", curses.A_BOLD)
+        self._escribir(pantalla, y + 1, 2, f"Atendidos: {banco.clientes_atendidos}  ·  "
+                                           f"{self.rendimiento():.0f} clientes/h (últimos "
+                                           f"{VENTANA_RENDIMIENTO_TERMINAL}s)  ·  utilización "
+                                           f"{self.utilizacion():.0%}")
+        self._escribir(pantalla, y + 2, 2, f"Espera media: {self.espera_media():.1f}s  ·  "
+                                           f"eventos procesados: {self.simulador.eventos_procesados:,}")
+        y += 4
+        if self.perfil is not None and self.perfil.ultimo is not None:
+            por_hora = self.perfil.crecimiento_por_hora()['memoria_kb']
+            self._escribir(pantalla, y - 1, 2, f"Memoria: {self.perfil.ultimo['memoria'] / 1048576:.1f} MB  ·  "
+                                               f"{'-' if por_hora is None else f'{por_hora:+,.0f} KB'} "
+                                               f"por hora simulada")
+            y += 1
+
+        # Eventos recientes
+        self._escribir(pantalla, y, 0, "EVENTOS RECIENTES", curses.A_BOLD)
+        recientes = list(itertools.islice(reversed(banco.log), max(0, alto - y - 1)))
+        for i, linea in enumerate(reversed(recientes)):
+            self._escribir(pantalla, y + 1 + i, 2, linea)
+
+        pantalla.noutrefresh()
+        curses.doupdate()
@@ -0,0 +1,338 @@
+"""
+Tablero web local: una página que recibe el estado del banco por Server-Sent Events
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.config import FPS_WEB, MARCOS_WEB, TIMEOUT_ESCRITURA_WEB, LATIDO_WEB
+from utils.metricas import Contador, Medidor
+
+
+class SumideroWeb:
+    """Sumidero de notificaciones que las guarda hasta el próximo cuadro del tablero web"""
+
+    nombre = "web"
+
+    def __init__(self, maximo=50):
+        self._pendientes = deque(maxlen=maximo)
+
+    def entregar(self, lote):
+        self._pendientes.extend(n.como_dict() for n in lote)
+
+    def drenar(self):
+        """Devuelve y retira las notificaciones pendientes"""
+        pendientes = []
+        while True:
+            try:
+                pendientes.append(self._pendientes.popleft())
+            except IndexError:
+                return pendientes
+
+
+class ServidorTablero:
+    """
+    Servidor HTTP local con la página del tablero (/), el estado completo
+    (/estado) y el flujo de cambios (/eventos, Server-Sent Events).
+
+    El motor llama a `publicar(banco)` una vez por cuadro: se toma una foto
+    del estado agregado, se compara con la anterior y los cambios del cuadro
+    se serializan una sola vez en un anillo de MARCOS_WEB cuadros. Cada
+    espectador lee el anillo desde su propio hilo, así que el costo para el
+    motor no depende de cuántos espectadores haya. Un espectador que se
+    atrasa más que el anillo se desconecta (al reconectarse recibe el estado
+    completo) en lugar de acumular cuadros en memoria.
+    """
+
+    def __init__(self, puerto=0, host="127.0.0.1", marcos=MARCOS_WEB,
+                 timeout_escritura=TIMEOUT_ESCRITURA_WEB, registro_metricas=None):
+        """
+        Inicializa el servidor
+
+        Args:
+            puerto (int): Puerto de escucha (0 elige uno libre)
+            host (str): Dirección donde escucha el servidor
+            marcos (int): Cuadros que se conservan para espectadores atrasados
+            timeout_escritura (float): Segundos que puede bloquear una escritura a un espectador
+            registro_metricas (RegistroMetricas): Donde publicar las métricas (opcional)
+        """
+        self.puerto = puerto
+        self.host = host
+        self.timeout_escritura = timeout_escritura
+        self.sumidero = SumideroWeb()
+
+        self._condicion = threading.Condition()
+        self._marcos = deque(maxlen=marcos)  # (secuencia, bytes)
+        self._secuencia = 0
+        self._estado = {}
+        self._detenido = False
+        self._servidor = None
+        self._hilo = None
+
+        self.espectadores = Medidor("banco_web_espectadores", "Espectadores conectados al tablero web")
+        self.desconectados = Contador("banco_web_desconectados_total",
+                                      "Espectadores desconectados por atrasarse", ())
+        if registro_metricas is not None:
+            registro_metricas.agregar(self.espectadores)
+            registro_metricas.agregar(self.desconectados)
+
+    def iniciar(self):
+        """Arranca el servidor en un hilo en segundo plano"""
+        self._servidor = ThreadingHTTPServer((self.host, self.puerto), self._crear_manejador())
+        self._servidor.daemon_threads = True
+        self.puerto = self._servidor.server_address[1]
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Cierra los flujos abiertos y detiene el servidor"""
+        with self._condicion:
+            self._detenido = True
+            self._condicion.notify_all()
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._hilo.join(timeout=2.0)
+
+    # ------------------------------------------------------------------
+    # Lado del motor
+    # ------------------------------------------------------------------
+    @staticmethod
+    def foto(banco):
+        """
+        Estado agregado del banco en un instante
+
+        Returns:
+            dict: Reloj, estado de cada ventanilla, largo y composición de la fila y atendidos
+        """
+        prioritarios = sum(1 for p in banco.fila if p.prioridad)
+        return {
+            'reloj': round(banco.reloj(), 1),
+            'ventanillas': {str(v.id): [v.estado, v.cliente.id if v.cliente else None]
+                            for v in banco.ventanillas},
+            'fila': len(banco.fila),
+            'prioritarios': prioritarios,
+            'atendidos': banco.clientes_atendidos,
+            'clientes': banco.contador_personas
+        }
+
+    def publicar(self, banco):
+        """
+        Publica un cuadro con los cambios desde el cuadro anterior. Debe
+        llamarse desde el hilo que maneja el banco, a ritmo fijo (FPS_WEB)
+
+        Returns:
+            dict: Cambios publicados (vacío si no hubo ninguno)
+        """
+        estado = self.foto(banco)
+        anterior = self._estado
+        cambios = {clave: valor for clave, valor in estado.items()
+                   if clave != 'ventanillas' and valor != anterior.get(clave)}
+        ventanillas_anteriores = anterior.get('ventanillas', {})
+        ventanillas = {vid: valor for vid, valor in estado['ventanillas'].items()
+                       if ventanillas_anteriores.get(vid) != valor}
+        if ventanillas:
+            cambios['ventanillas'] = ventanillas
+        notificaciones = self.sumidero.drenar()
+        if notificaciones:
+            cambios['notificaciones'] = notificaciones
+        if set(cambios) <= {'reloj'}:
+            # Solo avanzó el reloj: no vale un mensaje, el latido mantiene viva la conexión
+            cambios = {}
+
+        with self._condicion:
+            self._estado = estado
+            if cambios:
+                self._secuencia += 1
+                marco = f"id: {self._secuencia}\nevent: delta\ndata: {json.dumps(cambios)}\n\n"
+                self._marcos.append((self._secuencia, marco.encode("utf-8")))
+                self._condicion.notify_all()
+        return cambios
+
+    # ------------------------------------------------------------------
+    # Lado de los espectadores
+    # ------------------------------------------------------------------
+    def _suscribir(self):
+        """Estado completo y secuencia desde la que deben leerse los cambios"""
+        with self._condicion:
+            return self._secuencia, json.dumps(self._estado)
+
+    def _esperar_marcos(self, desde):
+        """
+        Espera cuadros posteriores a `desde`
+
+        Returns:
+            list | None: Cuadros nuevos ([] si venció el latido), o None si el
+                espectador se atrasó más que el anillo o el servidor se detuvo
+        """
+        with self._condicion:
+            self._condicion.wait_for(lambda: self._secuencia > desde or self._detenido, LATIDO_WEB)
+            if self._detenido:
+                return None
+            if self._secuencia == desde:
+                return []
+            if not self._marcos or self._marcos[0][0] > desde + 1:
+                return None
+            return [marco for marco in self._marcos if marco[0] > desde]
+
+    def _transmitir(self, manejador):
+        """Envía el estado completo y luego los cambios hasta que el espectador se va o se atrasa"""
+        manejador.connection.settimeout(self.timeout_escritura)
+        secuencia, estado = self._suscribir()
+        self.espectadores.inc()
+        try:
+            manejador.wfile.write(f"retry: 2000\nevent: estado\ndata: {estado}\n\n".encode("utf-8"))
+            manejador.wfile.flush()
+            while True:
+                marcos = self._esperar_marcos(secuencia)
+                if marcos is None:
+                    if not self._detenido:
+                        self.desconectados.inc()
+                    return
+                if not marcos:
+                    manejador.wfile.write(b": latido\n\n")
+                else:
+                    manejador.wfile.write(b"".join(datos for _, datos in marcos))
+                    secuencia = marcos[-1][0]
+                manejador.wfile.flush()
+        except OSError:
+            # El espectador cerró la conexión o no leyó a tiempo
+            pass
+        finally:
+            self.espectadores.dec()
+
+    def _crear_manejador(self):
+        servidor = self
+
+        class ManejadorTablero(BaseHTTPRequestHandler):
+            def do_GET(self):
+                ruta = self.path.split("?")[0]
+                if ruta == "/":
+                    self._responder(PAGINA_TABLERO.encode("utf-8"), "text/html; charset=utf-8")
+                elif ruta == "/estado":
+                    self._responder(servidor._suscribir()[1].encode("utf-8"), "application/json")
+                elif ruta == "/eventos":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    servidor._transmitir(self)
+                else:
+                    self.send_error(404)
+
+            def _responder(self, cuerpo, tipo):
+                self.send_response(200)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                pass
+
+        return ManejadorTablero
+
+
+class PublicadorPeriodico:
+    """Llama a servidor.publicar(banco) a FPS_WEB desde un temporizador del anfitrión"""
+
+    def __init__(self, servidor, banco, programar, fps=FPS_WEB):
+        """
+        Args:
+            servidor (ServidorTablero): Servidor que publica
+            banco (Banco): Banco a publicar
+            programar (callable): programar(ms, callback) del anfitrión (ej. root.after)
+            fps (float): Cuadros por segundo
+        """
+        self.servidor = servidor
+        self.banco = banco
+        self.programar = programar
+        self.intervalo_ms = max(1, int(1000 / fps))
+
+    def iniciar(self):
+        self._cuadro()
+        return self
+
+    def _cuadro(self):
+        inicio = time.perf_counter()
+        self.servidor.publicar(self.banco)
+        transcurrido_ms = (time.perf_counter() - inicio) * 1000
+        self.programar(max(1, int(self.intervalo_ms - transcurrido_ms)), self._cuadro)
+
+
+PAGINA_TABLERO = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Sistema de Gestión Bancaria</title>
+<style>
+  body { font-family: sans-serif; background: #2c3e50; color: #ecf0f1; margin: 20px; }
+  h1 { font-size: 1.4em; }
+  #resumen span { margin-right: 24px; font-size: 1.1em; }
+  #ventanillas { display: grid; grid-template-columns: repeat(auto-fill, minmax(120px, 1fr)); gap: 8px; margin: 16px 0; }
+  .ventanilla { padding: 10px; border-radius: 6px; background: #34495e; border-left: 6px solid #7f8c8d; }
+  .libre { border-color: #27ae60; } .atendiendo { border-color: #e74c3c; } .descansando { border-color: #f39c12; }
+  #notificaciones div { padding: 6px 10px; margin: 4px 0; background: #34495e; border-radius: 4px; white-space: pre-line; }
+  #conexion { float: right; font-size: 0.9em; }
+</style>
+</head>
+<body>
+<span id="conexion">conectando…</span>
+<h1>🏦 Sistema de Gestión Bancaria</h1>
+<div id="resumen">
+  <span>⏱️ <b id="reloj">-</b> s</span>
+  <span>👥 En fila: <b id="fila">-</b> (<b id="prioritarios">-</b> prioritarios)</span>
+  <span>✅ Atendidos: <b id="atendidos">-</b></span>
+  <span>🎫 Clientes: <b id="clientes">-</b></span>
+</div>
+<div id="ventanillas"></div>
+<h2>📱 Notificaciones</h2>
+<div id="notificaciones"></div>
+<script>
+const estado = {ventanillas: {}};
+const $ = id => document.getElementById(id);
+
+function dibujarVentanilla(id, [est, cliente]) {
+  let el = document.getElementById("v" + id);
+  if (!el) {
+    el = document.createElement("div");
+    el.id = "v" + id;
+    $("ventanillas").appendChild(el);
+  }
+  el.className = "ventanilla " + est;
+  el.textContent = "Ventanilla " + id + " · " + est + (cliente ? " · C" + cliente : "");
+}
+
+function aplicar(cambios) {
+  for (const clave of ["reloj", "fila", "prioritarios", "atendidos", "clientes"]) {
+    if (clave in cambios) { estado[clave] = cambios[clave]; $(clave).textContent = cambios[clave]; }
+  }
+  for (const [id, valor] of Object.entries(cambios.ventanillas || {})) {
+    estado.ventanillas[id] = valor;
+    dibujarVentanilla(id, valor);
+  }
+  for (const n of cambios.notificaciones || []) {
+    const el = document.createElement("div");
+    el.textContent = "[" + n.timestamp + "] " + n.mensaje;
+    $("notificaciones").prepend(el);
+    while ($("notificaciones").childElementCount > 20) $("notificaciones").lastChild.remove();
+  }
+}
+
+const fuente = new EventSource("/eventos");
+fuente.addEventListener("estado", e => {
+  $("ventanillas").innerHTML = "";
+  estado.ventanillas = {};
+  aplicar(JSON.parse(e.data));
+  $("conexion").textContent = "🟢 en vivo";
+});
+fuente.addEventListener("delta", e => aplicar(JSON.parse(e.data)));
+fuente.onerror = () => { $("conexion").textContent = "🔴 reconectando…"; };
+</script>
+</body>
+</html>
+"""